@@ -54,7 +54,7 @@ except ImportError:
     sys.exit(1)
 
 try:
-    from flask import Flask, jsonify, request as flask_request
+    from flask import Flask, Response, jsonify, request as flask_request, stream_with_context
 except ImportError:
     print("Flask required: pip install flask")
     sys.exit(1)
@@ -559,6 +559,44 @@ class LLMRouter:
         """Proxy /api/chat to Ollama with model resolution and fallback."""
         return self._proxy_request("/api/chat", body)
 
+    def stream_chat(self, body):
+        """Relay a streaming /api/chat from Ollama line by line (NDJSON).
+
+        No retries: once bytes have gone to the caller there is nothing to
+        retry, and the caller (ELAINE) owns the fallback order. Closing the
+        returned generator closes the upstream connection, which stops
+        generation on the GPU.
+        """
+        start = time.time()
+        with self._lock:
+            self.metrics["total_requests"] += 1
+        model = body.get("model", self.registry.get_default_model())
+        ollama_name = self.registry.resolve(model)
+        body["model"] = ollama_name
+        self.gpu.ensure_model_loaded(ollama_name)
+
+        resp = req_lib.post(f"{OLLAMA_URL}/api/chat", json=body, stream=True, timeout=120)
+        if resp.status_code != 200:
+            resp.close()
+            with self._lock:
+                self.metrics["errors"] += 1
+            raise RuntimeError(f"Ollama HTTP {resp.status_code}")
+
+        def relay():
+            try:
+                for line in resp.iter_lines():
+                    if line:
+                        yield line + b"\n"
+                latency = int((time.time() - start) * 1000)
+                with self._lock:
+                    self.metrics["local_success"] += 1
+                    self.metrics["latencies_ms"].append(latency)
+                logger.info(f"LLM stream served locally ({ollama_name}, {latency}ms)")
+            finally:
+                resp.close()
+
+        return relay()
+
     def proxy_generate(self, body):
         """Proxy /api/generate to Ollama with model resolution and fallback."""
         return self._proxy_request("/api/generate", body)
@@ -1210,6 +1248,12 @@ def api_boot():
 @app.route("/api/chat", methods=["POST"])
 def proxy_chat():
     body = flask_request.get_json(force=True, silent=True) or {}
+    if body.get("stream"):
+        try:
+            lines = llm_router.stream_chat(body)
+        except Exception as e:
+            return jsonify({"error": f"Ollama unavailable: {e}"}), 503
+        return Response(stream_with_context(lines), mimetype="application/x-ndjson")
     result, status = llm_router.proxy_chat(body)
     return jsonify(result), status
 
@@ -251,8 +251,9 @@ def create_constellation_routes(poi_engine, network_intel, reciprocity_engine, p
 
     @constellation_bp.route("/network/opportunities", methods=["GET"])
     def network_opportunities():
-        """Second-order relationship opportunities."""
-        opps = network_intel.find_opportunities(poi_engine.pois)
+        """Second-order relationship opportunities (?hops=2..3 to look further out)."""
+        hops = min(max(request.args.get("hops", 1, type=int), 1), 3)
+        opps = network_intel.find_opportunities(poi_engine.pois, max_hops=hops)
         return jsonify([
             {
                 "source": o.source_poi_name,
@@ -261,10 +262,25 @@ def create_constellation_routes(poi_engine, network_intel, reciprocity_engine, p
                 "value": o.estimated_value,
                 "action": o.action,
                 "prerequisites": o.prerequisites,
+                "path": o.path,
+                "hops": o.hops,
             }
             for o in opps
         ])
 
+    @constellation_bp.route("/network/intro-paths", methods=["GET"])
+    def intro_paths():
+        """Best warm-intro chains to a person: ?target=<name or poi_id>&max_hops=3."""
+        target = request.args.get("target", "").strip()
+        if not target:
+            return jsonify({"error": "target required"}), 400
+        max_hops = min(max(request.args.get("max_hops", 3, type=int), 1), 3)
+        paths = network_intel.find_intro_paths(poi_engine.pois, target, max_hops=max_hops)
+        return jsonify([
+            {"path": p.path, "poi_ids": p.poi_ids, "probability": p.probability, "hops": p.hops}
+            for p in paths
+        ])
+
     @constellation_bp.route("/reciprocity", methods=["GET"])
     def reciprocity():
         """Reciprocity analysis across all tiers."""
@@ -280,4 +296,13 @@ def create_constellation_routes(poi_engine, network_intel, reciprocity_engine, p
         """POI counts by tier."""
         return jsonify(poi_engine.get_poi_count())
 
+    @constellation_bp.route("/signals", methods=["POST"])
+    def ingest_signals():
+        """Bulk signal ingestion: {"signals": [{"type": "email", "from_name": ..., ...}, ...]}."""
+        data = request.get_json(silent=True) or {}
+        signals = data.get("signals")
+        if not isinstance(signals, list):
+            return jsonify({"error": "signals must be a list"}), 400
+        return jsonify(poi_engine.ingest_signals(signals))
+
     return constellation_bp
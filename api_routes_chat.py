@@ -6,15 +6,26 @@ Ollama only — no cloud APIs.
 Almost Magic Tech Lab
 """
 
-from flask import Blueprint, jsonify, request, Response
+from flask import Blueprint, jsonify, request, Response, stream_with_context
 import json
 import logging
 import os
+import queue
+import threading
+import time
 import urllib.request
 import urllib.error
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timezone
 
+from modules.stt_stream import (
+    SAMPLE_RATE as STT_SAMPLE_RATE, STTStream, WhisperPool, faster_whisper_loader,
+)
+from modules.tts_pipeline import (
+    ElevenLabsBackend, PCMBackend, PhraseCache, TTSPipeline, PCM_SAMPLE_RATE,
+    segments_to_chunks, split_speech, wav_header,
+)
+
 logger = logging.getLogger("elaine.chat")
 
 SUPERVISOR_URL = os.environ.get("SUPERVISOR_URL", "http://localhost:9000")
@@ -23,6 +34,8 @@ OLLAMA_URL = os.environ.get("OLLAMA_URL", "http://localhost:11434")
 CHAT_MODEL = os.environ.get("ELAINE_CHAT_MODEL", "llama3.2:3b")
 CHAT_TIMEOUT = 10  # seconds — hard cap per user spec
 CHAT_MAX_TOKENS = 150  # concise replies, not essays
+CHAT_FIRST_TOKEN_DEADLINE = float(os.environ.get("ELAINE_FIRST_TOKEN_DEADLINE", CHAT_TIMEOUT))
+CHAT_STREAM_IDLE_TIMEOUT = 30  # seconds between chunks once a reply is flowing
 
 # ── ElevenLabs Voice (TTS output) ─────────────────────────────
 ELEVENLABS_API_KEY = os.environ.get("ELEVENLABS_API_KEY", "")
@@ -52,14 +65,12 @@ def _get_kokoro():
     return _kokoro_pipeline
 
 
-def _kokoro_synthesise(text: str) -> bytes | None:
-    """Synthesise text to WAV bytes via Kokoro-82M. Returns None on failure."""
+def _kokoro_pcm(text: str) -> bytes | None:
+    """Synthesise text to raw 16-bit PCM (24 kHz mono) via Kokoro-82M. Returns None on failure."""
     pipeline = _get_kokoro()
     if pipeline is None:
         return None
     try:
-        import io
-        import struct
         samples = []
         for _, _, audio_chunk in pipeline(text, voice="af_heart"):
             samples.append(audio_chunk)
@@ -67,42 +78,71 @@ def _kokoro_synthesise(text: str) -> bytes | None:
             return None
         import numpy as np
         audio = np.concatenate(samples)
-        # Convert float32 numpy array to 16-bit PCM WAV
-        pcm = (audio * 32767).astype(np.int16)
-        buf = io.BytesIO()
-        # Write minimal WAV header + data
-        sample_rate = 24000
-        num_samples = len(pcm)
-        data_size = num_samples * 2
-        buf.write(b"RIFF")
-        buf.write(struct.pack("<I", 36 + data_size))
-        buf.write(b"WAVE")
-        buf.write(b"fmt ")
-        buf.write(struct.pack("<IHHIIHH", 16, 1, 1, sample_rate, sample_rate * 2, 2, 16))
-        buf.write(b"data")
-        buf.write(struct.pack("<I", data_size))
-        buf.write(pcm.tobytes())
-        logger.info("Kokoro TTS: %d bytes for %d chars", buf.tell(), len(text))
-        return buf.getvalue()
+        # Convert float32 numpy array to 16-bit PCM
+        return (audio * 32767).astype(np.int16).tobytes()
     except Exception as exc:
         logger.warning("Kokoro synthesis failed: %s", exc)
         return None
 
-# ── Whisper STT (lazy-loaded on first request) ──────────────
+
+def _kokoro_synthesise(text: str) -> bytes | None:
+    """Synthesise text to WAV bytes via Kokoro-82M. Returns None on failure."""
+    pcm = _kokoro_pcm(text)
+    if pcm is None:
+        return None
+    wav = wav_header(PCM_SAMPLE_RATE, len(pcm)) + pcm
+    logger.info("Kokoro TTS: %d bytes for %d chars", len(wav), len(text))
+    return wav
+
+
+# ── Streaming TTS (sentence-pipelined, phrase-cached) ────────
+_tts_pipeline = None
+_shared_lock = threading.Lock()  # Two first requests must not each build a pipeline or pool
+
+
+def _get_tts_pipeline():
+    """Lazy-create the shared TTS pipeline and its on-disk phrase cache."""
+    global _tts_pipeline
+    if _tts_pipeline is None:
+        with _shared_lock:
+            if _tts_pipeline is None:
+                _tts_pipeline = TTSPipeline(PhraseCache())
+    return _tts_pipeline
+
+
+def _tts_backends():
+    """Streaming backends in fallback order: ElevenLabs → Kokoro-82M."""
+    backends = []
+    if ELEVENLABS_API_KEY:
+        backends.append(ElevenLabsBackend(ELEVENLABS_API_KEY, ELEVENLABS_VOICE_ID,
+                                          ELEVENLABS_MODEL, timeout=TTS_TIMEOUT))
+    if _get_kokoro() is not None:
+        backends.append(PCMBackend("kokoro", _kokoro_pcm))
+    return backends
+
+# ── Whisper STT (pooled, pre-warmed at startup) ─────────────
 WHISPER_MODEL_SIZE = os.environ.get("ELAINE_WHISPER_MODEL", "tiny")
-_whisper_model = None
+STT_POOL_SIZE = int(os.environ.get("ELAINE_STT_POOL", "2"))
+STT_STREAM_MAX_S = 120  # seconds of audio accepted per stream / session
+STT_SESSION_IDLE_S = 60  # sessions with no chunk for this long are dropped
+_stt_pool = None
+_stt_sessions = {}
+_stt_sessions_lock = threading.Lock()
 
 
-def _get_whisper():
-    """Lazy-load the faster-whisper model. CPU int8 for speed (~75MB RAM)."""
-    global _whisper_model
-    if _whisper_model is None:
-        from faster_whisper import WhisperModel
-        _whisper_model = WhisperModel(
-            WHISPER_MODEL_SIZE, device="cpu", compute_type="int8"
-        )
-        logger.info("Whisper '%s' loaded (CPU, int8)", WHISPER_MODEL_SIZE)
-    return _whisper_model
+def _get_stt_pool():
+    """Shared pool of faster-whisper models (CPU int8, ~75MB RAM each for tiny)."""
+    global _stt_pool
+    if _stt_pool is None:
+        with _shared_lock:
+            if _stt_pool is None:
+                _stt_pool = WhisperPool(faster_whisper_loader(WHISPER_MODEL_SIZE), size=STT_POOL_SIZE)
+    return _stt_pool
+
+
+def prewarm_stt():
+    """Load the Whisper pool in a background thread so the first voice command doesn't pay for it."""
+    return _get_stt_pool().warm_in_background()
 
 # ── AMTL Tool Registry ─────────────────────────────────────────
 
@@ -287,6 +327,112 @@ def _ping_service(tool):
     return (tool["id"], "stopped", None)
 
 
+def _chat_messages(data):
+    """System prompt + last 10 history turns + the new user message."""
+    messages = [{"role": "system", "content": SYSTEM_PROMPT}]
+    for h in data.get("history", [])[-10:]:  # Keep last 10 turns to fit context
+        messages.append(h)
+    messages.append({"role": "user", "content": data.get("message", "").strip()})
+    return messages
+
+
+def _chat_targets():
+    """Supervisor first (manages VRAM + model loading), Ollama direct as fallback."""
+    return [
+        (f"{SUPERVISOR_URL}/api/chat", "supervisor"),
+        (f"{OLLAMA_URL}/api/chat", "ollama-direct"),
+    ]
+
+
+# ── Streaming relay ─────────────────────────────────────────────
+
+class FirstTokenTimeout(Exception):
+    """A chat target sent nothing before the first-token deadline."""
+
+
+class ChatStream:
+    """
+    One streamed reply from an Ollama-compatible /api/chat target.
+
+    Iterating yields content chunks as they arrive. A reader thread owns
+    the upstream connection; close() tells it to hang up at the next
+    chunk, which makes Ollama stop generating. `final` holds the closing
+    record (eval_count, eval_duration, ...) once the reply is done.
+    """
+
+    def __init__(self, url, payload, first_token_deadline=None, idle_timeout=None):
+        self.url = url
+        self.payload = payload
+        self.first_token_deadline = first_token_deadline or CHAT_FIRST_TOKEN_DEADLINE
+        self.idle_timeout = idle_timeout or CHAT_STREAM_IDLE_TIMEOUT
+        self.final = {}
+        self._lines = queue.Queue()
+        self._closed = threading.Event()
+
+    def _read(self):
+        try:
+            req = urllib.request.Request(
+                self.url,
+                data=self.payload,
+                headers={"Content-Type": "application/json"},
+                method="POST",
+            )
+            timeout = max(self.first_token_deadline, self.idle_timeout)
+            with urllib.request.urlopen(req, timeout=timeout) as resp:
+                for line in resp:
+                    if self._closed.is_set():
+                        return
+                    self._lines.put(("line", line))
+            self._lines.put(("eof", None))
+        except Exception as e:
+            self._lines.put(("error", e))
+
+    def __iter__(self):
+        threading.Thread(target=self._read, daemon=True, name="chat-stream").start()
+        deadline = time.monotonic() + self.first_token_deadline
+        started = False
+        buf = b""
+        while True:
+            wait = self.idle_timeout if started else deadline - time.monotonic()
+            try:
+                if wait <= 0:
+                    raise queue.Empty
+                kind, value = self._lines.get(timeout=wait)
+            except queue.Empty:
+                if not started:
+                    raise FirstTokenTimeout(
+                        f"no first token within {self.first_token_deadline}s")
+                raise TimeoutError(f"stream stalled for {self.idle_timeout}s")
+            if kind == "error":
+                raise value
+            if kind == "eof":
+                return
+            # Streaming targets send one JSON record per line; a
+            # non-streaming reply may span lines, so parse when complete.
+            buf += value
+            try:
+                record = json.loads(buf)
+            except ValueError:
+                continue
+            buf = b""
+            started = True
+            if record.get("error"):
+                raise RuntimeError(record["error"])
+            text = (record.get("message") or {}).get("content") or record.get("response") or ""
+            if text:
+                yield text
+            if record.get("done", True):
+                self.final = record
+                return
+
+    def close(self):
+        self._closed.set()
+
+
+def _sse(event, data):
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
 def create_chat_routes():
     bp = Blueprint("chat", __name__)
 
@@ -304,28 +450,18 @@ def create_chat_routes():
             return jsonify({"error": "message is required"}), 400
 
         model = data.get("model", CHAT_MODEL)
-        history = data.get("history", [])
-
-        # Build messages array for Ollama chat API
-        messages = [{"role": "system", "content": SYSTEM_PROMPT}]
-        for h in history[-10:]:  # Keep last 10 turns to fit context
-            messages.append(h)
-        messages.append({"role": "user", "content": message})
 
         # Build payload — cap response length for snappy chat
         payload = json.dumps({
             "model": model,
-            "messages": messages,
+            "messages": _chat_messages(data),
             "stream": False,
             "options": {"num_predict": CHAT_MAX_TOKENS},
         }).encode("utf-8")
 
         # Route through Supervisor first (manages VRAM + model loading),
         # fall back to Ollama direct only if Supervisor is down.
-        targets = [
-            (f"{SUPERVISOR_URL}/api/chat", "supervisor"),
-            (f"{OLLAMA_URL}/api/chat", "ollama-direct"),
-        ]
+        targets = _chat_targets()
 
         import time as _time
         start = _time.time()
@@ -377,6 +513,94 @@ def create_chat_routes():
             "via": "offline",
         }), 503
 
+    # ── POST /api/chat/stream ─────────────────────────────────────
+
+    @bp.route("/api/chat/stream", methods=["POST"])
+    def chat_stream():
+        """
+        Stream a reply as server-sent events, one event per chunk.
+        Body: same as /api/chat.
+        Events: start {via, model, ttft_ms} → token {text}… →
+        done {reply, ttft_ms, tokens, tokens_per_s, elapsed_s} | error {...}
+        The next target is tried only if no first token arrives within
+        CHAT_FIRST_TOKEN_DEADLINE; a client disconnect aborts generation.
+        """
+        data = request.get_json(silent=True) or {}
+        if not data.get("message", "").strip():
+            return jsonify({"error": "message is required"}), 400
+
+        model = data.get("model", CHAT_MODEL)
+        payload = json.dumps({
+            "model": model,
+            "messages": _chat_messages(data),
+            "stream": True,
+            "options": {"num_predict": CHAT_MAX_TOKENS},
+        }).encode("utf-8")
+
+        def events():
+            start = time.perf_counter()
+            last_error = ""
+            for url, via in _chat_targets():
+                stream = ChatStream(url, payload)
+                first = None
+                parts = []
+                try:
+                    for text in stream:
+                        if first is None:
+                            first = time.perf_counter()
+                            yield _sse("start", {"via": via, "model": model,
+                                                 "ttft_ms": int((first - start) * 1000)})
+                        parts.append(text)
+                        yield _sse("token", {"text": text})
+                except GeneratorExit:
+                    logger.info("Chat stream via %s aborted by client after %d chunks", via, len(parts))
+                    raise
+                except Exception as e:
+                    if first is None:
+                        last_error = str(e)
+                        logger.warning("Chat stream via %s failed before first token: %s", via, last_error)
+                        continue
+                    logger.warning("Chat stream via %s broke mid-reply: %s", via, e)
+                    yield _sse("error", {"error": str(e), "via": via, "partial": "".join(parts)})
+                    return
+                finally:
+                    stream.close()
+
+                end = time.perf_counter()
+                first = first or end
+                final = stream.final
+                tokens = final.get("eval_count") or len(parts)
+                gen_s = (final.get("eval_duration") or 0) / 1e9 or (end - first)
+                stats = {
+                    "reply": "".join(parts),
+                    "model": model,
+                    "via": via,
+                    "ttft_ms": int((first - start) * 1000),
+                    "tokens": tokens,
+                    "tokens_per_s": round(tokens / gen_s, 1) if gen_s > 0 else None,
+                    "elapsed_s": round(end - start, 2),
+                }
+                logger.info("Chat stream via %s: ttft %sms, %s tokens, %s tok/s (%s)",
+                            via, stats["ttft_ms"], tokens, stats["tokens_per_s"], model)
+                yield _sse("done", stats)
+                return
+
+            elapsed = round(time.perf_counter() - start, 1)
+            if "first token" in last_error or "timed out" in last_error.lower():
+                yield _sse("error", {"reply": "Still warming up — try again in a moment.",
+                                     "via": "warming-up", "elapsed_s": elapsed})
+            else:
+                yield _sse("error", {
+                    "error": "Cannot reach Ollama",
+                    "reply": "I can't reach Ollama right now. Check that Ollama (:11434) or The Supervisor (:9000) is running.",
+                    "via": "offline", "elapsed_s": elapsed,
+                })
+
+        resp = Response(stream_with_context(events()), mimetype="text/event-stream")
+        resp.headers["Cache-Control"] = "no-cache"
+        resp.headers["X-Accel-Buffering"] = "no"
+        return resp
+
     # ── GET /api/tools ────────────────────────────────────────────
 
     @bp.route("/api/tools", methods=["GET"])
@@ -442,15 +666,13 @@ def create_chat_routes():
                 audio_file.save(tmp)
                 tmp_path = tmp.name
 
-            model = _get_whisper()
-            segments, info = model.transcribe(tmp_path, language="en")
-            text = " ".join(seg.text for seg in segments).strip()
+            text, language = _get_stt_pool().transcribe(tmp_path)
 
             elapsed = round(_time.time() - start, 2)
-            logger.info("STT: '%s' (%.2fs, lang=%s)", text[:80], elapsed, info.language)
+            logger.info("STT: '%s' (%.2fs, lang=%s)", text[:80], elapsed, language)
             return jsonify({
                 "text": text,
-                "language": info.language,
+                "language": language,
                 "elapsed_s": elapsed,
             })
 
@@ -468,6 +690,86 @@ def create_chat_routes():
                 except Exception:
                     pass
 
+    # ── POST /api/stt/stream ─────────────────────────────────────
+
+    @bp.route("/api/stt/stream", methods=["POST"])
+    def stt_stream():
+        """Transcribe a live (chunked) upload of raw 16-bit mono PCM at 16 kHz.
+        Voice activity splits it into segments; each is decoded while audio keeps arriving.
+        Query: partials=0 to skip interim decodes.
+        Returns NDJSON events: partial / final as they are ready, then done {text, elapsed_s}."""
+        partials = request.args.get("partials", "1") != "0"
+        source = request.stream
+        start = time.perf_counter()
+
+        def events():
+            stream = STTStream(_get_stt_pool(), partials=partials)
+            received = 0
+            limit = STT_STREAM_MAX_S * STT_SAMPLE_RATE * 2
+            while received < limit:
+                chunk = source.read(STT_SAMPLE_RATE // 5)   # ~100 ms of audio
+                if not chunk:
+                    break
+                received += len(chunk)
+                for event in stream.feed(chunk):
+                    yield json.dumps(event) + "\n"
+            for event in stream.finish():
+                yield json.dumps(event) + "\n"
+            yield json.dumps({"type": "done", "text": stream.text,
+                              "audio_s": round(received / (2 * STT_SAMPLE_RATE), 2),
+                              "elapsed_s": round(time.perf_counter() - start, 2)}) + "\n"
+
+        return Response(stream_with_context(events()), mimetype="application/x-ndjson")
+
+    # ── POST /api/stt/sessions… (chunk-per-request streaming) ────
+
+    @bp.route("/api/stt/sessions", methods=["POST"])
+    def stt_session_open():
+        """Open a streaming STT session for clients that send audio as separate POSTs."""
+        import uuid
+        now = time.monotonic()
+        with _stt_sessions_lock:
+            for sid in [k for k, v in _stt_sessions.items() if now - v["seen"] > STT_SESSION_IDLE_S]:
+                del _stt_sessions[sid]
+            sid = uuid.uuid4().hex
+            _stt_sessions[sid] = {
+                "stream": STTStream(_get_stt_pool(),
+                                    partials=request.args.get("partials", "1") != "0"),
+                "seen": now, "bytes": 0, "lock": threading.Lock(),
+            }
+        return jsonify({"session_id": sid, "sample_rate": STT_SAMPLE_RATE, "format": "pcm_s16le"})
+
+    @bp.route("/api/stt/sessions/<sid>", methods=["POST"])
+    def stt_session_chunk(sid):
+        """Feed one chunk of PCM; returns the partial/final events ready so far."""
+        session = _stt_sessions.get(sid)
+        if session is None:
+            return jsonify({"error": "unknown or expired session"}), 404
+        chunk = request.get_data()
+        with session["lock"]:
+            session["seen"] = time.monotonic()
+            session["bytes"] += len(chunk)
+            if session["bytes"] > STT_STREAM_MAX_S * STT_SAMPLE_RATE * 2:
+                return jsonify({"error": "session audio limit reached"}), 413
+            return jsonify({"events": session["stream"].feed(chunk)})
+
+    @bp.route("/api/stt/sessions/<sid>/end", methods=["POST"])
+    def stt_session_end(sid):
+        """Flush the last segment and close the session."""
+        with _stt_sessions_lock:
+            session = _stt_sessions.pop(sid, None)
+        if session is None:
+            return jsonify({"error": "unknown or expired session"}), 404
+        with session["lock"]:
+            events = session["stream"].feed(request.get_data()) + session["stream"].finish()
+        return jsonify({"events": events, "text": session["stream"].text})
+
+    @bp.route("/api/stt/status", methods=["GET"])
+    def stt_status():
+        """Whisper pool state: loaded models, warm-up, decode counts and timings."""
+        return jsonify(dict(_get_stt_pool().status(), model=WHISPER_MODEL_SIZE,
+                            sessions=len(_stt_sessions)))
+
     # ── GET /api/tts/status ───────────────────────────────────────
 
     @bp.route("/api/tts/status", methods=["GET"])
@@ -513,31 +815,11 @@ def create_chat_routes():
         # ── Try 1: ElevenLabs (premium cloned voice) ─────────────
         if ELEVENLABS_API_KEY:
             try:
-                payload = json.dumps({
-                    "text": text,
-                    "model_id": ELEVENLABS_MODEL,
-                    "voice_settings": {
-                        "stability": 0.5,
-                        "similarity_boost": 0.75,
-                        "style": 0.3,
-                    },
-                }).encode("utf-8")
-
-                url = f"https://api.elevenlabs.io/v1/text-to-speech/{ELEVENLABS_VOICE_ID}"
-                req = urllib.request.Request(
-                    url,
-                    data=payload,
-                    headers={
-                        "Content-Type": "application/json",
-                        "xi-api-key": ELEVENLABS_API_KEY,
-                        "Accept": "audio/mpeg",
-                    },
-                    method="POST",
-                )
-                with urllib.request.urlopen(req, timeout=TTS_TIMEOUT) as resp:
-                    audio_data = resp.read()
-                    logger.info("ElevenLabs TTS: %d bytes for %d chars", len(audio_data), len(text))
-                    return Response(audio_data, mimetype="audio/mpeg")
+                backend = ElevenLabsBackend(ELEVENLABS_API_KEY, ELEVENLABS_VOICE_ID,
+                                            ELEVENLABS_MODEL, timeout=TTS_TIMEOUT)
+                audio_data = backend.synthesise(text)
+                logger.info("ElevenLabs TTS: %d bytes for %d chars", len(audio_data), len(text))
+                return Response(audio_data, mimetype="audio/mpeg")
 
             except Exception as e:
                 logger.warning("ElevenLabs TTS failed, trying Kokoro: %s", e)
@@ -554,6 +836,75 @@ def create_chat_routes():
             "message": "No server-side TTS available. Use browser speechSynthesis.",
         })
 
+    # ── POST /api/tts/stream ────────────────────────────────────────
+
+    @bp.route("/api/tts/stream", methods=["POST"])
+    def tts_stream():
+        """Stream speech sentence by sentence as chunked audio.
+        Body: {"text": "..."} (plain or SSML) or {"segments": [{"text", "emotion", "pause_ms"}]}
+        as returned by /api/voice/briefing. Chunks come from the phrase cache when seen before.
+        Returns audio/mpeg (ElevenLabs), an open-ended audio/wav (Kokoro), or the browser hint."""
+        data = request.get_json(silent=True) or {}
+        settings = None
+        if data.get("segments"):
+            from modules.chronicle.voice import EMOTION_VOICE_SETTINGS, EmotionalTag, VoiceSegment
+            try:
+                segments = [VoiceSegment(text=s.get("text", ""),
+                                         emotion=EmotionalTag(s.get("emotion", "calm")),
+                                         pause_before_ms=int(s.get("pause_ms", 0)))
+                            for s in data["segments"]]
+            except (AttributeError, TypeError, ValueError) as e:
+                # Unknown emotion, non-numeric pause or a segment that isn't an object
+                return jsonify({"error": f"invalid segments: {e}"}), 400
+            chunks, settings = [], []
+            for seg in segments:
+                seg_chunks = segments_to_chunks([seg])
+                chunks.extend(seg_chunks)
+                settings.extend([EMOTION_VOICE_SETTINGS.get(seg.emotion)] * len(seg_chunks))
+            text = " ".join(s.text for s in segments)
+        else:
+            text = data.get("text", "").strip()
+            chunks = split_speech(text)
+        if not chunks:
+            return jsonify({"error": "text is required"}), 400
+
+        pipeline = _get_tts_pipeline()
+        for backend in _tts_backends():
+            stream = pipeline.stream(backend, chunks,
+                                     settings if backend.name == "elevenlabs" else None)
+            started = time.perf_counter()
+            try:
+                first = next(stream)
+            except Exception as e:
+                logger.warning("Streaming TTS via %s failed, trying next: %s", backend.name, e)
+                continue
+
+            def audio(first=first, stream=stream):
+                yield first
+                yield from stream
+
+            first_audio_ms = int((time.perf_counter() - started) * 1000)
+            logger.info("Streaming TTS via %s: %d chunks, first audio in %sms",
+                        backend.name, len(chunks), first_audio_ms)
+            resp = Response(stream_with_context(audio()), mimetype=backend.mimetype)
+            resp.headers["X-TTS-Backend"] = backend.name
+            resp.headers["X-TTS-Chunks"] = str(len(chunks))
+            resp.headers["X-TTS-First-Audio-Ms"] = str(first_audio_ms)
+            return resp
+
+        return jsonify({
+            "fallback": "browser-tts",
+            "text": text,
+            "message": "No server-side TTS available. Use browser speechSynthesis.",
+        })
+
+    # ── GET /api/tts/cache ──────────────────────────────────────────
+
+    @bp.route("/api/tts/cache", methods=["GET"])
+    def tts_cache():
+        """Phrase cache and streaming pipeline counters."""
+        return jsonify(_get_tts_pipeline().status())
+
     return bp
 
 
@@ -0,0 +1,46 @@
+"""
+Elaine v4 — Performance Routes
+Per-route latency, span breakdown and slow-request profiles, plus a
+Prometheus scrape endpoint.
+
+Almost Magic Tech Lab
+"""
+
+from flask import Blueprint, Response, jsonify, request
+
+
+def create_perf_routes(monitor):
+    """
+    Factory for the perf blueprint.
+
+    Args:
+        monitor: modules.perf.PerfMonitor installed on the app
+    """
+    bp = Blueprint("perf", __name__)
+
+    # ── GET /api/perf ──────────────────────────────────────────────
+    @bp.route("/api/perf", methods=["GET"])
+    def perf():
+        """Routes ranked by total time (?sort=total|count|p99|mean|max|errors&limit=N)."""
+        limit = request.args.get("limit", type=int)
+        return jsonify(monitor.snapshot(sort=request.args.get("sort", "total"), limit=limit))
+
+    # ── GET /api/perf/slow ─────────────────────────────────────────
+    @bp.route("/api/perf/slow", methods=["GET"])
+    def perf_slow():
+        """Recent requests over the threshold, with sampled call stacks."""
+        return jsonify({"threshold_ms": monitor.slow_ms, "requests": monitor.slow_requests()})
+
+    # ── POST /api/perf/reset ───────────────────────────────────────
+    @bp.route("/api/perf/reset", methods=["POST"])
+    def perf_reset():
+        monitor.reset()
+        return jsonify({"reset": True})
+
+    # ── GET /metrics ───────────────────────────────────────────────
+    @bp.route("/metrics", methods=["GET"])
+    def metrics():
+        """Prometheus text exposition format."""
+        return Response(monitor.prometheus(), mimetype="text/plain; version=0.0.4")
+
+    return bp
@@ -4,7 +4,10 @@ Chronicle v2: Meeting Intelligence + ElevenLabs Voice
 Almost Magic Tech Lab
 """
 
-from flask import Blueprint, jsonify, request
+import codecs
+import json
+
+from flask import Blueprint, Response, jsonify, request, stream_with_context
 
 chronicle_bp = Blueprint("chronicle", __name__, url_prefix="/api/chronicle")
 voice_bp = Blueprint("voice", __name__, url_prefix="/api/voice")
@@ -127,6 +130,29 @@ def create_chronicle_routes(meeting_engine):
             for c in commitments
         ])
 
+    @chronicle_bp.route("/extract/<meeting_id>/stream", methods=["POST"])
+    def extract_stream(meeting_id):
+        """Extract from a transcript uploaded in chunks (e.g. live STT output) as it arrives.
+        Returns NDJSON events: participant / commitment / decision as found, then done {stats}."""
+        stream = meeting_engine.stream_transcript(meeting_id)
+        if stream is None:
+            return jsonify({"error": "Meeting not found"}), 404
+        source = request.stream
+
+        def events():
+            decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+            while True:
+                chunk = source.read(4096)
+                if not chunk:
+                    break
+                for event in stream.feed(decoder.decode(chunk)):
+                    yield json.dumps(event) + "\n"
+            for event in stream.feed(decoder.decode(b"", final=True)) + stream.finish():
+                yield json.dumps(event) + "\n"
+            yield json.dumps({"type": "done", "stats": stream.stats}) + "\n"
+
+        return Response(stream_with_context(events()), mimetype="application/x-ndjson")
+
     @chronicle_bp.route("/decisions/<meeting_id>", methods=["POST"])
     def add_decision(meeting_id):
         data = request.get_json() or {}
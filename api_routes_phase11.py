@@ -69,6 +69,20 @@ def create_innovator_routes(innovation_engine):
             for o in new
         ])
 
+    @innovator_bp.route("/similar", methods=["GET"])
+    def similar():
+        """Opportunities matching ?q=, Jaccard-ranked. Optional ?threshold= and ?limit=."""
+        matches = innovation_engine.find_similar(
+            request.args.get("q", ""),
+            threshold=request.args.get("threshold", type=float),
+            limit=request.args.get("limit", 5, type=int),
+        )
+        return jsonify([
+            {"id": o.opportunity_id, "title": o.title, "score": score,
+             "confidence": round(o.composite_confidence, 2)}
+            for o, score in matches
+        ])
+
     # ── Beast Research ──
 
     @innovator_bp.route("/beast/brief/<opp_id>", methods=["POST"])
@@ -4,40 +4,66 @@ Gatekeeper: Pre-transmission quality assurance
 Almost Magic Tech Lab
 """
 
-from flask import Blueprint, jsonify, request
+import json
+
+from flask import Blueprint, Response, jsonify, request, stream_with_context
 
 gatekeeper_bp = Blueprint("gatekeeper", __name__, url_prefix="/api/gatekeeper")
 
 
+def _check_args(data: dict) -> dict:
+    """Map a JSON check request onto Gatekeeper.check() arguments."""
+    from modules.gatekeeper import ContentChannel, ContentPriority
+    return {
+        "content": data.get("content", ""),
+        "title": data.get("title", ""),
+        "recipient": data.get("recipient", ""),
+        "channel": ContentChannel(data.get("channel", "email")),
+        "priority": ContentPriority(data["priority"]) if data.get("priority") else None,
+    }
+
+
+def _result_json(r) -> dict:
+    return {
+        "item_id": r.item_id,
+        "verdict": r.verdict.value,
+        "priority": r.priority.value,
+        "score": r.overall_score,
+        "summary": r.summary,
+        "checks": [
+            {"gate": c.gate_name, "passed": c.passed, "issues": c.issues, "suggestions": c.suggestions, "score": c.score}
+            for c in r.checks
+        ],
+    }
+
+
 def create_gatekeeper_routes(gatekeeper):
 
     @gatekeeper_bp.route("/check", methods=["POST"])
     def check():
         """Full gatekeeper check on outbound content."""
         data = request.get_json() or {}
-        from modules.gatekeeper import ContentChannel, ContentPriority
-        channel = ContentChannel(data.get("channel", "email"))
-        priority = None
-        if data.get("priority"):
-            priority = ContentPriority(data["priority"])
-        r = gatekeeper.check(
-            content=data.get("content", ""),
-            title=data.get("title", ""),
-            recipient=data.get("recipient", ""),
-            channel=channel,
-            priority=priority,
-        )
-        return jsonify({
-            "item_id": r.item_id,
-            "verdict": r.verdict.value,
-            "priority": r.priority.value,
-            "score": r.overall_score,
-            "summary": r.summary,
-            "checks": [
-                {"gate": c.gate_name, "passed": c.passed, "issues": c.issues, "suggestions": c.suggestions, "score": c.score}
-                for c in r.checks
-            ],
-        })
+        r = gatekeeper.check(**_check_args(data))
+        return jsonify(_result_json(r))
+
+    @gatekeeper_bp.route("/check/bulk", methods=["POST"])
+    def check_bulk():
+        """
+        Check many documents at once: {"items": [{content, title, recipient, channel, priority}]}.
+        Streams one JSON line per item (NDJSON) as each verdict finishes,
+        then a final {"done": true, ...} line. Identical items are checked once.
+        """
+        data = request.get_json() or {}
+        items = [_check_args(item) for item in data.get("items", [])]
+
+        def generate():
+            unique = 0
+            for index, result, duplicate_of in gatekeeper.check_many(items):
+                unique += duplicate_of is None
+                yield json.dumps({"index": index, "duplicate_of": duplicate_of, **_result_json(result)}) + "\n"
+            yield json.dumps({"done": True, "total": len(items), "checked": unique}) + "\n"
+
+        return Response(stream_with_context(generate()), mimetype="application/x-ndjson")
 
     @gatekeeper_bp.route("/override", methods=["POST"])
     def override():
@@ -52,6 +78,36 @@ def create_gatekeeper_routes(gatekeeper):
     def folders():
         return jsonify({"folders": gatekeeper.get_watched_folders()})
 
+    @gatekeeper_bp.route("/folders", methods=["POST"])
+    def add_folder():
+        """Watch another outbound folder: {path, channel, priority, extensions}."""
+        data = request.get_json() or {}
+        from modules.gatekeeper import ContentChannel, ContentPriority
+        if not data.get("path"):
+            return jsonify({"error": "path required"}), 400
+        folder = gatekeeper.add_watched_folder(
+            path=data["path"],
+            channel=ContentChannel(data.get("channel", "file")),
+            priority=ContentPriority(data.get("priority", "standard")),
+            extensions=data.get("extensions"),
+        )
+        return jsonify({"path": folder.path, "watching": gatekeeper.watcher.running})
+
+    @gatekeeper_bp.route("/watcher", methods=["GET"])
+    def watcher_stats():
+        """Per-folder events, checks, skips, latency and throughput."""
+        return jsonify(gatekeeper.watcher.stats())
+
+    @gatekeeper_bp.route("/watcher/<action>", methods=["POST"])
+    def watcher_control(action):
+        if action == "start":
+            gatekeeper.start_watching()
+        elif action == "stop":
+            gatekeeper.stop_watching()
+        else:
+            return jsonify({"error": f"Unknown action: {action}"}), 400
+        return jsonify({"running": gatekeeper.watcher.running})
+
     @gatekeeper_bp.route("/outlook-rules", methods=["GET"])
     def outlook_rules():
         return jsonify({"rules": gatekeeper.get_outlook_rules()})
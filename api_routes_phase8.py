@@ -124,6 +124,7 @@ def create_cartographer_routes(territory_map, discovery_engine):
 
     @cartographer_bp.route("/patterns", methods=["GET"])
     def patterns():
+        discovery_engine.detect_patterns()
         all_patterns = list(discovery_engine.patterns.values())
         return jsonify([
             {
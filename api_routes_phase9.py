@@ -106,6 +106,26 @@ def create_sentinel_routes(trust_engine):
     def positions():
         return jsonify(trust_engine.get_positions())
 
+    @sentinel_bp.route("/positions", methods=["POST"])
+    def track_position():
+        data = request.get_json() or {}
+        claim = data.get("claim")
+        if not isinstance(claim, str) or not claim.strip():
+            return jsonify({"error": "claim required"}), 400
+        pos = trust_engine.track_position(
+            claim=claim,
+            source_document=data.get("source", ""),
+            category=data.get("category", "general"),
+        )
+        return jsonify({"position_id": pos.position_id, "tracked": True})
+
+    @sentinel_bp.route("/positions/import", methods=["POST"])
+    def import_positions():
+        """Bulk-import positions from published content: {"documents": [{"source", "content"}]}."""
+        data = request.get_json() or {}
+        imported = trust_engine.import_positions(data.get("documents", []))
+        return jsonify({"imported": imported, "positions_tracked": len(trust_engine.positions)})
+
     @sentinel_bp.route("/positions/conflicts", methods=["POST"])
     def check_conflicts():
         """Check a piece of content against position graph."""
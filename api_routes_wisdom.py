@@ -1,7 +1,8 @@
 """
 Elaine v4 — Wisdom & Philosophy Routes
 Embedded knowledge base (sitcom quotes, one-liners, world idioms, philosophy)
-with optional proxy to Wisdom Quotes API (:3350) for additional content.
+with optional proxy to Wisdom Quotes API (:3350) for additional content,
+TTL-cached and refreshed in the background so it never sets request latency.
 
 Accessible to all AMTL apps via /api/wisdom/* endpoints.
 
@@ -9,9 +10,13 @@ Almost Magic Tech Lab
 """
 
 import logging
+import threading
+import time
 import urllib.request
 import urllib.parse
 import json
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
 
 from flask import Blueprint, jsonify, request
 from modules.wisdom_kb import WisdomKB
@@ -19,6 +24,10 @@ from modules.wisdom_kb import WisdomKB
 logger = logging.getLogger("elaine.wisdom")
 
 WISDOM_API = "http://localhost:3350"
+CACHE_TTL = 600            # Seconds an upstream answer is served before a background refresh
+FAILURE_TTL = 60           # Seconds an upstream failure is remembered (no retry per request)
+CACHE_SIZE = 256           # Distinct upstream queries kept
+UPSTREAM_WAIT = 0.25       # Seconds a request waits for an uncached upstream answer
 
 bp = Blueprint("wisdom", __name__)
 
@@ -26,19 +35,112 @@ bp = Blueprint("wisdom", __name__)
 _kb = WisdomKB()
 
 
+class ExternalCache:
+    """TTL cache in front of the Wisdom API, refreshed in the background.
+
+    Fresh entries are served directly. Stale entries are served while a
+    background fetch replaces them. A miss waits at most `wait` seconds
+    for the fetch; if the upstream is slower the caller gets None and the
+    answer lands in the cache for the next request. Failures are cached
+    too (as None, for FAILURE_TTL), so an offline upstream costs nothing.
+    """
+
+    def __init__(self, ttl: float = CACHE_TTL, failure_ttl: float = FAILURE_TTL,
+                 max_entries: int = CACHE_SIZE, workers: int = 4):
+        self.ttl = ttl
+        self.failure_ttl = failure_ttl
+        self.max_entries = max_entries
+        self._entries: OrderedDict = OrderedDict()   # key → (expires_at, value)
+        self._inflight: dict = {}                     # key → Future
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="wisdom-api")
+        self.hits = self.stale_hits = self.misses = 0
+
+    def _fetch(self, key, fetch):
+        try:
+            value = fetch()
+            ttl = self.ttl
+        except Exception as e:
+            logger.debug(f"Wisdom API unavailable for {key!r}: {e}")
+            value, ttl = None, self.failure_ttl
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            self._inflight.pop(key, None)
+        return value
+
+    def _refresh(self, key, fetch):
+        with self._lock:
+            future = self._inflight.get(key)
+            if future is None:
+                future = self._inflight[key] = self._pool.submit(self._fetch, key, fetch)
+        return future
+
+    def start(self, key, fetch):
+        """Begin a lookup: returns resolve(wait) → value or None.
+
+        Any needed fetch is already running when this returns, so the
+        caller can do local work before resolving.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry:
+                self._entries.move_to_end(key)
+        if entry and entry[0] > time.monotonic():
+            self.hits += 1
+            return lambda wait=None: entry[1]
+        future = self._refresh(key, fetch)
+        if entry:
+            self.stale_hits += 1
+            return lambda wait=None: entry[1]
+        self.misses += 1
+
+        def resolve(wait: float = UPSTREAM_WAIT):
+            try:
+                return future.result(timeout=wait)
+            except FutureTimeout:
+                return None
+        return resolve
+
+    def get(self, key, fetch, wait: float = UPSTREAM_WAIT):
+        return self.start(key, fetch)(wait)
+
+    def stats(self) -> dict:
+        return {"entries": len(self._entries), "hits": self.hits,
+                "stale_hits": self.stale_hits, "misses": self.misses}
+
+
+_external = ExternalCache()
+
+
+def _get_json(path: str, timeout: float) -> dict:
+    req = urllib.request.Request(f"{WISDOM_API}{path}", method="GET")
+    with urllib.request.urlopen(req, timeout=timeout) as resp:
+        return json.loads(resp.read().decode())
+
+
+def _search_both(query: str, limit: int = 10) -> tuple[list, list | None]:
+    """Local BM25 search while the (cached) upstream search runs concurrently.
+    External results are None when the Wisdom API is unavailable or slow."""
+    encoded = urllib.parse.quote(query)
+    external = _external.start(
+        ("search", query.lower()),
+        lambda: _get_json(f"/api/quotes/search?q={encoded}", timeout=5).get("results", []),
+    )
+    results = _kb.search(query, limit)
+    return results, external()
+
+
 @bp.route("/api/wisdom", methods=["GET"])
 def daily_wisdom():
     """Get the quote of the day (same all day, changes at midnight).
     Also tries the external Wisdom API for variety — falls back to embedded KB."""
-    # Try external API first for variety
-    try:
-        req = urllib.request.Request(f"{WISDOM_API}/api/quotes/random", method="GET")
-        with urllib.request.urlopen(req, timeout=3) as resp:
-            data = json.loads(resp.read().decode())
-            data["via"] = "wisdom-api"
-            return jsonify(data)
-    except Exception:
-        pass
+    # External API for variety — cached, so the random pick rotates every CACHE_TTL
+    data = _external.get("random", lambda: _get_json("/api/quotes/random", timeout=3))
+    if data:
+        return jsonify({**data, "via": "wisdom-api"})
 
     # Embedded KB — always works
     quote = _kb.daily()
@@ -62,20 +164,8 @@ def wisdom_search():
     if not query:
         return jsonify({"error": "q parameter required"}), 400
     limit = request.args.get("limit", 10, type=int)
-    results = _kb.search(query, limit)
-
-    # Also try external API
-    external = []
-    try:
-        encoded = urllib.parse.quote(query)
-        req = urllib.request.Request(
-            f"{WISDOM_API}/api/quotes/search?q={encoded}", method="GET"
-        )
-        with urllib.request.urlopen(req, timeout=5) as resp:
-            data = json.loads(resp.read().decode())
-            external = data.get("results", [])
-    except Exception:
-        pass
+    results, external = _search_both(query, limit)
+    external = external or []
 
     return jsonify({
         "query": query,
@@ -92,7 +182,7 @@ def sitcom_quotes():
     if source:
         quotes = _kb.by_source(source)
     else:
-        quotes = [q for q in _kb.all_quotes if q.get("category") == "sitcom"]
+        quotes = _kb.by_category("sitcom")
     return jsonify({"quotes": quotes, "count": len(quotes)})
 
 
@@ -103,28 +193,28 @@ def world_idioms():
     if culture:
         quotes = _kb.by_culture(culture)
     else:
-        quotes = [q for q in _kb.all_quotes if q.get("category") == "idiom"]
+        quotes = _kb.by_category("idiom")
     return jsonify({"idioms": quotes, "count": len(quotes)})
 
 
 @bp.route("/api/wisdom/one-liners", methods=["GET"])
 def one_liners():
     """Get one-liners and famous quotes."""
-    quotes = [q for q in _kb.all_quotes if q.get("category") == "one-liner"]
+    quotes = _kb.by_category("one-liner")
     return jsonify({"quotes": quotes, "count": len(quotes)})
 
 
 @bp.route("/api/wisdom/philosophy", methods=["GET"])
 def philosophy():
     """Get philosophy quotes."""
-    quotes = [q for q in _kb.all_quotes if q.get("category") == "philosophy"]
+    quotes = _kb.by_category("philosophy")
     return jsonify({"quotes": quotes, "count": len(quotes)})
 
 
 @bp.route("/api/wisdom/stats", methods=["GET"])
 def wisdom_stats():
     """Get knowledge base statistics."""
-    return jsonify(_kb.stats())
+    return jsonify({**_kb.stats(), "external_cache": _external.stats()})
 
 
 # Legacy endpoint compatibility
@@ -135,24 +225,15 @@ def philosophy_search():
     if not query:
         return jsonify({"error": "q parameter required"}), 400
 
-    results = _kb.search(query)
-
-    # Also try external API
-    try:
-        encoded = urllib.parse.quote(query)
-        req = urllib.request.Request(
-            f"{WISDOM_API}/api/quotes/search?q={encoded}", method="GET"
-        )
-        with urllib.request.urlopen(req, timeout=10) as resp:
-            data = json.loads(resp.read().decode())
-            return jsonify({
-                "results": results + data.get("results", []),
-                "query": query,
-                "sources": ["embedded-kb", "wisdom-api"],
-            })
-    except Exception:
+    results, external = _search_both(query)
+    if external is None:
         return jsonify({
             "results": results,
             "query": query,
             "sources": ["embedded-kb"],
         })
+    return jsonify({
+        "results": results + external,
+        "query": query,
+        "sources": ["embedded-kb", "wisdom-api"],
+    })
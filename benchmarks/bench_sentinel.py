@@ -0,0 +1,108 @@
+"""
+Elaine v4 — Sentinel Review Benchmark
+Times TrustEngine.review on large proposals: cold single-pass scans,
+memoised re-reviews of unchanged drafts (Gatekeeper re-checks), and
+position-integrity checks as the position library grows.
+
+Run as: python benchmarks/bench_sentinel.py [size_kb]
+
+Almost Magic Tech Lab
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from modules.sentinel.trust_engine import TrustEngine
+
+PROPOSAL_PHRASES = [
+    "Our methodology follows the ISO 42001 management system framework.",
+    "We ensure a thorough gap assessment within 30 days.",
+    "Pricing for phase one is $12,500 plus GST.",
+    "AI adoption is growing at 40% year on year.",
+    "The Essential Eight maturity review covers all eight controls.",
+    "Deliverables include a risk register and a board-ready summary.",
+    "Estimated timeline: 6 weeks from kickoff, subject to access.",
+    "This proposal is confidential and intended for the client only.",
+    "A case study from a 2024 implementation is attached.",
+    "Escalation paths are defined if any issue arises.",
+]
+
+
+def make_proposal(size_kb: int = 50, seed: int = 42) -> str:
+    """Synthetic proposal text of roughly size_kb kilobytes."""
+    rng = random.Random(seed)
+    parts, size = [], 0
+    while size < size_kb * 1024:
+        sentence = rng.choice(PROPOSAL_PHRASES)
+        parts.append(sentence)
+        size += len(sentence) + 1
+    return " ".join(parts)
+
+
+def run(size_kb: int = 50, repeats: int = 5) -> dict:
+    """Return mean milliseconds for cold and memoised reviews."""
+    engine = TrustEngine()
+    base = make_proposal(size_kb)
+
+    start = time.perf_counter()
+    for i in range(repeats):
+        engine.review(f"{base} Revision {i}.", title="Client proposal", has_pricing=True)
+    cold_ms = (time.perf_counter() - start) / repeats * 1000
+
+    draft = f"{base} Final."
+    engine.review(draft, title="Client proposal", has_pricing=True)
+    start = time.perf_counter()
+    for _ in range(repeats * 20):
+        engine.review(draft, title="Client proposal", has_pricing=True)
+    memo_ms = (time.perf_counter() - start) / (repeats * 20) * 1000
+
+    return {
+        "size_kb": size_kb,
+        "cold_review_ms": round(cold_ms, 3),
+        "memo_review_ms": round(memo_ms, 4),
+        "memo": engine.status()["review_memo"],
+    }
+
+
+def make_claims(count: int, seed: int = 7) -> list[str]:
+    """Synthetic historical claims: shared domain words plus claim-specific terms."""
+    rng = random.Random(seed)
+    domain = ["risk", "privacy", "vendor", "cloud", "model", "board", "data", "audit",
+              "review", "register", "policy", "training", "roadmap", "controls"]
+    verbs = ["covers", "includes", "requires", "never skips", "prioritises", "documents"]
+    return [
+        f"Our {rng.choice(domain)} {rng.choice(verbs)} {rng.choice(domain)} "
+        f"topic{rng.randrange(count * 2)} area{rng.randrange(count * 2)}"
+        for _ in range(count)
+    ]
+
+
+def run_positions(library_sizes=(10, 1000, 5000), size_kb: int = 50) -> dict:
+    """Mean position-integrity check time (ms) per library size."""
+    content = make_proposal(size_kb)
+    timings = {}
+    for size in library_sizes:
+        engine = TrustEngine()
+        for i, claim in enumerate(make_claims(size)):
+            engine.track_position(claim, f"doc_{i}", "methodology")
+        start = time.perf_counter()
+        for _ in range(3):
+            engine._check_position_integrity(content)
+        timings[size] = round((time.perf_counter() - start) / 3 * 1000, 3)
+    return timings
+
+
+if __name__ == "__main__":
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    result = run(size)
+    print(f"Sentinel review on {result['size_kb']}KB proposal")
+    print(f"  Cold review:     {result['cold_review_ms']:.2f} ms")
+    print(f"  Memoised review: {result['memo_review_ms']:.4f} ms")
+    print(f"  Memo:            {result['memo']}")
+    print("Position integrity vs library size")
+    for positions, ms in run_positions(size_kb=size).items():
+        print(f"  {positions:>6} positions: {ms:.2f} ms")
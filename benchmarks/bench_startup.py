@@ -0,0 +1,101 @@
+"""
+Elaine v4 — Startup Benchmark
+Time from process launch to the first healthy GET /api/health, with
+engines deferred (the default) and with every engine built before the
+server opens its port (the old eager start-up), plus the slowest imports
+and inits reported by /api/system/startup.
+
+Each run is a fresh interpreter so import caches don't flatter the result.
+Exits non-zero when the lazy start-up exceeds the budget, so it can gate
+a regression check.
+
+Run as: python benchmarks/bench_startup.py [runs] [budget_ms]
+
+Almost Magic Tech Lab
+"""
+
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.request
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+BUDGET_MS = 3000
+TIMEOUT_S = 60
+
+SERVER = """
+import logging, sys
+logging.disable(logging.INFO)
+from app import create_app
+app = create_app(warmup=False)
+if sys.argv[2] == "eager":
+    app.extensions["elaine_engines"].warm()
+app.run(host="127.0.0.1", port=int(sys.argv[1]), debug=False, use_reloader=False)
+"""
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _get(url, timeout=2):
+    with urllib.request.urlopen(url, timeout=timeout) as resp:
+        return resp.status, resp.read()
+
+
+def time_to_healthy(mode="lazy") -> dict:
+    """Launch app.py's create_app in a subprocess; ms until /api/health is 200."""
+    port = _free_port()
+    start = time.perf_counter()
+    proc = subprocess.Popen([sys.executable, "-c", SERVER, str(port), mode], cwd=ROOT,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        while time.perf_counter() - start < TIMEOUT_S:
+            if proc.poll() is not None:
+                raise RuntimeError(f"server exited with {proc.returncode}")
+            try:
+                status, _ = _get(f"http://127.0.0.1:{port}/api/health")
+                if status == 200:
+                    break
+            except OSError:
+                time.sleep(0.01)
+        else:
+            raise TimeoutError("no healthy /api/health")
+        healthy_ms = (time.perf_counter() - start) * 1000
+        _, body = _get(f"http://127.0.0.1:{port}/api/system/startup")
+        return {"healthy_ms": round(healthy_ms, 1), "startup": json.loads(body)}
+    finally:
+        proc.terminate()
+        proc.wait(timeout=10)
+
+
+def run(runs=3) -> dict:
+    results = {}
+    for mode in ("lazy", "eager"):
+        samples = [time_to_healthy(mode) for _ in range(runs)]
+        results[mode] = {
+            "healthy_ms": round(statistics.median(s["healthy_ms"] for s in samples), 1),
+            "create_app_ms": round(statistics.median(s["startup"]["create_app_ms"] for s in samples), 1),
+            "slowest": samples[-1]["startup"]["slowest"][:8],
+        }
+    return results
+
+
+if __name__ == "__main__":
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    budget = float(sys.argv[2]) if len(sys.argv) > 2 else BUDGET_MS
+    results = run(runs)
+    for mode, r in results.items():
+        print(f"{mode:>5}: healthy in {r['healthy_ms']:.0f} ms (create_app {r['create_app_ms']:.0f} ms)")
+    print("\nSlowest start-up steps (eager):")
+    for e in results["eager"]["slowest"]:
+        print(f"  {e['ms']:8.1f} ms  {e['kind']:<7} {e['name']}")
+    if results["lazy"]["healthy_ms"] > budget:
+        print(f"\nREGRESSION: lazy start-up {results['lazy']['healthy_ms']:.0f} ms > budget {budget:.0f} ms")
+        sys.exit(1)
@@ -0,0 +1,307 @@
+"""
+Elaine v4 — Synthetic Benchmark Data
+Seeded generators that fill the engines with n realistic-looking records.
+
+Records are built directly (not through get_or_create_poi / create_meeting)
+so seeding 100k items measures nothing but the generator itself.
+
+Almost Magic Tech Lab
+"""
+
+import random
+from datetime import datetime, timedelta
+
+FIRST = ["Sarah", "James", "Priya", "Wei", "Olivia", "Liam", "Aisha", "Noah", "Mei", "Lucas",
+         "Zara", "Ethan", "Fatima", "Oscar", "Hana", "Jack", "Ana", "Ravi", "Chloe", "Tom"]
+LAST = ["Chen", "Smith", "Patel", "Nguyen", "Brown", "Wilson", "Khan", "Taylor", "Kim", "Martin",
+        "Singh", "Lee", "Walker", "Garcia", "Ito", "Hall", "Young", "Lopez", "Wright", "Green"]
+COMPANIES = ["Acme", "Globex", "Initech", "Umbrella", "Hooli", "Vandelay", "Stark", "Wayne",
+             "Tyrell", "Cyberdyne", "Soylent", "Wonka", "Aperture", "Massive Dynamic"]
+WORDS = ["governance", "proposal", "audit", "roadmap", "privacy", "vendor", "risk", "board",
+         "cloud", "model", "training", "review", "controls", "register", "budget", "strategy",
+         "pilot", "workshop", "renewal", "migration", "policy", "security", "data", "insight"]
+
+
+def _rng(seed):
+    return random.Random(seed)
+
+
+def person(rng, i):
+    first, last = rng.choice(FIRST), rng.choice(LAST)
+    return f"{first} {last} {i}", f"{first.lower()}.{last.lower()}{i}@{rng.choice(COMPANIES).lower().replace(' ', '')}.com"
+
+
+def phrase(rng, words=6):
+    return " ".join(rng.choice(WORDS) for _ in range(words))
+
+
+# ── Gravity ──────────────────────────────────────────────────────
+
+def gravity_items(n, seed=1):
+    from modules.gravity_v2.models import (
+        ChargeData, ConsequenceData, EnergyCategory, GravityItem, MomentumState,
+    )
+    rng = _rng(seed)
+    now = datetime.now()
+    momenta = [MomentumState.NOT_STARTED, MomentumState.STARTED, MomentumState.IN_PROGRESS,
+               MomentumState.BLOCKED, MomentumState.NEAR_COMPLETE, MomentumState.COMPLETE]
+    items = []
+    for i in range(n):
+        items.append(GravityItem(
+            id=f"grav_{i:06d}",
+            title=f"{phrase(rng, 3)} {i}",
+            mass=rng.uniform(10, 100),
+            proximity_date=now + timedelta(days=rng.uniform(-3, 30)),
+            charge=ChargeData(people=[person(rng, i)[0]] if rng.random() < 0.4 else [],
+                              trust_cost_aud=rng.choice([0, 0, 500, 5000])),
+            consequence=ConsequenceData(revenue_at_risk=rng.choice([0, 0, 0, 10000, 50000])),
+            momentum=rng.choice(momenta),
+            estimated_hours=rng.choice([0.5, 1, 2, 4, 6]),
+            energy_fit=rng.choice(list(EnergyCategory)),
+            context_type=rng.choice(list(EnergyCategory)),
+            last_touched=now - timedelta(days=rng.uniform(0, 20)),
+        ))
+    return items
+
+
+def gravity_field(n, seed=1, recalculated=True):
+    from modules.gravity_v2.gravity_field import GravityField
+    field = GravityField()
+    for item in gravity_items(n, seed):
+        field.items[item.id] = item
+    if recalculated:
+        field.recalculate()
+    return field
+
+
+# ── Constellation ────────────────────────────────────────────────
+
+def pois(n, seed=2):
+    from modules.constellation.models import POIRecord, POITier, TrustAccount
+    rng = _rng(seed)
+    now = datetime.now()
+    records = {}
+    for i in range(n):
+        name, email = person(rng, i)
+        record = POIRecord(
+            poi_id=f"poi_{i:06d}",
+            name=name,
+            email=email,
+            company=rng.choice(COMPANIES),
+            title=rng.choice(["CEO", "CTO", "Head of Risk", "Partner", "Director", "Analyst"]),
+            tier=rng.choice(list(POITier)),
+            trust_account=TrustAccount(
+                balance=rng.uniform(0, 80),
+                last_interaction=now - timedelta(days=rng.uniform(0, 200)),
+                relationship_age_months=rng.uniform(0, 36),
+            ),
+        )
+        records[record.poi_id] = record
+    return records
+
+
+def network(n, per_poi=4, seed=9):
+    """POIs with known connections: mostly other POIs, ~1 in 4 a valuable outsider."""
+    from modules.constellation.models import NetworkConnection, POITier
+    rng = _rng(seed)
+    records = pois(n, seed)
+    people = list(records.values())
+    for i, poi in enumerate(people):
+        if i % 10 == 0:                             # A strong core to start chains from
+            poi.tier, poi.trust_account.balance = POITier.ACTIVE_NETWORK, rng.uniform(35, 80)
+        for _ in range(per_poi):
+            if rng.random() < 0.25:
+                name = f"{person(rng, 10 ** 6 + rng.randrange(n))[0]}"
+                poi.known_connections.append(NetworkConnection(
+                    name=name, estimated_value=rng.choice([2000, 8000, 25000])))
+            else:
+                poi.known_connections.append(NetworkConnection(name=rng.choice(people).name))
+    return records
+
+
+def poi_engine(n, seed=2):
+    from modules.constellation.poi_engine import POIEngine
+    engine = POIEngine()
+    engine.pois.update(pois(n, seed))
+    return engine
+
+
+def signals(n, pois_, seed=8):
+    """A mailbox's worth of mixed signals: ~80% from known POIs, the rest new senders."""
+    rng = _rng(seed)
+    known = list(pois_.values())
+    out = []
+    for i in range(n):
+        if known and rng.random() < 0.8:
+            poi = rng.choice(known)
+            name, email = poi.name, poi.email
+        else:
+            name, email = person(rng, 10 ** 6 + i)
+        kind = rng.choice(["email", "email", "email", "calendar", "chronicle"])
+        if kind == "email":
+            out.append({"type": "email", "from_name": name, "from_email": email,
+                        "subject": phrase(rng, 4)})
+        elif kind == "calendar":
+            out.append({"type": "calendar", "participant_name": name, "participant_email": email})
+        else:
+            out.append({"type": "chronicle", "participant_name": name, "participant_email": email})
+    return out
+
+
+# ── Chronicle ────────────────────────────────────────────────────
+
+def meeting_engine(n_commitments, per_meeting=5, years=3, seed=3):
+    """Years of meetings: commitments due around their meeting, most long since closed."""
+    from modules.chronicle.meeting_engine import MeetingEngine
+    from modules.chronicle.models import (
+        Commitment, CommitmentStatus, CommitmentType, MeetingRecord, MeetingTemplate, Participant,
+    )
+    rng = _rng(seed)
+    now = datetime.now()
+    engine = MeetingEngine()
+    closed = [CommitmentStatus.COMPLETED, CommitmentStatus.COMPLETED, CommitmentStatus.CANCELLED,
+              CommitmentStatus.BROKEN]
+    open_ = [CommitmentStatus.PENDING, CommitmentStatus.PENDING, CommitmentStatus.IN_PROGRESS]
+    contacts = [person(rng, i)[0] for i in range(max(20, n_commitments // 50))]
+    meetings = {}
+    for m in range(max(1, n_commitments // per_meeting)):
+        date = now - timedelta(days=rng.uniform(0, 365 * years))
+        people = rng.sample(contacts, 2)
+        meeting = MeetingRecord(
+            meeting_id=f"mtg_{m:06d}",
+            title=f"{rng.choice(COMPANIES)} {phrase(rng, 2)}",
+            template=rng.choice(list(MeetingTemplate)),
+            date=date,
+            participants=[Participant(name="Mani Padisetti", role="host")]
+                         + [Participant(name=p, role="client") for p in people],
+        )
+        age = (now - date).days
+        for c in range(per_meeting):
+            meeting.commitments.append(Commitment(
+                commitment_id=f"cmt_{m:06d}_{c}",
+                text=f"Send the {phrase(rng, 2)} by Friday",
+                owner=rng.choice(["mani", "mutual"] + people),
+                commitment_type=rng.choice(list(CommitmentType)),
+                due_date=date + timedelta(days=rng.uniform(1, 30)) if rng.random() < 0.8 else None,
+                # Recent meetings still have open items; older ones mostly don't
+                status=rng.choice(open_ if rng.random() < max(0.05, 1 - age / 60) else closed),
+            ))
+        meetings[meeting.meeting_id] = meeting
+    engine.meetings = meetings
+    return engine
+
+
+# ── Innovator ────────────────────────────────────────────────────
+
+def _topic(rng, words):
+    # ~12k distinct terms, so opportunities overlap the way real ones do: rarely
+    return " ".join(f"{rng.choice(WORDS)}{rng.randrange(500)}" for _ in range(words))
+
+
+def innovation_engine(n, seed=10):
+    from modules.innovator.engine import InnovationEngine
+    from modules.innovator.models import InnovationType, Opportunity
+    rng = _rng(seed)
+    engine = InnovationEngine()
+    for i in range(n):
+        opp = Opportunity(opportunity_id=f"opp_{i:06d}",
+                          title=f"{_topic(rng, 3)} {rng.choice(['service', 'tool', 'package'])}",
+                          innovation_type=rng.choice(list(InnovationType)),
+                          description=f"{_topic(rng, 8)}.")
+        engine.opportunities[opp.opportunity_id] = opp
+    return engine
+
+
+def client_questions(count, opportunities, seed=11):
+    """Half restate an existing opportunity's title, half are new needs."""
+    rng = _rng(seed)
+    known = list(opportunities.values())
+    out = []
+    for _ in range(count):
+        if known and rng.random() < 0.5:
+            out.append(f"Can you do {rng.choice(known).title} for us?")
+        else:
+            out.append(f"Can you help with {_topic(rng, rng.randint(3, 5))}?")
+    return out
+
+
+# ── Cartographer ─────────────────────────────────────────────────
+
+def discovery_engine(n, territories=200, days=90, seed=12):
+    """n discoveries over the last `days`, spread across `territories`."""
+    from modules.cartographer.discovery_engine import DiscoveryEngine
+    from modules.cartographer.models import Discovery, DiscoveryLayer, InteractionType
+    rng = _rng(seed)
+    now = datetime.now()
+    engine = DiscoveryEngine()
+    names = [s.name for s in engine.sources.sources.values()]
+    for i in range(n):
+        engine.discoveries[f"disc_{i:06d}"] = Discovery(
+            discovery_id=f"disc_{i:06d}",
+            title=_topic(rng, 5),
+            source_name=rng.choice(names),
+            source_credibility=rng.choice([0.3, 0.7, 0.8, 0.9]),
+            layer=rng.choice(list(DiscoveryLayer)),
+            territory=f"territory_{rng.randrange(territories)}",
+            interaction=rng.choice([None, None, InteractionType.READ, InteractionType.DISMISSED]),
+            discovered_at=now - timedelta(days=rng.uniform(0, days)),
+        )
+    return engine
+
+
+def territory_map(n, seed=13):
+    """n fine-grained territories, most engaged within the last two years."""
+    from modules.cartographer.models import DepthSignals, KnowledgeTerritory
+    from modules.cartographer.territory_map import TerritoryMap
+    rng = _rng(seed)
+    now = datetime.now()
+    tm = TerritoryMap()
+    for i in range(n):
+        tm.territories[f"territory_{i}"] = KnowledgeTerritory(
+            territory_id=f"territory_{i}", label=f"{_topic(rng, 2)} {i}",
+            depth_signals=DepthSignals(*(rng.uniform(0, 100) for _ in range(6))),
+            decay_rate_per_quarter=rng.choice([0.02, 0.03, 0.05]),
+            last_engagement=now - timedelta(days=rng.uniform(0, 730)),
+        )
+    return tm
+
+
+# ── Learning Radar ───────────────────────────────────────────────
+
+def learning_radar(n_interests, seed=4):
+    from modules.learning_radar import IntellectualInterest, LearningRadar
+    rng = _rng(seed)
+    radar = LearningRadar()
+    for i in range(n_interests):
+        interest = IntellectualInterest(interest_id=f"int_{i:06d}",
+                                        topic=f"{rng.choice(WORDS)} {rng.choice(WORDS)} studies {i}",
+                                        domain="synthetic")
+        radar.interests[interest.interest_id] = interest
+    return radar
+
+
+def interest_texts(count, seed=5):
+    rng = _rng(seed)
+    hooks = ["Reading Kahneman again", "A note on stoic practice", "Systems thinking applied to",
+             "Nothing topical here about", "Wardley mapping the", "Idle chat on"]
+    return [f"{rng.choice(hooks)} {phrase(rng, 8)}" for _ in range(count)]
+
+
+# ── Sentinel / Wisdom ────────────────────────────────────────────
+
+def document(sentences, seed=6):
+    """Proposal-like text of roughly 50 bytes per sentence."""
+    from bench_sentinel import PROPOSAL_PHRASES
+    rng = _rng(seed)
+    return " ".join(rng.choice(PROPOSAL_PHRASES) for _ in range(sentences))
+
+
+def quotes(n, seed=7):
+    rng = _rng(seed)
+    return [{
+        "text": f"The {phrase(rng, 5)} is {phrase(rng, 4)}.",
+        "author": " ".join(person(rng, i)[0].split()[:2]),
+        "source": rng.choice(["Seinfeld", "The Office", "Frasier", "Proverb", "Essays"]),
+        "culture": rng.choice(["American", "British", "Japanese", "Indian", "Greek"]),
+        "category": rng.choice(["sitcom", "one_liner", "idiom", "philosophy"]),
+    } for i in range(n)]
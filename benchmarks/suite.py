@@ -0,0 +1,430 @@
+"""
+Elaine v4 — Engine Benchmark Suite
+Times the intelligence engines against synthetic data at 1k / 10k / 100k
+records and compares each result with a stored baseline.
+
+Every timed call runs inside a perf-monitor span scope, so results also
+carry the sqlite and outbound-HTTP time they spent. The comparison uses
+time excluding HTTP, which keeps a slow network from reading as a
+regression.
+
+Run as:
+    python benchmarks/suite.py                        # all cases, all scales
+    python benchmarks/suite.py --scales 1000,10000 --only gravity,poi
+    python benchmarks/suite.py --update-baseline      # accept current numbers
+
+Writes benchmarks/results/latest.json and exits 1 when any case is slower
+than baseline by more than --tolerance (and by more than --noise-ms).
+By default HOME points at a scratch directory so no synthetic record ever
+lands in ~/.elaine.
+
+Almost Magic Tech Lab
+"""
+
+import argparse
+import json
+import logging
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(BENCH_DIR)
+BASELINE_PATH = os.path.join(BENCH_DIR, "baseline.json")
+RESULTS_PATH = os.path.join(BENCH_DIR, "results", "latest.json")
+SCALES = (1000, 10000, 100000)
+REPEATS = 5
+TOLERANCE = 0.25            # 25% slower than baseline is a regression
+NOISE_MS = 2.0              # ...but only if it is also this many ms slower
+SLOW_RUN_S = 2.0            # Runs this slow are not repeated
+
+sys.path[:0] = [ROOT, BENCH_DIR]
+import datagen  # noqa: E402  (engine modules are imported lazily, after HOME is set)
+
+CASES = {}                  # name -> (setup(n) -> run callable, max_scale)
+
+
+def case(name, max_scale=None):
+    """Register setup(n), which builds data for scale n and returns the timed callable."""
+    def register(setup):
+        CASES[name] = (setup, max_scale)
+        return setup
+    return register
+
+
+# ── Cases ────────────────────────────────────────────────────────
+
+@case("gravity.recalculate")
+def _gravity_recalculate(n):
+    field = datagen.gravity_field(n, recalculated=False)
+
+    def run():
+        field._last_recalc = None                   # Bypass the damping governor
+        field._recalc_count_this_hour = 0
+        field.recalculate()
+    return run
+
+
+@case("gravity.snapshot", max_scale=10000)
+def _gravity_snapshot(n):
+    # snapshot() runs detect_collisions, so it inherits the pairwise cost
+    field = datagen.gravity_field(n)
+    return field.snapshot
+
+
+@case("gravity.detect_collisions", max_scale=10000)
+def _gravity_collisions(n):
+    # Pairwise over red giants / approaching items: 100k would be ~10^7 pairs
+    field = datagen.gravity_field(n)
+    return field.detect_collisions
+
+
+@case("sentinel.review")
+def _sentinel_review(n):
+    from modules.sentinel.trust_engine import TrustEngine
+    engine = TrustEngine()
+    text = datagen.document(n // 10)                # 1k → ~5 KB, 100k → ~500 KB
+    revision = iter(range(10 ** 9))
+
+    def run():
+        # A fresh revision each time so the unchanged-draft memo never answers
+        engine.review(f"{text} Revision {next(revision)}.", title="Client proposal", has_pricing=True)
+    return run
+
+
+@case("learning_radar.detect_interest")
+def _learning_detect(n):
+    from modules.learning_radar import InterestSource
+    radar = datagen.learning_radar(n)
+    texts = datagen.interest_texts(20)
+    snapshot = dict(radar.interests)
+
+    def run():
+        for text in texts:
+            radar.detect_interest(text, InterestSource.CONVERSATION)
+        radar.interests = dict(snapshot)           # Keep n constant across repeats
+    return run
+
+
+@case("poi.search_pois")
+def _poi_search(n):
+    engine = datagen.poi_engine(n)
+
+    def run():
+        engine.search_pois(query="chen")
+        engine.search_pois(company="acme", min_trust=20)
+    return run
+
+
+@case("poi.ingest_signals")
+def _poi_ingest(n):
+    # n signals against n known POIs: the mailbox-sync path
+    engine = datagen.poi_engine(n)
+    batch = datagen.signals(n, engine.pois)
+    known = set(engine.pois)
+
+    def run():
+        engine.ingest_signals(batch)
+        for pid in [p for p in engine.pois if p not in known]:  # Drop this run's discoveries
+            del engine.pois[pid]
+    return run
+
+
+@case("network.find_opportunities", max_scale=10000)
+def _network_opportunities(n):
+    from modules.constellation.network_intelligence import NetworkIntelligence
+    from modules.constellation.poi_engine import POIEngine
+    engine = POIEngine()
+    engine.pois = datagen.network(n)
+    intel = NetworkIntelligence()
+    target = next(c.name for p in engine.pois.values() for c in p.known_connections
+                  if c.estimated_value > 5000)
+
+    def run():
+        intel.find_opportunities(engine.pois, max_hops=3)
+        intel.find_intro_paths(engine.pois, target)
+    return run
+
+
+@case("trust_ledger.apply_decay_all")
+def _trust_decay(n):
+    engine = datagen.poi_engine(n)
+    balances = {pid: p.trust_account.balance for pid, p in engine.pois.items()}
+
+    def run():
+        engine.trust_ledger.apply_decay_all(engine.pois)
+        for pid, poi in engine.pois.items():         # Undo so every repeat decays the same
+            poi.trust_account.balance = balances[pid]
+            poi.trust_account.transactions.clear()
+    return run
+
+
+@case("meeting.get_active_commitments")
+def _meeting_commitments(n):
+    engine = datagen.meeting_engine(n)
+    return engine.get_active_commitments
+
+
+@case("meeting.commitment_queries")
+def _meeting_queries(n):
+    # The morning-brief / orchestrator mix: overdue now, one owner's active list,
+    # a person's meetings, and status flips that keep the indexes moving
+    from modules.chronicle.models import CommitmentStatus
+    engine = datagen.meeting_engine(n)
+    meeting = next(iter(engine.meetings.values()))
+    person = meeting.participants[1].name
+    flips = [(m.meeting_id, c.commitment_id, c.status)
+             for m in list(engine.meetings.values())[:20] for c in m.commitments[:1]]
+
+    def run():
+        engine.get_overdue_commitments()
+        engine.get_active_commitments(owner=person)
+        engine.list_meetings(person=person)
+        engine.status()
+        for meeting_id, commitment_id, status in flips:
+            engine.update_commitment_status(meeting_id, commitment_id, CommitmentStatus.COMPLETED)
+            engine.update_commitment_status(meeting_id, commitment_id, status)
+    return run
+
+
+@case("innovator.detect_from_modules")
+def _innovator_detect(n):
+    # 100 repeated client questions matched against n opportunities
+    engine = datagen.innovation_engine(n)
+    questions = datagen.client_questions(100, engine.opportunities)
+    known = set(engine.opportunities)
+
+    def run():
+        engine.detect_from_modules({"chronicle": {"repeated_questions": questions}})
+        for oid in [o for o in engine.opportunities if o not in known]:   # Drop this run's new ones
+            del engine.opportunities[oid]
+    return run
+
+
+@case("cartographer.detect_patterns")
+def _cartographer_patterns(n):
+    # The briefing loop: a few new signals, patterns, and territory convergence
+    from modules.cartographer.models import ActionabilityLevel, DiscoveryLayer
+    engine = datagen.discovery_engine(n)
+    engine.detect_patterns()
+    territories = [f"territory_{i}" for i in range(10)]
+
+    def run():
+        new = [engine.create_discovery(f"signal {t}", "", "", "afr", DiscoveryLayer.SIGNAL,
+                                       ActionabilityLevel.INFORM, territory=t).discovery_id
+               for t in territories]
+        engine.detect_patterns()
+        for t in territories:
+            engine.calculate_convergence(territory=t)
+        for discovery_id in new:
+            del engine.discoveries[discovery_id]
+        engine.governor.reset_daily()
+    return run
+
+
+@case("cartographer.territory_passes")
+def _territory_passes(n):
+    # Quarterly decay (undone after), the map, debt against a third of the map,
+    # and a four-quarter projection
+    from modules.cartographer.models import DepthLevel
+    from modules.cartographer.territory_state import SIGNALS
+    tm = datagen.territory_map(n)
+    signals = {tid: [getattr(t.depth_signals, a) for a in SIGNALS] for tid, t in tm.territories.items()}
+    required = {tid: DepthLevel.GROWING for tid in list(tm.territories)[::3]}
+    quarters = [datetime.now() + timedelta(days=90 * q) for q in range(1, 5)]
+
+    def run():
+        tm.apply_quarterly_decay()
+        tm.get_map()
+        tm.calculate_knowledge_debt(required)
+        tm.project_depth(quarters)
+        for tid, t in tm.territories.items():     # Undo, through the hooks, so every repeat decays the same
+            for name, value in zip(SIGNALS, signals[tid]):
+                setattr(t.depth_signals, name, value)
+    return run
+
+
+@case("wisdom.search")
+def _wisdom_search(n):
+    from modules.wisdom_kb import BM25Index, WisdomKB
+    kb = WisdomKB()
+    kb.all_quotes = datagen.quotes(n)
+    kb._index = BM25Index(kb.all_quotes)
+    queries = ["risk", "board strategy", "privacy data", "gov", "the vendor roadmap"]
+
+    def run():
+        for q in queries:
+            kb.search(q)
+    return run
+
+
+_app = None
+
+
+@case("briefing.collect_briefing_data", max_scale=10000)
+def _collect_briefing(n):
+    # Seeds gravity, POIs and commitments; gravity.snapshot() caps the scale
+    global _app
+    if _app is None:                                 # Blueprints register once per process
+        from app import create_app
+        _app = create_app(warmup=False)
+    engines = _app.extensions["elaine_engines"].engines
+    engines["gravity"].items = {i.id: i for i in datagen.gravity_items(n)}
+    engines["gravity"].recalculate()
+    engines["poi"].pois = datagen.pois(n)
+    engines["meeting"].meetings = datagen.meeting_engine(n).meetings
+    return _app.extensions["elaine_collect_briefing"]
+
+
+# ── Runner ───────────────────────────────────────────────────────
+
+def measure(run, repeats=REPEATS) -> dict:
+    from modules.perf import monitor
+    samples, http, sql = [], [], []
+    for i in range(repeats + 1):
+        state = monitor.begin("BENCH", "suite")
+        start = time.perf_counter()
+        run()
+        elapsed = (time.perf_counter() - start) * 1000
+        monitor.end(state, 200)
+        if i == 0 and elapsed < SLOW_RUN_S * 1000:
+            continue                                 # Warm-up run
+        samples.append(elapsed)
+        http.append(state.span_s["http"] * 1000)
+        sql.append(state.span_s["sql"] * 1000)
+        if elapsed >= SLOW_RUN_S * 1000:
+            break
+    median = statistics.median(samples)
+    http_ms = statistics.median(http)
+    return {
+        "median_ms": round(median, 3),
+        "min_ms": round(min(samples), 3),
+        "runs": len(samples),
+        "sql_ms": round(statistics.median(sql), 3),
+        "http_ms": round(http_ms, 3),
+        "compare_ms": round(max(0.0, median - http_ms), 3),
+    }
+
+
+def compare(results, baseline, tolerance=TOLERANCE, noise_ms=NOISE_MS) -> list:
+    rows = []
+    for name, scales in results.items():
+        for scale, r in scales.items():
+            base = baseline.get("results", {}).get(name, {}).get(scale)
+            if not base or "compare_ms" not in r or "compare_ms" not in base:
+                continue
+            ratio = r["compare_ms"] / base["compare_ms"] if base["compare_ms"] else 1.0
+            regressed = ratio > 1 + tolerance and r["compare_ms"] - base["compare_ms"] > noise_ms
+            rows.append({"case": name, "scale": int(scale), "baseline_ms": base["compare_ms"],
+                         "current_ms": r["compare_ms"], "ratio": round(ratio, 3),
+                         "status": "regression" if regressed else
+                                   "improved" if ratio < 1 - tolerance else "ok"})
+    return rows
+
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                              capture_output=True, text=True, timeout=10).stdout.strip() or None
+    except Exception:
+        return None
+
+
+def run_suite(scales=SCALES, only=None, repeats=REPEATS) -> dict:
+    results = {}
+    for name, (setup, max_scale) in CASES.items():
+        if only and not any(name.startswith(prefix) for prefix in only):
+            continue
+        results[name] = {}
+        for n in scales:
+            if max_scale and n > max_scale:
+                results[name][str(n)] = {"skipped": f"above max scale {max_scale}"}
+                continue
+            start = time.perf_counter()
+            run = setup(n)
+            setup_ms = (time.perf_counter() - start) * 1000
+            r = measure(run, repeats)
+            r["setup_ms"] = round(setup_ms, 1)
+            results[name][str(n)] = r
+            print(f"  {name:<34} {n:>7}: {r['median_ms']:10.2f} ms  "
+                  f"(sql {r['sql_ms']:.1f}, http {r['http_ms']:.1f}, {r['runs']} runs)")
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Elaine engine benchmark suite")
+    parser.add_argument("--scales", default=",".join(map(str, SCALES)))
+    parser.add_argument("--only", default="", help="comma-separated case name prefixes")
+    parser.add_argument("--repeats", type=int, default=REPEATS)
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--output", default=RESULTS_PATH)
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE)
+    parser.add_argument("--noise-ms", type=float, default=NOISE_MS)
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--use-home", action="store_true", help="don't redirect HOME to a scratch dir")
+    args = parser.parse_args(argv)
+
+    if not args.use_home:
+        scratch = tempfile.mkdtemp(prefix="elaine-bench-")
+        os.environ["HOME"] = os.environ["USERPROFILE"] = scratch
+    logging.disable(logging.WARNING)
+    from modules.perf import monitor
+    monitor.patch_libraries()
+
+    scales = [int(s) for s in args.scales.split(",") if s]
+    only = [s for s in args.only.split(",") if s]
+    print(f"Elaine benchmark suite — scales {scales}")
+    results = run_suite(scales, only, args.repeats)
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    comparison = compare(results, baseline, args.tolerance, args.noise_ms)
+    report = {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "scales": scales,
+            "repeats": args.repeats,
+            "tolerance": args.tolerance,
+        },
+        "results": results,
+        "comparison": comparison,
+    }
+    os.makedirs(os.path.dirname(args.output), exist_ok=True)
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults written to {args.output}")
+
+    if args.update_baseline:
+        merged = baseline.get("results", {})
+        for name, scales_ in results.items():
+            merged.setdefault(name, {}).update(scales_)
+        with open(args.baseline, "w") as f:
+            json.dump({"meta": report["meta"], "results": merged}, f, indent=2)
+        print(f"Baseline updated: {args.baseline}")
+        return 0
+
+    regressions = [r for r in comparison if r["status"] == "regression"]
+    if not baseline:
+        print("No baseline yet — run with --update-baseline to record one")
+    for r in comparison:
+        if r["status"] != "ok":
+            print(f"  {r['status'].upper():<10} {r['case']} @ {r['scale']}: "
+                  f"{r['baseline_ms']:.2f} → {r['current_ms']:.2f} ms (×{r['ratio']})")
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) against baseline")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -8,6 +8,11 @@ Patentable:
 - Convergence-Based Dynamic Source Credibility
 - Self-Correcting Discovery via Counterfactual Gap Analysis
 
+Discoveries live in a DiscoveryStore (discovery_index.py) that keeps
+windowed territory, keyword and source-tier counters up to date as
+discoveries are created and interacted with, so pattern detection and
+territory convergence are lookups rather than rescans.
+
 Almost Magic Tech Lab — Patentable IP
 """
 
@@ -16,6 +21,8 @@ import uuid
 from datetime import datetime, timedelta
 from typing import Optional
 
+from modules.indexed_store import StoreAttribute
+
 from .models import (
     Discovery, DiscoveryLayer, ActionabilityLevel, InteractionType,
     Source, SourceTier, SOURCE_BASE_CREDIBILITY, INTERACTION_WEIGHTS,
@@ -23,6 +30,7 @@ from .models import (
     Pattern, CounterfactualGap,
     NewsCategory, IntelligenceCalendarSlot,
 )
+from .discovery_index import DiscoveryStore, PATTERN_WINDOW_DAYS, converge
 
 logger = logging.getLogger("elaine.cartographer.discovery")
 
@@ -35,6 +43,7 @@ class SourceRegistry:
 
     def __init__(self):
         self.sources: dict[str, Source] = {}
+        self._by_name: dict[str, Source] = {}
         self._seed_sources()
 
     def _seed_sources(self):
@@ -58,6 +67,13 @@ class SourceRegistry:
     def get_source(self, source_id: str) -> Optional[Source]:
         return self.sources.get(source_id)
 
+    def find_by_name(self, name: str) -> Optional[Source]:
+        src = self._by_name.get(name)
+        if src is None or src.name != name or self.sources.get(src.source_id) is not src:
+            self._by_name = {s.name: s for s in self.sources.values()}
+            src = self._by_name.get(name)
+        return src
+
     def adjust_credibility(self, source_id: str, delta: float, reason: str):
         src = self.sources.get(source_id)
         if src:
@@ -185,16 +201,25 @@ class DiscoveryEngine:
     Core discovery lifecycle: create, gate, deliver, track, learn.
     """
 
+    # discovery_id → Discovery
+    discoveries = StoreAttribute(DiscoveryStore,
+                                 lambda engine, records: DiscoveryStore(records, tier_of=engine._source_tier))
+
     def __init__(self):
-        self.discoveries: dict[str, Discovery] = {}
+        self.sources = SourceRegistry()
+        self.discoveries = DiscoveryStore(tier_of=self._source_tier)
         self.patterns: dict[str, Pattern] = {}
+        self._pattern_ids: dict[str, tuple[str, int]] = {}  # territory → (pattern_id, version)
         self.gaps: list[CounterfactualGap] = []
         self.governor = DiscoveryGovernor()
-        self.sources = SourceRegistry()
 
         # Engagement learning
         self._engagement_stats: dict[str, dict] = {}  # territory → {read, saved, acted, dismissed, ignored}
 
+    def _source_tier(self, disc: Discovery) -> Optional[SourceTier]:
+        src = self.sources.find_by_name(disc.source_name)
+        return src.base_tier if src else None
+
     # ── Discovery Lifecycle ──────────────────────────────────────
 
     def create_discovery(self, title: str, summary: str, so_what: str,
@@ -252,13 +277,11 @@ class DiscoveryEngine:
         disc.interaction_timestamp = datetime.now()
 
         # Update source engagement
-        if disc.source_name:
-            for src in self.sources.sources.values():
-                if src.name == disc.source_name:
-                    engaged = interaction in (InteractionType.READ, InteractionType.SAVED,
-                                               InteractionType.ACTED_ON, InteractionType.SHARED)
-                    self.sources.record_engagement(src.source_id, engaged)
-                    break
+        src = self.sources.find_by_name(disc.source_name) if disc.source_name else None
+        if src:
+            engaged = interaction in (InteractionType.READ, InteractionType.SAVED,
+                                       InteractionType.ACTED_ON, InteractionType.SHARED)
+            self.sources.record_engagement(src.source_id, engaged)
 
         # Update territory engagement stats
         if disc.territory:
@@ -273,29 +296,42 @@ class DiscoveryEngine:
     def detect_patterns(self) -> list[Pattern]:
         """
         Detect emerging patterns from 3+ discoveries converging on same theme.
+        Patterns already detected are refreshed when their territory's
+        signals change; only new ones are returned.
         """
-        # Group by territory
-        territory_groups: dict[str, list[Discovery]] = {}
-        recent_cutoff = datetime.now() - timedelta(days=30)
-        for d in self.discoveries.values():
-            if d.discovered_at > recent_cutoff and d.territory:
-                territory_groups.setdefault(d.territory, []).append(d)
+        self.discoveries.advance(datetime.now() - timedelta(days=PATTERN_WINDOW_DAYS))
 
         new_patterns = []
-        for territory, discs in territory_groups.items():
-            if len(discs) >= 3 and territory not in self.patterns:
-                pattern = Pattern(
+        for territory, version in self.discoveries.emerging():
+            pattern_id, seen = self._pattern_ids.get(territory, ("", -1))
+            existing = self.patterns.get(pattern_id)
+            if existing and seen == version:
+                continue
+            ids = self.discoveries.territory_signals(territory)
+            description = f"{len(ids)} signals in {PATTERN_WINDOW_DAYS} days"
+            keywords = self.discoveries.top_keywords(territory)
+            if keywords:
+                description += f": {', '.join(keywords)}"
+            confidence = min(0.95, 0.3 + len(ids) * 0.1)
+            if existing:
+                existing.discovery_ids = ids
+                existing.signal_count = len(ids)
+                existing.description = description
+                existing.confidence = confidence
+            else:
+                existing = Pattern(
                     pattern_id=f"pat_{uuid.uuid4().hex[:6]}",
                     label=f"Emerging: {territory}",
-                    description=f"{len(discs)} signals in 30 days",
-                    discovery_ids=[d.discovery_id for d in discs],
-                    signal_count=len(discs),
-                    confidence=min(0.95, 0.3 + len(discs) * 0.1),
+                    description=description,
+                    discovery_ids=ids,
+                    signal_count=len(ids),
+                    confidence=confidence,
                     territory=territory,
                 )
-                self.patterns[pattern.pattern_id] = pattern
-                new_patterns.append(pattern)
-                logger.info(f"Pattern detected: {territory} ({len(discs)} signals)")
+                self.patterns[existing.pattern_id] = existing
+                new_patterns.append(existing)
+                logger.info(f"Pattern detected: {territory} ({len(ids)} signals)")
+            self._pattern_ids[territory] = (existing.pattern_id, version)
 
         return new_patterns
 
@@ -319,31 +355,28 @@ class DiscoveryEngine:
 
     # ── Convergence Scoring ──────────────────────────────────────
 
-    def calculate_convergence(self, discovery_ids: list[str]) -> float:
+    def calculate_convergence(self, discovery_ids: list[str] = None, territory: str = "") -> float:
         """
         Multi-source convergence confidence.
         3+ sources across different tiers = 1.2× highest individual.
+        With a territory, its recent signals are used and sources are
+        counted by distinct tier.
         """
-        discs = [self.discoveries.get(did) for did in discovery_ids if did in self.discoveries]
-        if not discs:
-            return 0.0
+        if territory:
+            return self.discoveries.convergence(territory)
 
-        credibilities = [d.source_credibility for d in discs if d]
+        credibilities = [self.discoveries[did].source_credibility
+                         for did in discovery_ids or () if did in self.discoveries]
         if not credibilities:
             return 0.0
-
-        highest = max(credibilities)
-        if len(credibilities) >= 3:
-            return min(0.99, highest * 1.2)
-        elif len(credibilities) >= 2:
-            return min(0.95, highest * 1.1)
-        return highest
+        return converge(max(credibilities), len(credibilities))
 
     # ── Morning Briefing ─────────────────────────────────────────
 
     def get_morning_briefing(self) -> dict:
         """Today's synthesised intelligence narrative."""
         today_start = datetime.now().replace(hour=0, minute=0, second=0)
+        self.detect_patterns()
 
         signals = [
             d for d in self.discoveries.values()
@@ -414,6 +447,7 @@ class DiscoveryEngine:
             "delivered": len([d for d in self.discoveries.values() if d.actionability != ActionabilityLevel.ARCHIVE]),
             "archived": len([d for d in self.discoveries.values() if d.actionability == ActionabilityLevel.ARCHIVE]),
             "patterns": len(self.patterns),
+            "signals_in_window": self.discoveries.window_size(),
             "gaps": len(self.gaps),
             "governor": self.governor.status(),
             "sources": len(self.sources.sources),
@@ -0,0 +1,194 @@
+"""
+Cartographer v2 — Discovery Index
+Windowed pattern and convergence counters over discoveries.
+
+DiscoveryStore is the dict DiscoveryEngine keeps its discoveries in.
+Alongside the discoveries it keeps, for signals inside the pattern window:
+  - discoveries per territory, with the source tiers and credibilities
+    behind them, so territory convergence is a lookup
+  - title keyword × territory co-occurrence counts, both ways round, so a
+    territory's top keywords and a keyword's territories are lookups
+  - the territories at PATTERN_MIN_SIGNALS or more, each with a version
+    that changes whenever its signals do
+
+The window is a sorted list of discovery times. advance() drops the
+signals that have aged past the cutoff from the front and decrements their
+counters, so old discoveries leave the patterns without a rescan.
+Dismissed discoveries do not count. A Discovery reports changes to its
+title, territory, interaction, source or time (Discovery is an
+IndexedRecord), so the counters follow edits made anywhere.
+
+Almost Magic Tech Lab — Patentable IP
+"""
+
+import re
+from bisect import bisect_left, bisect_right, insort
+from collections import Counter
+from datetime import datetime
+from itertools import count
+from typing import Callable, Optional
+
+from modules.indexed_store import IndexedStore, claim
+
+from .models import Discovery, InteractionType
+
+PATTERN_WINDOW_DAYS = 30    # Signals older than this stop counting toward patterns
+PATTERN_MIN_SIGNALS = 3     # Signals a territory needs to be emerging
+
+_WORD = re.compile(r"[a-z][a-z0-9]{3,}")
+KEYWORD_STOPWORDS = frozenset("""
+about after also amid another been being between could does from have into just last more
+most much next over said says than that their them then there these they this those through
+under update very were what when where which while will with would year years your
+""".split())
+
+
+def keywords(title: str) -> frozenset:
+    """Title words of four or more letters, lower-cased, minus stopwords."""
+    return frozenset(w for w in _WORD.findall((title or "").lower()) if w not in KEYWORD_STOPWORDS)
+
+
+def converge(highest: float, sources: int) -> float:
+    """Multi-source convergence: 3+ sources = 1.2× the highest credibility, 2 = 1.1×."""
+    if sources >= 3:
+        return min(0.99, highest * 1.2)
+    elif sources >= 2:
+        return min(0.95, highest * 1.1)
+    return highest
+
+
+class DiscoveryStore(IndexedStore):
+    """discovery_id → Discovery, with windowed territory, keyword and source-tier counters."""
+
+    def __init__(self, discoveries=None, tier_of: Optional[Callable] = None,
+                 min_signals: int = PATTERN_MIN_SIGNALS):
+        super().__init__()
+        self.tier_of = tier_of or (lambda d: None)
+        self.min_signals = min_signals
+        self.cutoff = datetime.min     # Only moves forward; see advance()
+        self._seq = count()
+        self._entries = {}             # discovery_id → (discovery, item, territory, keywords, tier, credibility, windowed)
+        self._keys = {}                # id(discovery) → discovery_id
+        self._window = []              # sorted [(discovered_at, seq, discovery_id)] still counting
+        self._territory = {}           # territory → {discovery_id: None}
+        self._versions = {}            # territory → change count of its signals
+        self._tiers = {}               # territory → Counter(known source tier)
+        self._credibility = {}         # territory → Counter(source credibility)
+        self._territory_keywords = {}  # territory → Counter(keyword)
+        self._keyword_territories = {} # keyword → Counter(territory)
+        self._hot = {}                 # territory → None, at min_signals or more
+        if discoveries:
+            self.update(discoveries)
+
+    # ── Counters ─────────────────────────────────────────────────
+
+    @staticmethod
+    def _bump(index: dict, key, value, delta: int):
+        counter = index.setdefault(key, Counter())
+        counter[value] += delta
+        if counter[value] <= 0:
+            del counter[value]
+            if not counter:
+                del index[key]
+
+    def _count(self, discovery_id: str, entry: tuple, add: bool):
+        _, _, territory, words, tier, credibility, _ = entry
+        if not territory:
+            return
+        delta = 1 if add else -1
+        ids = self._territory.setdefault(territory, {})
+        if add:
+            ids[discovery_id] = None
+        else:
+            ids.pop(discovery_id, None)
+        self._versions[territory] = self._versions.get(territory, 0) + 1
+        if len(ids) >= self.min_signals:
+            self._hot[territory] = None
+        else:
+            self._hot.pop(territory, None)
+        if not ids:
+            del self._territory[territory]
+        if tier is not None:       # An unregistered source is not a tier of its own
+            self._bump(self._tiers, territory, tier, delta)
+        self._bump(self._credibility, territory, credibility, delta)
+        for word in words:
+            self._bump(self._territory_keywords, territory, word, delta)
+            self._bump(self._keyword_territories, word, territory, delta)
+
+    # ── Index ────────────────────────────────────────────────────
+
+    def _index(self, discovery_id: str, d: Discovery, seq: Optional[int] = None):
+        item = (d.discovered_at, next(self._seq) if seq is None else seq, discovery_id)
+        windowed = d.interaction != InteractionType.DISMISSED and d.discovered_at > self.cutoff
+        # Keep what it was counted under: the object may have changed by unindex time
+        entry = (d, item, d.territory, keywords(d.title) if d.territory else frozenset(),
+                 self.tier_of(d), d.source_credibility, windowed)
+        self._entries[discovery_id] = entry
+        self._keys[id(d)] = discovery_id
+        if windowed:
+            insort(self._window, item)
+            self._count(discovery_id, entry, True)
+        claim(self, d)
+
+    def _unindex(self, discovery_id: str) -> Optional[int]:
+        entry = self._entries.pop(discovery_id, None)
+        if entry is None:
+            return None
+        d, item = entry[:2]
+        self._keys.pop(id(d), None)
+        if entry[-1]:
+            i = bisect_left(self._window, item)
+            if i < len(self._window) and self._window[i] == item:
+                del self._window[i]
+            self._count(discovery_id, entry, False)
+        return item[1]
+
+    def reindex(self, d: Discovery, attr: Optional[str] = None, value=None):
+        """Called by Discovery when an indexed field changes."""
+        discovery_id = self._keys.get(id(d))
+        if discovery_id is None or self._entries[discovery_id][0] is not d:
+            return
+        seq = self._unindex(discovery_id)
+        self._index(discovery_id, d, seq)
+
+    def advance(self, cutoff: datetime) -> int:
+        """Age out signals discovered at or before cutoff. Returns how many left the window."""
+        if cutoff <= self.cutoff:
+            return 0
+        self.cutoff = cutoff
+        n = bisect_right(self._window, (cutoff, float("inf")))
+        expired, self._window[:n] = self._window[:n], []
+        for _, _, discovery_id in expired:
+            entry = self._entries[discovery_id]
+            self._entries[discovery_id] = entry[:-1] + (False,)
+            self._count(discovery_id, entry, False)
+        return n
+
+    # ── Queries ──────────────────────────────────────────────────
+
+    def window_size(self) -> int:
+        return len(self._window)
+
+    def territory_signals(self, territory: str) -> list[str]:
+        """Discovery ids counting toward a territory, in the order they were indexed."""
+        return list(self._territory.get(territory, ()))
+
+    def emerging(self) -> list[tuple[str, int]]:
+        """(territory, version) for territories with min_signals in the window."""
+        return [(t, self._versions[t]) for t in self._hot]
+
+    def top_keywords(self, territory: str, n: int = 3) -> list[str]:
+        """The title keywords most common among a territory's signals."""
+        counts = self._territory_keywords.get(territory)
+        return [w for w, c in counts.most_common(n) if c > 1] if counts else []
+
+    def keyword_territories(self, keyword: str) -> dict[str, int]:
+        """Territories a keyword co-occurs with in the window, and how often."""
+        return dict(self._keyword_territories.get(keyword.lower(), {}))
+
+    def convergence(self, territory: str) -> float:
+        """Convergence of a territory's windowed signals, counting distinct source tiers."""
+        credibility = self._credibility.get(territory)
+        if not credibility:
+            return 0.0
+        return converge(max(credibility), len(self._tiers.get(territory, ())))
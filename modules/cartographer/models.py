@@ -10,6 +10,8 @@ from datetime import datetime
 from enum import Enum
 from typing import Optional
 
+from modules.indexed_store import IndexedRecord
+
 
 # ── Enums ────────────────────────────────────────────────────────
 
@@ -108,9 +110,14 @@ DEPTH_THRESHOLDS = {
 
 # ── Data Models ──────────────────────────────────────────────────
 
+# Territory fields the TerritoryStore keeps in columns; changing one updates its row
+TERRITORY_COLUMNS = frozenset({"depth_signals", "last_engagement", "decay_rate_per_quarter"})
+
+
 @dataclass
-class DepthSignals:
+class DepthSignals(IndexedRecord):
     """Multi-signal analysis for knowledge depth calculation."""
+    # index_fields None: a TerritoryStore keeps every signal in a column
     credentials: float = 0.0      # 25% weight — certs, degrees, formal training
     content_production: float = 0.0  # 25% — articles, posts, proposals
     time_investment: float = 0.0  # 20% — hours in meetings, research
@@ -144,8 +151,10 @@ class DepthSignals:
 
 
 @dataclass
-class KnowledgeTerritory:
+class KnowledgeTerritory(IndexedRecord):
     """A node in Mani's knowledge territory map."""
+    index_fields = TERRITORY_COLUMNS
+
     territory_id: str
     label: str
     depth_signals: DepthSignals = field(default_factory=DepthSignals)
@@ -204,9 +213,16 @@ class Propagation:
     poi_engagement_opportunity: str = ""
 
 
+# Discovery fields the DiscoveryStore indexes on; changing one re-indexes the discovery
+INDEXED_FIELDS = frozenset({"title", "territory", "interaction", "source_name",
+                            "source_credibility", "discovered_at"})
+
+
 @dataclass
-class Discovery:
+class Discovery(IndexedRecord):
     """A single intelligence discovery."""
+    index_fields = INDEXED_FIELDS
+
     discovery_id: str = ""
     title: str = ""
     summary: str = ""
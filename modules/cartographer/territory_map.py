@@ -4,6 +4,11 @@ Auto-calculated depth with temporal decay.
 
 Patentable: Topographic Intelligence Mapping with Auto-Calculated Depth
 
+Territories live in a TerritoryStore (territory_state.py) that keeps
+their depth state in columns, so whole-map passes (decay, the map,
+knowledge debt) run column-wise. Pass as_of to see the map, or the debt,
+as decay would leave it at another date.
+
 Almost Magic Tech Lab — Patentable IP
 """
 
@@ -11,10 +16,13 @@ import logging
 from datetime import datetime, timedelta
 from typing import Optional
 
+from modules.indexed_store import StoreAttribute
+
 from .models import (
     KnowledgeTerritory, DepthSignals, DepthLevel,
-    TerritoryTrend, DEPTH_THRESHOLDS,
+    TerritoryTrend,
 )
+from .territory_state import DEPTH, DEPTH_VALUES, TerritoryStore
 
 logger = logging.getLogger("elaine.cartographer.territory")
 
@@ -26,8 +34,10 @@ class TerritoryMap:
     Auto-calculates depth from multi-signal analysis.
     """
 
+    territories = StoreAttribute(TerritoryStore)    # territory_id → KnowledgeTerritory
+
     def __init__(self):
-        self.territories: dict[str, KnowledgeTerritory] = {}
+        self.territories = TerritoryStore()
         self._seed_initial_territories()
 
     def _seed_initial_territories(self):
@@ -100,27 +110,38 @@ class TerritoryMap:
         logger.info(f"New territory: {label} (depth: {t.depth.value})")
         return t
 
-    def get_map(self) -> list[dict]:
-        """Full territory map for display."""
+    def get_map(self, as_of: Optional[datetime] = None) -> list[dict]:
+        """Full territory map for display; with as_of, depth as decay would leave it then."""
+        store = self.territories
+        scores = store.depth_scores(as_of)
+        codes = store.depth_codes(scores)
+        if store.numpy:
+            scores, codes = scores.tolist(), codes.tolist()
         return sorted(
             [
                 {
                     "territory_id": t.territory_id,
                     "label": t.label,
-                    "depth": t.depth.value,
-                    "depth_score": round(t.depth_score, 1),
+                    "depth": DEPTH_VALUES[code],
+                    "depth_score": round(score, 1),
                     "trend": t.trend.value,
                     "adjacent": t.adjacent_territories,
                     "negative_spaces": t.negative_spaces,
                     "knowledge_debt_hours": t.knowledge_debt_hours,
                     "last_engagement": t.last_engagement.isoformat() if t.last_engagement else None,
                 }
-                for t in self.territories.values()
+                for t, score, code in zip(store.records, scores, codes)
             ],
             key=lambda x: x["depth_score"],
             reverse=True,
         )
 
+    def project_depth(self, dates: list[datetime]) -> dict[str, list[float]]:
+        """territory_id → depth score at each date, past or future, in one batched pass."""
+        store = self.territories
+        return {t.territory_id: [round(s, 1) for s in scores]
+                for t, scores in zip(store.records, store.project(dates))}
+
     # ── Depth Decay ──────────────────────────────────────────────
 
     def apply_quarterly_decay(self) -> list[dict]:
@@ -128,32 +149,15 @@ class TerritoryMap:
         Apply temporal depth decay.
         Knowledge decays 5%/quarter (2% for credentialed).
         Alert when depth drops a level.
+        Computed column-wise; only territories inactive a quarter or more are written back.
         """
         alerts = []
-        now = datetime.now()
-
-        for t in self.territories.values():
-            if not t.last_engagement:
-                continue
-
-            quarters_since = (now - t.last_engagement).days / 90.0
-            if quarters_since < 1.0:
-                continue  # No decay within first quarter
-
-            decay_factor = 1.0 - (t.decay_rate_per_quarter * quarters_since)
-            decay_factor = max(0.3, decay_factor)  # Never decay below 30%
-
-            old_depth = t.depth
-            # Apply decay to all signals proportionally
-            t.depth_signals.content_production *= decay_factor
-            t.depth_signals.time_investment *= decay_factor
-            t.depth_signals.query_complexity *= decay_factor
-            t.depth_signals.teaching_evidence *= decay_factor
-            t.depth_signals.peer_recognition *= decay_factor
-            # Credentials decay slower (already in decay_rate)
-
-            new_depth = t.depth
-            if new_depth != old_depth:
+        # Apply decay to all signals proportionally
+        # Credentials decay slower (already in decay_rate)
+        for row, decay_factor, quarters_since, before, after in self.territories.decay(datetime.now()):
+            if before != after:
+                old_depth, new_depth = DEPTH[before], DEPTH[after]
+                t = self.territories.records[row]
                 t.trend = TerritoryTrend.STALE
                 alert = {
                     "territory": t.label,
@@ -184,15 +188,17 @@ class TerritoryMap:
 
     # ── Knowledge Debt ───────────────────────────────────────────
 
-    def calculate_knowledge_debt(self, required_territories: dict[str, DepthLevel]) -> list[dict]:
+    def calculate_knowledge_debt(self, required_territories: dict[str, DepthLevel],
+                                 as_of: Optional[datetime] = None) -> list[dict]:
         """
         Compare required depth (from clients, pipeline, market) against actual depth.
-        Returns gaps with learning paths.
+        Returns gaps with learning paths. With as_of, depth is projected to that date.
         """
         debts = []
+        store = self.territories
+        required = []
         for tid, required_depth in required_territories.items():
-            t = self.territories.get(tid)
-            if not t:
+            if tid not in store:
                 # Territory doesn't exist yet — full debt
                 debts.append({
                     "territory": tid,
@@ -202,22 +208,23 @@ class TerritoryMap:
                     "estimated_hours": 20,
                 })
                 continue
-
-            req_threshold = DEPTH_THRESHOLDS[required_depth]
-            if t.depth_score < req_threshold:
-                gap = req_threshold - t.depth_score
-                hours = gap * 0.5  # Rough: 0.5 hours per point of gap
-                debts.append({
-                    "territory": t.label,
-                    "required": required_depth.value,
-                    "current": t.depth.value,
-                    "current_score": round(t.depth_score, 1),
-                    "gap_points": round(gap, 1),
-                    "estimated_hours": round(hours, 0),
-                    "gap_severity": "critical" if gap > 40 else "moderate" if gap > 20 else "low",
-                    "debt_description": t.knowledge_debt_description,
-                    "roi": t.knowledge_debt_roi,
-                })
+            required.append((store.row(tid), required_depth))
+
+        levels = dict(required)
+        for row, score, gap, code in store.debt_rows(required, as_of):
+            t = store.records[row]
+            hours = gap * 0.5  # Rough: 0.5 hours per point of gap
+            debts.append({
+                "territory": t.label,
+                "required": levels[row].value,
+                "current": DEPTH_VALUES[code],
+                "current_score": round(score, 1),
+                "gap_points": round(gap, 1),
+                "estimated_hours": round(hours, 0),
+                "gap_severity": "critical" if gap > 40 else "moderate" if gap > 20 else "low",
+                "debt_description": t.knowledge_debt_description,
+                "roi": t.knowledge_debt_roi,
+            })
 
         return sorted(debts, key=lambda d: d.get("gap_points", 100), reverse=True)
 
@@ -0,0 +1,298 @@
+"""
+Cartographer v2 — Territory State
+Columnar depth state for the territory map.
+
+TerritoryStore is the dict TerritoryMap keeps its territories in.
+Alongside the territories it keeps one column per number the whole-map
+passes read — the six depth signals, last engagement (seconds since 1970)
+and the decay rate — row i ↔ self.records[i], in dict order. A
+KnowledgeTerritory reports changes to its signals, engagement or rate, and
+DepthSignals reports changes to any signal (both are IndexedRecords), so
+the columns follow edits made anywhere.
+
+Quarterly decay, the map and knowledge debt then run column-wise — with
+NumPy when it is installed, plain lists otherwise — and only territories
+whose state changes are written back. Depth can be projected to any date
+without touching the territories: depth_scores(as_of) is what
+apply_quarterly_decay would leave at that date, and project() does it for
+many dates in one batched pass. Scores are summed in the same order as
+DepthSignals.score, so both backends agree with the per-territory rules.
+
+Almost Magic Tech Lab — Patentable IP
+"""
+
+import math
+from datetime import datetime
+from typing import Optional
+
+from modules.indexed_store import IndexedStore, claim
+
+from .models import DepthLevel, KnowledgeTerritory, DEPTH_THRESHOLDS
+
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+QUARTER_DAYS = 90.0
+DECAY_FLOOR = 0.3           # Never decay below 30%
+
+# Codes shared by both backends: index into this tuple (DepthSignals.depth_level order)
+DEPTH = (DepthLevel.DEEP, DepthLevel.GROWING, DepthLevel.SURFACE,
+         DepthLevel.PERIPHERAL, DepthLevel.UNEXPLORED)
+DEPTH_VALUES = tuple(d.value for d in DEPTH)
+# The signals apply_quarterly_decay decays; credentials decay slower (via the rate)
+DECAYING = ("content_production", "time_investment", "query_complexity",
+            "teaching_evidence", "peer_recognition")
+SIGNALS = ("credentials",) + DECAYING
+COLUMNS = SIGNALS + ("engaged_at", "engaged", "rate")
+
+_EPOCH = datetime(1970, 1, 1)
+
+
+def _seconds(when: datetime) -> float:
+    return (when - _EPOCH).total_seconds()
+
+
+def _score(cred, content, time_, query, teaching, peer):
+    """DepthSignals.score, term for term."""
+    return cred * 0.25 + content * 0.25 + time_ * 0.20 + query * 0.15 + teaching * 0.10 + peer * 0.05
+
+
+class TerritoryStore(IndexedStore):
+    """territory_id → KnowledgeTerritory, with depth state in columns."""
+
+    def __init__(self, territories=None, use_numpy: Optional[bool] = None):
+        super().__init__()
+        self.numpy = HAS_NUMPY if use_numpy is None else (use_numpy and HAS_NUMPY)
+        self.ids: list[str] = []                    # row → territory_id
+        self.records: list[KnowledgeTerritory] = [] # row → territory
+        self._rows = {}                             # territory_id → row
+        self._keys = {}                             # id(territory) → territory_id
+        self._signals = {}                          # territory_id → DepthSignals it was indexed with
+        self._signal_keys = {}                      # id(DepthSignals) → territory_id
+        self._columns = {name: [] for name in COLUMNS}
+        self._arrays = {}                           # name → NumPy copy of the column, built on use
+        self._stale = set()                         # columns whose array is newer than the list
+        if territories:
+            self.update(territories)
+
+    # ── Columns ──────────────────────────────────────────────────
+
+    def column(self, name: str):
+        if not self.numpy:
+            return self._columns[name]
+        array = self._arrays.get(name)
+        if array is None:
+            array = self._arrays[name] = np.array(self._columns[name],
+                                                  dtype=bool if name == "engaged" else float)
+        return array
+
+    def _set(self, row: int, name: str, value):
+        array = self._arrays.get(name)
+        if array is not None:
+            array[row] = value
+        if name not in self._stale:
+            self._columns[name][row] = value
+
+    def _reshape(self):
+        """Before rows are added or removed: lists take back any newer array values."""
+        for name in self._stale:
+            self._columns[name] = self._arrays[name].tolist()
+        self._stale.clear()
+        self._arrays.clear()
+
+    @staticmethod
+    def _values(t: KnowledgeTerritory) -> list:
+        s, e = t.depth_signals, t.last_engagement
+        return ([getattr(s, name) for name in SIGNALS]
+                + [_seconds(e) if e else 0.0, e is not None, t.decay_rate_per_quarter])
+
+    # ── Index ────────────────────────────────────────────────────
+
+    def _link(self, territory_id: str, t: KnowledgeTerritory):
+        self._keys[id(t)] = territory_id
+        self._signals[territory_id] = t.depth_signals
+        self._signal_keys[id(t.depth_signals)] = territory_id
+        claim(self, t)
+        claim(self, t.depth_signals)
+
+    def _unlink(self, territory_id: str):
+        t = self.records[self._rows[territory_id]]
+        self._keys.pop(id(t), None)
+        self._signal_keys.pop(id(self._signals.pop(territory_id)), None)
+
+    def _index(self, territory_id: str, t: KnowledgeTerritory):
+        row = self._rows.get(territory_id)
+        if row is not None:                 # Replaced: keeps its row, as it keeps its dict position
+            self.records[row] = t
+            for name, value in zip(COLUMNS, self._values(t)):
+                self._set(row, name, value)
+        else:
+            self._reshape()
+            self._rows[territory_id] = len(self.records)
+            self.ids.append(territory_id)
+            self.records.append(t)
+            for name, value in zip(COLUMNS, self._values(t)):
+                self._columns[name].append(value)
+        self._link(territory_id, t)
+
+    def _unindex(self, territory_id: str):
+        self._unlink(territory_id)
+        if territory_id in self:
+            return                          # About to be replaced; _index reuses the row
+        # Removals are rare; rows stay in dict order
+        self._reshape()
+        row = self._rows.pop(territory_id)
+        del self.ids[row], self.records[row]
+        for values in self._columns.values():
+            del values[row]
+        for i in range(row, len(self.ids)):
+            self._rows[self.ids[i]] = i
+
+    def reindex(self, record, attr: Optional[str] = None, value=None):
+        """Called by a KnowledgeTerritory or DepthSignals this store claimed when a column field changes."""
+        if isinstance(record, KnowledgeTerritory):
+            self._reindex_territory(record)
+        else:
+            self._reindex_signals(record, attr, value)
+
+    def _reindex_territory(self, t: KnowledgeTerritory):
+        territory_id = self._keys.get(id(t))
+        if territory_id is None or dict.get(self, territory_id) is not t:
+            return
+        self._unlink(territory_id)
+        self._link(territory_id, t)
+        row = self._rows[territory_id]
+        for name, value in zip(COLUMNS, self._values(t)):
+            self._set(row, name, value)
+
+    def _reindex_signals(self, signals, attr: str, value):
+        territory_id = self._signal_keys.get(id(signals))
+        if territory_id is None or self._signals.get(territory_id) is not signals or attr not in SIGNALS:
+            return
+        self._set(self._rows[territory_id], attr, value)
+
+    def row(self, territory_id: str) -> int:
+        return self._rows[territory_id]
+
+    # ── Derived columns ──────────────────────────────────────────
+
+    def _take(self, name: str, rows=None):
+        column = self.column(name)
+        if rows is None:
+            return column
+        return column[rows] if self.numpy else [column[r] for r in rows]
+
+    def factors(self, as_of: datetime, rows=None):
+        """
+        Decay factor per row at as_of: 1 - rate × whole quarters-worth of days
+        inactive, floored at DECAY_FLOOR; exactly 1 inside the first quarter
+        or if never engaged.
+        """
+        at = _seconds(as_of)
+        engaged_at, engaged, rate = (self._take(n, rows) for n in ("engaged_at", "engaged", "rate"))
+        if self.numpy:
+            quarters = np.floor((at - engaged_at) / 86400.0) / QUARTER_DAYS
+            return np.where(engaged & (quarters >= 1.0),
+                            np.maximum(DECAY_FLOOR, 1.0 - rate * quarters), 1.0)
+        factors = []
+        for s, e, r in zip(engaged_at, engaged, rate):
+            q = math.floor((at - s) / 86400.0) / QUARTER_DAYS
+            factors.append(max(DECAY_FLOOR, 1.0 - r * q) if e and q >= 1.0 else 1.0)
+        return factors
+
+    def depth_scores(self, as_of: Optional[datetime] = None, rows=None):
+        """Depth score per row; with as_of, what one decay pass at that date would leave."""
+        cred, *rest = (self._take(name, rows) for name in SIGNALS)
+        if as_of is None:
+            if self.numpy:
+                return _score(cred, *rest)
+            return [_score(*row) for row in zip(cred, *rest)]
+        f = self.factors(as_of, rows)
+        if self.numpy:
+            return _score(cred, *(column * f for column in rest))
+        return [_score(c, *(s * fi for s in signals)) for c, fi, signals in zip(cred, f, zip(*rest))]
+
+    def depth_codes(self, scores):
+        """Index into DEPTH for each row (DepthSignals.depth_level thresholds)."""
+        if self.numpy:
+            s = scores
+            return np.where(s > 80, 0, np.where(s > 50, 1, np.where(s > 25, 2, np.where(s > 10, 3, 4))))
+        return [0 if s > 80 else 1 if s > 50 else 2 if s > 25 else 3 if s > 10 else 4 for s in scores]
+
+    def project(self, dates: list[datetime]) -> list[list[float]]:
+        """Depth scores at each date, one row per territory, in one batched pass."""
+        if not self.numpy:
+            return [list(scores) for scores in zip(*(self.depth_scores(d) for d in dates))] \
+                or [[] for _ in self.records]
+        at = np.array([_seconds(d) for d in dates])[:, None]
+        quarters = np.floor((at - self.column("engaged_at")) / 86400.0) / QUARTER_DAYS
+        f = np.where(self.column("engaged") & (quarters >= 1.0),
+                     np.maximum(DECAY_FLOOR, 1.0 - self.column("rate") * quarters), 1.0)
+        cred, *rest = (self.column(name) for name in SIGNALS)
+        return _score(cred, *(column * f for column in rest)).T.tolist()
+
+    # ── Passes ───────────────────────────────────────────────────
+
+    def decay(self, now: datetime) -> list[tuple[int, float, float, int, int]]:
+        """
+        Apply one quarterly decay pass at now, to the columns and to the
+        territories that decay. Returns (row, factor, quarters inactive,
+        depth code before, depth code after) for each of them.
+        """
+        at = _seconds(now)
+        engaged_at, engaged, rate = (self.column(n) for n in ("engaged_at", "engaged", "rate"))
+        if self.numpy:
+            quarters = np.floor((at - engaged_at) / 86400.0) / QUARTER_DAYS
+            rows = np.flatnonzero(engaged & (quarters >= 1.0))
+            if not rows.size:
+                return []
+            quarters = quarters[rows]
+            f = np.maximum(DECAY_FLOOR, 1.0 - rate[rows] * quarters)
+            cred, *old = (self.column(name)[rows] for name in SIGNALS)
+            new = [column * f for column in old]
+            before, after = self.depth_codes(_score(cred, *old)), self.depth_codes(_score(cred, *new))
+            for name, values in zip(DECAYING, new):
+                self._arrays[name][rows] = values
+            self._stale.update(DECAYING)           # The lists catch up in _reshape()
+            # Write straight to the signals: the columns already hold the new values
+            records = self.records
+            for row, *values in zip(rows.tolist(), *(column.tolist() for column in new)):
+                vars(records[row].depth_signals).update(zip(DECAYING, values))
+            return list(zip(rows.tolist(), f.tolist(), quarters.tolist(), before.tolist(), after.tolist()))
+
+        changes = []
+        cred_column, *columns = (self._columns[name] for name in SIGNALS)
+        for row, (s, e, r) in enumerate(zip(engaged_at, engaged, rate)):
+            if not e:
+                continue
+            q = math.floor((at - s) / 86400.0) / QUARTER_DAYS
+            if q < 1.0:
+                continue
+            f = max(DECAY_FLOOR, 1.0 - r * q)
+            old = [column[row] for column in columns]
+            decayed = [v * f for v in old]
+            for column, v in zip(columns, decayed):
+                column[row] = v
+            cred = cred_column[row]
+            before, after = self.depth_codes((_score(cred, *old), _score(cred, *decayed)))
+            changes.append((row, f, q, before, after))
+            vars(self.records[row].depth_signals).update(zip(DECAYING, decayed))
+        return changes
+
+    def debt_rows(self, required: list[tuple[int, DepthLevel]], as_of: Optional[datetime] = None):
+        """(row, score, gap, depth code) for each required (row, level) the row falls short of."""
+        if not required:
+            return []
+        rows = [r for r, _ in required]
+        thresholds = [DEPTH_THRESHOLDS[level] for _, level in required]
+        scores = self.depth_scores(as_of, np.array(rows, dtype=int) if self.numpy else rows)
+        codes = self.depth_codes(scores)
+        if self.numpy:
+            gaps = np.array(thresholds, dtype=float) - scores
+            below = np.flatnonzero(gaps > 0)
+            return list(zip(np.array(rows)[below].tolist(), scores[below].tolist(),
+                            gaps[below].tolist(), codes[below].tolist()))
+        return [(r, s, t - s, c) for r, s, t, c in zip(rows, scores, thresholds, codes) if s < t]
@@ -21,6 +21,8 @@ import uuid
 from datetime import datetime, timedelta
 from typing import Optional
 
+from modules.indexed_store import StoreAttribute
+
 from .models import (
     MeetingRecord, MeetingTemplate, Participant,
     Commitment, CommitmentType, CommitmentStatus, TrustStake,
@@ -33,6 +35,7 @@ from .models import (
     CalendarIntelligence,
     COMMITMENT_MASS, COMMITMENT_CONFIDENCE,
 )
+from .meeting_index import MeetingStore
 
 logger = logging.getLogger("elaine.chronicle")
 
@@ -50,14 +53,53 @@ COMMITMENT_PATTERNS = [
 ]
 
 
+def find_commitments(text: str) -> list[Commitment]:
+    """
+    Commitments stated in text, each with ~100 chars of surrounding context.
+    Owners are the pattern defaults ("mani", "mutual", "assigned").
+    """
+    commitments = []
+    for pattern, ctype, default_owner in COMMITMENT_PATTERNS:
+        matches = re.finditer(pattern, text, re.I)
+        for match in matches:
+            # Get surrounding context (40 chars each side)
+            start = max(0, match.start() - 40)
+            end = min(len(text), match.end() + 60)
+            context = text[start:end].strip()
+
+            commitment = Commitment(
+                text=context,
+                owner=default_owner,
+                commitment_type=ctype,
+                trust_stake=TrustStake.HIGH if ctype in (
+                    CommitmentType.EXPLICIT_DEADLINE, CommitmentType.ACTION_ITEM
+                ) else TrustStake.MEDIUM,
+            )
+
+            # Detect due dates from context
+            date_match = re.search(
+                r"by\s+(friday|monday|tuesday|wednesday|thursday|saturday|sunday|"
+                r"end of (?:week|month)|tomorrow|next week|\d{1,2}\s*\w+)",
+                context, re.I
+            )
+            if date_match:
+                commitment.due_date = datetime.now() + timedelta(days=7)  # Simplified
+
+            commitments.append(commitment)
+
+    return commitments
+
+
 class MeetingEngine:
     """
     Core Chronicle engine. Manages meeting lifecycle,
     commitment tracking, decision archaeology, and innovations.
     """
 
+    meetings = StoreAttribute(MeetingStore)     # meeting_id → MeetingRecord
+
     def __init__(self):
-        self.meetings: dict[str, MeetingRecord] = {}
+        self.meetings = MeetingStore()
         self.follow_through_models: dict[str, PersonFollowThroughModel] = {}
         self.innovations: list[Innovation] = []
 
@@ -90,12 +132,7 @@ class MeetingEngine:
         return self.meetings.get(meeting_id)
 
     def list_meetings(self, limit: int = 20, person: str = "") -> list[MeetingRecord]:
-        meetings = list(self.meetings.values())
-        if person:
-            meetings = [
-                m for m in meetings
-                if any(p.name.lower() == person.lower() for p in m.participants)
-            ]
+        meetings = self.meetings.meetings_with(person) if person else list(self.meetings.values())
         return sorted(meetings, key=lambda m: m.date, reverse=True)[:limit]
 
     # ── Pre-Meeting Brief ────────────────────────────────────────
@@ -112,7 +149,7 @@ class MeetingEngine:
         for p in meeting.participants:
             if p.role != "host":
                 prior = [
-                    m for m in self.meetings.values()
+                    m for m in self.meetings.meetings_with(p.name)
                     if any(pp.name == p.name for pp in m.participants)
                     and m.meeting_id != meeting_id
                 ]
@@ -122,13 +159,11 @@ class MeetingEngine:
                     brief.relationship_context = f"First meeting with {p.name}"
 
         # What you owe them (overdue commitments)
-        for m in self.meetings.values():
-            for c in m.commitments:
-                if c.owner == "mani" and c.status == CommitmentStatus.PENDING:
-                    # Check if any participant matches
-                    for p in meeting.participants:
-                        if p.name != "Mani Padisetti" and p.name in m.title:
-                            brief.what_you_owe.append(f"{c.text} (from {m.title})")
+        for m, c in self.meetings.with_status(CommitmentStatus.PENDING, owner="mani"):
+            # Check if any participant matches
+            for p in meeting.participants:
+                if p.name != "Mani Padisetti" and p.name in m.title:
+                    brief.what_you_owe.append(f"{c.text} (from {m.title})")
 
         # Template-based prep questions
         template_questions = {
@@ -165,35 +200,7 @@ class MeetingEngine:
         if not meeting:
             return []
 
-        commitments = []
-        for pattern, ctype, default_owner in COMMITMENT_PATTERNS:
-            matches = re.finditer(pattern, text, re.I)
-            for match in matches:
-                # Get surrounding context (40 chars each side)
-                start = max(0, match.start() - 40)
-                end = min(len(text), match.end() + 60)
-                context = text[start:end].strip()
-
-                commitment = Commitment(
-                    text=context,
-                    owner=default_owner,
-                    commitment_type=ctype,
-                    trust_stake=TrustStake.HIGH if ctype in (
-                        CommitmentType.EXPLICIT_DEADLINE, CommitmentType.ACTION_ITEM
-                    ) else TrustStake.MEDIUM,
-                )
-
-                # Detect due dates from context
-                date_match = re.search(
-                    r"by\s+(friday|monday|tuesday|wednesday|thursday|saturday|sunday|"
-                    r"end of (?:week|month)|tomorrow|next week|\d{1,2}\s*\w+)",
-                    context, re.I
-                )
-                if date_match:
-                    commitment.due_date = datetime.now() + timedelta(days=7)  # Simplified
-
-                commitments.append(commitment)
-
+        commitments = find_commitments(text)
         meeting.commitments.extend(commitments)
 
         # Update patterns
@@ -204,6 +211,17 @@ class MeetingEngine:
         logger.info(f"Extracted {len(commitments)} commitments from {meeting.title}")
         return commitments
 
+    def stream_transcript(self, meeting_id: str):
+        """
+        Open a TranscriptStream: feed() it transcript chunks as they arrive and
+        commitments, decisions and speakers are added to the meeting as found.
+        Returns None for an unknown meeting.
+        """
+        from .transcript_stream import TranscriptStream
+        if meeting_id not in self.meetings:
+            return None
+        return TranscriptStream(self, meeting_id)
+
     def add_commitment(self, meeting_id: str, text: str, owner: str,
                        commitment_type: CommitmentType,
                        due_date: datetime = None,
@@ -242,29 +260,27 @@ class MeetingEngine:
                 break
 
     def get_active_commitments(self, owner: str = "") -> list[dict]:
-        """Get all active commitments across all meetings."""
-        active = []
-        for m in self.meetings.values():
-            for c in m.commitments:
-                if c.status in (CommitmentStatus.PENDING, CommitmentStatus.IN_PROGRESS):
-                    if not owner or c.owner == owner:
-                        active.append({
-                            "meeting": m.title,
-                            "meeting_id": m.meeting_id,
-                            "commitment_id": c.commitment_id,
-                            "text": c.text,
-                            "owner": c.owner,
-                            "type": c.commitment_type.value,
-                            "due_date": c.due_date.isoformat() if c.due_date else None,
-                            "trust_stake": c.trust_stake.value,
-                            "overdue": c.is_overdue,
-                            "prediction": round(c.follow_through_prediction, 2),
-                            "mass": c.default_mass,
-                        })
-        return sorted(active, key=lambda x: x.get("due_date") or "9999")
+        """Get all active commitments across all meetings, earliest due first."""
+        return [self._commitment_dict(m, c) for m, c in self.meetings.active(owner)]
 
     def get_overdue_commitments(self) -> list[dict]:
-        return [c for c in self.get_active_commitments() if c["overdue"]]
+        return [self._commitment_dict(m, c) for m, c in self.meetings.overdue()]
+
+    @staticmethod
+    def _commitment_dict(m: MeetingRecord, c: Commitment) -> dict:
+        return {
+            "meeting": m.title,
+            "meeting_id": m.meeting_id,
+            "commitment_id": c.commitment_id,
+            "text": c.text,
+            "owner": c.owner,
+            "type": c.commitment_type.value,
+            "due_date": c.due_date.isoformat() if c.due_date else None,
+            "trust_stake": c.trust_stake.value,
+            "overdue": c.is_overdue,
+            "prediction": round(c.follow_through_prediction, 2),
+            "mass": c.default_mass,
+        }
 
     # ── Follow-Through Prediction ────────────────────────────────
 
@@ -533,7 +549,7 @@ class MeetingEngine:
             "by_template": by_template,
             "follow_through_models": follow_through,
             "total_meetings": len(self.meetings),
-            "total_commitments": sum(len(m.commitments) for m in self.meetings.values()),
+            "total_commitments": self.meetings.commitment_count(),
             "total_decisions": sum(len(m.decisions) for m in self.meetings.values()),
             "innovations_detected": len(self.innovations),
         }
@@ -550,7 +566,7 @@ class MeetingEngine:
             if today <= m.date < tomorrow
         ]
 
-        overdue = self.get_overdue_commitments()
+        overdue = self.meetings.overdue(now)
 
         return {
             "meetings_today": len(today_meetings),
@@ -560,8 +576,8 @@ class MeetingEngine:
                 for m in sorted(today_meetings, key=lambda m: m.date)
             ],
             "overdue_commitments": len(overdue),
-            "overdue_details": overdue[:3],
-            "active_commitments": len(self.get_active_commitments(owner="mani")),
+            "overdue_details": [self._commitment_dict(m, c) for m, c in overdue[:3]],
+            "active_commitments": self.meetings.count_active(owner="mani"),
         }
 
     # ── Status ───────────────────────────────────────────────────
@@ -569,8 +585,8 @@ class MeetingEngine:
     def status(self) -> dict:
         return {
             "total_meetings": len(self.meetings),
-            "active_commitments": len(self.get_active_commitments()),
-            "overdue": len(self.get_overdue_commitments()),
+            "active_commitments": self.meetings.count_active(),
+            "overdue": self.meetings.count_overdue(),
             "follow_through_models": len(self.follow_through_models),
             "decisions_tracked": sum(len(m.decisions) for m in self.meetings.values()),
             "innovations": len(self.innovations),
@@ -0,0 +1,222 @@
+"""
+Chronicle v2 — Meeting Index
+Maintained indexes over meetings and their commitments.
+
+MeetingStore is the dict MeetingEngine keeps its meetings in. Alongside
+the meetings it keeps:
+  - commitments by status and by owner
+  - active commitments (pending / in progress) in due-date order, overall
+    and per owner, so "active for X" is a walk of one short list
+  - pending commitments in due-date order, so "overdue now" is a bisect
+  - meetings by participant name
+
+Each meeting's commitments and participants lists are swapped for
+TrackedLists that report appends and removals, and a Commitment reports
+changes to its status, owner or due date (Commitment is an IndexedRecord), so
+the indexes follow edits made anywhere — not only through MeetingEngine.
+
+Almost Magic Tech Lab — Patentable IP
+"""
+
+import weakref
+from bisect import bisect_left, insort
+from datetime import datetime
+from itertools import count
+from typing import Optional
+
+from modules.indexed_store import IndexedStore, claim
+
+from .models import Commitment, CommitmentStatus, MeetingRecord
+
+ACTIVE = (CommitmentStatus.PENDING, CommitmentStatus.IN_PROGRESS)
+_NO_DUE = datetime.max                      # Undated commitments sort last
+
+
+class TrackedList(list):
+    """A list that tells its MeetingStore when its membership changes."""
+
+    __slots__ = ("_owner", "_meeting_id")
+
+    def __init__(self, items=(), owner=None, meeting_id: str = ""):
+        super().__init__(items)
+        self._owner = owner
+        self._meeting_id = meeting_id
+
+    def _changed(self):
+        store = self._owner() if self._owner else None
+        if store is not None:
+            store._sync_meeting(self._meeting_id)
+
+    def _wrap(name):
+        def method(self, *args, **kwargs):
+            result = getattr(list, name)(self, *args, **kwargs)
+            self._changed()
+            return result
+        method.__name__ = name
+        return method
+
+    for _name in ("append", "extend", "insert", "remove", "pop", "clear",
+                  "__setitem__", "__delitem__"):
+        locals()[_name] = _wrap(_name)
+    del _name, _wrap
+
+    def __iadd__(self, other):
+        self.extend(other)
+        return self
+
+
+class MeetingStore(IndexedStore):
+    """meeting_id → MeetingRecord, with commitment and participant indexes."""
+
+    def __init__(self, meetings=None):
+        super().__init__()
+        self._seq = count()
+        self._entries = {}          # id(commitment) → (meeting_id, commitment, sort item)
+        self._by_meeting = {}       # meeting_id → {id(commitment): None}
+        self._by_status = {}        # status → {id(commitment): None}
+        self._by_owner = {}         # owner → {id(commitment): None}
+        self._active = []           # sorted [(due, seq, id)] of active commitments
+        self._active_by_owner = {}  # owner → sorted [(due, seq, id)]
+        self._pending = []          # sorted [(due, seq, id)] of pending, for overdue
+        self._by_participant = {}   # lower-case name → {meeting_id: None}
+        self._participants = {}     # meeting_id → names indexed
+        if meetings:
+            self.update(meetings)
+
+    # ── Commitment index ─────────────────────────────────────────
+
+    def _index_commitment(self, meeting_id: str, c: Commitment, seq: Optional[int] = None):
+        key = id(c)
+        item = (c.due_date or _NO_DUE, next(self._seq) if seq is None else seq, key)
+        # Keep what it was indexed under: the object may have changed by unindex time
+        self._entries[key] = (meeting_id, c, item, c.status, c.owner)
+        self._by_meeting.setdefault(meeting_id, {})[key] = None
+        self._by_status.setdefault(c.status, {})[key] = None
+        self._by_owner.setdefault(c.owner, {})[key] = None
+        if c.status in ACTIVE:
+            insort(self._active, item)
+            insort(self._active_by_owner.setdefault(c.owner, []), item)
+        if c.status == CommitmentStatus.PENDING:
+            insort(self._pending, item)
+        claim(self, c)
+
+    def _unindex_commitment(self, key: int) -> Optional[int]:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return None
+        meeting_id, c, item, status, owner = entry
+        self._by_meeting.get(meeting_id, {}).pop(key, None)
+        for index, value in ((self._by_status, status), (self._by_owner, owner)):
+            bucket = index.get(value)
+            if bucket is not None:
+                bucket.pop(key, None)
+                if not bucket:
+                    del index[value]
+        if status in ACTIVE:
+            self._remove(self._active, item)
+            owner_list = self._active_by_owner.get(owner)
+            if owner_list is not None and self._remove(owner_list, item) and not owner_list:
+                del self._active_by_owner[owner]
+        if status == CommitmentStatus.PENDING:
+            self._remove(self._pending, item)
+        return item[1]
+
+    @staticmethod
+    def _remove(items: list, item) -> bool:
+        i = bisect_left(items, item)
+        if i < len(items) and items[i] == item:
+            del items[i]
+            return True
+        return False
+
+    def reindex(self, c: Commitment, attr: Optional[str] = None, value=None):
+        """Called by Commitment when its status, owner or due date changes."""
+        entry = self._entries.get(id(c))
+        if entry is None or entry[1] is not c:
+            return
+        seq = self._unindex_commitment(id(c))
+        self._index_commitment(entry[0], c, seq)
+
+    # ── Meeting index ────────────────────────────────────────────
+
+    def _index(self, meeting_id: str, meeting: MeetingRecord):
+        owner = weakref.ref(self)
+        for attr in ("commitments", "participants"):
+            items = getattr(meeting, attr)
+            if not isinstance(items, TrackedList) or items._owner is None or items._owner() is not self:
+                setattr(meeting, attr, TrackedList(items, owner, meeting_id))
+        self._sync_meeting(meeting_id)
+
+    def _unindex(self, meeting_id: str):
+        for key in list(self._by_meeting.pop(meeting_id, {})):
+            self._unindex_commitment(key)
+        for name in self._participants.pop(meeting_id, ()):
+            bucket = self._by_participant.get(name)
+            if bucket:
+                bucket.pop(meeting_id, None)
+                if not bucket:
+                    del self._by_participant[name]
+
+    def _sync_meeting(self, meeting_id: str):
+        """Bring one meeting's commitments and participants into the indexes."""
+        meeting = dict.get(self, meeting_id)
+        if meeting is None:
+            return
+        current = {id(c): c for c in meeting.commitments}
+        indexed = self._by_meeting.get(meeting_id, {})
+        for key in [k for k in indexed if k not in current]:
+            self._unindex_commitment(key)
+        for key, c in current.items():
+            if key not in indexed:
+                self._index_commitment(meeting_id, c)
+
+        names = {p.name.lower() for p in meeting.participants}
+        old = self._participants.get(meeting_id, set())
+        for name in old - names:
+            bucket = self._by_participant.get(name)
+            if bucket:
+                bucket.pop(meeting_id, None)
+                if not bucket:
+                    del self._by_participant[name]
+        for name in names - old:
+            self._by_participant.setdefault(name, {})[meeting_id] = None
+        self._participants[meeting_id] = names
+
+    # ── Queries ──────────────────────────────────────────────────
+
+    def _pairs(self, items) -> list[tuple[MeetingRecord, Commitment]]:
+        pairs = []
+        for _, _, key in items:
+            meeting_id, c = self._entries[key][:2]
+            pairs.append((self[meeting_id], c))
+        return pairs
+
+    def active(self, owner: str = "") -> list[tuple[MeetingRecord, Commitment]]:
+        """Pending and in-progress commitments, earliest due first, undated last."""
+        return self._pairs(self._active_by_owner.get(owner, []) if owner else self._active)
+
+    def overdue(self, now: Optional[datetime] = None) -> list[tuple[MeetingRecord, Commitment]]:
+        """Pending commitments due before now, earliest first (Commitment.is_overdue)."""
+        now = now or datetime.now()
+        return self._pairs(self._pending[:bisect_left(self._pending, (now,))])
+
+    def count_active(self, owner: str = "") -> int:
+        return len(self._active_by_owner.get(owner, ()) if owner else self._active)
+
+    def count_overdue(self, now: Optional[datetime] = None) -> int:
+        return bisect_left(self._pending, (now or datetime.now(),))
+
+    def with_status(self, status: CommitmentStatus, owner: str = "") -> list[tuple[MeetingRecord, Commitment]]:
+        keys = self._by_status.get(status, {})
+        if owner:
+            keys = [k for k in keys if k in self._by_owner.get(owner, {})]
+        return [(self[self._entries[k][0]], self._entries[k][1]) for k in keys]
+
+    def commitment_count(self) -> int:
+        return len(self._entries)
+
+    def meetings_with(self, person: str) -> list[MeetingRecord]:
+        """Meetings with a participant of this name (case-insensitive), in store order."""
+        name = person.lower()
+        return [self[m] for m in self._by_participant.get(name, ())
+                if any(p.name.lower() == name for p in self[m].participants)]
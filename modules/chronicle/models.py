@@ -11,6 +11,8 @@ from enum import Enum
 from typing import Optional
 import uuid
 
+from modules.indexed_store import IndexedRecord
+
 
 # ── Enums ────────────────────────────────────────────────────────
 
@@ -119,9 +121,15 @@ class Participant:
     email: str = ""
 
 
+# Fields MeetingStore indexes; changing one reindexes the commitment in its store
+INDEXED_FIELDS = frozenset({"status", "owner", "due_date"})
+
+
 @dataclass
-class Commitment:
+class Commitment(IndexedRecord):
     """A commitment extracted from a meeting."""
+    index_fields = INDEXED_FIELDS
+
     commitment_id: str = ""
     text: str = ""
     owner: str = ""            # "mani" or participant name
@@ -0,0 +1,179 @@
+"""
+Chronicle v2 — Transcript Stream
+Incremental commitment, decision and participant extraction from a
+meeting transcript that arrives in chunks (live STT, a chunked upload).
+
+Text is cut at sentence boundaries; the unfinished tail of each chunk is
+carried into the next, so a statement split across chunks is still seen
+whole. Each complete sentence is scanned once and then dropped — only the
+carry and the fingerprints of statements already extracted are held, not
+the transcript. A sentence repeated later (STT re-sends, "as I said, I'll
+send the deck") yields nothing new.
+
+Transcripts with speaker labels ("Sarah Chen: I'll send it") add the
+speaker as a participant, and first-person commitments and decisions are
+owned by the speaker rather than defaulting to Mani.
+
+Almost Magic Tech Lab — Patentable IP
+"""
+
+import logging
+import re
+from typing import Optional
+
+from .meeting_engine import find_commitments
+from .models import DecisionContext, Participant
+
+logger = logging.getLogger("elaine.chronicle.stream")
+
+MAX_CARRY = 2000            # Unpunctuated text longer than this is cut at a space
+HOST_NAMES = {"mani", "mani padisetti"}
+
+_BOUNDARY = re.compile(r"(?<=[.!?])\s+|\s*\n\s*")
+_SPEAKER = re.compile(r"^([A-Z][\w'.-]*(?: [A-Z][\w'.-]*){0,3}):\s+")
+_NOT_SPEAKERS = {"action", "decision", "agreed", "note", "notes", "next steps", "todo", "update",
+                 "summary", "agenda", "re", "q", "a"}
+_NORMALISE = re.compile(r"[\W_]+")
+
+DECISION_PATTERNS = [
+    (r"\b(?:I|we)(?:'ve| have)?\s+decided\b", "speaker"),
+    (r"\bDecision:\s*\S", "mutual"),
+    (r"\bAgreed:\s*\S", "mutual"),
+    (r"\bwe(?:'re| are)?\s+agreed\b|\bwe agree(?:d)?\s+(?:to|that|on)\b", "mutual"),
+    (r"\blet's go with\b|\bwe(?:'re| are) going (?:with|ahead)\b", "mutual"),
+]
+_DECISION = [(re.compile(p, re.I), by) for p, by in DECISION_PATTERNS]
+_DATA_INFORMED = re.compile(r"\b(?:data|numbers|research|analysis|figures)\b", re.I)
+
+
+def fingerprint(text: str) -> str:
+    """Case, punctuation and spacing folded, so re-sent statements compare equal."""
+    return _NORMALISE.sub(" ", text.lower()).strip()
+
+
+class TranscriptStream:
+    """
+    One meeting's live transcript. feed() and finish() return event dicts:
+      {"type": "participant", "name"}
+      {"type": "commitment", "id", "text", "owner", "commitment_type", "mass", "due_date"}
+      {"type": "decision", "id", "text", "made_by"}
+    Items are added to the meeting as they are found.
+    """
+
+    def __init__(self, engine, meeting_id: str):
+        self.engine = engine
+        self.meeting_id = meeting_id
+        self.meeting = engine.meetings[meeting_id]
+        self.speaker = ""               # Last labelled speaker; owns what follows until the next label
+        self._carry = ""
+        self._line_start = True
+        self._seen = {("commitment", fingerprint(c.text)) for c in self.meeting.commitments}
+        self._seen.update(("decision", fingerprint(d.text)) for d in self.meeting.decisions)
+        self._names = {p.name.lower() for p in self.meeting.participants}
+        self.stats = {"chars": 0, "sentences": 0, "commitments": 0, "decisions": 0,
+                      "participants": 0, "duplicates": 0}
+        self._balance = dict(self.meeting.patterns.commitment_balance or {})
+
+    def feed(self, text: str) -> list:
+        self.stats["chars"] += len(text)
+        self._carry += text
+        events = []
+        start = 0
+        for boundary in _BOUNDARY.finditer(self._carry):
+            if boundary.end() == len(self._carry) and "\n" not in boundary.group():
+                break                   # "...deck. " might be "...deck. 5 million" next chunk
+            events += self._sentence(self._carry[start:boundary.start()])
+            self._line_start = "\n" in boundary.group()
+            start = boundary.end()
+        self._carry = self._carry[start:]
+        while len(self._carry) > MAX_CARRY:
+            cut = self._carry.rfind(" ", 0, MAX_CARRY) + 1 or MAX_CARRY
+            events += self._sentence(self._carry[:cut])
+            self._line_start = False
+            self._carry = self._carry[cut:]
+        return events
+
+    def finish(self) -> list:
+        events = self._sentence(self._carry)
+        self._carry = ""
+        logger.info(f"Transcript stream for {self.meeting.title}: {self.stats}")
+        return events
+
+    # ── Per sentence ─────────────────────────────────────────────
+
+    def _sentence(self, sentence: str) -> list:
+        sentence = sentence.strip()
+        if not sentence:
+            return []
+        self.stats["sentences"] += 1
+        events = []
+        if self._line_start:
+            label = _SPEAKER.match(sentence)
+            if label and label.group(1).lower() not in _NOT_SPEAKERS:
+                self.speaker = label.group(1)
+                sentence = sentence[label.end():]
+                events += self._participant(self.speaker)
+        events += self._commitments(sentence)
+        events += self._decisions(sentence)
+        return events
+
+    def _speaker_owner(self) -> Optional[str]:
+        if self.speaker and self.speaker.lower() not in HOST_NAMES:
+            return self.speaker
+        return None
+
+    def _is_new(self, kind: str, text: str) -> bool:
+        key = (kind, fingerprint(text))
+        if key in self._seen:
+            self.stats["duplicates"] += 1
+            return False
+        self._seen.add(key)
+        return True
+
+    def _participant(self, name: str) -> list:
+        if name.lower() in self._names:
+            return []
+        self._names.add(name.lower())
+        role = "host" if name.lower() in HOST_NAMES else ""
+        self.meeting.participants.append(Participant(name=name, role=role))
+        self.stats["participants"] += 1
+        return [{"type": "participant", "name": name}]
+
+    def _commitments(self, sentence: str) -> list:
+        events = []
+        for c in find_commitments(sentence):
+            if not self._is_new("commitment", c.text):
+                continue
+            if c.owner == "mani" and self._speaker_owner():
+                c.owner = self._speaker_owner()
+            self.meeting.commitments.append(c)
+            side = "mani" if c.owner == "mani" else "other"
+            self._balance[side] = self._balance.get(side, 0) + 1
+            self.meeting.patterns.commitment_balance = dict(self._balance)
+            self.stats["commitments"] += 1
+            events.append({
+                "type": "commitment", "id": c.commitment_id, "text": c.text, "owner": c.owner,
+                "commitment_type": c.commitment_type.value, "mass": c.default_mass,
+                "due_date": c.due_date.isoformat() if c.due_date else None,
+            })
+        return events
+
+    def _decisions(self, sentence: str) -> list:
+        for pattern, made_by in _DECISION:
+            match = pattern.search(sentence)
+            if match:
+                break
+        else:
+            return []
+        if not self._is_new("decision", sentence):
+            return []
+        if made_by == "speaker":
+            we = match.group().lower().startswith("we")
+            made_by = "mutual" if we else self._speaker_owner() or "mani"
+        decision = self.engine.add_decision(
+            self.meeting_id, sentence, made_by, DecisionContext.COLLABORATIVE,
+            data_informed=bool(_DATA_INFORMED.search(sentence)),
+        )
+        self.stats["decisions"] += 1
+        return [{"type": "decision", "id": decision.decision_id, "text": decision.text,
+                 "made_by": decision.made_by}]
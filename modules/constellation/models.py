@@ -8,8 +8,11 @@ from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
 from typing import Optional
+import os
 import uuid
 
+from modules.indexed_store import IndexedRecord
+
 
 # ── Enums ──────────────────────────────────────────────────────────
 
@@ -73,7 +76,8 @@ class DiscoverySource(Enum):
 @dataclass
 class TrustTransaction:
     """A single deposit or withdrawal from a trust account."""
-    id: str = field(default_factory=lambda: f"tx_{uuid.uuid4().hex[:8]}")
+    # Same 32 random bits uuid4().hex[:8] kept, without building a UUID (weekly decay makes one per POI)
+    id: str = field(default_factory=lambda: f"tx_{os.urandom(4).hex()}")
     date: datetime = field(default_factory=datetime.now)
     amount: float = 0.0
     transaction_type: TrustTransactionType = TrustTransactionType.MANUAL_ADJUSTMENT
@@ -222,12 +226,18 @@ class NetworkConnection:
 
 # ── The POI Record ─────────────────────────────────────────────────
 
+# Fields POIStore indexes; changing one reindexes the record in its store
+INDEXED_FIELDS = frozenset({"name", "email", "company", "tier"})
+
+
 @dataclass
-class POIRecord:
+class POIRecord(IndexedRecord):
     """
     Person of Interest — the core entity in the Constellation.
     Auto-discovered, auto-enriched, trust-tracked.
     """
+    index_fields = INDEXED_FIELDS
+
     poi_id: str = field(default_factory=lambda: f"poi_{uuid.uuid4().hex[:8]}")
 
     # Identity
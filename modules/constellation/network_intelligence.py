@@ -12,6 +12,8 @@ from dataclasses import dataclass, field
 from typing import Optional
 
 from .models import POIRecord, POITier, NetworkConnection
+from .poi_index import POIStore
+from .relationship_graph import MAX_HOPS, RelationshipGraph
 
 logger = logging.getLogger("elaine.constellation.network")
 
@@ -29,6 +31,18 @@ class NetworkOpportunity:
     rationale: str = ""
     action: str = ""
     prerequisites: list[str] = field(default_factory=list)
+    path: list[str] = field(default_factory=list)  # Names, source POI first
+    hops: int = 1
+
+
+@dataclass
+class IntroPath:
+    """A chain of introductions from someone Mani knows to a target."""
+    target_name: str
+    path: list[str]          # Names, first is the person Mani asks
+    poi_ids: list[str]       # POI ids along the path (target omitted if not a POI)
+    probability: float
+    hops: int
 
 
 @dataclass
@@ -49,20 +63,73 @@ class NetworkIntelligence:
     """
 
     def __init__(self):
-        pass
-
-    def find_opportunities(self, pois: dict[str, POIRecord]) -> list[NetworkOpportunity]:
+        self._graph: Optional[RelationshipGraph] = None
+
+    # ── Relationship Graph ───────────────────────────────────────
+
+    def graph(self, pois: dict[str, POIRecord]) -> RelationshipGraph:
+        """The adjacency index for this POI dict, synced with any changes since last use."""
+        if self._graph is None or self._graph.pois is not pois:
+            self._graph = RelationshipGraph(pois)
+        self._graph.sync()
+        return self._graph
+
+    @staticmethod
+    def _can_ask(poi: POIRecord) -> bool:
+        """Strong, healthy relationships are the ones Mani can ask for intros."""
+        return (poi.tier in (POITier.INNER_CIRCLE, POITier.ACTIVE_NETWORK)
+                and poi.trust_account.health not in ("at_risk", "cold"))
+
+    def _best_paths(self, pois: dict[str, POIRecord], max_hops: int):
+        graph = self.graph(pois)
+        sources = [pid for pid, poi in pois.items() if self._can_ask(poi)]
+        return graph, graph.best_paths(
+            sources, lambda pid: self._calculate_intro_probability(pois[pid], None), max_hops)
+
+    def find_intro_paths(self, pois: dict[str, POIRecord], target: str,
+                         max_hops: int = MAX_HOPS, limit: int = 3) -> list[IntroPath]:
+        """
+        Most probable introduction chains to a person (name or POI id), at most
+        max_hops introductions long, one per final introducer, best first.
+        """
+        graph, best = self._best_paths(pois, max_hops - 1)
+        key = graph.node(target)
+        if key in pois:
+            target_name = pois[key].name
+        else:                                       # Spelled as whoever knows them recorded it
+            target_name = next((c.name for pid in graph.neighbours(key) for t, c in graph.edges(pid)
+                                if t == key and c is not None), target)
+        paths = []
+        for introducer in graph.neighbours(key):
+            if introducer not in best or introducer not in pois or key in best[introducer][1]:
+                continue
+            prob, path = best[introducer]
+            prob *= self._calculate_intro_probability(pois[introducer], None)
+            paths.append(IntroPath(
+                target_name=target_name,
+                path=[pois[p].name for p in path] + [target_name],
+                poi_ids=path + ([key] if key in pois else []),
+                probability=round(prob, 3),
+                hops=len(path),
+            ))
+        return sorted(paths, key=lambda p: (-p.probability, p.hops))[:limit]
+
+    # ── Opportunities ────────────────────────────────────────────
+
+    def find_opportunities(self, pois: dict[str, POIRecord],
+                           max_hops: int = 1) -> list[NetworkOpportunity]:
         """
         Detect warm introduction opportunities through existing POI connections.
+        With max_hops > 1, valuable connections of weaker or indirect contacts
+        are reached through the most probable chain of introductions.
         """
         opportunities = []
+        if not isinstance(pois, POIStore):
+            pois = POIStore(pois, track=False)      # One index build instead of a scan per connection
 
         for poi in pois.values():
-            if poi.tier not in (POITier.INNER_CIRCLE, POITier.ACTIVE_NETWORK):
-                continue  # Only leverage strong relationships
-
-            if poi.trust_account.health in ("at_risk", "cold"):
-                continue  # Don't ask favours from cooling relationships
+            if not self._can_ask(poi):
+                continue  # Only leverage strong, healthy relationships
 
             for connection in poi.known_connections:
                 # Check if connection is already a POI
@@ -85,11 +152,57 @@ class NetworkIntelligence:
                         rationale=f"Known connection of {poi.name}",
                         action=self._suggest_intro_action(poi, connection, probability),
                         prerequisites=self._get_prerequisites(poi),
+                        path=[poi.name, connection.name],
                     ))
 
+        if max_hops > 1:
+            opportunities += self._multi_hop_opportunities(
+                pois, max_hops, {o.target_name.lower().strip() for o in opportunities})
+
         return sorted(opportunities, key=lambda o: o.estimated_value * o.warm_intro_probability, reverse=True)
 
-    def _calculate_intro_probability(self, poi: POIRecord, connection: NetworkConnection) -> float:
+    def _multi_hop_opportunities(self, pois, max_hops: int, covered: set) -> list[NetworkOpportunity]:
+        """Valuable connections reachable only through two or more introductions."""
+        graph, best = self._best_paths(pois, max_hops - 1)
+        targets = {}
+        for introducer_id, (prob, path) in best.items():
+            if len(path) < 2 or introducer_id not in pois:
+                continue
+            introducer = pois[introducer_id]
+            step = prob * self._calculate_intro_probability(introducer, None)
+            for target, connection in graph.edges(introducer_id):
+                if connection is None or connection.estimated_value <= 5000 or target in path:
+                    continue
+                name = connection.name.lower().strip()
+                existing = pois.get(target)
+                if name in covered or (existing and existing.tier.value <= 2):
+                    continue
+                if step > targets.get(name, (0.0,))[0]:
+                    targets[name] = (step, path, connection)
+
+        opportunities = []
+        for step, path, connection in targets.values():
+            source = pois[path[0]]
+            names = [pois[p].name for p in path] + [connection.name]
+            opportunities.append(NetworkOpportunity(
+                source_poi_id=source.poi_id,
+                source_poi_name=source.name,
+                target_name=connection.name,
+                target_company=connection.relationship_to_poi,
+                relationship=connection.relationship_to_poi,
+                warm_intro_probability=round(step, 3),
+                estimated_value=connection.estimated_value,
+                rationale=f"Reachable via {' → '.join(names[1:-1])}",
+                action=f"Ask {source.name} to introduce you to {names[1]}, "
+                       f"then on to {connection.name}",
+                prerequisites=self._get_prerequisites(source),
+                path=names,
+                hops=len(path),
+            ))
+        return opportunities
+
+    def _calculate_intro_probability(self, poi: POIRecord,
+                                     connection: Optional[NetworkConnection]) -> float:
         """Estimate probability that POI will make an introduction."""
         base = 0.5
 
@@ -126,6 +239,8 @@ class NetworkIntelligence:
         return prereqs
 
     def _find_poi_by_name(self, pois: dict[str, POIRecord], name: str) -> Optional[POIRecord]:
+        if isinstance(pois, POIStore):
+            return pois.find_by_name(name)
         name_lower = name.lower().strip()
         for poi in pois.values():
             if poi.name.lower().strip() == name_lower:
@@ -206,12 +321,20 @@ class NetworkIntelligence:
         if len(referrers) < 2:
             gaps.append("Few active referrers — cultivate referral relationships")
 
+        # Best-connected people (cached until the graph changes)
+        centrality = self.graph(pois).centrality()
+        connectors = sorted((pid for pid in centrality if centrality[pid]["degree"]),
+                            key=lambda pid: centrality[pid]["reach"], reverse=True)[:5]
+
         return {
             "total_active": len(active),
             "concentration_pct": concentration_pct,
             "top_3_by_value": [{"name": p.name, "value": p.economics.direct_value} for p in by_value[:3]],
             "gaps": gaps,
             "referrer_count": len(referrers),
+            "top_connectors": [
+                {"poi_id": pid, "name": pois[pid].name, **centrality[pid]} for pid in connectors
+            ],
             "avg_trust_tier1": round(
                 sum(p.trust_account.balance for p in active if p.tier == POITier.INNER_CIRCLE)
                 / max(tier_1_count, 1), 1
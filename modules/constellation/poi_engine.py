@@ -10,12 +10,15 @@ Almost Magic Tech Lab — Patentable IP
 
 import logging
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Iterable, Optional
+
+from modules.indexed_store import StoreAttribute
 
 from .models import (
     POIRecord, POITier, TierTrend, DiscoverySource,
     TrustAccount, TrustTransactionType,
 )
+from .poi_index import POIStore
 from .trust_ledger import TrustLedger
 
 logger = logging.getLogger("elaine.constellation.poi")
@@ -27,8 +30,18 @@ class POIEngine:
     Auto-discovers and ranks people from multi-channel activity.
     """
 
+    SIGNAL_HANDLERS = {
+        "email": "process_email_signal",
+        "calendar": "process_calendar_signal",
+        "chronicle": "process_chronicle_signal",
+        "content": "process_content_signal",
+        "voice_agent": "process_voice_agent_signal",
+    }
+
+    pois = StoreAttribute(POIStore)         # poi_id → POIRecord
+
     def __init__(self):
-        self.pois: dict[str, POIRecord] = {}
+        self.pois = POIStore()
         self.trust_ledger = TrustLedger()
         self._discovery_log: list[dict] = []
 
@@ -41,17 +54,24 @@ class POIEngine:
         source: DiscoverySource = DiscoverySource.EMAIL,
         **kwargs,
     ) -> POIRecord:
-        """Get existing POI by email or create new. Zero-input."""
+        """
+        Get existing POI by email, exact name, or a close spelling of the
+        name (when the emails can't contradict it), or create new. Zero-input.
+        """
         if email:
-            for poi in self.pois.values():
-                if poi.email.lower() == email.lower():
-                    return poi
-
-        name_lower = name.lower().strip()
-        for poi in self.pois.values():
-            if poi.name.lower().strip() == name_lower:
+            poi = self.pois.find_by_email(email)
+            if poi:
                 return poi
 
+        poi = self.pois.find_by_name(name)
+        if poi:
+            return poi
+
+        poi = self.pois.find_similar(name)
+        if poi and not (email and poi.email):
+            logger.debug(f"Matched {name!r} to existing POI {poi.name!r}")
+            return poi
+
         poi = POIRecord(
             name=name, email=email, discovery_source=source,
             auto_discovered=True, **kwargs,
@@ -71,7 +91,9 @@ class POIEngine:
         self, query: str = "", tier: Optional[POITier] = None,
         company: str = "", min_trust: Optional[float] = None,
     ) -> list[POIRecord]:
-        results = list(self.pois.values())
+        results = self.pois.candidates(query=query, tier=tier, company=company)
+        if results is None:
+            results = list(self.pois.values())
         if query:
             q = query.lower()
             results = [p for p in results if q in p.name.lower()
@@ -141,12 +163,50 @@ class POIEngine:
         logger.info(f"Voice agent lead captured: {visitor_name} ({company})")
         return poi
 
+    def ingest_signals(self, signals: Iterable[dict]) -> dict:
+        """
+        Process a batch of signals — e.g. a whole mailbox sync — in one call.
+
+        Each signal is {"type": "email"|"calendar"|"chronicle"|"content"|
+        "voice_agent", **arguments of the matching process_*_signal}.
+        Bad signals are counted and skipped, not raised.
+        """
+        before = len(self.pois)
+        by_type: dict[str, int] = {}
+        touched = set()
+        errors = []
+        for signal in signals:
+            if not isinstance(signal, dict):
+                errors.append({"signal": signal, "error": "Signal must be an object"})
+                continue
+            kind = signal.get("type", "email")
+            handler = self.SIGNAL_HANDLERS.get(kind)
+            if not handler:
+                errors.append({"signal": signal, "error": f"Unknown signal type: {kind}"})
+                continue
+            try:
+                poi = getattr(self, handler)(**{k: v for k, v in signal.items() if k != "type"})
+            except (TypeError, ValueError) as e:
+                errors.append({"signal": signal, "error": str(e)})
+                continue
+            touched.add(poi.poi_id)
+            by_type[kind] = by_type.get(kind, 0) + 1
+        if errors:
+            logger.warning(f"Signal batch: {len(errors)} signals skipped")
+        return {
+            "processed": sum(by_type.values()),
+            "created": len(self.pois) - before,
+            "pois_touched": len(touched),
+            "by_type": by_type,
+            "errors": errors[:20],
+            "error_count": len(errors),
+        }
+
     # ── Tier Recalculation ───────────────────────────────────────
 
-    def recalculate_all_tiers(self):
-        """Recalculate tiers for all POIs."""
-        for poi in self.pois.values():
-            self.trust_ledger.recalculate_tier(poi)
+    def recalculate_all_tiers(self) -> int:
+        """Recalculate tiers for all POIs. Returns how many changed."""
+        return self.trust_ledger.recalculate_all_tiers(self.pois)
 
     # ── Decay Processing ─────────────────────────────────────────
 
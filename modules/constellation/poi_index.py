@@ -0,0 +1,244 @@
+"""
+POI Index
+Secondary indexes over the POI store so signal processing and search stay
+O(matches) instead of O(POIs).
+
+POIStore is the dict POIEngine keeps its records in. It indexes each record
+by normalised email, full name, name/company/email tokens, company and
+tier, plus a phonetic blocking key (first initial + Soundex of the surname)
+for fuzzy name matching. Records tell their store when an indexed field
+changes (POIRecord is an IndexedRecord), so `poi.company = ...` or a tier
+recalculation keeps the indexes current. Index hits are candidates only:
+callers re-check the real predicate, so an index can narrow a scan but
+never change its answer.
+
+Almost Magic Tech Lab — Patentable IP
+"""
+
+import itertools
+import re
+from difflib import SequenceMatcher
+from typing import Iterable, Optional
+
+from modules.indexed_store import IndexedStore, claim
+
+from .models import POIRecord, POITier
+
+FUZZY_MATCH = 0.9           # SequenceMatcher ratio for "same person, different spelling"
+
+_TOKEN = re.compile(r"[^\W_]+")
+_SOUNDEX = {c: code for code, letters in (("1", "bfpv"), ("2", "cgjkqsxz"), ("3", "dt"),
+                                          ("4", "l"), ("5", "mn"), ("6", "r"))
+            for c in letters}
+
+
+def normalise_email(email: str) -> str:
+    return (email or "").strip().lower()
+
+
+def normalise_name(name: str) -> str:
+    return (name or "").lower().strip()
+
+
+def tokens(text: str) -> list[str]:
+    return _TOKEN.findall((text or "").lower())
+
+
+def soundex(word: str) -> str:
+    word = "".join(c for c in word.lower() if "a" <= c <= "z")
+    if not word:
+        return ""
+    digits, last = [], _SOUNDEX.get(word[0], "")
+    for c in word[1:]:
+        if c in "hw":
+            continue                            # h/w don't separate equal codes; vowels do
+        code = _SOUNDEX.get(c, "")
+        if code and code != last:
+            digits.append(code)
+        last = code
+    return (word[0].upper() + "".join(digits) + "000")[:4]
+
+
+def blocking_key(name: str) -> str:
+    """
+    First initial + Soundex of the last alphabetic token ("Jon Smyth" → "jS530"),
+    plus any numeric tokens, which must match exactly ("Team 2" is not "Team 3").
+    """
+    toks = tokens(name)
+    words = [t for t in toks if t.isalpha()]
+    if len(words) < 2:
+        return ""                               # A lone first name is too ambiguous to fuzz
+    return " ".join([words[0][0] + soundex(words[-1])] + [t for t in toks if not t.isalpha()])
+
+
+class POIStore(IndexedStore):
+    """poi_id → POIRecord, with secondary indexes kept in step with every write."""
+
+    def __init__(self, records=None, track: bool = True):
+        """
+        Args:
+            track: register as the records' owner so later field edits reindex.
+                   A short-lived store built for one lookup pass uses False.
+        """
+        super().__init__()
+        self._track = track
+        self._keys = {}                         # poi_id → keys currently indexed
+        self._position = {}                     # poi_id → insertion sequence, so hits come back in dict order
+        self._sequence = itertools.count()
+        self._by_email = {}
+        self._by_name = {}
+        self._by_token = {}
+        self._by_company = {}
+        self._by_tier = {}
+        self._by_block = {}
+        if records:
+            self.update(records)
+
+    # ── Index maintenance ────────────────────────────────────────
+
+    @staticmethod
+    def _add(index, key, poi_id):
+        if key:
+            index.setdefault(key, {})[poi_id] = None    # dict as an ordered set
+
+    @staticmethod
+    def _discard(index, key, poi_id):
+        if key and key in index:
+            bucket = index[key]
+            bucket.pop(poi_id, None)
+            if not bucket:
+                del index[key]
+
+    def _index(self, poi_id: str, poi: POIRecord):
+        keys = (
+            normalise_email(poi.email),
+            normalise_name(poi.name),
+            frozenset(tokens(poi.name) + tokens(poi.company) + tokens(poi.email)),
+            (poi.company or "").lower(),
+            poi.tier,
+            blocking_key(poi.name),
+        )
+        self._keys[poi_id] = keys
+        if poi_id not in self._position:
+            self._position[poi_id] = next(self._sequence)
+        email, name, toks, company, tier, block = keys
+        self._add(self._by_email, email, poi_id)
+        self._add(self._by_name, name, poi_id)
+        for token in toks:
+            self._add(self._by_token, token, poi_id)
+        self._add(self._by_company, company, poi_id)
+        self._add(self._by_tier, tier, poi_id)
+        self._add(self._by_block, block, poi_id)
+        if self._track:
+            claim(self, poi)
+
+    def _unindex(self, poi_id: str):
+        if poi_id not in self:
+            self._position.pop(poi_id, None)    # Removed, not replaced: a re-add goes to the end
+        keys = self._keys.pop(poi_id, None)
+        if keys is None:
+            return
+        email, name, toks, company, tier, block = keys
+        self._discard(self._by_email, email, poi_id)
+        self._discard(self._by_name, name, poi_id)
+        for token in toks:
+            self._discard(self._by_token, token, poi_id)
+        self._discard(self._by_company, company, poi_id)
+        self._discard(self._by_tier, tier, poi_id)
+        self._discard(self._by_block, block, poi_id)
+
+    def reindex(self, poi: POIRecord, attr: Optional[str] = None, value=None):
+        """Called by POIRecord when name, email, company or tier changes."""
+        poi_id = poi.poi_id
+        if dict.get(self, poi_id) is not poi:
+            # Stored under a key other than its poi_id — rare, so a scan is fine
+            poi_id = next((k for k, v in self.items() if v is poi), None)
+            if poi_id is None:
+                return
+        if attr == "tier" and poi_id in self._keys:
+            # Tier moves on every recalculation; only its own index needs touching
+            keys = self._keys[poi_id]
+            self._discard(self._by_tier, keys[4], poi_id)
+            self._add(self._by_tier, poi.tier, poi_id)
+            self._keys[poi_id] = keys[:4] + (poi.tier,) + keys[5:]
+            return
+        self._unindex(poi_id)
+        self._index(poi_id, poi)
+
+    # ── Lookups ──────────────────────────────────────────────────
+
+    def _records(self, ids: Iterable[str]) -> list[POIRecord]:
+        return [self[i] for i in ids if i in self]
+
+    def find_by_email(self, email: str) -> Optional[POIRecord]:
+        key = normalise_email(email)
+        for poi in self._records(self._by_email.get(key, ())):
+            if normalise_email(poi.email) == key:
+                return poi
+        return None
+
+    def find_by_name(self, name: str) -> Optional[POIRecord]:
+        key = normalise_name(name)
+        for poi in self._records(self._by_name.get(key, ())):
+            if normalise_name(poi.name) == key:
+                return poi
+        return None
+
+    def find_similar(self, name: str, threshold: float = FUZZY_MATCH) -> Optional[POIRecord]:
+        """Best fuzzy name match within the name's phonetic block, if any clears threshold."""
+        block = blocking_key(name)
+        if not block:
+            return None
+        target = normalise_name(name)
+        best, best_score = None, threshold
+        for poi in self._records(self._by_block.get(block, ())):
+            score = SequenceMatcher(None, target, normalise_name(poi.name)).ratio()
+            if score >= best_score:
+                best, best_score = poi, score
+        return best
+
+    def candidates(self, query: str = "", tier: Optional[POITier] = None,
+                   company: str = "") -> Optional[list[POIRecord]]:
+        """
+        Records that could match a search_pois() filter, in store order, or
+        None when no filter narrows the set (the caller then scans everything).
+        """
+        postings = []
+        if tier:
+            postings.append(self._by_tier.get(tier, {}))
+        if company:
+            needle = company.lower()
+            postings.append(self._union(self._by_company, needle))
+        if query:
+            # Any substring of a field contains each of the query's runs of
+            # letters/digits inside a single field token
+            runs = tokens(query)
+            if runs:
+                postings.append(self._union(self._by_token, max(runs, key=len)))
+        if not postings:
+            return None
+        postings.sort(key=len)
+        rest = postings[1:]
+        ids = [i for i in postings[0] if all(i in posting for posting in rest)]
+        # Postings are ordered by when an id joined that key, not by store order
+        ids.sort(key=self._position.__getitem__)
+        return self._records(ids)
+
+    @staticmethod
+    def _union(index, needle: str) -> dict:
+        """Postings of every key containing needle (the key vocabulary is far smaller than the store)."""
+        ids = {}
+        for key, bucket in index.items():
+            if needle in key:
+                ids.update(bucket)
+        return ids
+
+    def stats(self) -> dict:
+        return {
+            "pois": len(self),
+            "emails": len(self._by_email),
+            "names": len(self._by_name),
+            "tokens": len(self._by_token),
+            "companies": len(self._by_company),
+            "blocks": len(self._by_block),
+        }
@@ -0,0 +1,191 @@
+"""
+Portfolio View
+Columnar snapshot of the POI portfolio for whole-constellation passes.
+
+Weekly decay, tier recalculation, trust alerts and the portfolio summary
+all read the same handful of numbers per POI. PortfolioView pulls them
+into columns in one pass (balance, days since interaction, decay rate
+factors, tier), does the arithmetic column-wise — with NumPy when it is
+installed, plain lists otherwise — and hands back only the records whose
+state actually changes, so the ledger writes back a fraction of the
+portfolio instead of touching every POIRecord.
+
+Almost Magic Tech Lab — Patentable IP
+"""
+
+from datetime import datetime, timedelta
+from functools import cached_property
+from typing import Optional
+
+from .models import POIRecord, POITier, TrustTransactionType
+
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+REFERRAL_TYPES = (TrustTransactionType.REFERRAL_MADE, TrustTransactionType.REFERRAL_RECEIVED)
+REFERRAL_WINDOW_DAYS = 90
+
+# Codes shared by both backends: index into these tuples
+HEALTH = ("healthy", "cooling", "at_risk", "cold")
+FREQUENCY = ("weekly", "monthly", "quarterly", "rare")
+
+
+def _recent_referral(transactions, now: datetime) -> bool:
+    """Same test as TrustAccount.effective_decay_rate, newest first.
+
+    The ledger appends transactions in date order, so the scan stops at the
+    first one older than the window instead of walking the whole history.
+    """
+    cutoff = now - timedelta(days=REFERRAL_WINDOW_DAYS + 1)
+    for t in reversed(transactions):
+        if t.date <= cutoff:
+            break
+        if t.transaction_type in REFERRAL_TYPES and (now - t.date).days <= REFERRAL_WINDOW_DAYS:
+            return True
+    return False
+
+
+class PortfolioView:
+    """One column per attribute, row i ↔ self.records[i]."""
+
+    def __init__(self, pois: dict[str, POIRecord], now: Optional[datetime] = None,
+                 use_numpy: Optional[bool] = None):
+        self.now = now or datetime.now()
+        self.numpy = HAS_NUMPY if use_numpy is None else (use_numpy and HAS_NUMPY)
+        self.records = list(pois.values())
+
+    # Columns are pulled from the records on first use, so a pass that only
+    # needs balances never reads interaction dates or transactions.
+
+    def _column(self, values, dtype=float):
+        return np.fromiter(values, dtype=dtype, count=len(self.records)) if self.numpy else list(values)
+
+    @cached_property
+    def balance(self):
+        return self._column(p.trust_account.balance for p in self.records)
+
+    @cached_property
+    def days(self):
+        now = self.now
+        return self._column((now - (p.trust_account.last_interaction or p.discovered_at)).days
+                            for p in self.records)
+
+    @cached_property
+    def interacted(self):
+        return self._column((p.trust_account.last_interaction is not None for p in self.records), bool)
+
+    @cached_property
+    def rate(self):
+        """TrustAccount.effective_decay_rate per row."""
+        now = self.now
+        accounts = [p.trust_account for p in self.records]
+        base = self._column(a.decay_rate for a in accounts)
+        age = self._column(a.relationship_age_months for a in accounts)
+        referral = self._column((bool(a.transactions) and _recent_referral(a.transactions, now)
+                                 for a in accounts), bool)
+        if self.numpy:
+            return (base * np.where(age > 12, 0.5, np.where(age < 3, 2.0, 1.0))
+                    * np.where(referral, 0.3, 1.0))
+        return [r * (0.5 if a > 12 else 2.0 if a < 3 else 1.0) * (0.3 if ref else 1.0)
+                for r, a, ref in zip(base, age, referral)]
+
+    @cached_property
+    def tier(self):
+        return self._column((p.tier.value for p in self.records), int)
+
+    @cached_property
+    def pinned(self):
+        return self._column((p.pinned_tier for p in self.records), bool)
+
+    def __len__(self):
+        return len(self.records)
+
+    # ── Derived columns ──────────────────────────────────────────
+
+    def health_codes(self, balance=None):
+        """Index into HEALTH for each row (TrustAccount.health thresholds)."""
+        balance = self.balance if balance is None else balance
+        if self.numpy:
+            return np.where(balance > 30, 0, np.where(balance > 15, 1, np.where(balance > 5, 2, 3)))
+        return [0 if b > 30 else 1 if b > 15 else 2 if b > 5 else 3 for b in balance]
+
+    def frequency_codes(self):
+        """Index into FREQUENCY for each row (POIRecord.interaction_frequency)."""
+        if self.numpy:
+            d = self.days
+            return np.where(d <= 7, 0, np.where(d <= 30, 1, np.where(d <= 90, 2, 3)))
+        return [0 if d <= 7 else 1 if d <= 30 else 2 if d <= 90 else 3 for d in self.days]
+
+    # ── Passes ───────────────────────────────────────────────────
+
+    def decay(self) -> list[tuple[int, float, float, float]]:
+        """
+        Rows that decay: (row, amount, weeks, rate), as TrustLedger.apply_decay
+        would compute them. Updates self.balance in place.
+        """
+        if self.numpy:
+            weeks = self.days / 7
+            amount = self.rate * weeks
+            rows = np.flatnonzero(self.interacted & (weeks >= 1) & (amount > 0))
+            self.balance[rows] -= amount[rows]
+            return list(zip(rows.tolist(), amount[rows].tolist(),
+                            weeks[rows].tolist(), self.rate[rows].tolist()))
+        changes = []
+        interacted = self.interacted
+        rows = [i for i, d in enumerate(self.days) if d >= 7 and interacted[i]]
+        rates = self.rate if rows else ()
+        for i in rows:
+            weeks, rate = self.days[i] / 7, rates[i]
+            if rate * weeks > 0:
+                changes.append((i, rate * weeks, weeks, rate))
+                self.balance[i] -= rate * weeks
+        return changes
+
+    def recalculated_tiers(self) -> list[int]:
+        """New POITier value per row (TrustLedger.recalculate_tier rules)."""
+        freq = self.frequency_codes()
+        if self.numpy:
+            b = self.balance
+            tiers = np.where((b >= 60) & (freq == 0), 1,
+                             np.where((b >= 30) & (freq <= 1), 2,
+                                      np.where((b >= 10) & (freq <= 2), 3, 4)))
+            return np.where(self.pinned, self.tier, tiers).tolist()
+        return [old if pin else 1 if b >= 60 and f == 0 else 2 if b >= 30 and f <= 1
+                else 3 if b >= 10 and f <= 2 else 4
+                for b, f, old, pin in zip(self.balance, freq, self.tier, self.pinned)]
+
+    def unhealthy_rows(self) -> list[tuple[int, int]]:
+        """(row, health code) for every row that is not healthy, in portfolio order."""
+        codes = self.health_codes()
+        if self.numpy:
+            rows = np.flatnonzero(codes != 0)
+            return list(zip(rows.tolist(), codes[rows].tolist()))
+        return [(i, c) for i, c in enumerate(codes) if c != 0]
+
+    def tier_stats(self, healthy_threshold: float) -> dict:
+        """Per-tier count and balance sum, cooling count, total gap to healthy."""
+        codes = self.health_codes()
+        tiers = [t.value for t in POITier]
+        if self.numpy:
+            counts = np.bincount(self.tier, minlength=max(tiers) + 1)
+            sums = np.bincount(self.tier, weights=self.balance, minlength=max(tiers) + 1)
+            unhealthy = codes != 0
+            return {
+                "count": {t: int(counts[t]) for t in tiers},
+                "sum": {t: float(sums[t]) for t in tiers},
+                "cooling": int(unhealthy.sum()),
+                "debt": float(np.maximum(0, healthy_threshold - self.balance[unhealthy]).sum()),
+            }
+        count = {t: 0 for t in tiers}
+        total = {t: 0.0 for t in tiers}
+        cooling, debt = 0, 0.0
+        for t, b, c in zip(self.tier, self.balance, codes):
+            count[t] += 1
+            total[t] += b
+            if c != 0:
+                cooling += 1
+                debt += max(0, healthy_threshold - b)
+        return {"count": count, "sum": total, "cooling": cooling, "debt": debt}
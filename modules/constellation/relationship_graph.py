@@ -0,0 +1,195 @@
+"""
+Relationship Graph
+Adjacency index over POI connections for multi-hop warm-intro search.
+
+Nodes are POI ids, plus "name:<name>" keys for people known only as a
+NetworkConnection. Edges come from each POI's known_connections and
+referral links. Edges carry structure only; the probability that a POI
+makes an introduction depends on that POI's trust with Mani, so it is
+computed at search time and a weekly decay never forces a rebuild.
+
+The graph is synced incrementally: each POI has a cheap signature (name,
+connection and referral counts), and only POIs whose signature changed —
+plus those whose connections pointed at a renamed, added or removed
+person — are re-linked.
+
+Almost Magic Tech Lab — Patentable IP
+"""
+
+import logging
+from typing import Callable, Optional
+
+from .models import NetworkConnection, POIRecord
+
+logger = logging.getLogger("elaine.constellation.graph")
+
+MAX_HOPS = 3
+
+
+def _norm(name: str) -> str:
+    return (name or "").lower().strip()
+
+
+def name_key(name: str) -> str:
+    return f"name:{_norm(name)}"
+
+
+class RelationshipGraph:
+    """Adjacency lists keyed by POI id, kept in step with a POI dict by sync()."""
+
+    def __init__(self, pois: dict[str, POIRecord]):
+        self.pois = pois
+        self.version = 0
+        self._signatures = {}       # poi_id → signature at last link
+        self._edges = {}            # poi_id → [(target key, NetworkConnection | None)]
+        self._referrers = {}        # target key → {poi_id: None} that link to it
+        self._names = {}            # normalised name → first poi_id with it
+        self._centrality = None     # (version, scores)
+
+    # ── Maintenance ──────────────────────────────────────────────
+
+    @staticmethod
+    def _signature(poi: POIRecord) -> tuple:
+        return (_norm(poi.name), len(poi.known_connections),
+                len(poi.referrals_made), len(poi.referrals_received))
+
+    def invalidate(self):
+        """Forget everything (e.g. after editing a connection in place)."""
+        self._signatures.clear()
+        self._edges.clear()
+        self._referrers.clear()
+        self._names.clear()
+        self.version += 1
+
+    def sync(self) -> int:
+        """Re-link POIs that changed since the last sync. Returns how many."""
+        pois = self.pois
+        dirty = set()
+        names_changed = set()
+
+        for poi_id in [p for p in self._signatures if p not in pois]:
+            names_changed.add(self._signatures.pop(poi_id)[0])
+            self._unlink(poi_id)
+            dirty.update(self._referrers.get(poi_id, ()))
+
+        for poi_id, poi in pois.items():
+            signature = self._signature(poi)
+            old = self._signatures.get(poi_id)
+            if old == signature:
+                continue
+            if old is None or old[0] != signature[0]:
+                names_changed.add(signature[0])
+                if old is not None:
+                    names_changed.add(old[0])
+                    dirty.update(self._referrers.get(poi_id, ()))
+            self._signatures[poi_id] = signature
+            dirty.add(poi_id)
+
+        if names_changed:
+            self._names = {}
+            for poi_id, signature in self._signatures.items():
+                self._names.setdefault(signature[0], poi_id)
+            for name in names_changed:
+                dirty.update(self._referrers.get(f"name:{name}", ()))
+                resolved = self._names.get(name)
+                if resolved:
+                    dirty.update(self._referrers.get(resolved, ()))
+
+        for poi_id in dirty:
+            if poi_id in pois:
+                self._link(poi_id, pois[poi_id])
+        if dirty:
+            self.version += 1
+            logger.debug(f"Relationship graph: re-linked {len(dirty)} of {len(pois)} POIs")
+        return len(dirty)
+
+    def _resolve(self, connection: NetworkConnection) -> str:
+        if connection.poi_id and connection.poi_id in self.pois:
+            return connection.poi_id
+        return self._names.get(_norm(connection.name)) or name_key(connection.name)
+
+    def _link(self, poi_id: str, poi: POIRecord):
+        self._unlink(poi_id)
+        edges = [(self._resolve(c), c) for c in poi.known_connections]
+        edges += [(other, None) for other in (*poi.referrals_made, *poi.referrals_received)
+                  if other in self.pois and other != poi_id]
+        self._edges[poi_id] = edges
+        for target, _ in edges:
+            self._referrers.setdefault(target, {})[poi_id] = None
+
+    def _unlink(self, poi_id: str):
+        for target, _ in self._edges.pop(poi_id, ()):
+            referrers = self._referrers.get(target)
+            if referrers:
+                referrers.pop(poi_id, None)
+                if not referrers:
+                    del self._referrers[target]
+
+    # ── Queries ──────────────────────────────────────────────────
+
+    def node(self, name_or_id: str) -> str:
+        """Graph key for a POI id or a person's name."""
+        if name_or_id in self.pois:
+            return name_or_id
+        return self._names.get(_norm(name_or_id)) or name_key(name_or_id)
+
+    def edges(self, poi_id: str) -> list[tuple[str, Optional[NetworkConnection]]]:
+        return self._edges.get(poi_id, [])
+
+    def neighbours(self, key: str) -> set[str]:
+        """People this node can introduce (knowing is mutual between POIs)."""
+        out = {target for target, _ in self._edges.get(key, ())}
+        out.update(self._referrers.get(key, ()))
+        out.discard(key)
+        return out
+
+    def best_paths(self, sources, introducer_probability: Callable[[str], float],
+                   max_hops: int = MAX_HOPS) -> dict[str, tuple[float, list[str]]]:
+        """
+        Most probable introduction chain to every node within max_hops.
+
+        sources: POI ids Mani can ask directly (path probability 1.0).
+        introducer_probability(poi_id): chance that POI makes an intro.
+        Returns key → (probability, [source, ..., key]); a path's
+        probability is the product over every introducer on it.
+        """
+        best = {s: (1.0, [s]) for s in sources}
+        frontier = dict(best)
+        factors = {}
+        for _ in range(max_hops):
+            reached = {}
+            for node, (prob, path) in frontier.items():
+                if node not in self.pois:
+                    continue                    # Name-only people have no known connections
+                factor = factors.get(node)
+                if factor is None:
+                    factor = factors[node] = introducer_probability(node)
+                step = prob * factor
+                for target in self.neighbours(node):
+                    if step > best.get(target, (0.0,))[0] and target not in path:
+                        best[target] = reached[target] = (step, path + [target])
+            if not reached:
+                break
+            frontier = reached
+        return best
+
+    def centrality(self) -> dict[str, dict]:
+        """
+        Per-POI connectedness, cached until the graph next changes:
+        degree (direct contacts) and reach (distinct people within two hops).
+        """
+        if self._centrality and self._centrality[0] == self.version:
+            return self._centrality[1]
+        neighbours = {poi_id: self.neighbours(poi_id) for poi_id in self._signatures}
+        scores = {}
+        for poi_id, direct in neighbours.items():
+            reach = set(direct)
+            for n in direct:
+                reach.update(neighbours.get(n, ()))
+            reach.discard(poi_id)
+            scores[poi_id] = {"degree": len(direct), "reach": len(reach)}
+        top = max((s["reach"] for s in scores.values()), default=0) or 1
+        for s in scores.values():
+            s["centrality"] = round(s["reach"] / top, 3)
+        self._centrality = (self.version, scores)
+        return scores
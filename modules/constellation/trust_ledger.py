@@ -15,6 +15,7 @@ from .models import (
     POIRecord, TrustAccount, TrustTransaction,
     TrustTransactionType, TRUST_DEFAULTS, POITier,
 )
+from .portfolio_view import HEALTH, PortfolioView
 
 logger = logging.getLogger("elaine.constellation.trust")
 
@@ -156,13 +157,28 @@ class TrustLedger:
         return decay_amount
 
     def apply_decay_all(self, pois: dict[str, POIRecord]) -> list[dict]:
-        """Apply decay to all POIs and return alerts."""
+        """
+        Apply decay to all POIs and return alerts.
+        Computed column-wise; only POIs that actually decay are written back.
+        """
+        view = PortfolioView(pois)
+        before = view.health_codes()
+        changes = view.decay()
+        after = view.health_codes()
+
         alerts = []
-        for poi in pois.values():
-            prev_health = poi.trust_account.health
-            self.apply_decay(poi)
-            new_health = poi.trust_account.health
+        for row, amount, weeks, rate in changes:
+            poi = view.records[row]
+            poi.trust_account.transactions.append(TrustTransaction(
+                amount=-amount,
+                transaction_type=TrustTransactionType.DECAY,
+                reason=f"Natural decay: {weeks:.1f} weeks, rate {rate:.2f}/week",
+                auto_detected=True,
+            ))
+            poi.trust_account.balance -= amount
+            self._update_trajectory(poi)
 
+            prev_health, new_health = HEALTH[before[row]], HEALTH[after[row]]
             if prev_health != new_health and new_health in ("cooling", "at_risk", "cold"):
                 alerts.append({
                     "poi_id": poi.poi_id,
@@ -174,8 +190,24 @@ class TrustLedger:
                     "action": self._suggest_action(poi, new_health),
                 })
 
+        logger.debug(f"Decay applied to {len(changes)} of {len(view)} POIs, {len(alerts)} alerts")
         return alerts
 
+    def recalculate_all_tiers(self, pois: dict[str, POIRecord]) -> int:
+        """recalculate_tier() for every POI, column-wise. Returns how many records changed."""
+        view = PortfolioView(pois)
+        changed = 0
+        for poi, old, new in zip(view.records, view.tier, view.recalculated_tiers()):
+            if poi.pinned_tier:
+                continue
+            trend = "rising" if new < old else "falling" if new > old else "stable"
+            if new != old or poi.tier_trend != trend:
+                poi.tier_trend = trend
+                if new != old:
+                    poi.tier = POITier(new)
+                changed += 1
+        return changed
+
     def _suggest_action(self, poi: POIRecord, health: str) -> str:
         """Suggest action based on trust health."""
         if health == "cooling":
@@ -190,9 +222,10 @@ class TrustLedger:
 
     def _update_trajectory(self, poi: POIRecord):
         """Update trust trajectory based on recent transactions."""
+        now = datetime.now()
         recent = [
             t for t in poi.trust_account.transactions
-            if (datetime.now() - t.date).days <= 30
+            if (now - t.date).days <= 30
         ]
 
         if not recent:
@@ -251,10 +284,12 @@ class TrustLedger:
 
     def get_trust_alerts(self, pois: dict[str, POIRecord]) -> list[dict]:
         """Get current trust alerts for the morning briefing."""
+        view = PortfolioView(pois)
         alerts = []
 
-        for poi in pois.values():
-            health = poi.trust_account.health
+        for row, code in view.unhealthy_rows():
+            poi = view.records[row]
+            health = HEALTH[code]
             balance = poi.trust_account.balance
 
             if health == "cooling":
@@ -298,33 +333,20 @@ class TrustLedger:
 
     def get_portfolio_summary(self, pois: dict[str, POIRecord]) -> dict:
         """Portfolio-level trust analytics."""
-        tier_counts = {tier: 0 for tier in POITier}
-        tier_avg_trust = {tier: [] for tier in POITier}
-        total_trust_debt = 0
-        cooling_count = 0
-
-        for poi in pois.values():
-            tier_counts[poi.tier] += 1
-            tier_avg_trust[poi.tier].append(poi.trust_account.balance)
-            if poi.trust_account.health in ("cooling", "at_risk", "cold"):
-                cooling_count += 1
-                if poi.trust_account.health != "healthy":
-                    # Approximate trust debt as the gap to healthy
-                    gap = max(0, self.HEALTHY_THRESHOLD - poi.trust_account.balance)
-                    total_trust_debt += gap
+        stats = PortfolioView(pois).tier_stats(self.HEALTHY_THRESHOLD)
 
         summary = {
             "tiers": {},
             "total_pois": len(pois),
-            "cooling_count": cooling_count,
-            "total_trust_debt": round(total_trust_debt, 1),
+            "cooling_count": stats["cooling"],
+            "total_trust_debt": round(stats["debt"], 1),
         }
 
         for tier in POITier:
-            balances = tier_avg_trust[tier]
+            count = stats["count"][tier.value]
             summary["tiers"][tier.name] = {
-                "count": tier_counts[tier],
-                "avg_trust": round(sum(balances) / len(balances), 1) if balances else 0,
+                "count": count,
+                "avg_trust": round(stats["sum"][tier.value] / count, 1) if count else 0,
                 "max_count": self.TIER_MAX_COUNTS.get(tier),
             }
 
@@ -0,0 +1,438 @@
+"""
+Elaine v4 — Folder Watcher
+In-process watcher for the Gatekeeper's outbound folders.
+
+Replaces "one HTTP check per created file" with a small pipeline:
+
+1. Events   — inotify on Linux (via libc), a cheap stat-polling scan elsewhere
+2. Debounce — every event for a path pushes its deadline out, so an editor's
+               save storm (create, write, write, rename) becomes one check
+3. Dedupe   — files are content-hashed; re-saving identical bytes is skipped
+4. Queue    — due paths go onto a bounded queue drained by a few worker
+               threads; when it is full, paths stay pending and retry later,
+               so a large document drop is absorbed instead of flooding checks
+5. Stats    — per-folder events, coalesced events, checks, skips, latency
+               (first event → verdict) and throughput
+
+Almost Magic Tech Lab
+"""
+
+import ctypes
+import ctypes.util
+import hashlib
+import logging
+import os
+import queue
+import select
+import struct
+import sys
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Callable, Optional
+
+logger = logging.getLogger("elaine.folder_watcher")
+
+
+DEBOUNCE_SECONDS = 0.75    # Quiet period after the last event before a file is checked
+MAX_DELAY_SECONDS = 10.0   # A file still being written is checked after this long anyway
+QUEUE_SIZE = 64            # Files waiting for a worker; beyond this, paths stay pending
+WORKERS = 2                # Concurrent file checks
+POLL_INTERVAL = 1.0        # Scan interval for the polling backend
+TEXT_EXTENSIONS = {".txt", ".md", ".csv", ".html", ".htm", ".eml"}
+MAX_TEXT_BYTES = 2_000_000  # Text read into the check; the hash always covers the whole file
+
+# inotify(7) event masks
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+_WATCH_MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE | IN_MOVED_FROM | IN_DELETE
+_EVENT = struct.Struct("iIII")
+
+
+def _load_inotify():
+    """libc handle if this platform has inotify, else None."""
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        libc.inotify_init1, libc.inotify_add_watch, libc.inotify_rm_watch
+        return libc
+    except (OSError, AttributeError):
+        return None
+
+
+_LIBC = _load_inotify()
+
+
+@dataclass
+class FolderStats:
+    """Throughput and latency for one watched folder."""
+    path: str
+    state: str = "idle"            # watching / missing / idle
+    events: int = 0                # raw filesystem events
+    coalesced: int = 0             # events absorbed by the debounce window
+    deferred: int = 0              # times the queue was full and a file waited
+    checked: int = 0
+    unchanged: int = 0             # saves with identical content, not re-checked
+    errors: int = 0
+    total_latency: float = 0.0
+    max_latency: float = 0.0
+    last_verdict: str = ""
+    last_file: str = ""
+    _recent: deque = field(default_factory=lambda: deque(maxlen=10_000), repr=False)
+
+    def record(self, latency: float, verdict: str, filename: str):
+        self.checked += 1
+        self.total_latency += latency
+        self.max_latency = max(self.max_latency, latency)
+        self.last_verdict = verdict
+        self.last_file = filename
+        self._recent.append(time.monotonic())
+
+    def to_dict(self) -> dict:
+        cutoff = time.monotonic() - 60
+        return {
+            "path": self.path,
+            "state": self.state,
+            "events": self.events,
+            "coalesced": self.coalesced,
+            "deferred": self.deferred,
+            "checked": self.checked,
+            "unchanged": self.unchanged,
+            "errors": self.errors,
+            "checks_last_minute": sum(1 for t in self._recent if t >= cutoff),
+            "avg_latency_ms": round(1000 * self.total_latency / self.checked, 1) if self.checked else 0.0,
+            "max_latency_ms": round(1000 * self.max_latency, 1),
+            "last_verdict": self.last_verdict,
+            "last_file": self.last_file,
+        }
+
+
+class FolderWatcher:
+    """
+    Watches folders and hands settled, changed files to `check_fn`.
+
+    `check_fn(content, title, folder)` is called from a worker thread and
+    returns the Gatekeeper result (anything with a `.verdict`). Folders
+    are the Gatekeeper's WatchedFolder records: path, extensions, channel.
+    """
+
+    def __init__(self, check_fn: Callable, debounce: float = DEBOUNCE_SECONDS,
+                 queue_size: int = QUEUE_SIZE, workers: int = WORKERS,
+                 backend: str = None, poll_interval: float = POLL_INTERVAL):
+        self.check_fn = check_fn
+        self.debounce = debounce
+        self.max_delay = max(MAX_DELAY_SECONDS, debounce)
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self.backend = backend or ("inotify" if _LIBC else "polling")
+        if self.backend == "inotify" and not _LIBC:
+            raise ValueError("inotify is not available on this platform")
+
+        self._folders: dict[str, object] = {}           # path → WatchedFolder
+        self._stats: dict[str, FolderStats] = {}
+        self._pending: dict[str, list] = {}             # file → [folder, first_seen, deadline]
+        self._queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self._inflight: set[str] = set()
+        self._hashes: dict[str, str] = {}               # file → content hash last checked
+        self._snapshots: dict[str, dict] = {}           # polling: folder → {file: (mtime, size)}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._threads: list[threading.Thread] = []
+        self._fd: Optional[int] = None
+        self._wds: dict[int, str] = {}                  # inotify watch descriptor → folder path
+
+    @property
+    def running(self) -> bool:
+        return bool(self._threads) and not self._stop.is_set()
+
+    # ── Folder Registration ──────────────────────────────────
+
+    def watch(self, folder):
+        """Start (or keep) watching a folder. Safe before or after start()."""
+        path = os.path.abspath(os.path.expanduser(folder.path))
+        with self._lock:
+            self._folders[path] = folder
+            self._stats.setdefault(path, FolderStats(path=path))
+        if self.running:
+            self._attach(path)
+
+    def unwatch(self, path: str):
+        path = os.path.abspath(os.path.expanduser(path))
+        with self._lock:
+            self._folders.pop(path, None)
+            self._snapshots.pop(path, None)
+            for wd, folder_path in list(self._wds.items()):
+                if folder_path == path:
+                    del self._wds[wd]
+                    if self._fd is not None:
+                        _LIBC.inotify_rm_watch(self._fd, wd)
+            if path in self._stats:
+                self._stats[path].state = "idle"
+
+    def _attach(self, path: str):
+        stats = self._stats[path]
+        if not os.path.isdir(path):
+            stats.state = "missing"
+            return
+        if self.backend == "inotify":
+            wd = _LIBC.inotify_add_watch(self._fd, os.fsencode(path), _WATCH_MASK)
+            if wd < 0:
+                stats.state = "missing"
+                logger.warning(f"inotify watch failed for {path}: {os.strerror(ctypes.get_errno())}")
+                return
+            with self._lock:
+                self._wds[wd] = path
+        else:
+            self._snapshots[path] = self._snapshot(path)
+        stats.state = "watching"
+
+    def _matches(self, folder, filename: str) -> bool:
+        if not getattr(folder, "active", True) or filename.startswith((".", "~$")):
+            return False
+        ext = os.path.splitext(filename)[1].lower()
+        return ext in {e.lower() for e in folder.file_extensions}
+
+    # ── Lifecycle ────────────────────────────────────────────
+
+    def start(self):
+        if self.running:
+            return
+        self._stop.clear()
+        if self.backend == "inotify":
+            self._fd = _LIBC.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+            if self._fd < 0:
+                raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        for path in list(self._folders):
+            self._attach(path)
+
+        loop = self._inotify_loop if self.backend == "inotify" else self._polling_loop
+        self._threads = [threading.Thread(target=loop, name="gate-watch-events", daemon=True)]
+        self._threads += [
+            threading.Thread(target=self._worker, name=f"gate-watch-{i}", daemon=True)
+            for i in range(self.workers)
+        ]
+        for t in self._threads:
+            t.start()
+        logger.info(f"Folder watcher started ({self.backend}, {len(self._folders)} folders)")
+
+    def stop(self, timeout: float = 2.0):
+        self._stop.set()
+        for t in self._threads:
+            t.join(timeout)
+        self._threads = []
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+        self._wds.clear()
+        for stats in self._stats.values():
+            stats.state = "idle"
+
+    # ── Event Sources ────────────────────────────────────────
+
+    def _inotify_loop(self):
+        while not self._stop.is_set():
+            readable, _, _ = select.select([self._fd], [], [], self._next_wait())
+            if readable:
+                try:
+                    data = os.read(self._fd, 65536)
+                except BlockingIOError:
+                    data = b""
+                self._parse_inotify(data)
+            self._flush_due()
+
+    def _parse_inotify(self, data: bytes):
+        offset = 0
+        while offset + _EVENT.size <= len(data):
+            wd, mask, _cookie, length = _EVENT.unpack_from(data, offset)
+            name = data[offset + _EVENT.size: offset + _EVENT.size + length].rstrip(b"\0")
+            offset += _EVENT.size + length
+            folder_path = self._wds.get(wd)
+            if folder_path is None or not name or mask & IN_ISDIR:
+                if mask & IN_IGNORED and folder_path:
+                    self._wds.pop(wd, None)
+                    self._stats[folder_path].state = "missing"
+                continue
+            path = os.path.join(folder_path, os.fsdecode(name))
+            if mask & (IN_DELETE | IN_MOVED_FROM):
+                self._forget(path)
+            else:
+                self._on_event(folder_path, path)
+
+    def _polling_loop(self):
+        next_scan = time.monotonic() + self.poll_interval
+        while not self._stop.wait(self._poll_wait(next_scan)):
+            if time.monotonic() >= next_scan:
+                next_scan = time.monotonic() + self.poll_interval
+                self._rescan()
+            self._flush_due()
+
+    def _poll_wait(self, next_scan: float) -> float:
+        """Until the next rescan, or sooner only when a debounced file comes due first."""
+        wait = max(0.0, next_scan - time.monotonic())
+        return min(wait, self._next_wait()) if self._pending else wait
+
+    def _rescan(self):
+        for folder_path in list(self._folders):
+            if folder_path not in self._snapshots:
+                continue
+            before = self._snapshots[folder_path]
+            after = self._snapshot(folder_path)
+            self._snapshots[folder_path] = after
+            for path, sig in after.items():
+                if before.get(path) != sig:
+                    self._on_event(folder_path, path)
+            for path in before.keys() - after.keys():
+                self._forget(path)
+
+    @staticmethod
+    def _snapshot(folder_path: str) -> dict:
+        snap = {}
+        try:
+            with os.scandir(folder_path) as it:
+                for entry in it:
+                    if entry.is_file():
+                        st = entry.stat()
+                        snap[entry.path] = (st.st_mtime_ns, st.st_size)
+        except OSError:
+            pass
+        return snap
+
+    # ── Debounce and Queue ───────────────────────────────────
+
+    def _on_event(self, folder_path: str, path: str):
+        folder = self._folders.get(folder_path)
+        if folder is None or not self._matches(folder, os.path.basename(path)):
+            return
+        stats = self._stats[folder_path]
+        stats.events += 1
+        now = time.monotonic()
+        entry = self._pending.get(path)
+        if entry:
+            stats.coalesced += 1
+            entry[2] = min(now + self.debounce, entry[1] + self.max_delay)
+        else:
+            self._pending[path] = [folder_path, now, now + self.debounce]
+
+    def _forget(self, path: str):
+        self._pending.pop(path, None)
+        with self._lock:
+            self._hashes.pop(path, None)
+
+    def _next_wait(self) -> float:
+        if not self._pending:
+            return 0.5
+        soonest = min(entry[2] for entry in self._pending.values())
+        return max(0.01, min(0.5, soonest - time.monotonic()))
+
+    def _flush_due(self):
+        now = time.monotonic()
+        for path, (folder_path, first_seen, deadline) in list(self._pending.items()):
+            if deadline > now:
+                continue
+            with self._lock:
+                busy = path in self._inflight
+            if busy:
+                # A check for this file is still running; look again shortly
+                self._pending[path][2] = now + self.debounce
+                continue
+            try:
+                self._queue.put_nowait((folder_path, path, first_seen))
+            except queue.Full:
+                self._stats[folder_path].deferred += 1
+                self._pending[path][2] = now + self.debounce
+                continue
+            with self._lock:
+                self._inflight.add(path)
+            del self._pending[path]
+
+    # ── Workers ──────────────────────────────────────────────
+
+    def _worker(self):
+        while not self._stop.is_set():
+            try:
+                folder_path, path, first_seen = self._queue.get(timeout=0.25)
+            except queue.Empty:
+                continue
+            try:
+                self._process(folder_path, path, first_seen)
+            finally:
+                with self._lock:
+                    self._inflight.discard(path)
+                self._queue.task_done()
+
+    def _process(self, folder_path: str, path: str, first_seen: float):
+        stats = self._stats[folder_path]
+        folder = self._folders.get(folder_path)
+        if folder is None:
+            return
+        try:
+            digest, content = self._read(path)
+        except FileNotFoundError:
+            return
+        except OSError as e:
+            stats.errors += 1
+            logger.warning(f"Watcher could not read {path}: {e}")
+            return
+
+        with self._lock:
+            if self._hashes.get(path) == digest:
+                stats.unchanged += 1
+                return
+            self._hashes[path] = digest
+
+        filename = os.path.basename(path)
+        try:
+            result = self.check_fn(content or f"[File: {filename}]", filename, folder)
+        except Exception as e:
+            stats.errors += 1
+            with self._lock:
+                self._hashes.pop(path, None)
+            logger.error(f"Watcher check failed for {filename}: {e}")
+            return
+        verdict = getattr(getattr(result, "verdict", None), "value", "")
+        stats.record(time.monotonic() - first_seen, verdict, filename)
+        logger.info(f"Watched file {filename}: {verdict or 'checked'}")
+
+    @staticmethod
+    def _read(path: str) -> tuple[str, str]:
+        """Content hash of the whole file, plus text for text formats."""
+        h = hashlib.sha256()
+        text = bytearray()
+        is_text = os.path.splitext(path)[1].lower() in TEXT_EXTENSIONS
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(65536), b""):
+                h.update(chunk)
+                if is_text and len(text) < MAX_TEXT_BYTES:
+                    text += chunk[:MAX_TEXT_BYTES - len(text)]
+        return h.hexdigest(), text.decode("utf-8", errors="ignore")
+
+    # ── Reporting ────────────────────────────────────────────
+
+    def drain(self, timeout: float = 5.0) -> bool:
+        """Wait until nothing is pending, queued or in flight (used by tests and shutdown)."""
+        end = time.monotonic() + timeout
+        while time.monotonic() < end:
+            with self._lock:
+                idle = not self._inflight
+            if idle and not self._pending and self._queue.empty():
+                return True
+            time.sleep(0.02)
+        return False
+
+    def stats(self) -> dict:
+        return {
+            "running": self.running,
+            "backend": self.backend,
+            "pending": len(self._pending),
+            "queued": self._queue.qsize(),
+            "in_flight": len(self._inflight),
+            "folders": [s.to_dict() for s in self._stats.values()],
+        }
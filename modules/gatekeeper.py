@@ -4,7 +4,7 @@ The last line of defence before anything leaves Mani's desk.
 
 Intercepts:
 1. Emails (Outlook COM automation / file watcher)
-2. Files in outbound folders (watchdog)
+2. Files in outbound folders (in-process watcher, see folder_watcher.py)
 3. Chat messages (API hook)
 4. Social media posts (API hook)
 5. Proposals and documents (file watcher)
@@ -25,12 +25,19 @@ Patentable: Pre-Transmission Quality Assurance with Multi-Dimensional Trust Anal
 Almost Magic Tech Lab — Patentable IP
 """
 
+import hashlib
 import logging
 import os
+import sqlite3
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
-from typing import Optional
+from typing import Iterator, Optional
+
+from modules.folder_watcher import FolderWatcher
 
 logger = logging.getLogger("elaine.gatekeeper")
 
@@ -85,6 +92,7 @@ class GateResult:
     overall_score: float = 1.0
     summary: str = ""
     override_reason: str = ""
+    content_hash: str = ""
     timestamp: datetime = field(default_factory=datetime.now)
 
 
@@ -130,6 +138,13 @@ SENSITIVE_RECIPIENTS = [
     "@asx.com", "@asic.gov",
 ]
 
+HISTORY_SIZE = 500      # Gate results kept in memory (and on disk)
+BULK_WORKERS = 8        # Items checked concurrently by check_many()
+
+
+def _content_hash(content: str) -> str:
+    return hashlib.sha256(content.encode("utf-8", "surrogatepass")).hexdigest()
+
 
 # ── The Gatekeeper ───────────────────────────────────────────────
 
@@ -139,17 +154,24 @@ class Gatekeeper:
     Checks everything before it leaves — emails, files, posts.
     """
 
-    def __init__(self, sentinel=None, compassion=None, communication=None):
+    def __init__(self, sentinel=None, compassion=None, communication=None,
+                 db_path: str = None, history_size: int = HISTORY_SIZE):
         self.sentinel = sentinel
         self.compassion = compassion
         self.communication = communication
 
-        self._history: list[GateResult] = []
-        self._overrides: list[GateResult] = []
+        # Bounded ring of recent results; persisted to SQLite when db_path is set
+        self._history: deque[GateResult] = deque(maxlen=history_size)
+        self._overrides: deque[GateResult] = deque(maxlen=history_size)
+        self._lock = threading.Lock()
+        self._stage_pool = ThreadPoolExecutor(max_workers=3 * BULK_WORKERS, thread_name_prefix="gate-stage")
+        self._item_pool = ThreadPoolExecutor(max_workers=BULK_WORKERS, thread_name_prefix="gate-item")
+        self.db_path = db_path
         self._watched_folders: list[WatchedFolder] = []
         self._outlook_rules: list[OutlookRule] = []
         self._items_checked: int = 0
         self._items_held: int = 0
+        self.watcher = FolderWatcher(self._check_file)
 
         # Default watched folders
         self._watched_folders.append(WatchedFolder(
@@ -163,6 +185,8 @@ class Gatekeeper:
             priority=ContentPriority.SENSITIVE,
             file_extensions=[".docx", ".pdf"],
         ))
+        for folder in self._watched_folders:
+            self.watcher.watch(folder)
 
         # Default Outlook rules
         self._outlook_rules.append(OutlookRule(
@@ -181,6 +205,80 @@ class Gatekeeper:
             priority=ContentPriority.CRITICAL,
         ))
 
+        if self.db_path:
+            self._init_db()
+            self._load_history()
+
+    # ── History Persistence ───────────────────────────────────
+
+    def _init_db(self):
+        os.makedirs(os.path.dirname(self.db_path) or ".", exist_ok=True)
+        conn = sqlite3.connect(self.db_path)
+        conn.execute("""CREATE TABLE IF NOT EXISTS gate_history (
+            item_id TEXT PRIMARY KEY,
+            seq INTEGER,
+            channel TEXT,
+            priority TEXT,
+            verdict TEXT,
+            title TEXT,
+            recipient TEXT,
+            score REAL,
+            summary TEXT,
+            override_reason TEXT,
+            content_hash TEXT,
+            timestamp TEXT
+        )""")
+        conn.commit()
+        conn.close()
+
+    def _load_history(self):
+        """Restore the ring (and item numbering) from disk."""
+        conn = sqlite3.connect(self.db_path)
+        rows = conn.execute(
+            "SELECT item_id, channel, priority, verdict, title, recipient, score, summary, "
+            "override_reason, content_hash, timestamp FROM gate_history ORDER BY seq DESC LIMIT ?",
+            (self._history.maxlen,),
+        ).fetchall()
+        last_seq = conn.execute("SELECT COALESCE(MAX(seq), 0) FROM gate_history").fetchone()[0]
+        held = conn.execute("SELECT COUNT(*) FROM gate_history WHERE verdict = 'hold'").fetchone()[0]
+        conn.close()
+
+        for row in reversed(rows):
+            result = GateResult(
+                item_id=row[0], channel=ContentChannel(row[1]), priority=ContentPriority(row[2]),
+                verdict=GateVerdict(row[3]), title=row[4], recipient=row[5],
+                overall_score=row[6], summary=row[7], override_reason=row[8] or "",
+                content_hash=row[9] or "", timestamp=datetime.fromisoformat(row[10]),
+            )
+            self._history.append(result)
+            if result.verdict == GateVerdict.OVERRIDE:
+                self._overrides.append(result)
+        self._items_checked = last_seq
+        self._items_held = held
+
+    def _persist(self, results: list[GateResult]):
+        """Write results in one transaction and trim the table to the ring size."""
+        if not self.db_path or not results:
+            return
+        conn = sqlite3.connect(self.db_path)
+        conn.executemany(
+            "INSERT OR REPLACE INTO gate_history (item_id, seq, channel, priority, verdict, title, "
+            "recipient, score, summary, override_reason, content_hash, timestamp) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            [
+                (r.item_id, int(r.item_id.rsplit("-", 1)[-1]), r.channel.value, r.priority.value,
+                 r.verdict.value, r.title, r.recipient, r.overall_score, r.summary,
+                 r.override_reason, r.content_hash, r.timestamp.isoformat())
+                for r in results
+            ],
+        )
+        conn.execute(
+            "DELETE FROM gate_history WHERE seq <= (SELECT MAX(seq) FROM gate_history) - ?",
+            (self._history.maxlen,),
+        )
+        conn.commit()
+        conn.close()
+
     # ── Priority Detection ────────────────────────────────────
 
     def detect_priority(self, content: str, recipient: str = "",
@@ -212,30 +310,27 @@ class Gatekeeper:
     def check(self, content: str, title: str = "", recipient: str = "",
               channel: ContentChannel = ContentChannel.EMAIL,
               priority: ContentPriority = None,
-              emotional_context: str = "") -> GateResult:
+              emotional_context: str = "", persist: bool = True) -> GateResult:
         """
         Full gatekeeper check on outbound content.
         Returns verdict: CLEAR, REVIEW, or HOLD.
         """
-        self._items_checked += 1
+        with self._lock:
+            self._items_checked += 1
+            item_id = f"gate-{self._items_checked:04d}"
 
         if priority is None:
             priority = self.detect_priority(content, recipient, channel)
 
-        item_id = f"gate-{self._items_checked:04d}"
-        checks = []
-
-        # ── 1. Sentinel Check (trust/quality) ────────────────
-        sentinel_check = self._run_sentinel(content, title, recipient, priority)
-        checks.append(sentinel_check)
-
-        # ── 2. Compassion Check (tone/context) ───────────────
-        compassion_check = self._run_compassion(content, emotional_context)
-        checks.append(compassion_check)
-
-        # ── 3. Communication Check (structure) ───────────────
-        comm_check = self._run_communication(content, channel)
-        checks.append(comm_check)
+        # The three gates are independent — run them concurrently:
+        # 1. Sentinel (trust/quality), 2. Compassion (tone/context),
+        # 3. Communication (structure)
+        stages = [
+            self._stage_pool.submit(self._run_sentinel, content, title, recipient, priority),
+            self._stage_pool.submit(self._run_compassion, content, emotional_context),
+            self._stage_pool.submit(self._run_communication, content, channel),
+        ]
+        checks = [stage.result() for stage in stages]
 
         # ── Calculate Overall Verdict ─────────────────────────
         overall_score = sum(c.score for c in checks) / len(checks)
@@ -253,7 +348,8 @@ class Gatekeeper:
 
         if overall_score < hold_threshold:
             verdict = GateVerdict.HOLD
-            self._items_held += 1
+            with self._lock:
+                self._items_held += 1
         elif overall_score < review_threshold:
             verdict = GateVerdict.REVIEW
         else:
@@ -281,13 +377,50 @@ class Gatekeeper:
             checks=checks,
             overall_score=round(overall_score, 3),
             summary=summary,
+            content_hash=_content_hash(content),
         )
 
         self._history.append(result)
+        if persist:
+            self._persist([result])
         logger.info(f"GATE: {verdict.value} | {channel.value} | {priority.value} | "
                      f"score={overall_score:.2f} | '{title[:40]}'")
         return result
 
+    # ── Bulk Gate ─────────────────────────────────────────────
+
+    def check_many(self, items: list[dict]) -> Iterator[tuple[int, GateResult, Optional[int]]]:
+        """
+        Check many outbound items concurrently (e.g. a morning's outbox).
+        Each item takes the same fields as check(). Items whose fields are
+        all equal (every argument check() would get) are checked once.
+
+        Yields (index, result, duplicate_of) as each verdict finishes;
+        duplicate_of is the index of the item whose check was reused.
+        """
+        first_seen: dict[tuple, int] = {}
+        duplicates: dict[int, list[int]] = {}
+        futures = {}
+        for index, item in enumerate(items):
+            key = tuple(sorted(item.items()))
+            if key in first_seen:
+                duplicates.setdefault(first_seen[key], []).append(index)
+                continue
+            first_seen[key] = index
+            futures[self._item_pool.submit(self.check, persist=False, **item)] = index
+
+        finished = []
+        try:
+            for future in as_completed(futures):
+                index = futures[future]
+                result = future.result()
+                finished.append(result)
+                yield index, result, None
+                for dup in duplicates.get(index, ()):
+                    yield dup, result, index
+        finally:
+            self._persist(finished)
+
     # ── Individual Gate Checks ────────────────────────────────
 
     def _run_sentinel(self, content: str, title: str, recipient: str,
@@ -413,6 +546,7 @@ class Gatekeeper:
                 result.verdict = GateVerdict.OVERRIDE
                 result.override_reason = reason
                 self._overrides.append(result)
+                self._persist([result])
                 logger.info(f"GATE OVERRIDE: {item_id} — {reason[:60]}")
                 return result
         return None
@@ -427,7 +561,9 @@ class Gatekeeper:
             path=path, channel=channel, priority=priority,
             file_extensions=extensions or [".docx", ".pdf", ".pptx"],
         )
+        self._watched_folders = [f for f in self._watched_folders if f.path != path]
         self._watched_folders.append(folder)
+        self.watcher.watch(folder)
         logger.info(f"Watching folder: {path}")
         return folder
 
@@ -439,6 +575,16 @@ class Gatekeeper:
             for f in self._watched_folders
         ]
 
+    def start_watching(self):
+        """Watch every configured folder in-process (inotify where available)."""
+        self.watcher.start()
+
+    def stop_watching(self):
+        self.watcher.stop()
+
+    def _check_file(self, content: str, title: str, folder: WatchedFolder) -> GateResult:
+        return self.check(content, title=title, channel=folder.channel, priority=folder.priority)
+
     # ── Outlook Rules Configuration ───────────────────────────
 
     def add_outlook_rule(self, name: str, recipient_pattern: str = "",
@@ -534,6 +680,7 @@ if __name__ == "__main__":
     def get_file_watcher_script(self) -> str:
         """
         Returns a Python script for file system monitoring.
+        For folders on another machine; local folders use start_watching().
         Run as: python file_watcher.py
         Requires: watchdog (pip install watchdog)
         """
@@ -629,6 +776,7 @@ if __name__ == "__main__":
             "overrides": len(self._overrides),
             "verdicts": {"clear": clear_count, "review": review_count, "hold": hold_count},
             "watched_folders": len(self._watched_folders),
+            "watcher": {"running": self.watcher.running, "backend": self.watcher.backend},
             "outlook_rules": len(self._outlook_rules),
         }
 
@@ -644,5 +792,5 @@ if __name__ == "__main__":
                 "summary": r.summary,
                 "timestamp": r.timestamp.isoformat(),
             }
-            for r in self._history[-limit:]
+            for r in list(self._history)[-limit:]
         ]
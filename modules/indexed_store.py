@@ -0,0 +1,124 @@
+"""
+Indexed Store
+Shared plumbing for the dicts that keep secondary indexes over their
+records.
+
+IndexedStore routes every way of adding, replacing or removing an entry
+through two methods a store implements:
+  - _index(key, value) after value is stored under key
+  - _unindex(key) before key is replaced (key is still present) or after
+    it is removed (key is gone)
+
+Records tell their store when an indexed field changes: a record class
+derives from IndexedRecord, the store claims each record it indexes, and
+setting one of the record's index_fields calls the store's
+reindex(record, attr, value). The indexes follow edits made anywhere.
+StoreAttribute is the engine attribute that holds a store, wrapping plain
+dicts assigned to it from outside.
+
+Almost Magic Tech Lab
+"""
+
+import weakref
+from typing import Callable, Optional
+
+
+def claim(store, record):
+    """Make store the owner told when record's indexed fields change."""
+    object.__setattr__(record, "_index_owner", weakref.ref(store))
+
+
+class IndexedRecord:
+    """
+    Base for dataclass records kept in an IndexedStore. Setting a field in
+    index_fields (any field, when None) on a claimed record calls its
+    store's reindex(record, attr, value).
+    """
+
+    index_fields: Optional[frozenset] = None
+
+    def __setattr__(self, attr, value):
+        object.__setattr__(self, attr, value)
+        fields = self.index_fields
+        if (fields is None or attr in fields) and "_index_owner" in self.__dict__:
+            store = self._index_owner()
+            if store is not None:
+                store.reindex(self, attr, value)
+
+
+class IndexedStore(dict):
+    """A dict whose writes all pass through _index / _unindex."""
+
+    def _index(self, key, value):
+        raise NotImplementedError
+
+    def _unindex(self, key):
+        raise NotImplementedError
+
+    def __setitem__(self, key, value):
+        if key in self:
+            self._unindex(key)
+        super().__setitem__(key, value)
+        self._index(key, value)
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self._unindex(key)
+
+    def pop(self, key, *default):
+        if key not in self:
+            return super().pop(key, *default)
+        value = super().pop(key)
+        self._unindex(key)
+        return value
+
+    def popitem(self):
+        key, value = super().popitem()
+        self._unindex(key)
+        return key, value
+
+    def setdefault(self, key, value=None):
+        if key not in self:
+            self[key] = value
+        return self[key]
+
+    def update(self, other=(), **kwargs):
+        items = other.items() if hasattr(other, "items") else other
+        for key, value in items:
+            self[key] = value
+        for key, value in kwargs.items():
+            self[key] = value
+
+    def __ior__(self, other):
+        self.update(other)
+        return self
+
+    def clear(self):
+        keys = list(self)
+        super().clear()
+        for key in reversed(keys):      # Last first, so positional stores drop from the end
+            self._unindex(key)
+
+
+class StoreAttribute:
+    """
+    Engine attribute holding an IndexedStore. A plain dict assigned to it
+    from outside is wrapped with make(engine, records), so it is indexed too.
+    """
+
+    def __init__(self, store: type, make: Optional[Callable] = None):
+        self.store = store
+        self.make = make or (lambda engine, records: store(records))
+
+    def __set_name__(self, owner, name):
+        self.attr = "_" + name
+
+    def __get__(self, engine, owner=None):
+        if engine is None:
+            return self
+        return engine.__dict__[self.attr]
+
+    def __set__(self, engine, records):
+        if not isinstance(records, self.store):
+            records = self.make(engine, records)
+        engine.__dict__[self.attr] = records
@@ -11,15 +11,19 @@ Almost Magic Tech Lab — Patentable IP
 """
 
 import logging
+import re
 from datetime import datetime
 from typing import Optional
 
+from modules.indexed_store import StoreAttribute
+
 from .models import (
     Opportunity, InnovationType, InnovationStatus, InnovationSignal,
     SignalSource, Recommendation,
     ResearchBrief, ResearchQuestion, ResearchType, ResearchStatus,
     ResearchResult, ResearchFinding,
 )
+from .similarity import OpportunityStore
 
 logger = logging.getLogger("elaine.innovator")
 
@@ -76,6 +80,21 @@ SEED_OPPORTUNITIES = [
 ]
 
 
+# Wording detect_from_modules wraps around a signal; stripped before indexing
+# so every generated opportunity doesn't look alike
+_GENERATED_TITLE = re.compile(r"^(?:Product from client need|Market gap|Automate):\s*")
+_GENERATED_DESCRIPTION = re.compile(
+    r"^(?:Multiple clients asking: |Cartographer detected: nobody is offering "
+    r"|Mani spends significant time on )'(.*)'", re.S)
+
+
+def similarity_texts(opp: Opportunity) -> tuple[str, str]:
+    """The title and description an opportunity is matched on."""
+    description = _GENERATED_DESCRIPTION.match(opp.description)
+    return (_GENERATED_TITLE.sub("", opp.title),
+            description.group(1) if description else opp.description)
+
+
 class InnovationEngine:
     """
     Cross-module opportunity detection engine.
@@ -84,8 +103,12 @@ class InnovationEngine:
     Delegates market research to Beast.
     """
 
+    # opportunity_id → Opportunity
+    opportunities = StoreAttribute(OpportunityStore,
+                                   lambda engine, records: OpportunityStore(records, similarity_texts))
+
     def __init__(self):
-        self.opportunities: dict[str, Opportunity] = {}
+        self.opportunities = OpportunityStore(texts=similarity_texts)
         self.research_briefs: dict[str, ResearchBrief] = {}
         self.research_results: dict[str, ResearchResult] = {}
 
@@ -193,13 +216,16 @@ class InnovationEngine:
 
         return new_opportunities
 
+    def find_similar(self, text: str, threshold: Optional[float] = None,
+                     limit: int = 5) -> list[tuple[Opportunity, float]]:
+        """Opportunities whose title or description overlaps this text, by Jaccard, best first."""
+        return [(self.opportunities[oid], score)
+                for oid, score in self.opportunities.index.query(text, threshold, limit)]
+
     def _find_similar(self, text: str) -> Optional[Opportunity]:
         """Find an existing opportunity that matches this signal."""
-        text_lower = text.lower()
-        for opp in self.opportunities.values():
-            if any(word in opp.title.lower() for word in text_lower.split() if len(word) > 4):
-                return opp
-        return None
+        matches = self.find_similar(text, limit=1)
+        return matches[0][0] if matches else None
 
     # ── Mani's Decision ──────────────────────────────────────────
 
@@ -11,6 +11,8 @@ from enum import Enum
 from typing import Optional
 import uuid
 
+from modules.indexed_store import IndexedRecord
+
 
 # ── Enums ────────────────────────────────────────────────────────
 
@@ -80,9 +82,15 @@ class InnovationSignal:
     detected_at: datetime = field(default_factory=datetime.now)
 
 
+# Fields OpportunityStore matches on; changing one re-indexes the opportunity
+INDEXED_FIELDS = frozenset({"title", "description"})
+
+
 @dataclass
-class Opportunity:
+class Opportunity(IndexedRecord):
     """A detected product/service/tool opportunity."""
+    index_fields = INDEXED_FIELDS
+
     opportunity_id: str = ""
     title: str = ""
     innovation_type: InnovationType = InnovationType.CUSTOMER_PRODUCT
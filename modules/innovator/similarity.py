@@ -0,0 +1,198 @@
+"""
+App Innovator — Opportunity Similarity Index
+MinHash + LSH over opportunity titles and descriptions, so matching a new
+signal to the pipeline costs O(candidates) instead of O(opportunities).
+
+Each text is reduced to shingles (lower-cased, lightly stemmed content
+words). A MinHash signature of NUM_PERM hashes is split into BANDS bands;
+opportunities sharing any band with the query are candidates, and
+candidates are ranked by their exact Jaccard similarity to the query.
+Title and description are indexed as separate fields and an opportunity
+scores its best field, so a short question can match a short title
+without being diluted by a long description.
+
+OpportunityStore is the dict InnovationEngine keeps opportunities in; it
+keeps the index in step with every write and with edits to a title or
+description (Opportunity is an IndexedRecord).
+
+With 48 bands of 2 rows, a field right at the 0.25 threshold is a
+candidate ~95% of the time and one at 0.4 almost always; raise rows per
+band for fewer, stricter candidates.
+
+Almost Magic Tech Lab — Patentable IP
+"""
+
+import hashlib
+import random
+import re
+from functools import lru_cache
+from typing import Callable, Iterable, Optional
+
+from modules.indexed_store import IndexedStore, claim
+
+NUM_PERM = 96
+BANDS = 48
+MATCH_THRESHOLD = 0.25      # Jaccard a signal needs to join an existing opportunity
+BUCKET_CAP = 256            # Bigger band buckets only hold very common words; see query()
+
+_PRIME = (1 << 61) - 1
+_WORD = re.compile(r"[a-z0-9]+")
+
+STOPWORDS = frozenset("""
+a about above after again all also am an and any are as at be because been before being
+between both but by can could did do does doing down during each few for from further had
+has have having he her here him his how i if in into is it its just me more most my no nor
+not now of off on once only or other our out over own same she should so some such than that
+the their them then there these they this those through to too under until up very was we
+were what when where which while who why will with would you your yours
+""".split())
+
+_SUFFIXES = (("ies", "y"), ("ied", "y"), ("ance", ""), ("ence", ""), ("ment", ""),
+             ("ing", ""), ("ed", ""), ("s", ""))
+
+
+def stem(word: str) -> str:
+    """Strip one common suffix: "policies" → "policy", "governance" → "govern"."""
+    for suffix, replacement in _SUFFIXES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= 3 and not word.endswith("ss"):
+            return word[:-len(suffix)] + replacement
+    return word
+
+
+def shingles(text: str, stopwords: frozenset = STOPWORDS) -> frozenset:
+    return frozenset(stem(w) for w in _WORD.findall((text or "").lower()) if w not in stopwords)
+
+
+def jaccard(a: frozenset, b: frozenset) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+class MinHasher:
+    """NUM_PERM universal hash functions (a·x + b mod p), seeded so signatures are stable."""
+
+    def __init__(self, num_perm: int = NUM_PERM, seed: int = 42):
+        rng = random.Random(seed)
+        self.coefficients = [(rng.randrange(1, _PRIME), rng.randrange(0, _PRIME))
+                             for _ in range(num_perm)]
+        self._hashes = lru_cache(maxsize=65536)(self._shingle_hashes)
+
+    def _shingle_hashes(self, shingle: str) -> tuple:
+        x = int.from_bytes(hashlib.blake2b(shingle.encode(), digest_size=8).digest(), "big")
+        return tuple((a * x + b) % _PRIME for a, b in self.coefficients)
+
+    def signature(self, items: Iterable[str]) -> tuple:
+        # A set's signature is the element-wise min of its shingles' hash vectors,
+        # and vocabularies are small, so the vectors are cached per shingle
+        vectors = [self._hashes(s) for s in items]
+        return tuple(map(min, *vectors)) if len(vectors) > 1 else tuple(vectors[0]) if vectors else ()
+
+
+class OpportunityIndex:
+    """opportunity_id → indexed fields, with banded LSH buckets for candidate lookup."""
+
+    def __init__(self, threshold: float = MATCH_THRESHOLD, num_perm: int = NUM_PERM,
+                 bands: int = BANDS, stopwords: Iterable[str] = STOPWORDS,
+                 bucket_cap: int = BUCKET_CAP):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.threshold = threshold
+        self.rows = num_perm // bands
+        self.hasher = MinHasher(num_perm)
+        self.stopwords = frozenset(stopwords)
+        self.bucket_cap = bucket_cap
+        self._fields: dict[str, list[tuple[frozenset, tuple]]] = {}   # id → [(shingles, signature)]
+        self._buckets = [dict() for _ in range(bands)]                # band → {band key: {(id, field): None}}
+
+    def __len__(self):
+        return len(self._fields)
+
+    def __contains__(self, opportunity_id):
+        return opportunity_id in self._fields
+
+    def _bands(self, signature: tuple):
+        r = self.rows
+        for band in range(len(self._buckets)):
+            yield band, signature[band * r:(band + 1) * r]
+
+    def add(self, opportunity_id: str, texts: Iterable[str]):
+        """Index (or re-index) an opportunity under each of its texts."""
+        self.remove(opportunity_id)
+        fields = []
+        for text in texts:
+            items = shingles(text, self.stopwords)
+            if not items:
+                continue
+            signature = self.hasher.signature(items)
+            entry = (opportunity_id, len(fields))
+            fields.append((items, signature))
+            for band, key in self._bands(signature):
+                self._buckets[band].setdefault(key, {})[entry] = None
+        self._fields[opportunity_id] = fields
+
+    def remove(self, opportunity_id: str):
+        for field, (_, signature) in enumerate(self._fields.pop(opportunity_id, ())):
+            for band, key in self._bands(signature):
+                bucket = self._buckets[band].get(key)
+                if bucket is not None:
+                    bucket.pop((opportunity_id, field), None)
+                    if not bucket:
+                        del self._buckets[band][key]
+
+    def query(self, text: str, threshold: Optional[float] = None,
+              limit: Optional[int] = None) -> list[tuple[str, float]]:
+        """(opportunity_id, Jaccard) for every match at or above threshold, best first."""
+        threshold = self.threshold if threshold is None else threshold
+        items = shingles(text, self.stopwords)
+        if not items:
+            return []
+        buckets = [bucket for band, key in self._bands(self.hasher.signature(items))
+                   if (bucket := self._buckets[band].get(key))]
+        # A bucket past the cap is keyed by words half the pipeline shares ("service",
+        # "ai"); a real match also collides on its rarer words, so big buckets are
+        # only read when the query has nothing rarer to go on
+        small = [b for b in buckets if len(b) <= self.bucket_cap]
+        candidates = {}
+        for bucket in small or sorted(buckets, key=len)[:1]:
+            candidates.update(bucket)
+        # Only fields that collided are verified; an opportunity keeps its best field
+        best = {}
+        size = len(items)
+        for opportunity_id, field in candidates:
+            other = self._fields[opportunity_id][field][0]
+            shared = len(items & other)
+            score = shared / (size + len(other) - shared)
+            if score >= threshold and score > best.get(opportunity_id, 0.0):
+                best[opportunity_id] = score
+        scored = sorted(((oid, round(score, 3)) for oid, score in best.items()), key=lambda pair: -pair[1])
+        return scored[:limit] if limit else scored
+
+
+class OpportunityStore(IndexedStore):
+    """opportunity_id → Opportunity, matched through an OpportunityIndex kept in step."""
+
+    def __init__(self, opportunities=None, texts: Callable = lambda o: (o.title, o.description),
+                 threshold: float = MATCH_THRESHOLD):
+        super().__init__()
+        self.texts = texts
+        self.index = OpportunityIndex(threshold=threshold)
+        if opportunities:
+            self.update(opportunities)
+
+    def _index(self, opportunity_id: str, opp):
+        self.index.add(opportunity_id, self.texts(opp))
+        claim(self, opp)
+
+    def _unindex(self, opportunity_id: str):
+        self.index.remove(opportunity_id)
+
+    def reindex(self, opp, attr: Optional[str] = None, value=None):
+        """Called by Opportunity when its title or description changes."""
+        opportunity_id = opp.opportunity_id
+        if dict.get(self, opportunity_id) is not opp:
+            # Stored under a key other than its opportunity_id — rare, so a scan is fine
+            opportunity_id = next((k for k, v in self.items() if v is opp), None)
+            if opportunity_id is None:
+                return
+        self.index.add(opportunity_id, self.texts(opp))
@@ -0,0 +1,607 @@
+"""
+Elaine v4 — Request Performance Instrumentation
+Per-route latency histograms, span attribution and slow-request sampling.
+
+Every request through any blueprint is timed and filed under its URL rule
+(`/api/poi/<poi_id>`, not the concrete path), so memory stays fixed no
+matter how many requests arrive. That is all a request pays for unless
+profiling is switched on (ELAINE_PROFILE=1). With profiling, time inside a
+request is also attributed to:
+
+  sql     — sqlite3 cursor calls (every connect() in the process is traced)
+  http    — outbound requests / urllib calls (Supervisor, Ollama, other apps)
+  engine  — public methods of the module engines wired up in create_app()
+  other   — whatever is left: Python in the route, JSON encoding, templates
+
+Span times are exclusive: an engine method that runs a query is charged for
+its own Python, the query goes to sql. Requests slower than a threshold are
+kept, and with profiling on they carry the call stacks a background sampler
+caught while they ran.
+
+Almost Magic Tech Lab
+"""
+
+import functools
+import inspect
+import logging
+import os
+import re
+import sqlite3
+import sys
+import threading
+import time
+import urllib.request
+from collections import Counter, deque
+from datetime import datetime
+
+logger = logging.getLogger("elaine.perf")
+
+try:
+    import requests as http_requests
+    HAS_REQUESTS = True
+except ImportError:
+    HAS_REQUESTS = False
+
+
+PERF_ENABLED = os.environ.get("ELAINE_PERF", "1") != "0"
+PROFILE_ENABLED = os.environ.get("ELAINE_PROFILE", "0") == "1"    # Spans, library tracing, stack sampling
+SLOW_MS = float(os.environ.get("ELAINE_PERF_SLOW_MS", "1000"))
+SAMPLE_INTERVAL_S = float(os.environ.get("ELAINE_PERF_SAMPLE_MS", "10")) / 1000
+SLOW_KEEP = 50              # Slow-request records kept for /api/perf/slow
+MAX_SPAN_NAMES = 500        # Distinct span names tracked before folding into "other"
+MAX_STACK_DEPTH = 40
+SPAN_KINDS = ("sql", "http", "engine")
+
+# Upper bounds in seconds (1-2-5 steps); the last bucket is +Inf
+BUCKETS = (0.0005, 0.001, 0.002, 0.005, 0.01, 0.02, 0.05, 0.1, 0.2, 0.5,
+           1.0, 2.0, 5.0, 10.0, 20.0, 60.0)
+
+
+# ── Histogram ────────────────────────────────────────────────────
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram; quantiles are interpolated."""
+
+    __slots__ = ("counts", "count", "total", "max")
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds):
+        lo, hi = 0, len(BUCKETS)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if seconds <= BUCKETS[mid]:
+                hi = mid
+            else:
+                lo = mid + 1
+        self.counts[lo] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def quantile(self, q):
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            if n and seen + n >= rank:
+                lower = BUCKETS[i - 1] if i else 0.0
+                upper = BUCKETS[i] if i < len(BUCKETS) else self.max
+                return min(self.max, lower + (upper - lower) * (rank - seen) / n)
+            seen += n
+        return self.max
+
+    def cumulative(self):
+        """(le, cumulative count) pairs for Prometheus, ending with +Inf."""
+        running, out = 0, []
+        for le, n in zip(BUCKETS + (float("inf"),), self.counts):
+            running += n
+            out.append((le, running))
+        return out
+
+
+class RouteStats:
+    __slots__ = ("latency", "errors", "statuses", "span_s", "span_calls")
+
+    def __init__(self):
+        self.latency = LatencyHistogram()
+        self.errors = 0
+        self.statuses = Counter()
+        self.span_s = dict.fromkeys(SPAN_KINDS, 0.0)
+        self.span_calls = dict.fromkeys(SPAN_KINDS, 0)
+
+
+# ── Per-request State ────────────────────────────────────────────
+
+class RequestState:
+    """Span accounting for one in-flight request."""
+
+    def __init__(self, method, route):
+        self.method = method
+        self.route = route
+        self.thread_id = threading.get_ident()
+        self.started = time.perf_counter()
+        self.span_s = dict.fromkeys(SPAN_KINDS, 0.0)
+        self.span_calls = dict.fromkeys(SPAN_KINDS, 0)
+        self.stack = []             # [kind, name, started, child_seconds, state]
+        self.spans = {}             # (kind, name) -> [calls, seconds], merged into the monitor at end()
+        self.samples = Counter()    # collapsed stack -> hits
+        self.samples_lock = threading.Lock()    # The sampler thread writes samples while this request runs
+        self.status = 0
+        self.finished = False
+
+
+class _Span:
+    __slots__ = ("monitor", "kind", "name", "frame")
+
+    def __init__(self, monitor, kind, name):
+        self.monitor = monitor
+        self.kind = kind
+        self.name = name
+
+    def __enter__(self):
+        state = getattr(self.monitor._local, "state", None)
+        self.frame = [self.kind, self.name, time.perf_counter(), 0.0, state]
+        if state is not None:
+            state.stack.append(self.frame)
+        return self
+
+    def __exit__(self, *exc):
+        kind, name, started, child, state = self.frame
+        elapsed = time.perf_counter() - started
+        own = max(0.0, elapsed - child)
+        if state is not None and state.stack and state.stack[-1] is self.frame:
+            state.stack.pop()
+            if state.stack:
+                state.stack[-1][3] += elapsed
+            state.span_s[kind] += own
+            state.span_calls[kind] += 1
+            entry = state.spans.get((kind, name))
+            if entry is None:
+                entry = state.spans[(kind, name)] = [0, 0.0]
+            entry[0] += 1
+            entry[1] += own
+        else:
+            self.monitor._record_span(kind, name, 1, own, in_request=state is not None)
+        return False
+
+
+# ── Monitor ──────────────────────────────────────────────────────
+
+class PerfMonitor:
+    """Process-wide collector; install() hooks a Flask app into it."""
+
+    def __init__(self, slow_ms=SLOW_MS, sample_interval=SAMPLE_INTERVAL_S, profile=PROFILE_ENABLED):
+        """
+        Args:
+            profile: also trace sqlite3 / HTTP / engine spans and sample stacks.
+                     Off, a request costs one timer and one histogram update.
+        """
+        self.slow_ms = slow_ms
+        self.sample_interval = sample_interval
+        self.profile = profile
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._routes = {}                   # (method, rule) -> RouteStats
+        self._spans = {}                    # (kind, name) -> [calls, seconds, in_request_seconds]
+        self._active = {}                   # thread id -> RequestState
+        self._slow = deque(maxlen=SLOW_KEEP)
+        self._slow_hooks = []
+        self._slow_total = 0
+        self._started = time.time()
+        self._wake = threading.Event()
+        self._sampler = None
+
+    # ── Flask integration ──
+
+    def install(self, app):
+        """Time every request on `app`; with profiling, trace sqlite3 / outbound HTTP."""
+        if not PERF_ENABLED:
+            logger.info("Perf instrumentation disabled (ELAINE_PERF=0)")
+            return self
+        if self.profile:
+            self.patch_libraries()
+
+        from flask import request
+
+        @app.before_request
+        def _perf_start():
+            rule = request.url_rule.rule if request.url_rule else "(unmatched)"
+            self.begin(request.method, rule)
+
+        @app.after_request
+        def _perf_finish(response):
+            state = getattr(self._local, "state", None)
+            if state is None:
+                return response
+            state.status = response.status_code
+            if response.is_streamed:
+                # The body is generated after this hook; time it to the close
+                response.call_on_close(lambda: self.end(state, state.status))
+            else:
+                self.end(state, state.status)
+            return response
+
+        return self
+
+    def begin(self, method, route):
+        stale = getattr(self._local, "state", None)
+        if stale is not None and not stale.finished:
+            self.end(stale, stale.status)       # streamed response never closed
+        state = RequestState(method, route)
+        self._local.state = state
+        if self.profile:
+            with self._lock:
+                self._active[state.thread_id] = state
+            self._ensure_sampler()
+        return state
+
+    def end(self, state, status):
+        if state.finished:
+            return
+        state.finished = True
+        elapsed = time.perf_counter() - state.started
+        if getattr(self._local, "state", None) is state:
+            self._local.state = None
+        with self._lock:
+            if self._active.get(state.thread_id) is state:
+                del self._active[state.thread_id]
+            stats = self._routes.get((state.method, state.route))
+            if stats is None:
+                stats = self._routes[(state.method, state.route)] = RouteStats()
+            stats.latency.observe(elapsed)
+            stats.statuses[status] += 1
+            if status >= 500 or status == 0:
+                stats.errors += 1
+            for kind in SPAN_KINDS:
+                stats.span_s[kind] += state.span_s[kind]
+                stats.span_calls[kind] += state.span_calls[kind]
+            for (kind, name), (calls, seconds) in state.spans.items():
+                self._record_span_locked(kind, name, calls, seconds, in_request=True)
+        if elapsed * 1000 >= self.slow_ms:
+            self._record_slow(state, elapsed, status)
+
+    def span(self, kind, name):
+        """Context manager charging its time to `kind` in the current request."""
+        return _Span(self, kind, name)
+
+    def _record_span(self, kind, name, calls, seconds, in_request):
+        with self._lock:
+            self._record_span_locked(kind, name, calls, seconds, in_request)
+
+    def _record_span_locked(self, kind, name, calls, seconds, in_request):
+        key = (kind, name)
+        entry = self._spans.get(key)
+        if entry is None:
+            if len(self._spans) >= MAX_SPAN_NAMES:
+                key = (kind, "other")
+                entry = self._spans.get(key)
+            if entry is None:
+                entry = self._spans[key] = [0, 0.0, 0.0]
+        entry[0] += calls
+        entry[1] += seconds
+        if in_request:
+            entry[2] += seconds
+
+    # ── Slow requests and sampling ──
+
+    def on_slow(self, callback):
+        """Register callback(record) run for every request over the threshold."""
+        self._slow_hooks.append(callback)
+        return callback
+
+    def _record_slow(self, state, elapsed, status):
+        with state.samples_lock:
+            samples = Counter(state.samples)
+        leaves = Counter()
+        for stack, hits in samples.items():
+            leaves[stack.rsplit(";", 1)[-1]] += hits
+        record = {
+            "method": state.method,
+            "route": state.route,
+            "status": status,
+            "ms": round(elapsed * 1000, 1),
+            "at": datetime.now().isoformat(timespec="seconds"),
+            "spans_ms": {k: round(v * 1000, 1) for k, v in state.span_s.items()},
+            "span_calls": dict(state.span_calls),
+            "samples": sum(samples.values()),
+            "hot_functions": leaves.most_common(10),
+            "stacks": samples.most_common(10),
+        }
+        with self._lock:
+            self._slow.append(record)
+            self._slow_total += 1
+        logger.warning(f"Slow request {state.method} {state.route}: {record['ms']} ms "
+                       f"(sql {record['spans_ms']['sql']} ms, http {record['spans_ms']['http']} ms)")
+        for hook in list(self._slow_hooks):
+            try:
+                hook(record)
+            except Exception as e:
+                logger.error(f"Slow-request hook failed: {e}")
+
+    def _ensure_sampler(self):
+        self._wake.set()
+        if self._sampler is None and self.sample_interval > 0:
+            with self._lock:
+                if self._sampler is None:
+                    self._sampler = threading.Thread(target=self._sample_loop, daemon=True,
+                                                     name="perf-sampler")
+                    self._sampler.start()
+
+    def _sample_loop(self):
+        own_file = __file__.rstrip("c")
+        while True:
+            self._wake.wait()
+            time.sleep(self.sample_interval)
+            with self._lock:
+                active = list(self._active.values())
+                if not active:
+                    self._wake.clear()
+                    continue
+            frames = sys._current_frames()
+            for state in active:
+                frame = frames.get(state.thread_id)
+                if frame is None or state.finished:
+                    continue
+                parts = []
+                while frame is not None and len(parts) < MAX_STACK_DEPTH:
+                    code = frame.f_code
+                    if code.co_filename != own_file:
+                        parts.append(f"{os.path.basename(code.co_filename)}:{code.co_name}:{frame.f_lineno}")
+                    frame = frame.f_back
+                with state.samples_lock:
+                    state.samples[";".join(reversed(parts))] += 1
+
+    # ── Library tracing ──
+
+    def patch_libraries(self):
+        """Route sqlite3.connect, requests and urlopen through spans."""
+        if self not in _monitors:
+            _monitors.append(self)
+        _patch_libraries()
+
+    def trace_engines(self, engines: dict):
+        """Wrap the public methods of each engine instance in an engine span (profiling only)."""
+        wrapped = 0
+        if not (PERF_ENABLED and self.profile):
+            return wrapped
+        for label, engine in engines.items():
+            for attr in dir(type(engine)):
+                if attr.startswith("_"):
+                    continue
+                if not inspect.isfunction(inspect.getattr_static(engine, attr, None)):
+                    continue
+                setattr(engine, attr, self._wrap(f"{label}.{attr}", getattr(engine, attr)))
+                wrapped += 1
+        return wrapped
+
+    def _wrap(self, name, method):
+        monitor = self
+
+        @functools.wraps(method)
+        def traced(*args, **kwargs):
+            if getattr(monitor._local, "state", None) is None:
+                return method(*args, **kwargs)
+            with monitor.span("engine", name):
+                return method(*args, **kwargs)
+        return traced
+
+    # ── Reporting ──
+
+    def snapshot(self, sort="total", limit=None) -> dict:
+        with self._lock:
+            routes = [(k, self._copy_stats(v)) for k, v in self._routes.items()]
+            spans = [(k, list(v)) for k, v in self._spans.items()]
+            slow_total = self._slow_total
+            in_flight = len(self._active)
+        grand_total = sum(s.latency.total for _, s in routes) or 1.0
+        rows = []
+        for (method, rule), s in routes:
+            h = s.latency
+            span_ms = {k: round(v * 1000, 1) for k, v in s.span_s.items()}
+            rows.append({
+                "method": method,
+                "route": rule,
+                "count": h.count,
+                "errors": s.errors,
+                "statuses": {str(k): v for k, v in s.statuses.items()},
+                "total_s": round(h.total, 3),
+                "share": round(h.total / grand_total, 4),
+                "mean_ms": round(h.total / h.count * 1000, 2) if h.count else 0.0,
+                "p50_ms": round(h.quantile(0.5) * 1000, 2),
+                "p90_ms": round(h.quantile(0.9) * 1000, 2),
+                "p99_ms": round(h.quantile(0.99) * 1000, 2),
+                "max_ms": round(h.max * 1000, 2),
+                "spans_ms": dict(span_ms, other=round(max(0.0, h.total * 1000 - sum(span_ms.values())), 1)),
+                "span_calls": dict(s.span_calls),
+            })
+        keys = {"total": "total_s", "count": "count", "p99": "p99_ms", "mean": "mean_ms",
+                "max": "max_ms", "errors": "errors"}
+        rows.sort(key=lambda r: r[keys.get(sort, "total_s")], reverse=True)
+        spans.sort(key=lambda kv: kv[1][1], reverse=True)
+        return {
+            "uptime_s": round(time.time() - self._started),
+            "profiling": self.profile,
+            "requests": sum(r["count"] for r in rows),
+            "in_flight": in_flight,
+            "slow_threshold_ms": self.slow_ms,
+            "slow_requests": slow_total,
+            "routes": rows[:limit] if limit else rows,
+            "top_spans": [
+                {"kind": kind, "name": name, "calls": calls, "total_ms": round(total * 1000, 1),
+                 "in_request_ms": round(in_req * 1000, 1)}
+                for (kind, name), (calls, total, in_req) in spans[:25]
+            ],
+        }
+
+    def slow_requests(self) -> list:
+        with self._lock:
+            return list(reversed(self._slow))
+
+    def prometheus(self) -> str:
+        with self._lock:
+            routes = sorted((k, self._copy_stats(v)) for k, v in self._routes.items())
+            slow_total = self._slow_total
+            in_flight = len(self._active)
+        lines = [
+            "# HELP elaine_request_duration_seconds Request latency by route.",
+            "# TYPE elaine_request_duration_seconds histogram",
+        ]
+        for (method, rule), s in routes:
+            labels = f'method="{method}",route="{_escape(rule)}"'
+            for le, n in s.latency.cumulative():
+                bound = "+Inf" if le == float("inf") else repr(le)
+                lines.append(f'elaine_request_duration_seconds_bucket{{{labels},le="{bound}"}} {n}')
+            lines.append(f"elaine_request_duration_seconds_sum{{{labels}}} {s.latency.total:.6f}")
+            lines.append(f"elaine_request_duration_seconds_count{{{labels}}} {s.latency.count}")
+        lines += ["# HELP elaine_request_span_seconds_total Request time attributed to sql, http and engine calls.",
+                  "# TYPE elaine_request_span_seconds_total counter"]
+        for (method, rule), s in routes:
+            for kind in SPAN_KINDS:
+                lines.append(f'elaine_request_span_seconds_total{{method="{method}",route="{_escape(rule)}",'
+                             f'kind="{kind}"}} {s.span_s[kind]:.6f}')
+        lines += ["# HELP elaine_request_errors_total Requests answered with a 5xx status.",
+                  "# TYPE elaine_request_errors_total counter"]
+        for (method, rule), s in routes:
+            lines.append(f'elaine_request_errors_total{{method="{method}",route="{_escape(rule)}"}} {s.errors}')
+        lines += ["# HELP elaine_slow_requests_total Requests slower than the profiling threshold.",
+                  "# TYPE elaine_slow_requests_total counter",
+                  f"elaine_slow_requests_total {slow_total}",
+                  "# HELP elaine_requests_in_flight Requests currently being served.",
+                  "# TYPE elaine_requests_in_flight gauge",
+                  f"elaine_requests_in_flight {in_flight}"]
+        return "\n".join(lines) + "\n"
+
+    def reset(self):
+        with self._lock:
+            self._routes.clear()
+            self._spans.clear()
+            self._slow.clear()
+            self._slow_total = 0
+            self._started = time.time()
+
+    @staticmethod
+    def _copy_stats(stats):
+        copy = RouteStats()
+        copy.latency.counts = list(stats.latency.counts)
+        copy.latency.count = stats.latency.count
+        copy.latency.total = stats.latency.total
+        copy.latency.max = stats.latency.max
+        copy.errors = stats.errors
+        copy.statuses = Counter(stats.statuses)
+        copy.span_s = dict(stats.span_s)
+        copy.span_calls = dict(stats.span_calls)
+        return copy
+
+
+# ── Library Patches ──────────────────────────────────────────────
+
+_monitors = []              # PerfMonitors whose requests library spans are charged to
+_patched = False
+
+
+def _span(kind, name):
+    """Span on whichever monitor is timing this thread's request."""
+    for m in _monitors:
+        if getattr(m._local, "state", None) is not None:
+            return m.span(kind, name)
+    return _monitors[0].span(kind, name)
+
+
+def _patch_libraries():
+    global _patched
+    if _patched:
+        return
+    _patched = True
+
+    class TracedCursor(sqlite3.Cursor):
+        def execute(self, sql, *args):
+            with _span("sql", _sql_name(sql)):
+                return super().execute(sql, *args)
+
+        def executemany(self, sql, *args):
+            with _span("sql", _sql_name(sql)):
+                return super().executemany(sql, *args)
+
+        def executescript(self, script):
+            with _span("sql", "SCRIPT"):
+                return super().executescript(script)
+
+        def fetchall(self):
+            with _span("sql", "FETCH"):
+                return super().fetchall()
+
+    class TracedConnection(sqlite3.Connection):
+        def cursor(self, factory=TracedCursor):
+            return super().cursor(factory)
+
+        def execute(self, sql, *args):
+            return self.cursor().execute(sql, *args)
+
+        def executemany(self, sql, *args):
+            return self.cursor().executemany(sql, *args)
+
+        def executescript(self, script):
+            return self.cursor().executescript(script)
+
+        def commit(self):
+            with _span("sql", "COMMIT"):
+                return super().commit()
+
+    connect = sqlite3.connect
+
+    @functools.wraps(connect)
+    def traced_connect(*args, **kwargs):
+        kwargs.setdefault("factory", TracedConnection)
+        return connect(*args, **kwargs)
+
+    sqlite3.connect = traced_connect
+
+    urlopen = urllib.request.urlopen
+
+    @functools.wraps(urlopen)
+    def traced_urlopen(url, *args, **kwargs):
+        target = url.full_url if isinstance(url, urllib.request.Request) else url
+        with _span("http", _http_name(target)):
+            return urlopen(url, *args, **kwargs)
+
+    urllib.request.urlopen = traced_urlopen
+
+    if HAS_REQUESTS:
+        session_request = http_requests.Session.request
+
+        @functools.wraps(session_request)
+        def traced_request(session, method, url, *args, **kwargs):
+            with _span("http", _http_name(url)):
+                return session_request(session, method, url, *args, **kwargs)
+
+        http_requests.Session.request = traced_request
+
+
+_SQL_TABLE = re.compile(r"\b(?:FROM|INTO|UPDATE|TABLE(?:\s+IF\s+NOT\s+EXISTS)?)\s+[\"`\[]?(\w+)", re.I)
+
+
+def _sql_name(sql) -> str:
+    """'SELECT pois' — statement verb and first table, so names stay few."""
+    text = str(sql).lstrip()
+    verb = text.split(None, 1)[0].upper() if text else "SQL"
+    m = _SQL_TABLE.search(text)
+    return f"{verb} {m.group(1)}" if m else verb
+
+
+def _http_name(url) -> str:
+    m = re.match(r"\w+://([^/?#]+)", str(url))
+    return m.group(1) if m else "?"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"')
+
+
+monitor = PerfMonitor()
@@ -0,0 +1,244 @@
+"""
+ELAINE Phase 4: The Current — Feed Fetcher
+Concurrent, polite, conditional-GET fetch engine for The Current's scanners.
+
+- Bounded concurrency: at most `max_concurrency` requests in flight overall
+- Per-host politeness: at most `max_per_host` requests in flight per host,
+  and request starts spaced by that host's minimum interval
+- Conditional GETs: ETag / Last-Modified validators are stored in SQLite,
+  so an unchanged feed costs a single 304 and is never re-parsed
+- Parsing (feedparser / JSON) runs in a separate worker pool, so slow
+  parses never hold a network slot
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlencode, urlsplit
+
+try:
+    import requests
+    HAS_REQUESTS = True
+except ImportError:
+    HAS_REQUESTS = False
+
+try:
+    import feedparser
+    HAS_FEEDPARSER = True
+except ImportError:
+    HAS_FEEDPARSER = False
+
+
+USER_AGENT = 'ELAINE/1.0 (Almost Magic Tech Lab)'
+
+# Minimum seconds between request starts to the same host
+HOST_INTERVALS = {
+    'www.reddit.com': 2.0,
+    'api.semanticscholar.org': 3.0,
+    'www.googleapis.com': 1.0,
+}
+
+
+class FetchJob:
+    """One request: url (+ params), how to parse it, and an opaque tag for the caller."""
+
+    def __init__(self, url, params=None, parse='feed', tag=None, timeout=15):
+        self.url = url
+        self.params = params or {}
+        self.parse = parse          # 'feed' | 'json'
+        self.tag = tag
+        self.timeout = timeout
+
+    @property
+    def key(self):
+        """Validator key: the full request URL."""
+        return f"{self.url}?{urlencode(sorted(self.params.items()))}" if self.params else self.url
+
+
+class FetchResult:
+    def __init__(self, job, status=0, data=None, not_modified=False,
+                 error=None, duration=0.0):
+        self.job = job
+        self.status = status
+        self.data = data
+        self.not_modified = not_modified
+        self.error = error
+        self.duration = duration
+
+    @property
+    def ok(self):
+        return self.error is None and self.data is not None
+
+
+class FeedFetcher:
+    """Shared fetch engine. Thread-safe; scanners may call fetch_all() concurrently."""
+
+    def __init__(self, db_path, max_concurrency=8, max_per_host=4,
+                 host_intervals=None, parse_workers=4, session=None):
+        self.db_path = db_path
+        self.max_per_host = max_per_host
+        self.host_intervals = dict(HOST_INTERVALS if host_intervals is None else host_intervals)
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+        self._io_pool = ThreadPoolExecutor(max_workers=max_concurrency * 4,
+                                           thread_name_prefix='current-fetch')
+        self._parse_pool = ThreadPoolExecutor(max_workers=parse_workers,
+                                              thread_name_prefix='current-parse')
+        self._host_lock = threading.Lock()
+        self._host_slots = {}       # host → BoundedSemaphore
+        self._host_next = {}        # host → earliest next request start (monotonic)
+        self._session = session or (requests.Session() if HAS_REQUESTS else None)
+        self._stats_lock = threading.Lock()
+        self.stats = {'requests': 0, 'not_modified': 0, 'errors': 0, 'bytes': 0}
+        self._init_db()
+        self._validators = self._load_validators()
+
+    # ─── Validator Store ───
+    def _init_db(self):
+        conn = sqlite3.connect(self.db_path)
+        conn.execute("""CREATE TABLE IF NOT EXISTS fetch_validators (
+            url TEXT PRIMARY KEY,
+            etag TEXT,
+            last_modified TEXT,
+            status INTEGER,
+            fetched_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )""")
+        conn.commit()
+        conn.close()
+
+    def _load_validators(self):
+        conn = sqlite3.connect(self.db_path)
+        rows = conn.execute("SELECT url, etag, last_modified FROM fetch_validators").fetchall()
+        conn.close()
+        return {url: (etag, last_modified) for url, etag, last_modified in rows}
+
+    def _save_validators(self, results):
+        rows, dropped = [], []
+        for r in results:
+            if r.status != 200:
+                continue
+            if r.ok and r.job.key in self._validators:
+                etag, last_modified = self._validators[r.job.key]
+                rows.append((r.job.key, etag, last_modified, r.status))
+            else:
+                dropped.append((r.job.key,))     # Unreadable, or served without validators
+        if not rows and not dropped:
+            return
+        try:
+            conn = sqlite3.connect(self.db_path)
+            conn.executemany("""INSERT OR REPLACE INTO fetch_validators
+                (url, etag, last_modified, status, fetched_at)
+                VALUES (?, ?, ?, ?, CURRENT_TIMESTAMP)""", rows)
+            conn.executemany("DELETE FROM fetch_validators WHERE url = ?", dropped)
+            conn.commit()
+            conn.close()
+        except Exception:
+            pass
+
+    # ─── Politeness ───
+    def _host_slot(self, host):
+        with self._host_lock:
+            if host not in self._host_slots:
+                self._host_slots[host] = threading.BoundedSemaphore(self.max_per_host)
+            return self._host_slots[host]
+
+    def _wait_turn(self, host):
+        """Reserve the next start time for this host and sleep until it arrives."""
+        interval = self.host_intervals.get(host, 0.0)
+        with self._host_lock:
+            now = time.monotonic()
+            start = max(now, self._host_next.get(host, now))
+            self._host_next[host] = start + interval
+        if start > now:
+            time.sleep(start - now)
+
+    # ─── Fetching ───
+    def _fetch(self, job):
+        host = urlsplit(job.url).hostname or ''
+        headers = {'User-Agent': USER_AGENT}
+        etag, last_modified = self._validators.get(job.key, (None, None))
+        if etag:
+            headers['If-None-Match'] = etag
+        if last_modified:
+            headers['If-Modified-Since'] = last_modified
+
+        started = time.time()
+        with self._host_slot(host):
+            self._wait_turn(host)
+            with self._slots:
+                try:
+                    resp = self._session.get(job.url, params=job.params or None,
+                                             headers=headers, timeout=job.timeout)
+                except Exception as e:
+                    self._count('errors')
+                    return FetchResult(job, error=str(e), duration=time.time() - started)
+
+        self._count('requests')
+        if resp.status_code == 304:
+            self._count('not_modified')
+            return FetchResult(job, status=304, not_modified=True,
+                               duration=time.time() - started)
+        if resp.status_code != 200:
+            self._count('errors')
+            return FetchResult(job, status=resp.status_code,
+                               error=f"HTTP {resp.status_code}",
+                               duration=time.time() - started)
+
+        body = resp.content
+        self._count('bytes', len(body))
+        try:
+            data = self._parse_pool.submit(self._parse, job.parse, body).result()
+        except Exception as e:
+            # No validators for a body we could not read, or it would 304 forever
+            self._validators.pop(job.key, None)
+            self._count('errors')
+            return FetchResult(job, status=200, error=f"parse: {e}",
+                               duration=time.time() - started)
+
+        new_etag = resp.headers.get('ETag')
+        new_modified = resp.headers.get('Last-Modified')
+        if new_etag or new_modified:
+            self._validators[job.key] = (new_etag, new_modified)
+        else:
+            self._validators.pop(job.key, None)     # The old ones describe a body we no longer hold
+        return FetchResult(job, status=200, data=data, duration=time.time() - started)
+
+    @staticmethod
+    def _parse(kind, body):
+        if kind == 'feed':
+            # feedparser never raises; a feed it could not read comes back bozo with no entries
+            data = feedparser.parse(body)
+            if data.bozo and not data.entries:
+                raise ValueError(data.get('bozo_exception') or 'unreadable feed')
+            return data
+        return json.loads(body)
+
+    def _count(self, name, amount=1):
+        with self._stats_lock:
+            self.stats[name] += amount
+
+    def fetch_all(self, jobs):
+        """Fetch every job concurrently; returns results in job order."""
+        if not HAS_REQUESTS:
+            raise RuntimeError('requests not installed. Run: pip install requests')
+        futures = [self._io_pool.submit(self._fetch, job) for job in jobs]
+        results = [f.result() for f in futures]
+        self._save_validators(results)
+        return results
+
+    def forget(self, job):
+        """Drop one job's validators, so its next fetch is unconditional
+        (for a caller that could not use the body it was given)."""
+        self._validators.pop(job.key, None)
+        try:
+            conn = sqlite3.connect(self.db_path)
+            conn.execute("DELETE FROM fetch_validators WHERE url = ?", (job.key,))
+            conn.commit()
+            conn.close()
+        except Exception:
+            pass
+
+    def status(self):
+        with self._stats_lock:
+            return {**self.stats, 'validators': len(self._validators)}
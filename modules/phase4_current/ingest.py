@@ -0,0 +1,201 @@
+"""
+ELAINE Phase 4: The Current — Ingestion Pipeline
+Batched dedupe-and-insert for discoveries, with incremental trend counters.
+
+- Dedupe: an in-memory bloom filter over content hashes answers "definitely
+  new" for most items; only bloom hits are confirmed against the indexed
+  content_hash column, in one query per batch
+- Insert: one transaction per scan batch, rows written with executemany
+- Trends: every inserted discovery bumps (interest area, keyword, day)
+  counters in trend_buckets, so trend detection sums a few precomputed
+  day buckets instead of re-reading the discoveries table
+"""
+
+import hashlib
+import json
+import math
+import sqlite3
+import threading
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+
+
+AREA_TOTAL = ''     # trend_buckets keyword for the per-area total
+
+
+class BloomFilter:
+    """Fixed-size bloom filter over strings (double hashing of one SHA-1)."""
+
+    def __init__(self, capacity=200_000, error_rate=0.001):
+        self.size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, item):
+        digest = hashlib.sha1(item.encode()).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:16], 'little') | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hashes))
+
+    def add(self, item):
+        for pos in self._positions(item):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+    def __contains__(self, item):
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(item))
+
+
+def day_bucket(when=None):
+    """UTC day, matching SQLite's CURRENT_TIMESTAMP in discovered_at."""
+    return (when or datetime.now(timezone.utc)).strftime('%Y-%m-%d')
+
+
+class IngestPipeline:
+    """Writes batches of discoveries for TheCurrentEngine. Thread-safe."""
+
+    def __init__(self, db_path, bloom_capacity=200_000):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._init_db()
+        self.bloom = BloomFilter(capacity=bloom_capacity)
+        conn = sqlite3.connect(self.db_path)
+        for (content_hash,) in conn.execute(
+                "SELECT content_hash FROM discoveries WHERE content_hash IS NOT NULL"):
+            self.bloom.add(content_hash)
+        conn.close()
+        self.stats = {'batches': 0, 'offered': 0, 'inserted': 0,
+                      'duplicates': 0, 'bloom_checks': 0}
+
+    def _init_db(self):
+        conn = sqlite3.connect(self.db_path)
+        c = conn.cursor()
+        backfill = not c.execute("""SELECT 1 FROM sqlite_master
+            WHERE type = 'table' AND name = 'trend_buckets'""").fetchone()
+        c.execute("""CREATE TABLE IF NOT EXISTS trend_buckets (
+            interest_area TEXT NOT NULL,
+            keyword TEXT NOT NULL,
+            bucket TEXT NOT NULL,
+            mentions INTEGER DEFAULT 0,
+            PRIMARY KEY (bucket, interest_area, keyword)
+        )""")
+        c.execute("""CREATE INDEX IF NOT EXISTS idx_opportunities_discovery
+            ON content_opportunities(discovery_id)""")
+        conn.commit()
+        conn.close()
+        if backfill:
+            self.rebuild_trend_buckets()
+
+    def save(self, records, when=None):
+        """Insert new discoveries from one scan batch.
+
+        records: dicts with source, source_url, title, summary, author,
+        interest_area, keywords_matched, content_hash, relevance_score and
+        optional content. Returns summaries of the rows actually inserted.
+        """
+        if not records:
+            return []
+        with self._lock:
+            # Dedupe within the batch, then against the store
+            batch = {}
+            for rec in records:
+                batch.setdefault(rec['content_hash'], rec)
+            maybe_seen = [h for h in batch if h in self.bloom]
+            self.stats['bloom_checks'] += len(maybe_seen)
+
+            conn = sqlite3.connect(self.db_path)
+            try:
+                c = conn.cursor()
+                if maybe_seen:
+                    seen = set()
+                    for i in range(0, len(maybe_seen), 500):
+                        chunk = maybe_seen[i:i + 500]
+                        c.execute(f"""SELECT content_hash FROM discoveries
+                            WHERE content_hash IN ({','.join('?' * len(chunk))})""", chunk)
+                        seen.update(h for (h,) in c.fetchall())
+                    for h in seen:
+                        del batch[h]
+                new = list(batch.values())
+
+                ids = {}
+                if new:
+                    c.executemany("""INSERT OR IGNORE INTO discoveries
+                        (source, source_url, title, summary, content, author,
+                         interest_area, keywords_matched, relevance_score, content_hash)
+                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+                        [(r['source'], r['source_url'], r['title'], r['summary'],
+                          r.get('content'), r['author'], r['interest_area'],
+                          json.dumps(r['keywords_matched']),
+                          r.get('relevance_score', 0.5), r['content_hash'])
+                         for r in new])
+                    hashes = [r['content_hash'] for r in new]
+                    for i in range(0, len(hashes), 500):
+                        chunk = hashes[i:i + 500]
+                        c.execute(f"""SELECT content_hash, id FROM discoveries
+                            WHERE content_hash IN ({','.join('?' * len(chunk))})""", chunk)
+                        ids.update(c.fetchall())
+                    new = [r for r in new if r['content_hash'] in ids]
+                    self._bump_trends(c, new, day_bucket(when))
+                conn.commit()
+            finally:
+                conn.close()
+
+            for r in new:
+                self.bloom.add(r['content_hash'])
+            self.stats['batches'] += 1
+            self.stats['offered'] += len(records)
+            self.stats['inserted'] += len(new)
+            self.stats['duplicates'] += len(records) - len(new)
+
+        return [{'id': ids[r['content_hash']], 'title': r['title'],
+                 'source': r['source'], 'interest_area': r['interest_area'],
+                 'content_hash': r['content_hash']}
+                for r in new]
+
+    @staticmethod
+    def _bump_trends(c, rows, bucket):
+        counts = Counter()
+        for r in rows:
+            counts[(r['interest_area'], AREA_TOTAL)] += 1
+            for kw in set(r['keywords_matched']):
+                counts[(r['interest_area'], kw)] += 1
+        c.executemany("""INSERT INTO trend_buckets
+            (interest_area, keyword, bucket, mentions) VALUES (?, ?, ?, ?)
+            ON CONFLICT (bucket, interest_area, keyword)
+            DO UPDATE SET mentions = mentions + excluded.mentions""",
+            [(area, kw, bucket, n) for (area, kw), n in counts.items()])
+
+    def window_counts(self, days=7, keywords_only=True, now=None):
+        """{(interest_area, keyword): mentions} over the last `days` day buckets."""
+        since = day_bucket((now or datetime.now(timezone.utc)) - timedelta(days=days - 1))
+        conn = sqlite3.connect(self.db_path)
+        rows = conn.execute("""SELECT interest_area, keyword, SUM(mentions)
+            FROM trend_buckets WHERE bucket >= ?
+            GROUP BY interest_area, keyword""", (since,)).fetchall()
+        conn.close()
+        return {(area, kw): n for area, kw, n in rows
+                if not (keywords_only and kw == AREA_TOTAL)}
+
+    def rebuild_trend_buckets(self):
+        """Recount trend_buckets from the discoveries table (one-off backfill)."""
+        with self._lock:
+            conn = sqlite3.connect(self.db_path)
+            c = conn.cursor()
+            c.execute("DELETE FROM trend_buckets")
+            rows = c.execute("""SELECT interest_area, keywords_matched, discovered_at
+                FROM discoveries""").fetchall()
+            by_bucket = {}
+            for area, keywords, discovered_at in rows:
+                try:
+                    keywords = json.loads(keywords)
+                except (json.JSONDecodeError, TypeError):
+                    keywords = []
+                bucket = (discovered_at or day_bucket())[:10]
+                by_bucket.setdefault(bucket, []).append(
+                    {'interest_area': area or '', 'keywords_matched': keywords})
+            for bucket, bucket_rows in by_bucket.items():
+                self._bump_trends(c, bucket_rows, bucket)
+            conn.commit()
+            conn.close()
+            return len(rows)
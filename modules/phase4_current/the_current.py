@@ -12,22 +12,14 @@ import hashlib
 import re
 import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from pathlib import Path
 from urllib.parse import quote_plus
 
-# Optional imports — graceful fallback
-try:
-    import requests
-    HAS_REQUESTS = True
-except ImportError:
-    HAS_REQUESTS = False
-
-try:
-    import feedparser
-    HAS_FEEDPARSER = True
-except ImportError:
-    HAS_FEEDPARSER = False
+# Optional imports (requests, feedparser) — graceful fallback, in the fetcher
+from .fetcher import HAS_FEEDPARSER, HAS_REQUESTS, FeedFetcher, FetchJob
+from .ingest import IngestPipeline
 
 
 # ─── Default Interest Areas for Almost Magic ───
@@ -122,6 +114,8 @@ class TheCurrentEngine:
         self.db_path = db_path or str(Path.home() / ".elaine" / "the_current.db")
         Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
         self._init_db()
+        self.fetcher = FeedFetcher(self.db_path)
+        self.ingest = IngestPipeline(self.db_path)
         self.interest_areas = DEFAULT_INTEREST_AREAS
         self._scan_thread = None
         self._running = False
@@ -230,26 +224,59 @@ class TheCurrentEngine:
         conn.commit()
         conn.close()
 
-    # ─── RSS / News Scanning ───
-    def scan_rss_feeds(self, interest_area=None):
-        """Scan RSS feeds for new content in interest areas."""
-        if not HAS_FEEDPARSER:
-            return {"error": "feedparser not installed. Run: pip install feedparser"}
-
-        results = []
+    # ─── Scan Helpers ───
+    def _areas(self, interest_area=None):
+        """Resolve an interest area (name or dict) or all areas to config dicts."""
         areas = [interest_area] if interest_area else self.interest_areas
-
         for area in areas:
             if isinstance(area, str):
                 area = next((a for a in self.interest_areas if a['name'] == area), None)
                 if not area:
                     continue
+            yield area
+
+    def _ingest(self, scan_type, batches):
+        """Save one scan's discoveries in a single batch and log every source.
+        batches: [(FetchResult, [discovery record, ...]), ...]"""
+        saved = self.ingest.save([rec for _, records in batches for rec in records])
+        saved_hashes = {d.pop('content_hash') for d in saved}
+        logs = []
+        for fetched, records in batches:
+            area, label = fetched.job.tag[0], fetched.job.tag[1]
+            found = len({r['content_hash'] for r in records} & saved_hashes)
+            logs.append((scan_type, area['name'], label, found,
+                         fetched.duration, fetched.error))
+        self._log_scans(logs)
+        return saved
+
+    def _unreadable(self, fetched, error):
+        """A payload that broke its scanner: log the error against that feed
+        (not the whole scan) and fetch it unconditionally next time."""
+        fetched.error = str(error)
+        self.fetcher.forget(fetched.job)
+        return []
 
-            for feed_url in area.get('rss_feeds', []):
+    # ─── RSS / News Scanning ───
+    def scan_rss_feeds(self, interest_area=None):
+        """Scan RSS feeds for new content in interest areas.
+        Feeds are fetched concurrently with conditional GETs; an unchanged
+        feed answers 304 and is skipped without parsing."""
+        if not HAS_FEEDPARSER:
+            return {"error": "feedparser not installed. Run: pip install feedparser"}
+        if not HAS_REQUESTS:
+            return {"error": "requests not installed. Run: pip install requests"}
+
+        batches = []
+        jobs = [FetchJob(feed_url, parse='feed', tag=(area, feed_url))
+                for area in self._areas(interest_area)
+                for feed_url in area.get('rss_feeds', [])]
+
+        for fetched in self.fetcher.fetch_all(jobs):
+            area = fetched.job.tag[0]
+            records = []
+            if fetched.ok:
                 try:
-                    start = time.time()
-                    feed = feedparser.parse(feed_url)
-                    for entry in feed.entries[:10]:
+                    for entry in fetched.data.entries[:10]:
                         title = entry.get('title', '')
                         link = entry.get('link', '')
                         summary = entry.get('summary', '')[:500]
@@ -265,7 +292,7 @@ class TheCurrentEngine:
                                 f"{title}{link}".encode()
                             ).hexdigest()
 
-                            discovery = self._save_discovery(
+                            records.append(dict(
                                 source='rss',
                                 source_url=link,
                                 title=title,
@@ -274,17 +301,11 @@ class TheCurrentEngine:
                                 interest_area=area['name'],
                                 keywords_matched=matched,
                                 content_hash=content_hash
-                            )
-                            if discovery:
-                                results.append(discovery)
-
-                    duration = time.time() - start
-                    self._log_scan('rss', area['name'], feed_url,
-                                   len(results), duration)
+                            ))
                 except Exception as e:
-                    self._log_scan('rss', area['name'], feed_url,
-                                   0, 0, str(e))
-        return results
+                    records = self._unreadable(fetched, e)
+            batches.append((fetched, records))
+        return self._ingest('rss', batches)
 
     # ─── Reddit Scanning ───
     def scan_reddit(self, interest_area=None):
@@ -292,66 +313,52 @@ class TheCurrentEngine:
         if not HAS_REQUESTS:
             return {"error": "requests not installed. Run: pip install requests"}
 
-        results = []
-        areas = [interest_area] if interest_area else self.interest_areas
+        batches = []
+        jobs = [FetchJob(f"https://www.reddit.com/r/{subreddit}/hot.json",
+                         params={'limit': 15}, parse='json', timeout=10,
+                         tag=(area, f"r/{subreddit}"))
+                for area in self._areas(interest_area)
+                for subreddit in area.get('subreddits', [])]
+
+        for fetched in self.fetcher.fetch_all(jobs):
+            area = fetched.job.tag[0]
+            records = []
+            if fetched.ok:
+                try:
+                    posts = fetched.data.get('data', {}).get('children', [])
 
-        headers = {'User-Agent': 'ELAINE/1.0 (Almost Magic Tech Lab)'}
+                    for post in posts:
+                        pd = post.get('data', {})
+                        title = pd.get('title', '')
+                        selftext = pd.get('selftext', '')[:500]
+                        permalink = f"https://reddit.com{pd.get('permalink', '')}"
+                        author = pd.get('author', '')
+                        score = pd.get('score', 0)
 
-        for area in areas:
-            if isinstance(area, str):
-                area = next((a for a in self.interest_areas if a['name'] == area), None)
-                if not area:
-                    continue
+                        text = f"{title} {selftext}".lower()
+                        matched = [k for k in area['keywords']
+                                   if k.lower() in text]
 
-            for subreddit in area.get('subreddits', []):
-                try:
-                    start = time.time()
-                    url = f"https://www.reddit.com/r/{subreddit}/hot.json?limit=15"
-                    resp = requests.get(url, headers=headers, timeout=10)
-
-                    if resp.status_code == 200:
-                        data = resp.json()
-                        posts = data.get('data', {}).get('children', [])
-
-                        for post in posts:
-                            pd = post.get('data', {})
-                            title = pd.get('title', '')
-                            selftext = pd.get('selftext', '')[:500]
-                            permalink = f"https://reddit.com{pd.get('permalink', '')}"
-                            author = pd.get('author', '')
-                            score = pd.get('score', 0)
-
-                            text = f"{title} {selftext}".lower()
-                            matched = [k for k in area['keywords']
-                                       if k.lower() in text]
-
-                            if matched and score > 5:
-                                content_hash = hashlib.md5(
-                                    permalink.encode()
-                                ).hexdigest()
-
-                                discovery = self._save_discovery(
-                                    source='reddit',
-                                    source_url=permalink,
-                                    title=title,
-                                    summary=selftext,
-                                    author=f"u/{author}",
-                                    interest_area=area['name'],
-                                    keywords_matched=matched,
-                                    relevance_score=min(1.0, score / 100),
-                                    content_hash=content_hash
-                                )
-                                if discovery:
-                                    results.append(discovery)
-
-                    duration = time.time() - start
-                    self._log_scan('reddit', area['name'],
-                                   f"r/{subreddit}", len(results), duration)
-                    time.sleep(2)  # Rate limiting
+                        if matched and score > 5:
+                            content_hash = hashlib.md5(
+                                permalink.encode()
+                            ).hexdigest()
+
+                            records.append(dict(
+                                source='reddit',
+                                source_url=permalink,
+                                title=title,
+                                summary=selftext,
+                                author=f"u/{author}",
+                                interest_area=area['name'],
+                                keywords_matched=matched,
+                                relevance_score=min(1.0, score / 100),
+                                content_hash=content_hash
+                            ))
                 except Exception as e:
-                    self._log_scan('reddit', area['name'],
-                                   f"r/{subreddit}", 0, 0, str(e))
-        return results
+                    records = self._unreadable(fetched, e)
+            batches.append((fetched, records))
+        return self._ingest('reddit', batches)
 
     # ─── Academic Paper Scanning ───
     def scan_academic(self, interest_area=None):
@@ -359,66 +366,54 @@ class TheCurrentEngine:
         if not HAS_REQUESTS:
             return {"error": "requests not installed"}
 
-        results = []
-        areas = [interest_area] if interest_area else self.interest_areas
-
-        for area in areas:
-            if isinstance(area, str):
-                area = next((a for a in self.interest_areas if a['name'] == area), None)
-                if not area:
-                    continue
-
-            for query in area.get('scholar_queries', []):
+        batches = []
+        year_range = f"{datetime.now().year - 1}-{datetime.now().year}"
+        jobs = [FetchJob("https://api.semanticscholar.org/graph/v1/paper/search",
+                         params={
+                             'query': query,
+                             'limit': 10,
+                             'fields': 'title,abstract,authors,year,url,citationCount',
+                             'year': year_range,
+                         },
+                         parse='json', timeout=15, tag=(area, query))
+                for area in self._areas(interest_area)
+                for query in area.get('scholar_queries', [])]
+
+        for fetched in self.fetcher.fetch_all(jobs):
+            area, query = fetched.job.tag
+            records = []
+            if fetched.ok:
                 try:
-                    start = time.time()
-                    url = "https://api.semanticscholar.org/graph/v1/paper/search"
-                    params = {
-                        'query': query,
-                        'limit': 10,
-                        'fields': 'title,abstract,authors,year,url,citationCount',
-                        'year': f"{datetime.now().year - 1}-{datetime.now().year}"
-                    }
-                    resp = requests.get(url, params=params, timeout=15)
-
-                    if resp.status_code == 200:
-                        data = resp.json()
-                        for paper in data.get('data', []):
-                            title = paper.get('title', '')
-                            abstract = (paper.get('abstract') or '')[:500]
-                            authors = ", ".join(
-                                a.get('name', '') for a in
-                                (paper.get('authors') or [])[:3]
-                            )
-                            paper_url = paper.get('url', '')
-
-                            content_hash = hashlib.md5(
-                                title.encode()
-                            ).hexdigest()
-
-                            discovery = self._save_discovery(
-                                source='academic',
-                                source_url=paper_url,
-                                title=title,
-                                summary=abstract,
-                                author=authors,
-                                interest_area=area['name'],
-                                keywords_matched=[query],
-                                relevance_score=min(1.0,
-                                    (paper.get('citationCount', 0) + 1) / 50
-                                ),
-                                content_hash=content_hash
-                            )
-                            if discovery:
-                                results.append(discovery)
-
-                    duration = time.time() - start
-                    self._log_scan('academic', area['name'], query,
-                                   len(results), duration)
-                    time.sleep(3)  # Rate limiting
+                    for paper in fetched.data.get('data', []):
+                        title = paper.get('title', '')
+                        abstract = (paper.get('abstract') or '')[:500]
+                        authors = ", ".join(
+                            a.get('name', '') for a in
+                            (paper.get('authors') or [])[:3]
+                        )
+                        paper_url = paper.get('url', '')
+
+                        content_hash = hashlib.md5(
+                            title.encode()
+                        ).hexdigest()
+
+                        records.append(dict(
+                            source='academic',
+                            source_url=paper_url,
+                            title=title,
+                            summary=abstract,
+                            author=authors,
+                            interest_area=area['name'],
+                            keywords_matched=[query],
+                            relevance_score=min(1.0,
+                                (paper.get('citationCount', 0) + 1) / 50
+                            ),
+                            content_hash=content_hash
+                        ))
                 except Exception as e:
-                    self._log_scan('academic', area['name'], query,
-                                   0, 0, str(e))
-        return results
+                    records = self._unreadable(fetched, e)
+            batches.append((fetched, records))
+        return self._ingest('academic', batches)
 
     # ─── Google Books Scanning ───
     def scan_books(self, interest_area=None):
@@ -426,78 +421,79 @@ class TheCurrentEngine:
         if not HAS_REQUESTS:
             return {"error": "requests not installed"}
 
-        results = []
-        areas = [interest_area] if interest_area else self.interest_areas
-
-        for area in areas:
-            if isinstance(area, str):
-                area = next((a for a in self.interest_areas if a['name'] == area), None)
-                if not area:
-                    continue
-
-            for keyword in area.get('keywords', [])[:3]:
+        batches = []
+        jobs = [FetchJob("https://www.googleapis.com/books/v1/volumes",
+                         params={
+                             'q': keyword,
+                             'orderBy': 'newest',
+                             'maxResults': 5,
+                             'langRestrict': 'en',
+                         },
+                         parse='json', timeout=10, tag=(area, keyword))
+                for area in self._areas(interest_area)
+                for keyword in area.get('keywords', [])[:3]]
+
+        for fetched in self.fetcher.fetch_all(jobs):
+            area, keyword = fetched.job.tag
+            records = []
+            if fetched.ok:
                 try:
-                    start = time.time()
-                    url = "https://www.googleapis.com/books/v1/volumes"
-                    params = {
-                        'q': keyword,
-                        'orderBy': 'newest',
-                        'maxResults': 5,
-                        'langRestrict': 'en'
-                    }
-                    resp = requests.get(url, params=params, timeout=10)
-
-                    if resp.status_code == 200:
-                        data = resp.json()
-                        for item in data.get('items', []):
-                            info = item.get('volumeInfo', {})
-                            title = info.get('title', '')
-                            authors = ", ".join(info.get('authors', []))
-                            desc = (info.get('description') or '')[:500]
-                            link = info.get('infoLink', '')
-
-                            content_hash = hashlib.md5(
-                                f"book:{title}:{authors}".encode()
-                            ).hexdigest()
-
-                            discovery = self._save_discovery(
-                                source='books',
-                                source_url=link,
-                                title=f"📚 {title}",
-                                summary=desc,
-                                author=authors,
-                                interest_area=area['name'],
-                                keywords_matched=[keyword],
-                                content_hash=content_hash
-                            )
-                            if discovery:
-                                results.append(discovery)
-
-                    duration = time.time() - start
-                    self._log_scan('books', area['name'], keyword,
-                                   len(results), duration)
-                    time.sleep(1)
+                    for item in fetched.data.get('items', []):
+                        info = item.get('volumeInfo', {})
+                        title = info.get('title', '')
+                        authors = ", ".join(info.get('authors', []))
+                        desc = (info.get('description') or '')[:500]
+                        link = info.get('infoLink', '')
+
+                        content_hash = hashlib.md5(
+                            f"book:{title}:{authors}".encode()
+                        ).hexdigest()
+
+                        records.append(dict(
+                            source='books',
+                            source_url=link,
+                            title=f"📚 {title}",
+                            summary=desc,
+                            author=authors,
+                            interest_area=area['name'],
+                            keywords_matched=[keyword],
+                            content_hash=content_hash
+                        ))
                 except Exception as e:
-                    self._log_scan('books', area['name'], keyword,
-                                   0, 0, str(e))
-        return results
+                    records = self._unreadable(fetched, e)
+            batches.append((fetched, records))
+        return self._ingest('books', batches)
 
     # ─── Full Scan ───
     def run_full_scan(self):
-        """Run all scanners across all interest areas."""
-        results = {
-            'rss': self.scan_rss_feeds(),
-            'reddit': self.scan_reddit(),
-            'academic': self.scan_academic(),
-            'books': self.scan_books(),
-            'timestamp': datetime.now().isoformat()
+        """Run all scanners across all interest areas, in parallel.
+        They share one fetcher, so overall concurrency and per-host
+        politeness still hold; the scan takes about as long as the
+        slowest source instead of the sum of all of them."""
+        scanners = {
+            'rss': self.scan_rss_feeds,
+            'reddit': self.scan_reddit,
+            'academic': self.scan_academic,
+            'books': self.scan_books,
         }
+        with ThreadPoolExecutor(max_workers=len(scanners),
+                                thread_name_prefix='current-scan') as pool:
+            futures = {name: pool.submit(scan) for name, scan in scanners.items()}
+            results = {}
+            for name, future in futures.items():
+                try:
+                    results[name] = future.result()
+                except Exception as e:
+                    results[name] = {"error": str(e)}
+        results['timestamp'] = datetime.now().isoformat()
         total = sum(len(v) for v in results.values() if isinstance(v, list))
         results['total_new'] = total
+        results['fetch'] = self.fetcher.status()
 
-        # After scanning, generate content opportunities
+        # After scanning, generate content opportunities for the new discoveries
         if total > 0:
-            self.generate_content_opportunities()
+            new_ids = [d['id'] for v in results.values() if isinstance(v, list) for d in v]
+            self.generate_content_opportunities(discovery_ids=new_ids)
             self.detect_trends()
 
         return results
@@ -527,32 +523,43 @@ class TheCurrentEngine:
         return {"status": "stopped"}
 
     # ─── Content Opportunity Generator ───
-    def generate_content_opportunities(self, limit=20):
-        """Analyse recent discoveries and suggest content formats."""
+    def generate_content_opportunities(self, limit=20, discovery_ids=None):
+        """Analyse recent discoveries and suggest content formats.
+        With discovery_ids (e.g. the ones a scan just inserted) only those
+        are considered, instead of searching the whole table."""
         conn = sqlite3.connect(self.db_path)
         conn.row_factory = sqlite3.Row
         c = conn.cursor()
 
         # Get unprocessed high-relevance discoveries
-        c.execute("""SELECT * FROM discoveries
-            WHERE id NOT IN (SELECT discovery_id FROM content_opportunities
-                             WHERE discovery_id IS NOT NULL)
-            AND relevance_score >= 0.3
-            ORDER BY relevance_score DESC, discovered_at DESC
-            LIMIT ?""", (limit,))
+        only = ""
+        params = []
+        if discovery_ids is not None:
+            if not discovery_ids:
+                conn.close()
+                return []
+            only = f"AND d.id IN ({','.join('?' * len(discovery_ids))})"
+            params = list(discovery_ids)
+        c.execute(f"""SELECT d.* FROM discoveries d
+            WHERE NOT EXISTS (SELECT 1 FROM content_opportunities o
+                              WHERE o.discovery_id = d.id)
+            AND d.relevance_score >= 0.3 {only}
+            ORDER BY d.relevance_score DESC, d.discovered_at DESC
+            LIMIT ?""", params + [limit])
         discoveries = [dict(r) for r in c.fetchall()]
 
         opportunities = []
+        rows = []
         for disc in discoveries:
             # Map discovery to content formats based on source and area
             formats = self._suggest_formats(disc)
             for fmt in formats:
-                c.execute("""INSERT INTO content_opportunities
-                    (discovery_id, format, title, hook, target_audience, urgency)
-                    VALUES (?, ?, ?, ?, ?, ?)""",
-                    (disc['id'], fmt['format'], fmt['title'],
-                     fmt['hook'], fmt['audience'], fmt['urgency']))
+                rows.append((disc['id'], fmt['format'], fmt['title'],
+                             fmt['hook'], fmt['audience'], fmt['urgency']))
                 opportunities.append(fmt)
+        c.executemany("""INSERT INTO content_opportunities
+            (discovery_id, format, title, hook, target_audience, urgency)
+            VALUES (?, ?, ?, ?, ?, ?)""", rows)
 
         conn.commit()
         conn.close()
@@ -639,55 +646,34 @@ class TheCurrentEngine:
 
     # ─── Trend Detection ───
     def detect_trends(self):
-        """Analyse discoveries for emerging trends."""
+        """Promote keywords mentioned 3+ times in the last 7 days to trends.
+        Reads the day-bucket counters kept by the ingest pipeline."""
+        keyword_counts = self.ingest.window_counts(days=7)
+
         conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
         c = conn.cursor()
+        existing = {(area, topic): trend_id for trend_id, topic, area in
+                    c.execute("SELECT id, topic, interest_area FROM trends")}
 
-        # Get recent discoveries (last 7 days)
-        week_ago = (datetime.now() - timedelta(days=7)).isoformat()
-        c.execute("""SELECT interest_area, keywords_matched, title
-            FROM discoveries WHERE discovered_at >= ?""", (week_ago,))
-        rows = c.fetchall()
-
-        # Count keyword frequencies
-        keyword_counts = {}
-        for row in rows:
-            area = row['interest_area']
-            try:
-                keywords = json.loads(row['keywords_matched'])
-            except (json.JSONDecodeError, TypeError):
-                keywords = []
-
-            for kw in keywords:
-                key = f"{area}::{kw}"
-                keyword_counts[key] = keyword_counts.get(key, 0) + 1
-
-        # Update or create trends
-        for key, count in keyword_counts.items():
+        now = datetime.now().isoformat()
+        updates, inserts = [], []
+        for (area, topic), count in keyword_counts.items():
             if count >= 3:  # Threshold for trend
-                area, topic = key.split("::", 1)
-                c.execute("""SELECT id, mention_count FROM trends
-                    WHERE topic = ? AND interest_area = ?""", (topic, area))
-                existing = c.fetchone()
-
-                if existing:
-                    new_count = existing['mention_count'] + count
-                    velocity = count / 7  # mentions per day
-                    c.execute("""UPDATE trends
-                        SET mention_count = ?, velocity = ?,
-                            last_seen = ?, status = ?
-                        WHERE id = ?""",
-                        (new_count, velocity,
-                         datetime.now().isoformat(),
-                         'accelerating' if velocity > 1 else 'steady',
-                         existing['id']))
+                velocity = count / 7  # mentions per day
+                if (area, topic) in existing:
+                    updates.append((count, velocity, now,
+                                    'accelerating' if velocity > 1 else 'steady',
+                                    existing[(area, topic)]))
                 else:
-                    c.execute("""INSERT INTO trends
-                        (topic, interest_area, mention_count, velocity, status)
-                        VALUES (?, ?, ?, ?, ?)""",
-                        (topic, area, count, count / 7, 'emerging'))
-
+                    inserts.append((topic, area, count, velocity, 'emerging'))
+
+        c.executemany("""UPDATE trends
+            SET mention_count = ?, velocity = ?,
+                last_seen = ?, status = ?
+            WHERE id = ?""", updates)
+        c.executemany("""INSERT INTO trends
+            (topic, interest_area, mention_count, velocity, status)
+            VALUES (?, ?, ?, ?, ?)""", inserts)
         conn.commit()
         conn.close()
 
@@ -719,37 +705,32 @@ class TheCurrentEngine:
     def _save_discovery(self, source, source_url, title, summary,
                         author, interest_area, keywords_matched,
                         content_hash, relevance_score=0.5, content=None):
+        """Save a single discovery (scanners batch through self.ingest)."""
         try:
-            conn = sqlite3.connect(self.db_path)
-            c = conn.cursor()
-            c.execute("""INSERT OR IGNORE INTO discoveries
-                (source, source_url, title, summary, content, author,
-                 interest_area, keywords_matched, relevance_score, content_hash)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
-                (source, source_url, title, summary, content, author,
-                 interest_area, json.dumps(keywords_matched),
-                 relevance_score, content_hash))
-            disc_id = c.lastrowid if c.rowcount > 0 else None
-            conn.commit()
-            conn.close()
-            if disc_id:
-                return {'id': disc_id, 'title': title, 'source': source,
-                        'interest_area': interest_area}
+            saved = self.ingest.save([dict(
+                source=source, source_url=source_url, title=title,
+                summary=summary, author=author, interest_area=interest_area,
+                keywords_matched=keywords_matched, content_hash=content_hash,
+                relevance_score=relevance_score, content=content)])
         except Exception:
-            pass
+            return None
+        if saved:
+            saved[0].pop('content_hash')
+            return saved[0]
         return None
 
-    def _log_scan(self, scan_type, interest_area, source,
-                  items_found, duration, error=None):
+    def _log_scans(self, rows):
+        """rows: (scan_type, interest_area, source, items_found, duration, error)"""
         try:
             conn = sqlite3.connect(self.db_path)
             c = conn.cursor()
-            c.execute("""INSERT INTO scan_log
+            c.executemany("""INSERT INTO scan_log
                 (scan_type, interest_area, source, items_found,
                  status, duration_seconds, error_message)
                 VALUES (?, ?, ?, ?, ?, ?, ?)""",
-                (scan_type, interest_area, source, items_found,
-                 'error' if error else 'completed', duration, error))
+                [(scan_type, area, source, items_found,
+                  'error' if error else 'completed', duration, error)
+                 for scan_type, area, source, items_found, duration, error in rows])
             conn.commit()
             conn.close()
         except Exception:
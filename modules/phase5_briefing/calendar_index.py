@@ -0,0 +1,414 @@
+"""
+ELAINE Phase 5: Calendar Index
+Parsed-calendar cache and time-window index for the morning briefing.
+
+ICS files are parsed once and cached against their (mtime, size); an
+unchanged file is never re-read. Parsed events, with recurring series
+expanded over a rolling window, go into a start-sorted index, so "what
+starts between A and B" is a bisect plus the matching slice however many
+years of history the calendar carries.
+
+Recurrence support covers what desktop calendars export for meetings:
+RRULE with FREQ=DAILY/WEEKLY/MONTHLY/YEARLY, INTERVAL, COUNT, UNTIL,
+BYDAY (with ordinals for MONTHLY) and BYMONTHDAY, plus RDATE, EXDATE and
+RECURRENCE-ID overrides. Times ending in Z are converted to local time;
+TZID-qualified times are taken as local, as before.
+"""
+
+import calendar
+import os
+import threading
+from bisect import bisect_left
+from datetime import date, datetime, timedelta, timezone
+
+
+PAST_DAYS = 1           # Index window kept behind "now"
+FUTURE_DAYS = 30        # ... and ahead of it
+MAX_PERIODS = 50_000    # Guard against runaway RRULE expansion
+
+WEEKDAYS = {"MO": 0, "TU": 1, "WE": 2, "TH": 3, "FR": 4, "SA": 5, "SU": 6}
+
+
+# ─── Parsing ───
+def unfold(text):
+    """Content lines with RFC 5545 folding (CRLF + space/tab) undone."""
+    lines = []
+    for raw in text.splitlines():
+        if raw[:1] in (" ", "\t") and lines:
+            lines[-1] += raw[1:]
+        elif raw:
+            lines.append(raw)
+    return lines
+
+
+def split_line(line):
+    """'NAME;P=1;Q="a:b":value' → ('NAME', {'P': '1', 'Q': 'a:b'}, 'value')."""
+    quoted = False
+    for i, ch in enumerate(line):
+        if ch == '"':
+            quoted = not quoted
+        elif ch == ":" and not quoted:
+            head, value = line[:i], line[i + 1:]
+            break
+    else:
+        return line.upper(), {}, ""
+    name, *params = head.split(";")
+    parsed = {}
+    for p in params:
+        key, _, val = p.partition("=")
+        parsed[key.upper()] = val.strip('"')
+    return name.upper(), parsed, value
+
+
+def unescape(value):
+    return (value.replace("\\n", " ").replace("\\N", " ").replace("\\,", ",")
+            .replace("\\;", ";").replace("\\\\", "\\"))
+
+
+def parse_dt(value):
+    """ICS DATE or DATE-TIME → naive local datetime (None if unparseable)."""
+    value = value.strip()
+    utc = value.endswith("Z")
+    value = value.rstrip("Z")
+    for fmt in ("%Y%m%dT%H%M%S", "%Y%m%d", "%Y%m%dT%H%M"):
+        try:
+            dt = datetime.strptime(value, fmt)
+        except ValueError:
+            continue
+        if utc:
+            dt = dt.replace(tzinfo=timezone.utc).astimezone().replace(tzinfo=None)
+        return dt
+    return None
+
+
+def parse_duration(value):
+    """ICS DURATION (e.g. PT1H30M, P1D) → timedelta."""
+    sign = -1 if value.startswith("-") else 1
+    value = value.lstrip("+-").lstrip("P")
+    total, number, in_time = timedelta(), "", False
+    units = {"W": "weeks", "D": "days", "H": "hours", "M": "minutes", "S": "seconds"}
+    for ch in value:
+        if ch == "T":
+            in_time = True
+        elif ch.isdigit():
+            number += ch
+        elif ch in units and number:
+            if ch == "M" and not in_time:
+                return None
+            total += timedelta(**{units[ch]: int(number)})
+            number = ""
+    return sign * total
+
+
+def parse_ics(text):
+    """All VEVENTs in an ICS document as plain dicts (series not expanded)."""
+    events = []
+    ev = None
+    depth = 0       # nesting inside the current VEVENT (VALARM etc.)
+    for line in unfold(text):
+        name, params, value = split_line(line)
+        if name == "BEGIN":
+            if value.upper() == "VEVENT" and ev is None:
+                ev = {"attendees": [], "exdates": set(), "rdates": []}
+                depth = 0
+            elif ev is not None:
+                depth += 1
+            continue
+        if name == "END":
+            if ev is not None and depth:
+                depth -= 1
+            elif ev is not None and value.upper() == "VEVENT":
+                if isinstance(ev.get("start"), datetime):
+                    events.append(_finish(ev))
+                ev = None
+            continue
+        if ev is None or depth:
+            continue
+
+        if name == "SUMMARY":
+            ev["title"] = unescape(value)
+        elif name == "LOCATION":
+            ev["location"] = unescape(value)
+        elif name == "UID":
+            ev["uid"] = value
+        elif name == "DTSTART":
+            ev["start"] = parse_dt(value)
+            ev["all_day"] = params.get("VALUE") == "DATE" or len(value.strip()) == 8
+        elif name == "DTEND":
+            ev["end"] = parse_dt(value)
+        elif name == "DURATION":
+            ev["duration"] = parse_duration(value)
+        elif name == "RRULE":
+            ev["rrule"] = parse_rrule(value)
+        elif name == "EXDATE":
+            ev["exdates"].update(d for d in map(parse_dt, value.split(",")) if d)
+        elif name == "RDATE" and params.get("VALUE") != "PERIOD":
+            ev["rdates"].extend(d for d in map(parse_dt, value.split(",")) if d)
+        elif name == "RECURRENCE-ID":
+            ev["recurrence_id"] = parse_dt(value)
+        elif name == "ATTENDEE":
+            _, sep, addr = value.partition(":") if value.lower().startswith("mailto:") else ("", "", "")
+            if sep:
+                ev["attendees"].append(addr.strip())
+            elif params.get("CN"):
+                ev["attendees"].append(params["CN"])
+    return events
+
+
+def _finish(ev):
+    start = ev["start"]
+    if isinstance(ev.get("end"), datetime) and ev["end"] >= start:
+        ev["length"] = ev["end"] - start
+    elif ev.get("duration") is not None:
+        ev["length"] = ev["duration"]
+    else:
+        ev["length"] = timedelta(days=1) if ev.get("all_day") else timedelta()
+    ev.pop("end", None)
+    ev.pop("duration", None)
+    return ev
+
+
+def parse_rrule(value):
+    rule = {}
+    for part in value.split(";"):
+        key, _, val = part.partition("=")
+        rule[key.upper()] = val
+    parsed = {
+        "freq": rule.get("FREQ", "").upper(),
+        "interval": max(1, int(rule.get("INTERVAL", 1) or 1)),
+        "count": int(rule["COUNT"]) if rule.get("COUNT", "").isdigit() else None,
+        "until": parse_dt(rule["UNTIL"]) if rule.get("UNTIL") else None,
+        "byday": [],
+        "bymonthday": [int(d) for d in rule.get("BYMONTHDAY", "").split(",") if d.lstrip("-").isdigit()],
+    }
+    if parsed["until"] is not None and len(rule["UNTIL"].rstrip("Z")) == 8:
+        parsed["until"] += timedelta(days=1, microseconds=-1)     # DATE UNTIL is inclusive
+    for day in filter(None, rule.get("BYDAY", "").split(",")):
+        code = day[-2:].upper()
+        if code in WEEKDAYS:
+            nth = day[:-2]
+            parsed["byday"].append((int(nth) if nth.lstrip("+-").isdigit() else 0, WEEKDAYS[code]))
+    return parsed
+
+
+# ─── Recurrence ───
+def _month_add(year, month, n):
+    index = year * 12 + (month - 1) + n
+    return index // 12, index % 12 + 1
+
+
+def _monthly_days(year, month, rule, dtstart):
+    """Days of one month selected by BYMONTHDAY / BYDAY (default: DTSTART's day)."""
+    last = calendar.monthrange(year, month)[1]
+    days = set()
+    for d in rule["bymonthday"]:
+        day = d if d > 0 else last + d + 1
+        if 1 <= day <= last:
+            days.add(day)
+    for nth, weekday in rule["byday"]:
+        matches = [d for d in range(1, last + 1) if date(year, month, d).weekday() == weekday]
+        if nth == 0:
+            days.update(matches)
+        elif -len(matches) <= nth <= len(matches) and nth:
+            days.add(matches[nth - 1 if nth > 0 else nth])
+    if not rule["bymonthday"] and not rule["byday"] and dtstart.day <= last:
+        days.add(dtstart.day)
+    return sorted(days)
+
+
+def _period(dtstart, rule, k):
+    """Candidate starts in the k-th period of the series (unsorted, unfiltered)."""
+    freq, step = rule["freq"], rule["interval"] * k
+    clock = dtstart.time()
+    if freq == "DAILY":
+        day = dtstart + timedelta(days=step)
+        if rule["byday"] and day.weekday() not in {w for _, w in rule["byday"]}:
+            return []
+        return [day]
+    if freq == "WEEKLY":
+        week = dtstart.date() - timedelta(days=dtstart.weekday()) + timedelta(weeks=step)
+        weekdays = sorted({w for _, w in rule["byday"]}) or [dtstart.weekday()]
+        return [datetime.combine(week + timedelta(days=w), clock) for w in weekdays]
+    if freq == "MONTHLY":
+        year, month = _month_add(dtstart.year, dtstart.month, step)
+        return [datetime.combine(date(year, month, d), clock)
+                for d in _monthly_days(year, month, rule, dtstart)]
+    if freq == "YEARLY":
+        year = dtstart.year + step
+        if dtstart.month == 2 and dtstart.day == 29 and not calendar.isleap(year):
+            return []
+        return [dtstart.replace(year=year)]
+    return []
+
+
+def _skip_periods(dtstart, rule, window_start):
+    """Whole periods that end before the window (only safe without COUNT)."""
+    if rule["count"] is not None or window_start <= dtstart:
+        return 0
+    freq, interval = rule["freq"], rule["interval"]
+    if freq == "DAILY":
+        periods = (window_start - dtstart).days // interval
+    elif freq == "WEEKLY":
+        periods = (window_start - dtstart).days // (7 * interval)
+    elif freq == "MONTHLY":
+        periods = ((window_start.year - dtstart.year) * 12
+                   + window_start.month - dtstart.month) // interval
+    elif freq == "YEARLY":
+        periods = (window_start.year - dtstart.year) // interval
+    else:
+        return 0
+    return max(0, periods - 1)
+
+
+def expand(ev, window_start, window_end):
+    """Start times of a series' instances that fall in [window_start, window_end)."""
+    dtstart, rule = ev["start"], ev.get("rrule")
+    starts = set()
+    if rule and rule["freq"] in ("DAILY", "WEEKLY", "MONTHLY", "YEARLY"):
+        emitted = 0
+        first = _skip_periods(dtstart, rule, window_start)
+        for k in range(first, first + MAX_PERIODS):
+            candidates = sorted(c for c in _period(dtstart, rule, k) if c >= dtstart)
+            if not candidates and _period_start(dtstart, rule, k) >= window_end:
+                break
+            done = False
+            for cand in candidates:
+                if (rule["until"] and cand > rule["until"]) or cand >= window_end:
+                    done = True
+                    break
+                emitted += 1
+                if cand >= window_start:
+                    starts.add(cand)
+                if rule["count"] is not None and emitted >= rule["count"]:
+                    done = True
+                    break
+            if done:
+                break
+    else:
+        if window_start <= dtstart < window_end:
+            starts.add(dtstart)
+    starts.update(d for d in ev["rdates"] if window_start <= d < window_end)
+    return sorted(starts - ev["exdates"])
+
+
+def _period_start(dtstart, rule, k):
+    freq, step = rule["freq"], rule["interval"] * k
+    if freq == "MONTHLY":
+        year, month = _month_add(dtstart.year, dtstart.month, step)
+        return datetime(year, month, 1)
+    if freq == "YEARLY":
+        return datetime(dtstart.year + step, 1, 1)
+    return dtstart + timedelta(days=step * (7 if freq == "WEEKLY" else 1))
+
+
+# ─── Index ───
+class CalendarIndex:
+    """Start-sorted event instances over [window_start, window_end)."""
+
+    def __init__(self, events, window_start, window_end):
+        self.window_start = window_start
+        self.window_end = window_end
+        overrides = {(ev.get("uid"), ev["recurrence_id"]) for ev in events
+                     if ev.get("recurrence_id") and ev.get("uid")}
+        instances = []
+        for ev in events:
+            if ev.get("recurrence_id"):
+                starts = [ev["start"]] if window_start <= ev["start"] < window_end else []
+            else:
+                starts = [s for s in expand(ev, window_start, window_end)
+                          if (ev.get("uid"), s) not in overrides]
+            for s in starts:
+                instances.append({
+                    "title": ev.get("title", "Untitled"),
+                    "start": s,
+                    "end": s + ev["length"],
+                    "all_day": ev.get("all_day", False),
+                    "location": ev.get("location", ""),
+                    "attendees": list(ev["attendees"]),
+                    "uid": ev.get("uid"),
+                    "recurring": bool(ev.get("rrule") or ev.get("recurrence_id")),
+                })
+        instances.sort(key=lambda i: i["start"])
+        self.instances = instances
+        self._starts = [i["start"] for i in instances]
+
+    def covers(self, start, end):
+        return self.window_start <= start and end <= self.window_end
+
+    def starting_between(self, start, end):
+        """Instances whose start falls in [start, end)."""
+        lo = bisect_left(self._starts, start)
+        hi = bisect_left(self._starts, end, lo)
+        return self.instances[lo:hi]
+
+    def __len__(self):
+        return len(self.instances)
+
+
+class CalendarCache:
+    """Parsed ICS files keyed by (mtime, size), plus a shared CalendarIndex.
+
+    The index is rebuilt only when a file changes, a file appears or
+    disappears, or a query falls outside the indexed window. Thread-safe.
+    """
+
+    def __init__(self, past_days=PAST_DAYS, future_days=FUTURE_DAYS):
+        self.past = timedelta(days=past_days)
+        self.future = timedelta(days=future_days)
+        self._files = {}            # path → ((mtime_ns, size), events)
+        self._index = None
+        self._index_key = None
+        self._lock = threading.Lock()
+        self.stats = {"parses": 0, "index_builds": 0, "queries": 0, "errors": 0}
+
+    def _load(self, paths):
+        """(signature tuple, events) for the readable files among `paths`."""
+        signature, events = [], []
+        for path in dict.fromkeys(p for p in paths if p):
+            try:
+                st = os.stat(path)
+            except OSError:
+                self._files.pop(path, None)
+                continue
+            sig = (st.st_mtime_ns, st.st_size)
+            cached = self._files.get(path)
+            if cached is None or cached[0] != sig:
+                try:
+                    with open(path, "r", encoding="utf-8", errors="ignore") as f:
+                        parsed = parse_ics(f.read())
+                except Exception:
+                    self.stats["errors"] += 1
+                    continue
+                self.stats["parses"] += 1
+                cached = self._files[path] = (sig, parsed)
+            signature.append((path, sig))
+            events.extend(cached[1])
+        return tuple(signature), events
+
+    def index(self, paths, start=None, end=None, now=None):
+        """A CalendarIndex over `paths` that covers [start, end)."""
+        now = now or datetime.now()
+        start = start or now
+        end = end or start
+        with self._lock:
+            signature, events = self._load(paths)
+            if (self._index is None or self._index_key != signature
+                    or not self._index.covers(start, end)):
+                self._index = CalendarIndex(events, min(start, now - self.past),
+                                            max(end, now + self.future))
+                self._index_key = signature
+                self.stats["index_builds"] += 1
+            return self._index
+
+    def starting_between(self, paths, start, end, now=None):
+        self.stats["queries"] += 1
+        return self.index(paths, start, end, now).starting_between(start, end)
+
+    def upcoming(self, paths, hours=24, now=None):
+        now = now or datetime.now()
+        return self.starting_between(paths, now, now + timedelta(hours=hours), now)
+
+    def on_day(self, paths, day=None, now=None):
+        day = day or (now or datetime.now()).date()
+        start = datetime.combine(day, datetime.min.time())
+        return self.starting_between(paths, start, start + timedelta(days=1), now)
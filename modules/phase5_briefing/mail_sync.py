@@ -0,0 +1,274 @@
+"""
+ELAINE Phase 5: Incremental Mail Sync
+Header-only IMAP sync feeding a persistent local mail index.
+
+Per folder, the sync remembers UIDVALIDITY and the last UID it has seen.
+Each run asks only for UIDs above that mark and fetches them in batches
+of `batch_size` per UID FETCH round trip, reading just the header fields
+the briefing needs plus the first few KB of the body for a snippet
+(BODY.PEEK, so nothing is marked as read). A changed UIDVALIDITY means
+the mailbox was rebuilt: that folder's index is dropped and re-synced.
+
+Scoring runs against the local index, so a briefing costs one short
+round trip per folder when nothing new has arrived. The IMAP session stays
+open between syncs and is used by one sync at a time.
+"""
+
+import email
+import imaplib
+import logging
+import re
+import sqlite3
+import threading
+from datetime import datetime, timedelta, timezone
+from email.header import decode_header
+from email.utils import parsedate_to_datetime
+
+logger = logging.getLogger("elaine.briefing.mail")
+
+HEADER_FIELDS = "FROM SUBJECT DATE MESSAGE-ID CONTENT-TYPE CONTENT-TRANSFER-ENCODING"
+SNIPPET_BYTES = 2048
+BATCH_SIZE = 100
+FIRST_SYNC_DAYS = 7     # How far back the first sync of a folder reaches
+
+_UID_RX = re.compile(rb"UID (\d+)")
+_UIDVALIDITY_RX = re.compile(rb"UIDVALIDITY (\d+)")
+
+
+def decode_hdr(h):
+    if not h:
+        return ""
+    out = []
+    for part, charset in decode_header(h):
+        out.append(part.decode(charset or 'utf-8', errors='replace') if isinstance(part, bytes) else part)
+    return " ".join(out)
+
+
+def extract_email(h):
+    m = re.search(r'<([^>]+)>', h)
+    return m.group(1).lower() if m else h.strip().lower()
+
+
+def snippet_from(msg, limit=300):
+    """First text/plain content of a (possibly truncated) message."""
+    parts = msg.walk() if msg.is_multipart() else [msg]
+    for part in parts:
+        if part.is_multipart() or part.get_content_type() not in ("text/plain", "text/html"):
+            continue
+        try:
+            payload = part.get_payload(decode=True)
+        except Exception:
+            payload = None
+        if payload is None:
+            payload = part.get_payload().encode('utf-8', errors='replace') \
+                if isinstance(part.get_payload(), str) else b""
+        text = payload.decode(part.get_content_charset() or 'utf-8', errors='replace')
+        if part.get_content_type() == "text/html":
+            text = re.sub(r"<[^>]+>", " ", text)
+        text = " ".join(text.split())
+        if text:
+            return text[:limit]
+    return ""
+
+
+class MailSync:
+    """Incremental IMAP → SQLite sync. `connect()` returns a logged-in IMAP4 client."""
+
+    def __init__(self, db_path, connect, batch_size=BATCH_SIZE,
+                 snippet_bytes=SNIPPET_BYTES, first_sync_days=FIRST_SYNC_DAYS):
+        self.db_path = db_path
+        self.connect = connect
+        self.batch_size = batch_size
+        self.snippet_bytes = snippet_bytes
+        self.first_sync_days = first_sync_days
+        self._mail = None
+        self._lock = threading.Lock()       # Guards the shared session across concurrent syncs
+        self.errors = {}                    # folder → why its last sync failed
+        self._init_db()
+
+    def _init_db(self):
+        conn = sqlite3.connect(self.db_path)
+        c = conn.cursor()
+        c.execute("""CREATE TABLE IF NOT EXISTS mail_folders (
+            folder TEXT PRIMARY KEY,
+            uidvalidity INTEGER,
+            last_uid INTEGER DEFAULT 0,
+            synced_at TIMESTAMP
+        )""")
+        c.execute("""CREATE TABLE IF NOT EXISTS mail_index (
+            folder TEXT NOT NULL,
+            uid INTEGER NOT NULL,
+            message_id TEXT,
+            sender TEXT,
+            sender_email TEXT,
+            subject TEXT,
+            snippet TEXT,
+            received_at TEXT,
+            received_ts REAL,
+            PRIMARY KEY (folder, uid)
+        )""")
+        c.execute("CREATE INDEX IF NOT EXISTS idx_mail_received ON mail_index(received_ts)")
+        conn.commit()
+        conn.close()
+
+    # ─── Connection ───
+    def _client(self):
+        """Reuse the open session if it still answers NOOP; otherwise log in again."""
+        if self._mail is not None:
+            try:
+                if self._mail.noop()[0] == 'OK':
+                    return self._mail
+            except Exception:
+                pass
+            self._mail = None
+        self._mail = self.connect()
+        return self._mail
+
+    def close(self):
+        with self._lock:
+            if self._mail is not None:
+                try:
+                    self._mail.logout()
+                except Exception:
+                    pass
+                self._mail = None
+
+    # ─── Sync ───
+    def sync(self, folders):
+        """
+        Pull new messages for every folder. Returns {folder: [new message dicts]}.
+        A folder that fails maps to [] and is logged and kept in self.errors
+        until it next syncs cleanly.
+        """
+        with self._lock:                    # SELECT/FETCH of two syncs must not interleave
+            mail = self._client()
+            new = {}
+            for folder in folders:
+                try:
+                    new[folder] = self._sync_folder(mail, folder)
+                    self.errors.pop(folder, None)
+                except imaplib.IMAP4.abort:
+                    self._mail = None
+                    raise
+                except Exception as e:
+                    logger.warning(f"Mail sync of {folder} failed: {e}")
+                    self.errors[folder] = str(e)
+                    new[folder] = []
+        return new
+
+    def _sync_folder(self, mail, folder):
+        typ, _ = mail.select(folder, readonly=True)
+        if typ != 'OK':
+            raise imaplib.IMAP4.error(f"cannot select {folder}")
+        uidvalidity = self._uidvalidity(mail, folder)
+
+        conn = sqlite3.connect(self.db_path)
+        c = conn.cursor()
+        row = c.execute("SELECT uidvalidity, last_uid FROM mail_folders WHERE folder = ?",
+                        (folder,)).fetchone()
+        last_uid = 0
+        if row and row[0] == uidvalidity:
+            last_uid = row[1] or 0
+        elif row:
+            c.execute("DELETE FROM mail_index WHERE folder = ?", (folder,))
+
+        if last_uid:
+            _, data = mail.uid('SEARCH', None, f"UID {last_uid + 1}:*")
+        else:
+            since = (datetime.now() - timedelta(days=self.first_sync_days)).strftime("%d-%b-%Y")
+            _, data = mail.uid('SEARCH', None, f'(SINCE "{since}")')
+        # "n:*" always matches the highest UID, even when it is below n
+        uids = sorted(u for u in (int(x) for x in (data[0] or b"").split()) if u > last_uid)
+
+        rows = []
+        for i in range(0, len(uids), self.batch_size):
+            rows.extend(self._fetch_batch(mail, folder, uids[i:i + self.batch_size]))
+
+        c.executemany("""INSERT OR REPLACE INTO mail_index
+            (folder, uid, message_id, sender, sender_email, subject, snippet,
+             received_at, received_ts)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)""", rows)
+        c.execute("""INSERT OR REPLACE INTO mail_folders (folder, uidvalidity, last_uid, synced_at)
+            VALUES (?, ?, ?, ?)""",
+            (folder, uidvalidity, max(uids, default=last_uid), datetime.now().isoformat()))
+        conn.commit()
+        conn.close()
+        columns = ("folder", "uid", "message_id", "sender", "sender_email", "subject",
+                   "snippet", "received_at", "received_ts")
+        return [dict(zip(columns, row)) for row in rows]
+
+    @staticmethod
+    def _uidvalidity(mail, folder):
+        typ, data = mail.response('UIDVALIDITY')
+        if data and data[0]:
+            return int(data[0])
+        typ, data = mail.status(folder, '(UIDVALIDITY)')
+        m = _UIDVALIDITY_RX.search(data[0] or b"")
+        return int(m.group(1)) if m else 0
+
+    def _fetch_batch(self, mail, folder, uids):
+        """One UID FETCH round trip for a batch: header fields + partial text."""
+        spec = (f"(UID BODY.PEEK[HEADER.FIELDS ({HEADER_FIELDS})] "
+                f"BODY.PEEK[TEXT]<0.{self.snippet_bytes}>)")
+        _, data = mail.uid('FETCH', ",".join(str(u) for u in uids), spec)
+
+        messages = {}
+        current = None
+        for item in data:
+            if not isinstance(item, tuple):
+                continue
+            prefix, payload = item
+            m = _UID_RX.search(prefix)
+            if m:
+                current = messages.setdefault(int(m.group(1)), {"header": b"", "text": b""})
+            if current is None:
+                continue
+            if b"HEADER" in prefix.upper():
+                current["header"] = payload
+            else:
+                current["text"] = payload
+
+        rows = []
+        for uid, parts in sorted(messages.items()):
+            msg = email.message_from_bytes(parts["header"].rstrip(b"\r\n") + b"\r\n\r\n" + parts["text"])
+            sender_raw = msg.get("From", "")
+            received_at, received_ts = self._parse_date(msg.get("Date", ""))
+            rows.append((
+                folder, uid, msg.get("Message-ID", "").strip(),
+                decode_hdr(sender_raw), extract_email(sender_raw),
+                decode_hdr(msg.get("Subject", "(no subject)")),
+                snippet_from(msg), received_at, received_ts,
+            ))
+        return rows
+
+    @staticmethod
+    def _parse_date(s):
+        try:
+            dt = parsedate_to_datetime(s)
+            if dt.tzinfo is None:
+                dt = dt.replace(tzinfo=timezone.utc)
+            return dt.isoformat(), dt.timestamp()
+        except Exception:
+            return s, 0.0
+
+    # ─── Local Index ───
+    def recent(self, hours, folders=None):
+        """Messages received in the last `hours`, newest first, from the local index."""
+        since = (datetime.now(timezone.utc) - timedelta(hours=hours)).timestamp()
+        conn = sqlite3.connect(self.db_path)
+        conn.row_factory = sqlite3.Row
+        query = "SELECT * FROM mail_index WHERE received_ts >= ?"
+        params = [since]
+        if folders:
+            query += f" AND folder IN ({','.join('?' * len(folders))})"
+            params += list(folders)
+        rows = conn.execute(query + " ORDER BY received_ts DESC", params).fetchall()
+        conn.close()
+        return [dict(r) for r in rows]
+
+    def folder_state(self):
+        conn = sqlite3.connect(self.db_path)
+        conn.row_factory = sqlite3.Row
+        rows = conn.execute("SELECT * FROM mail_folders").fetchall()
+        conn.close()
+        return [dict(r) for r in rows]
@@ -9,12 +9,12 @@ and People of Interest tracking into a unified morning briefing.
 import json
 import sqlite3
 import imaplib
-import email
-import re
 import os
 from datetime import datetime, timedelta
 from pathlib import Path
-from email.header import decode_header
+
+from .calendar_index import CalendarCache
+from .mail_sync import MailSync
 
 try:
     import requests
@@ -43,6 +43,9 @@ class MorningBriefingEngine:
         self.db_path = str(self.home / "briefing.db")
         self.config = self._load_config()
         self._init_db()
+        self._mail_sync = None
+        self._mail_sync_key = None
+        self.calendar = CalendarCache()
 
     def _load_config(self):
         defaults = {
@@ -50,6 +53,7 @@ class MorningBriefingEngine:
                 "enabled": False,
                 "imap_server": "",
                 "imap_port": 993,
+                "imap_ssl": True,
                 "username": "",
                 "password": "",
                 "folders": ["INBOX"],
@@ -560,53 +564,33 @@ class MorningBriefingEngine:
         result["items"].sort(key=lambda x: x.get("time", "99:99"))
         return result
 
-    def _parse_ics_calendar(self):
-        meetings = []
-        today = datetime.now().date()
+    def _calendar_paths(self):
         paths = []
         if self.config["calendar"].get("ics_path"):
             paths.append(self.config["calendar"]["ics_path"])
         paths.extend(self.config["calendar"].get("outlook_ics_paths", []))
-        for ics_path in paths:
-            if not Path(ics_path).exists():
-                continue
-            try:
-                with open(ics_path, 'r', encoding='utf-8', errors='ignore') as f:
-                    content = f.read()
-                events = content.split("BEGIN:VEVENT")
-                for block in events[1:]:
-                    ev = {}
-                    for line in block.split("\n"):
-                        line = line.strip()
-                        if line.startswith("SUMMARY:"): ev["title"] = line[8:]
-                        elif line.startswith("DTSTART"):
-                            ev["start"] = self._parse_ics_dt(line.split(":", 1)[-1].strip())
-                        elif line.startswith("DTEND"):
-                            ev["end"] = self._parse_ics_dt(line.split(":", 1)[-1].strip())
-                        elif line.startswith("LOCATION:"): ev["location"] = line[9:]
-                        elif line.startswith("ATTENDEE"):
-                            m = line.split("mailto:", 1)
-                            if len(m) > 1:
-                                ev.setdefault("attendees", []).append(m[1].strip())
-                    if ev.get("start") and isinstance(ev["start"], datetime) and ev["start"].date() == today:
-                        meetings.append({
-                            "title": ev.get("title", "Untitled"),
-                            "time": ev["start"].strftime("%I:%M %p"),
-                            "end_time": ev["end"].strftime("%I:%M %p") if isinstance(ev.get("end"), datetime) else "",
-                            "location": ev.get("location", ""),
-                            "attendees": ev.get("attendees", []),
-                            "source": "ics"
-                        })
-            except Exception:
-                continue
-        return meetings
+        return paths
 
-    def _parse_ics_dt(self, s):
-        s = s.replace("Z", "").strip()
-        for fmt in ["%Y%m%dT%H%M%S", "%Y%m%d", "%Y%m%dT%H%M"]:
-            try: return datetime.strptime(s, fmt)
-            except ValueError: continue
-        return None
+    def _parse_ics_calendar(self):
+        """Today's ICS meetings, from the parsed-calendar cache."""
+        return [self._ics_meeting(ev) for ev in self.calendar.on_day(self._calendar_paths())]
+
+    def get_upcoming_events(self, hours=24):
+        """ICS meetings starting in the next `hours`, recurring instances included."""
+        return [self._ics_meeting(ev) for ev in self.calendar.upcoming(self._calendar_paths(), hours)]
+
+    def _ics_meeting(self, ev):
+        return {
+            "title": ev["title"],
+            "time": ev["start"].strftime("%I:%M %p"),
+            "end_time": ev["end"].strftime("%I:%M %p") if ev["end"] > ev["start"] else "",
+            "start": ev["start"].isoformat(),
+            "location": ev["location"],
+            "attendees": ev["attendees"],
+            "all_day": ev["all_day"],
+            "recurring": ev["recurring"],
+            "source": "ics"
+        }
 
     def _get_important_emails(self):
         result = {"title": "Important Emails", "items": [], "source": "disabled"}
@@ -621,39 +605,30 @@ class MorningBriefingEngine:
                 result["source"] = "not_configured"
                 result["message"] = "Email credentials incomplete."
                 return result
-            mail = imaplib.IMAP4_SSL(srv, self.config["email"]["imap_port"])
-            mail.login(usr, pwd)
+            sync = self._get_mail_sync()
+            new = sync.sync(self.config["email"]["folders"])
+            self._cache_emails([m for msgs in new.values() for m in msgs])
+
             hours = self.config["email"]["hours_lookback"]
-            since = (datetime.now() - timedelta(hours=hours)).strftime("%d-%b-%Y")
             pri_senders = [s.lower() for s in self.config["email"].get("priority_senders", [])]
             pri_kw = [k.lower() for k in self.config["email"].get("priority_keywords", [])]
             poi_emails = self._get_poi_emails()
             pri_senders.extend(poi_emails)
-            for folder in self.config["email"]["folders"]:
-                try:
-                    mail.select(folder)
-                    _, msgs = mail.search(None, f'(SINCE "{since}")')
-                    for mid in msgs[0].split()[-50:]:
-                        _, data = mail.fetch(mid, "(RFC822)")
-                        msg = email.message_from_bytes(data[0][1])
-                        sender_raw = msg.get("From", "")
-                        sender = self._decode_hdr(sender_raw)
-                        sender_email = self._extract_email(sender_raw)
-                        subject = self._decode_hdr(msg.get("Subject", "(no subject)"))
-                        snippet = self._get_snippet(msg)
-                        recv = self._parse_email_date(msg.get("Date", ""))
-                        score = self._score_priority(sender_email, subject, snippet, pri_senders, pri_kw)
-                        self._cache_email(sender, sender_email, subject, snippet, recv)
-                        result["items"].append({
-                            "sender": sender, "sender_email": sender_email,
-                            "subject": subject, "snippet": snippet[:200],
-                            "received_at": recv, "priority_score": score,
-                            "is_poi": sender_email.lower() in [e.lower() for e in poi_emails]
-                        })
-                except Exception:
-                    continue
-            mail.logout()
+            poi_set = {e.lower() for e in poi_emails}
+            for m in sync.recent(hours, self.config["email"]["folders"]):
+                snippet = m["snippet"] or ""
+                score = self._score_priority(m["sender_email"], m["subject"], snippet, pri_senders, pri_kw)
+                result["items"].append({
+                    "sender": m["sender"], "sender_email": m["sender_email"],
+                    "subject": m["subject"], "snippet": snippet[:200],
+                    "received_at": m["received_at"], "priority_score": score,
+                    "is_poi": m["sender_email"].lower() in poi_set
+                })
             result["source"] = "imap"
+            result["new_since_last_sync"] = sum(len(v) for v in new.values())
+            failed = {f: sync.errors[f] for f in new if f in sync.errors}
+            if failed:
+                result["folder_errors"] = failed
             result["items"].sort(key=lambda x: x.get("priority_score", 0), reverse=True)
             result["items"] = result["items"][:self.config["email"]["max_emails"]]
         except Exception as e:
@@ -661,6 +636,22 @@ class MorningBriefingEngine:
             result["message"] = str(e)
         return result
 
+    def _get_mail_sync(self):
+        """Incremental IMAP sync; its connection stays open between briefings."""
+        cfg = self.config["email"]
+        key = (cfg["imap_server"], cfg["imap_port"], cfg["username"])
+        if self._mail_sync is None or self._mail_sync_key != key:
+            def connect():
+                imap = imaplib.IMAP4_SSL if cfg.get("imap_ssl", True) else imaplib.IMAP4
+                mail = imap(cfg["imap_server"], cfg["imap_port"])
+                mail.login(cfg["username"], cfg["password"])
+                return mail
+            if self._mail_sync is not None:
+                self._mail_sync.close()
+            self._mail_sync = MailSync(self.db_path, connect)
+            self._mail_sync_key = key
+        return self._mail_sync
+
     def _get_poi_emails(self):
         conn = sqlite3.connect(self.db_path)
         c = conn.cursor()
@@ -669,47 +660,21 @@ class MorningBriefingEngine:
         conn.close()
         return emails
 
-    def _cache_email(self, sender, sender_email, subject, snippet, recv):
+    def _cache_emails(self, messages):
+        """Record newly synced messages (feeds sender-frequency POI discovery)."""
+        if not messages:
+            return
         conn = sqlite3.connect(self.db_path)
         c = conn.cursor()
         try:
-            c.execute("INSERT OR IGNORE INTO email_cache (message_id, sender, subject, snippet, received_at) VALUES (?, ?, ?, ?, ?)",
-                (f"{sender_email}:{subject}:{recv}", f"{sender} <{sender_email}>", subject, snippet[:200], recv))
+            c.executemany("INSERT OR IGNORE INTO email_cache (message_id, sender, subject, snippet, received_at) VALUES (?, ?, ?, ?, ?)",
+                [(m.get("message_id") or f"{m['sender_email']}:{m['subject']}:{m['received_at']}",
+                  f"{m['sender']} <{m['sender_email']}>", m["subject"], (m["snippet"] or "")[:200],
+                  m["received_at"]) for m in messages])
             conn.commit()
         except Exception: pass
         conn.close()
 
-    def _decode_hdr(self, h):
-        if not h: return ""
-        parts = decode_header(h)
-        out = []
-        for c, ch in parts:
-            out.append(c.decode(ch or 'utf-8', errors='replace') if isinstance(c, bytes) else c)
-        return " ".join(out)
-
-    def _extract_email(self, h):
-        m = re.search(r'<([^>]+)>', h)
-        return m.group(1).lower() if m else h.strip().lower()
-
-    def _get_snippet(self, msg):
-        if msg.is_multipart():
-            for p in msg.walk():
-                if p.get_content_type() == 'text/plain':
-                    try: return p.get_payload(decode=True).decode('utf-8', errors='replace')[:300]
-                    except: continue
-        else:
-            try:
-                b = msg.get_payload(decode=True)
-                return b.decode('utf-8', errors='replace')[:300] if b else ""
-            except: pass
-        return ""
-
-    def _parse_email_date(self, s):
-        try:
-            from email.utils import parsedate_to_datetime
-            return parsedate_to_datetime(s).isoformat()
-        except: return s
-
     def _score_priority(self, sender, subject, snippet, pri_senders, pri_kw):
         score = 0
         text = f"{subject} {snippet}".lower()
@@ -734,7 +699,8 @@ class MorningBriefingEngine:
         except Exception:
             clients, pipeline = [], []
         max_q = self.config.get("prep_questions_per_meeting", 4)
-        for meeting in meetings:
+        poi_matches = self._match_pois([m.get("attendees", []) for m in meetings])
+        for meeting, poi_match in zip(meetings, poi_matches):
             title = meeting.get("title", "Meeting")
             tl = title.lower()
             attendees = meeting.get("attendees", [])
@@ -746,8 +712,6 @@ class MorningBriefingEngine:
                     if (cl.get("email") and al == cl["email"].lower()) or \
                        (cl.get("name") and cl["name"].lower() in al):
                         matched.append(cl)
-            # Match to POI
-            poi_match = self._match_poi(attendees)
             # Build questions
             if "discovery" in tl or "intro" in tl:
                 qs = ["What is their primary business challenge?",
@@ -793,17 +757,38 @@ class MorningBriefingEngine:
         return result
 
     def _match_poi(self, attendees):
+        return self._match_pois([attendees])[0]
+
+    def _match_pois(self, attendee_lists):
+        """POI matches for several attendee lists with one query.
+
+        An attendee matches a person by exact email or by appearing in
+        their name (case-insensitive), as the per-attendee lookup did.
+        """
+        wanted = sorted({a if isinstance(a, str) else str(a)
+                         for attendees in attendee_lists for a in attendees})
+        if not wanted:
+            return [[] for _ in attendee_lists]
         conn = sqlite3.connect(self.db_path)
         conn.row_factory = sqlite3.Row
         c = conn.cursor()
-        matched = []
-        for a in attendees:
-            a_str = a if isinstance(a, str) else str(a)
-            c.execute("SELECT * FROM people_of_interest WHERE email = ? OR name LIKE ?",
-                (a_str.lower(), f"%{a_str}%"))
-            matched.extend(dict(r) for r in c.fetchall())
+        people = {}
+        for i in range(0, len(wanted), 400):
+            chunk = wanted[i:i + 400]
+            where = " OR ".join([f"email IN ({','.join('?' * len(chunk))})"] + ["name LIKE ?"] * len(chunk))
+            c.execute(f"SELECT * FROM people_of_interest WHERE {where}",
+                      [a.lower() for a in chunk] + [f"%{a}%" for a in chunk])
+            people.update((r["id"], dict(r)) for r in c.fetchall())
         conn.close()
-        return matched
+        people = [people[pid] for pid in sorted(people)]
+
+        by_attendee = {}
+        for a in wanted:
+            al = a.lower()
+            by_attendee[a] = [p for p in people
+                              if p.get("email") == al or al in (p.get("name") or "").lower()]
+        return [[p for a in attendees for p in by_attendee[a if isinstance(a, str) else str(a)]]
+                for attendees in attendee_lists]
 
     def _get_poi_briefing(self):
         result = {"title": "People of Interest", "items": []}
@@ -2,16 +2,140 @@
 ELAINE Phase 5: Self-Healing Framework
 Error recovery, health monitoring, and graceful degradation.
 Wraps all module calls with resilience patterns.
+
+Call telemetry is kept in memory (per-module counters and latency rings)
+and written to health.db in batches by a background writer, so safe_call
+never waits on a disk write. Each module has a circuit breaker: after
+repeated failures or timeout-length calls the breaker opens and calls fail
+fast to their fallback until a half-open trial call succeeds.
 """
 
+import atexit
 import json
+import logging
+import threading
 import time
 import traceback
 import sqlite3
+from collections import deque
 from datetime import datetime, timedelta
 from pathlib import Path
 from functools import wraps
 
+logger = logging.getLogger("elaine.resilience")
+
+FLUSH_INTERVAL_S = 2.0      # Background writer cadence
+FLUSH_BATCH = 500           # ...or sooner once this many records are waiting
+MAX_PENDING = 10000         # Oldest telemetry is dropped beyond this
+LATENCY_RING = 256          # Recent call latencies kept per module
+ERROR_RING = 1000           # Recent error times kept per module (24h counts)
+RECENT_ERRORS = 50          # Recent errors kept for the health report
+
+BREAKER_FAILURES = 5        # Consecutive failures (or slow calls) that open a breaker
+BREAKER_RESET_S = 30.0      # Open → half-open after this long
+BREAKER_SLOW_MS = 5000      # A call this slow counts as a failure for the breaker
+
+
+# ─── Circuit Breaker ───
+
+class CircuitBreaker:
+    """closed → open after repeated failures → half-open trial → closed."""
+
+    CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+    def __init__(self, failures=BREAKER_FAILURES, reset_s=BREAKER_RESET_S, slow_ms=BREAKER_SLOW_MS):
+        self.failure_threshold = failures
+        self.reset_s = reset_s
+        self.slow_ms = slow_ms
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = None
+        self.trial_in_flight = False
+        self.times_opened = 0
+        self.short_circuited = 0
+        self._lock = threading.Lock()
+
+    def allow(self):
+        """True if a call may go through now; False means fail fast."""
+        with self._lock:
+            if self.state == self.OPEN:
+                if time.monotonic() - self.opened_at < self.reset_s:
+                    self.short_circuited += 1
+                    return False
+                self.state = self.HALF_OPEN
+            if self.state == self.HALF_OPEN:
+                if self.trial_in_flight:
+                    self.short_circuited += 1
+                    return False
+                self.trial_in_flight = True
+            return True
+
+    def record(self, ok, elapsed_ms=0):
+        with self._lock:
+            self.trial_in_flight = False
+            if ok and elapsed_ms < self.slow_ms:
+                self.consecutive_failures = 0
+                self.state = self.CLOSED
+                return
+            self.consecutive_failures += 1
+            if self.state == self.HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    self.times_opened += 1
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+
+    def to_dict(self):
+        retry_in = None
+        if self.state == self.OPEN:
+            retry_in = round(max(0.0, self.reset_s - (time.monotonic() - self.opened_at)), 1)
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "times_opened": self.times_opened,
+            "short_circuited": self.short_circuited,
+            "retry_in_s": retry_in,
+        }
+
+
+# ─── In-memory Module Health ───
+
+class ModuleHealth:
+    """Counters and rings for one module; the source of the health report."""
+
+    def __init__(self, module):
+        self.module = module
+        self.status = "unknown"
+        self.last_success = None
+        self.last_error = None
+        self.updated_at = None
+        self.calls = 0
+        self.errors = 0
+        self.recovered = 0
+        self.latencies = deque(maxlen=LATENCY_RING)
+        self.error_times = deque(maxlen=ERROR_RING)
+
+    def errors_24h(self, now=None):
+        cutoff = (now or datetime.now()) - timedelta(days=1)
+        while self.error_times and self.error_times[0] < cutoff:
+            self.error_times.popleft()
+        return len(self.error_times)
+
+    def to_dict(self):
+        lat = sorted(self.latencies)
+        return {
+            "module": self.module,
+            "status": self.status,
+            "last_success": self.last_success,
+            "last_error": self.last_error,
+            "error_count_24h": self.errors_24h(),
+            "updated_at": self.updated_at,
+            "calls": self.calls,
+            "errors": self.errors,
+            "recovered": self.recovered,
+            "p50_ms": lat[len(lat) // 2] if lat else None,
+            "p95_ms": lat[int(len(lat) * 0.95)] if lat else None,
+        }
+
 
 class ResilienceEngine:
     """
@@ -19,12 +143,26 @@ class ResilienceEngine:
     Wraps module calls so that failures don't crash the whole system.
     """
 
-    def __init__(self):
-        self.home = Path.home() / ".elaine"
+    RETRY_DELAY_S = 0.5
+
+    def __init__(self, home=None):
+        self.home = Path(home) if home else Path.home() / ".elaine"
         self.home.mkdir(exist_ok=True)
         self.db_path = str(self.home / "health.db")
         self._init_db()
-        self._module_status = {}
+        self._module_status = {}            # module → ModuleHealth
+        self._breakers = {}                 # module → CircuitBreaker
+        self._recent_errors = deque(maxlen=RECENT_ERRORS)
+        self._lock = threading.Lock()
+        self._pending = deque()             # ("ok"|"recovered"|"error", module, payload)
+        self._dropped = 0
+        self._flushes = 0
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._writer = None
+        self._closed = False
+        self.retry_delay = self.RETRY_DELAY_S
+        self._load_state()
 
     def _init_db(self):
         conn = sqlite3.connect(self.db_path)
@@ -58,120 +196,239 @@ class ResilienceEngine:
         conn.commit()
         conn.close()
 
+    def _load_state(self):
+        """Seed the in-memory view from health.db once, at start-up."""
+        conn = sqlite3.connect(self.db_path)
+        conn.row_factory = sqlite3.Row
+        c = conn.cursor()
+        c.execute("SELECT * FROM module_status")
+        for row in c.fetchall():
+            health = self._health(row["module"])
+            health.status = row["status"] or "unknown"
+            health.last_success = row["last_success"]
+            health.last_error = row["last_error"]
+            health.updated_at = row["updated_at"]
+        yesterday = (datetime.now() - timedelta(days=1)).isoformat()
+        c.execute("""SELECT module, error_type, error_message, created_at
+            FROM error_log WHERE created_at >= ? ORDER BY created_at""", (yesterday,))
+        for row in c.fetchall():
+            self._recent_errors.appendleft(dict(row))
+            try:
+                self._health(row["module"]).error_times.append(datetime.fromisoformat(row["created_at"]))
+            except (TypeError, ValueError):
+                pass
+        conn.close()
+
+    def _health(self, module):
+        health = self._module_status.get(module)
+        if health is None:
+            health = self._module_status[module] = ModuleHealth(module)
+        return health
+
+    # ─── Circuit breakers ───
+
+    def breaker(self, module):
+        with self._lock:
+            breaker = self._breakers.get(module)
+            if breaker is None:
+                breaker = self._breakers[module] = CircuitBreaker()
+            return breaker
+
+    def configure_breaker(self, module, failures=None, reset_s=None, slow_ms=None):
+        """Tune one module's breaker (e.g. a tighter slow_ms for a local service)."""
+        breaker = self.breaker(module)
+        if failures is not None:
+            breaker.failure_threshold = failures
+        if reset_s is not None:
+            breaker.reset_s = reset_s
+        if slow_ms is not None:
+            breaker.slow_ms = slow_ms
+        return breaker
+
     def safe_call(self, module_name, func, *args, fallback=None, **kwargs):
         """
         Safely call a function with error recovery.
-        Returns the function result or fallback on error.
+        Returns the function result or fallback on error, or straight away
+        while the module's circuit breaker is open.
         """
+        breaker = self.breaker(module_name)
+        if not breaker.allow():
+            return fallback() if callable(fallback) else fallback
+
         start = time.time()
         try:
             result = func(*args, **kwargs)
             elapsed = int((time.time() - start) * 1000)
+            breaker.record(True, elapsed)
             self._record_success(module_name, func.__name__, elapsed)
             return result
         except Exception as e:
             elapsed = int((time.time() - start) * 1000)
+            breaker.record(False, elapsed)
             self._record_error(module_name, func.__name__, e)
 
-            # Try once more with a brief pause
-            try:
-                time.sleep(0.5)
-                result = func(*args, **kwargs)
-                self._record_success(module_name, func.__name__, elapsed, recovered=True)
-                return result
-            except Exception:
-                pass
+            # Try once more with a brief pause — unless that just opened the breaker
+            if breaker.state == CircuitBreaker.CLOSED:
+                try:
+                    time.sleep(self.retry_delay)
+                    start = time.time()
+                    result = func(*args, **kwargs)
+                    elapsed = int((time.time() - start) * 1000)
+                    breaker.record(True, elapsed)
+                    self._record_success(module_name, func.__name__, elapsed, recovered=True)
+                    return result
+                except Exception:
+                    breaker.record(False, int((time.time() - start) * 1000))
 
             return fallback() if callable(fallback) else fallback
 
+    # ─── Telemetry (memory first, disk in batches) ───
+
     def _record_success(self, module, func_name, elapsed_ms, recovered=False):
-        conn = sqlite3.connect(self.db_path)
-        c = conn.cursor()
-        c.execute("""INSERT OR REPLACE INTO module_status
-            (module, status, last_success, updated_at)
-            VALUES (?, 'healthy', ?, ?)""",
-            (module, datetime.now().isoformat(), datetime.now().isoformat()))
-        c.execute("""INSERT INTO health_checks
-            (module, status, response_ms, details)
-            VALUES (?, ?, ?, ?)""",
-            (module, 'recovered' if recovered else 'ok', elapsed_ms, func_name))
-        conn.commit()
-        conn.close()
+        now = datetime.now().isoformat()
+        with self._lock:
+            health = self._health(module)
+            health.calls += 1
+            health.recovered += recovered
+            health.latencies.append(elapsed_ms)
+            health.status = "healthy"
+            health.last_success = health.updated_at = now
+            self._enqueue(("recovered" if recovered else "ok", module, (func_name, elapsed_ms)))
 
     def _record_error(self, module, func_name, error):
         tb = traceback.format_exc()
-        conn = sqlite3.connect(self.db_path)
-        c = conn.cursor()
-        c.execute("""INSERT INTO error_log
-            (module, function_name, error_type, error_message, traceback)
-            VALUES (?, ?, ?, ?, ?)""",
-            (module, func_name, type(error).__name__, str(error), tb))
-
-        # Update module status
-        c.execute("SELECT error_count_24h FROM module_status WHERE module = ?", (module,))
-        row = c.fetchone()
-        count = (row[0] + 1) if row else 1
-        status = 'degraded' if count < 5 else 'unhealthy'
-
-        c.execute("""INSERT OR REPLACE INTO module_status
-            (module, status, last_error, error_count_24h, updated_at)
-            VALUES (?, ?, ?, ?, ?)""",
-            (module, status, datetime.now().isoformat(), count,
-             datetime.now().isoformat()))
-
-        conn.commit()
-        conn.close()
+        now = datetime.now()
+        with self._lock:
+            health = self._health(module)
+            health.calls += 1
+            health.errors += 1
+            health.error_times.append(now)
+            count = health.errors_24h(now)
+            health.status = 'degraded' if count < 5 else 'unhealthy'
+            health.last_error = health.updated_at = now.isoformat()
+            self._recent_errors.appendleft({
+                "module": module, "error_type": type(error).__name__,
+                "error_message": str(error), "created_at": now.isoformat(),
+            })
+            self._enqueue(("error", module, (func_name, type(error).__name__, str(error), tb,
+                                            now.isoformat())))
+
+    def _enqueue(self, record):
+        self._pending.append(record)
+        if len(self._pending) > MAX_PENDING:
+            self._pending.popleft()
+            self._dropped += 1
+        if self._writer is None and not self._closed:
+            self._writer = threading.Thread(target=self._writer_loop, daemon=True,
+                                            name="resilience-writer")
+            self._writer.start()
+        if len(self._pending) >= FLUSH_BATCH:
+            self._wake.set()
+
+    def _writer_loop(self):
+        while not self._closed:
+            self._wake.wait(FLUSH_INTERVAL_S)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"Health telemetry flush failed: {e}")
+
+    def flush(self):
+        """Write waiting telemetry to health.db in one transaction. Returns records written."""
+        with self._flush_lock:
+            with self._lock:
+                batch = list(self._pending)
+                self._pending.clear()
+                statuses = {m: (h.status, h.last_success, h.last_error, h.errors_24h(), h.updated_at)
+                            for m, h in self._module_status.items()
+                            if any(r[1] == m for r in batch)}
+            if not batch:
+                return 0
+
+            # Successes collapse to one row per module/function/status per batch
+            checks = {}
+            errors = []
+            for kind, module, payload in batch:
+                if kind == "error":
+                    errors.append((module,) + payload)
+                    continue
+                func_name, elapsed_ms = payload
+                entry = checks.setdefault((module, kind, func_name), [0, 0])
+                entry[0] += 1
+                entry[1] += elapsed_ms
+
+            conn = sqlite3.connect(self.db_path)
+            try:
+                c = conn.cursor()
+                c.executemany("""INSERT INTO error_log
+                    (module, function_name, error_type, error_message, traceback, created_at)
+                    VALUES (?, ?, ?, ?, ?, ?)""", errors)
+                c.executemany("""INSERT INTO health_checks
+                    (module, status, response_ms, details)
+                    VALUES (?, ?, ?, ?)""",
+                    [(m, kind, round(total / n), func_name if n == 1 else f"{func_name} x{n}")
+                     for (m, kind, func_name), (n, total) in checks.items()])
+                c.executemany("""INSERT OR REPLACE INTO module_status
+                    (module, status, last_success, last_error, error_count_24h, updated_at)
+                    VALUES (?, ?, ?, ?, ?, ?)""",
+                    [(m,) + s for m, s in statuses.items()])
+                conn.commit()
+            finally:
+                conn.close()
+            self._flushes += 1
+            return len(batch)
+
+    def close(self):
+        """Stop the writer and flush what is left."""
+        self._closed = True
+        self._wake.set()
+        self.flush()
 
     def get_health_report(self):
-        """Get full system health report."""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        c = conn.cursor()
-
-        # Module statuses
-        c.execute("SELECT * FROM module_status ORDER BY module")
-        modules = [dict(r) for r in c.fetchall()]
-
-        # Recent errors
-        c.execute("""SELECT module, error_type, error_message, created_at
-            FROM error_log ORDER BY created_at DESC LIMIT 20""")
-        recent_errors = [dict(r) for r in c.fetchall()]
-
-        # Error counts last 24h
-        yesterday = (datetime.now() - timedelta(days=1)).isoformat()
-        c.execute("""SELECT module, COUNT(*) as count
-            FROM error_log WHERE created_at >= ?
-            GROUP BY module""", (yesterday,))
-        error_counts = dict(c.fetchall())
+        """Get full system health report (from memory — no disk reads)."""
+        with self._lock:
+            modules = [self._module_status[m].to_dict() for m in sorted(self._module_status)]
+            recent_errors = list(self._recent_errors)[:20]
+            breakers = {m: b.to_dict() for m, b in sorted(self._breakers.items())}
+            pending = len(self._pending)
+        for m in modules:
+            if m["module"] in breakers:
+                m["breaker"] = breakers[m["module"]]["state"]
+        error_counts = {m["module"]: m["error_count_24h"] for m in modules if m["error_count_24h"]}
 
         # Overall health
         unhealthy = sum(1 for m in modules if m.get("status") == "unhealthy")
         degraded = sum(1 for m in modules if m.get("status") == "degraded")
         healthy = sum(1 for m in modules if m.get("status") == "healthy")
+        open_breakers = [m for m, b in breakers.items() if b["state"] != CircuitBreaker.CLOSED]
 
         if unhealthy > 0:
             overall = "unhealthy"
-        elif degraded > 0:
+        elif degraded > 0 or open_breakers:
             overall = "degraded"
         elif healthy > 0:
             overall = "healthy"
         else:
             overall = "unknown"
 
-        conn.close()
         return {
             "overall": overall,
             "modules": modules,
             "recent_errors": recent_errors,
             "error_counts_24h": error_counts,
+            "breakers": breakers,
             "summary": {
                 "healthy": healthy,
                 "degraded": degraded,
-                "unhealthy": unhealthy
-            }
+                "unhealthy": unhealthy,
+                "open_breakers": open_breakers,
+            },
+            "telemetry": {"pending": pending, "dropped": self._dropped, "flushes": self._flushes},
         }
 
     def get_error_log(self, module=None, limit=50):
+        self.flush()
         conn = sqlite3.connect(self.db_path)
         conn.row_factory = sqlite3.Row
         c = conn.cursor()
@@ -186,6 +443,10 @@ class ResilienceEngine:
 
     def reset_error_counts(self):
         """Reset 24h error counts (for daily maintenance)."""
+        with self._lock:
+            for health in self._module_status.values():
+                health.error_times.clear()
+        self.flush()
         conn = sqlite3.connect(self.db_path)
         c = conn.cursor()
         c.execute("UPDATE module_status SET error_count_24h = 0")
@@ -276,6 +537,7 @@ def get_resilience():
     global _resilience
     if _resilience is None:
         _resilience = ResilienceEngine()
+        atexit.register(_resilience.close)
     return _resilience
 
 def resilient(module_name, fallback_value=None):
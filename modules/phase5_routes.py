@@ -71,6 +71,15 @@ def briefing_history():
     return jsonify(get_briefing().get_briefing_history(limit))
 
 
+@phase5_bp.route('/api/briefing/calendar', methods=['GET'])
+def briefing_calendar():
+    """ICS meetings starting in the next `hours` (default 24)."""
+    b = get_briefing()
+    hours = request.args.get('hours', 24, type=float)
+    return jsonify({"hours": hours, "events": b.get_upcoming_events(hours),
+                    "cache": b.calendar.stats})
+
+
 # ═══════════════════════════════════════════
 #  PEOPLE OF INTEREST
 # ═══════════════════════════════════════════
@@ -0,0 +1,193 @@
+"""
+Sentinel v2 — Position Index
+Inverted index over the Position Integrity Graph.
+
+Every tracked claim is reduced to normalised key terms and entities
+(prices, figures, ISO references, content words). Reviews look up only
+the positions that share terms with each sentence of new content, so
+conflict checking stays flat as the position library grows into the
+thousands. Candidate positions are scored by term containment, with
+optional negation awareness ("we never guarantee" vs "we guarantee").
+
+Almost Magic Tech Lab — Patentable IP
+"""
+
+import re
+from collections import defaultdict
+
+from .models import PositionConflict, TrackedPosition
+
+
+_TOKEN_RX = re.compile(r"\$[\d,]+(?:\.\d+)?|\d+(?:\.\d+)?%?|[a-z][a-z0-9'-]*")
+_SENTENCE_END_RX = re.compile(r"[.!?]+(?=\s|$)|\n")    # "3.5%" and "$1.5M" stay whole
+_PRICE_RX = re.compile(r"\$[\d,]+(?:\.\d+)?")
+_UNIT_RX = re.compile(r"\d+\s*(?:working\s+)?(?:day|week|month)s?")
+
+NEGATIONS = {
+    "not", "never", "no", "none", "without", "cannot", "can't", "won't",
+    "don't", "doesn't", "isn't", "aren't", "wasn't", "shouldn't", "wouldn't",
+}
+
+STOPWORDS = {
+    "a", "an", "the", "and", "or", "but", "of", "to", "in", "on", "for", "with",
+    "at", "by", "from", "as", "is", "are", "was", "were", "be", "been", "it",
+    "its", "this", "that", "these", "those", "we", "our", "us", "you", "your",
+    "they", "their", "i", "my", "will", "can", "may", "all", "any", "so", "if",
+    "than", "then", "also", "which", "who", "what", "into", "about", "has", "have",
+}
+
+# Claims that look like positions worth tracking when importing published content
+_CLAIM_MARKERS = re.compile(
+    r"\b(?:we|our|always|never|only|guarantee|designed|includes?|takes?|costs?|"
+    r"price|fee|days?|weeks?|months?|is|are)\b|\$|%", re.I,
+)
+
+
+def _normalise(token: str) -> str:
+    if token.startswith("$"):
+        return "$" + token[1:].replace(",", "")
+    if len(token) > 4 and token.endswith("s") and not token.endswith("ss"):
+        return token[:-1]  # crude plural folding: "assessments" → "assessment"
+    return token
+
+
+def key_terms(text: str) -> tuple[frozenset, bool]:
+    """Return (normalised key terms, negated?) for a claim or sentence."""
+    terms = set()
+    negations = 0
+    for token in _TOKEN_RX.findall(text.lower()):
+        if token in NEGATIONS or token.endswith("n't"):
+            negations += 1
+        elif token not in STOPWORDS and len(token) > 1:
+            terms.add(_normalise(token))
+    return frozenset(terms), negations % 2 == 1
+
+
+def prices(terms: frozenset) -> set[str]:
+    return {t for t in terms if t.startswith("$")}
+
+
+def split_sentences(text: str) -> list[str]:
+    return [s.strip() for s in _SENTENCE_END_RX.split(text) if s.strip()]
+
+
+class PositionIndex:
+    """
+    Inverted index: normalised term → position ids, split into buckets.
+
+    A sentence can only contradict a claim of the opposite polarity, and
+    can only misprice a pricing claim that states a figure, so each
+    lookup reads just the buckets that could produce a conflict:
+    "negated" / "affirmed" claims and "priced" pricing claims.
+
+    Terms held by more than `max_postings` positions in a bucket (e.g.
+    "ai", "governance") carry no signal and are skipped when gathering
+    candidates, which keeps every lookup bounded however large the
+    library grows.
+    """
+
+    def __init__(self, min_containment: float = 0.6, max_postings: int = 250):
+        self.min_containment = min_containment
+        self.max_postings = max_postings
+        self._postings: dict[str, dict[str, set[str]]] = {
+            "negated": defaultdict(set), "affirmed": defaultdict(set), "priced": defaultdict(set),
+        }
+        self._positions: dict[str, TrackedPosition] = {}
+        self._terms: dict[str, frozenset] = {}
+        self._negated: dict[str, bool] = {}
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+    @property
+    def term_count(self) -> int:
+        return len(set().union(*self._postings.values()))
+
+    def _buckets(self, pid: str) -> list[str]:
+        position = self._positions[pid]
+        buckets = ["negated" if self._negated[pid] else "affirmed"]
+        if position.category == "pricing" and prices(self._terms[pid]):
+            buckets.append("priced")
+        return buckets
+
+    def add(self, position: TrackedPosition):
+        pid = position.position_id
+        terms, negated = key_terms(position.claim)
+        self._positions[pid] = position
+        self._terms[pid] = terms
+        self._negated[pid] = negated
+        for bucket in self._buckets(pid):
+            postings = self._postings[bucket]
+            for term in terms:
+                postings[term].add(pid)
+
+    def candidates(self, terms: frozenset, bucket: str) -> dict[str, int]:
+        """Position id → number of key terms shared with `terms`, within one bucket."""
+        postings = self._postings[bucket]
+        shared: dict[str, int] = defaultdict(int)
+        for term in terms:
+            ids = postings.get(term)
+            if ids and len(ids) <= self.max_postings:
+                for pid in ids:
+                    shared[pid] += 1
+        return shared
+
+    def find_conflicts(self, content: str, negation_aware: bool = True) -> list[PositionConflict]:
+        """Compare each distinct sentence of content against candidate positions only."""
+        conflicts = []
+        for sentence in dict.fromkeys(split_sentences(content)):
+            terms, negated = key_terms(sentence)
+            if not terms:
+                continue
+
+            # Pricing: same subject, different figure
+            sentence_prices = prices(terms)
+            if sentence_prices:
+                for pid in self.candidates(terms, "priced"):
+                    pos = self._positions[pid]
+                    if pos.still_current and not prices(self._terms[pid]) & sentence_prices:
+                        for price in _PRICE_RX.findall(sentence):
+                            conflicts.append(PositionConflict(
+                                claim_in_document=f"Price: {price}",
+                                conflicts_with=pos.source_document,
+                                conflict_description=f"Price differs from prior: {pos.claim}",
+                                resolution_options=["Update prior document", "Adjust this document", "Explain variance"],
+                            ))
+
+            # Negation: same claim, opposite polarity
+            if negation_aware:
+                opposite = "affirmed" if negated else "negated"
+                for pid, shared in self.candidates(terms, opposite).items():
+                    pos = self._positions[pid]
+                    containment = shared / max(len(self._terms[pid]), 1)
+                    if pos.still_current and containment >= self.min_containment:
+                        conflicts.append(PositionConflict(
+                            claim_in_document=sentence[:200],
+                            conflicts_with=pos.source_document,
+                            conflict_description=f"Contradicts prior position: {pos.claim}",
+                            resolution_options=["Align with prior position", "Retire prior position", "Explain change"],
+                            severity="high" if containment >= 0.8 else "moderate",
+                        ))
+        return conflicts
+
+
+def extract_claims(content: str, min_words: int = 4, max_words: int = 40) -> list[tuple[str, str]]:
+    """Pull claim-like sentences from published content as (claim, category)."""
+    claims = []
+    for sentence in split_sentences(content):
+        words = sentence.split()
+        if not (min_words <= len(words) <= max_words) or not _CLAIM_MARKERS.search(sentence):
+            continue
+        lower = sentence.lower()
+        if "$" in sentence:
+            category = "pricing"
+        elif _UNIT_RX.search(lower):
+            category = "timeline"
+        elif any(w in lower for w in ("methodology", "approach", "framework", "assessment")):
+            category = "methodology"
+        elif any(w in lower for w in ("we offer", "we provide", "we can", "capabilit")):
+            category = "capability"
+        else:
+            category = "general"
+        claims.append((sentence, category))
+    return claims
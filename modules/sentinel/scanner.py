@@ -0,0 +1,169 @@
+"""
+Sentinel v2 — Content Scanner
+Single-pass rule scanner for the Trust Engine.
+
+Every rule family Sentinel checks — guarantee and aggressive language,
+compliance references, sensitive terms, model names, statistics,
+prices, timelines, persona and credibility signals — is compiled into
+one combined regex. The literal terms are folded into a character trie
+so the regex engine only follows branches that match the next
+character, which makes the combined pattern behave like a keyword
+automaton. One finditer() pass over the lowercased content collects
+every hit into a ScanResult; the review, council, credibility and
+position passes then read from it instead of re-scanning the document.
+
+The whole pattern sits inside a zero-width lookahead, so hits that
+start at different offsets never shadow each other (e.g. "$50%" yields
+both a price and a percentage, as the old per-pattern searches did).
+
+Almost Magic Tech Lab
+"""
+
+import re
+from dataclasses import dataclass, field
+
+
+# Years flagged by the timeliness dimension
+STALE_YEARS = ("2022", "2023", "2024")
+
+_YEAR_RX = re.compile(r"\b(?:%s)\b" % "|".join(STALE_YEARS))
+_WORD_RX = re.compile(r"\w")
+
+# Built-in (non-literal) rules, tried before the term trie. Literal terms
+# must never start like these, otherwise both could begin at one offset.
+_BUILTIN_RULES = (
+    r"iso (?P<iso>\d{5})",
+    r"(?P<price>\$[\d,]+)",
+    r"(?<!\d)(?P<num>\d+)(?:(?P<pct>%)|(?P<unit>[\s-]*(?:day|week|month)))?",
+)
+
+
+def _trie_pattern(terms: list[str]) -> str:
+    """Fold literal terms into a prefix-factored regex (longest match wins)."""
+    root: dict = {}
+    for term in terms:
+        node = root
+        for ch in term:
+            node = node.setdefault(ch, {})
+        node[""] = True
+
+    def build(node: dict) -> str:
+        branches = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        return f"(?:{body})?" if "" in node else body
+
+    return build(root)
+
+
+@dataclass
+class ScanResult:
+    """Every rule hit found in one pass over a piece of content."""
+    length: int = 0
+    terms: dict[str, list[int]] = field(default_factory=dict)  # term → start offsets
+    iso_refs: list[str] = field(default_factory=list)           # "iso 42001"
+    years: list[str] = field(default_factory=list)              # stale year references
+    stats: list[str] = field(default_factory=list)              # "40%", "$5,000"
+    prices: list[str] = field(default_factory=list)             # "$5,000"
+    timelines: list[tuple[str, int]] = field(default_factory=list)  # ("3 week", offset)
+    trend_claim: bool = False                                   # "40% ... growing" on one line
+    vocabulary: frozenset = frozenset()
+
+    def has(self, *terms: str) -> bool:
+        """True if any of the given terms occurred."""
+        for t in terms:
+            if self.vocabulary and t not in self.vocabulary:
+                raise KeyError(f"'{t}' is not in the scanner vocabulary")
+        return any(t in self.terms for t in terms)
+
+    def count(self, term: str) -> int:
+        return len(self.terms.get(term, ()))
+
+    def has_iso(self, *standards: str) -> bool:
+        """True if any ISO reference was found (or one of the given standards)."""
+        if not standards:
+            return bool(self.iso_refs)
+        return any(ref in self.iso_refs for ref in standards)
+
+
+class ContentScanner:
+    """
+    Compiles a rule set into one lookahead regex over lowercased content.
+
+    `terms` are matched as plain substrings (like `term in text.lower()`);
+    `bounded_terms` require word boundaries on both sides (like r"\\bterm\\b").
+    `trend_terms` are the words that turn a percentage into a trend claim.
+    """
+
+    def __init__(self, terms: list[str], bounded_terms: list[str] = None,
+                 trend_terms: list[str] = None):
+        self.trend_terms = {t.lower() for t in (trend_terms or [])}
+        self.bounded = {t.lower() for t in (bounded_terms or [])}
+        vocabulary = {t.lower() for t in terms} | self.trend_terms | self.bounded
+        self.vocabulary = frozenset(vocabulary)
+
+        for term in vocabulary:
+            if term[:1].isdigit() or term[:1] == "$" or "iso ".startswith(term[:4]):
+                raise ValueError(f"Scanner term '{term}' collides with a built-in rule")
+
+        # The trie returns the longest term at an offset; any shorter term
+        # that also starts there is one of its prefixes.
+        self._prefixes = {
+            term: sorted((other for other in vocabulary if other != term and term.startswith(other)),
+                         key=len, reverse=True)
+            for term in vocabulary
+        }
+        self._rx = re.compile(
+            "(?=" + "|".join(_BUILTIN_RULES + (f"(?P<term>{_trie_pattern(sorted(vocabulary))})",)) + ")"
+        )
+
+    def _bounded_ok(self, text: str, pos: int, term: str) -> bool:
+        if term not in self.bounded:
+            return True
+        end = pos + len(term)
+        before = pos > 0 and _WORD_RX.match(text, pos - 1)
+        after = end < len(text) and _WORD_RX.match(text, end)
+        # \b needs a word/non-word transition on each side
+        return (bool(before) != bool(_WORD_RX.match(term[0]))) and \
+               (bool(after) != bool(_WORD_RX.match(term[-1])))
+
+    def scan(self, content: str) -> ScanResult:
+        """Scan content once. Offsets refer to content.lower()."""
+        text = content.lower()
+        result = ScanResult(length=len(text), vocabulary=self.vocabulary)
+        terms = result.terms
+        price_end = -1
+        last_pct = -1
+
+        for m in self._rx.finditer(text):
+            pos = m.start()
+            term = m.group("term")
+
+            if term is not None:
+                for hit in (term, *self._prefixes[term]):
+                    if not self._bounded_ok(text, pos, hit):
+                        continue
+                    terms.setdefault(hit, []).append(pos)
+                    if (hit in self.trend_terms and last_pct >= 0
+                            and text.find("\n", last_pct, pos) == -1):
+                        result.trend_claim = True
+            elif m.group("iso") is not None:
+                result.iso_refs.append("iso " + m.group("iso"))
+            elif m.group("price") is not None:
+                price = m.group("price")
+                result.prices.append(price)
+                result.stats.append(price)
+                price_end = pos + len(price)
+            else:
+                num = m.group("num")
+                if num in STALE_YEARS and _YEAR_RX.match(text, pos):
+                    result.years.append(num)
+                if m.group("pct"):
+                    last_pct = pos
+                    if pos >= price_end:  # "$5%" is one stat, not two
+                        result.stats.append(num + "%")
+                elif m.group("unit"):
+                    result.timelines.append((num + m.group("unit"), pos))
+
+        return result
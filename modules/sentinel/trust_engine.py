@@ -14,8 +14,11 @@ Patentable:
 Almost Magic Tech Lab — Patentable IP
 """
 
+import bisect
+import hashlib
 import logging
-import re
+import threading
+from collections import OrderedDict
 from datetime import datetime, timedelta
 from typing import Optional
 
@@ -29,6 +32,8 @@ from .models import (
     StalenessItem, CredibilitySuggestion, ResilienceLevel,
     AuditVerdict, PROFILE_GATE_LEVELS, HALF_LIVES, INTENT_WEIGHTS,
 )
+from .position_index import PositionIndex, extract_claims
+from .scanner import ContentScanner, ScanResult
 
 logger = logging.getLogger("elaine.sentinel")
 
@@ -54,6 +59,41 @@ SENSITIVE_TERMS = [
     "client name", "proprietary",
 ]
 
+COMPLIANCE_TERMS = ["essential eight", "privacy act", "acsc"]  # plus ISO references
+
+MODEL_NAMES = ["claude", "gpt-4", "gemini", "llama"]
+
+TREND_TERMS = ["growing", "increasing", "trending"]
+
+# Credibility signal → terms that evidence it
+CREDIBILITY_SIGNALS = {
+    "certification_reference": ["certified", "certification"],  # plus ISO references
+    "social_proof": ["case study", "client", "implementation", "delivered"],
+    "methodology": ["methodology", "approach", "framework", "process"],
+    "commitment": ["milestone", "timeline", "deliverable", "phase"],
+}
+
+# Profile, intent and review-council signals
+SIGNAL_TERMS = [
+    "essential eight", "audit report", "compliance assessment", "compliance", "governance",
+    "press release", "media statement", "proposal", "pricing",
+    "linkedin", "newsletter", "blog post",
+    "apolog", "understand your concern", "follow", "great meeting", "touch base",
+    "comprehensive", "estimated", "testimonial", "reference", "case study",
+    "solo", "one-person", "only", "australia", "first", "escalat", "issue",
+]
+
+# Every rule family above, compiled once into a single-pass scanner
+SCANNER = ContentScanner(
+    terms=SENSITIVE_TERMS + COMPLIANCE_TERMS + MODEL_NAMES + SIGNAL_TERMS
+    + [t for terms in CREDIBILITY_SIGNALS.values() for t in terms],
+    bounded_terms=[term for _, term, _ in GUARANTEE_PATTERNS + AGGRESSIVE_PATTERNS],
+    trend_terms=TREND_TERMS,
+)
+
+SCAN_CACHE_SIZE = 128
+REVIEW_MEMO_SIZE = 256
+
 
 class TrustEngine:
     """
@@ -61,10 +101,12 @@ class TrustEngine:
     applies risk economics, audience modelling, and position integrity.
     """
 
-    def __init__(self, thinking_engine=None):
+    def __init__(self, thinking_engine=None, negation_aware: bool = True):
         self.thinking_engine = thinking_engine
         self.audits: dict[str, QualityAudit] = {}
         self.positions: list[TrackedPosition] = []
+        self.position_index = PositionIndex()
+        self.negation_aware = negation_aware
         self.overrides: list[OverrideRecord] = []
         self.incidents: list[IncidentRecord] = []
         self.exceptions: list[StrategicException] = []
@@ -73,6 +115,13 @@ class TrustEngine:
         self._error_patterns: dict[str, int] = {}
         self._override_outcomes: dict[str, int] = {"correct": 0, "neutral": 0, "incorrect": 0}
 
+        # Scan results keyed by content hash; finished audits keyed by
+        # (content hash, governance profile, ...) so unchanged re-reviews are free
+        self._scan_cache: OrderedDict[str, ScanResult] = OrderedDict()
+        self._review_memo: OrderedDict[tuple, QualityAudit] = OrderedDict()
+        self._memo_stats = {"hits": 0, "misses": 0}
+        self._cache_lock = threading.Lock()
+
         self._seed_positions()
 
     def _seed_positions(self):
@@ -84,34 +133,55 @@ class TrustEngine:
             ("Our assessments are designed to identify gaps, not certify", "proposal_template", "methodology"),
         ]
         for claim, source, category in seeds:
-            self.positions.append(TrackedPosition(
+            self._add_position(TrackedPosition(
                 claim=claim, source_document=source, category=category,
             ))
 
+    # ── Single-Pass Scan ─────────────────────────────────────────
+
+    @staticmethod
+    def _content_hash(content: str) -> str:
+        return hashlib.sha256(content.encode("utf-8", "surrogatepass")).hexdigest()
+
+    def _scan(self, content: str, digest: str = None) -> ScanResult:
+        """Scan content once for every rule family, cached by content hash."""
+        digest = digest or self._content_hash(content)
+        with self._cache_lock:
+            cached = self._scan_cache.get(digest)
+            if cached is not None:
+                self._scan_cache.move_to_end(digest)
+                return cached
+        result = SCANNER.scan(content)
+        with self._cache_lock:
+            self._scan_cache[digest] = result
+            if len(self._scan_cache) > SCAN_CACHE_SIZE:
+                self._scan_cache.popitem(last=False)
+        return result
+
     # ── Profile Auto-Detection ───────────────────────────────────
 
     def detect_profile(self, content: str, recipient: str = "",
                        has_pricing: bool = False, has_compliance_refs: bool = False,
-                       is_public: bool = False) -> GovernanceProfile:
+                       is_public: bool = False, scan: ScanResult = None) -> GovernanceProfile:
         """Auto-detect governance profile from content signals."""
-        content_lower = content.lower()
+        scan = scan or self._scan(content)
 
         # Regulated output
-        if any(term in content_lower for term in ["iso 42001", "iso 27001", "essential eight", "audit report", "compliance assessment"]):
-            if has_pricing or "proposal" in content_lower:
+        if scan.has_iso("iso 42001", "iso 27001") or scan.has("essential eight", "audit report", "compliance assessment"):
+            if has_pricing or scan.has("proposal"):
                 return GovernanceProfile.SALES_MATERIALS
             return GovernanceProfile.REGULATED_OUTPUT
 
         # Public statement
-        if is_public or any(term in content_lower for term in ["press release", "media statement"]):
+        if is_public or scan.has("press release", "media statement"):
             return GovernanceProfile.PUBLIC_STATEMENT
 
         # Sales materials
-        if has_pricing or "proposal" in content_lower or "pricing" in content_lower:
+        if has_pricing or scan.has("proposal", "pricing"):
             return GovernanceProfile.SALES_MATERIALS
 
         # Social content
-        if any(term in content_lower for term in ["linkedin", "newsletter", "blog post"]):
+        if scan.has("linkedin", "newsletter", "blog post"):
             return GovernanceProfile.SOCIAL_CONTENT
 
         # Client communication
@@ -120,19 +190,20 @@ class TrustEngine:
 
         return GovernanceProfile.INTERNAL
 
-    def detect_intent(self, content: str, profile: GovernanceProfile) -> StrategicIntent:
+    def detect_intent(self, content: str, profile: GovernanceProfile,
+                      scan: ScanResult = None) -> StrategicIntent:
         """Infer strategic intent from content and profile."""
-        content_lower = content.lower()
-
         if profile == GovernanceProfile.INTERNAL:
             return StrategicIntent.INTERNAL_COMMS
         if profile in (GovernanceProfile.SOCIAL_CONTENT, GovernanceProfile.PUBLIC_STATEMENT):
             return StrategicIntent.THOUGHT_LEADERSHIP
-        if "apolog" in content_lower or "understand your concern" in content_lower:
+
+        scan = scan or self._scan(content)
+        if scan.has("apolog", "understand your concern"):
             return StrategicIntent.DE_ESCALATE
-        if "proposal" in content_lower or "pricing" in content_lower:
+        if scan.has("proposal", "pricing"):
             return StrategicIntent.CLOSE_DEAL
-        if "follow" in content_lower or "great meeting" in content_lower or "touch base" in content_lower:
+        if scan.has("follow", "great meeting", "touch base"):
             return StrategicIntent.BUILD_RELATIONSHIP
 
         return StrategicIntent.BUILD_RELATIONSHIP
@@ -148,10 +219,24 @@ class TrustEngine:
         Full quality review. Auto-detects profile and intent.
         Applies all nine trust dimensions + risk economics + thinking frameworks.
         """
-        has_compliance = bool(re.search(r"iso \d{5}|essential eight|compliance|governance", content, re.I))
-
-        profile = self.detect_profile(content, recipient, has_pricing, has_compliance, is_public)
-        intent = self.detect_intent(content, profile)
+        digest = self._content_hash(content)
+        scan = self._scan(content, digest)
+        has_compliance = scan.has_iso() or scan.has("essential eight", "compliance", "governance")
+
+        profile = self.detect_profile(content, recipient, has_pricing, has_compliance, is_public, scan=scan)
+
+        # Unchanged content under the same profile → same audit
+        fit_score = (audience_context or {}).get("fit_score")
+        memo_key = (digest, profile.value, title, document_type, fit_score)
+        with self._cache_lock:
+            memoised = self._review_memo.get(memo_key)
+            if memoised is not None:
+                self._review_memo.move_to_end(memo_key)
+                self._memo_stats["hits"] += 1
+                return memoised
+            self._memo_stats["misses"] += 1
+
+        intent = self.detect_intent(content, profile, scan=scan)
         gate_level = PROFILE_GATE_LEVELS[profile]
 
         audit = QualityAudit(
@@ -167,7 +252,7 @@ class TrustEngine:
         # Accuracy: check for guarantee/overstatement patterns
         guarantee_issues = []
         for pattern, term, message in GUARANTEE_PATTERNS:
-            if re.search(pattern, content, re.I):
+            if scan.has(term):
                 guarantee_issues.append({"term": term, "message": message})
                 trust.accuracy -= 5
                 audit.risk_items.append(RiskEconomicsItem(
@@ -191,16 +276,16 @@ class TrustEngine:
 
         # Voice match: check for aggressive patterns
         for pattern, term, message in AGGRESSIVE_PATTERNS:
-            if re.search(pattern, content, re.I):
+            if scan.has(term):
                 trust.voice_match -= 3
 
         # Compliance: check for compliance references
-        compliance_count = len(re.findall(r"iso \d{5}|essential eight|privacy act|acsc", content, re.I))
+        compliance_count = len(scan.iso_refs) + sum(scan.count(t) for t in COMPLIANCE_TERMS)
         audit.compliance_rules_checked = compliance_count
         audit.compliance_passed = compliance_count  # Assume pass unless specific issues found
 
         # Timeliness: check for year references
-        old_years = re.findall(r"\b(2022|2023|2024)\b", content)
+        old_years = scan.years
         if old_years:
             trust.timeliness -= 5 * len(old_years)
             for year in old_years:
@@ -218,7 +303,7 @@ class TrustEngine:
 
         # Resilience scoring
         resilience_hits = 0
-        if re.search(r"claude|gpt-4|gemini|llama", content, re.I):
+        if scan.has(*MODEL_NAMES):
             resilience_hits += 1
             audit.staleness_items.append(StalenessItem(
                 item_type="technology_claim",
@@ -226,15 +311,14 @@ class TrustEngine:
                 half_life_days=90,
                 action_needed="Replace with generic 'leading AI models' for resilience",
             ))
-        if re.search(r"\d+%.*(?:growing|increasing|trending)", content, re.I):
+        if scan.trend_claim:
             resilience_hits += 1
         trust.resilience = max(50, 100 - resilience_hits * 15)
         audit.resilience_score = trust.resilience
 
         # Sensitive content check
-        content_lower = content.lower()
         for term in SENSITIVE_TERMS:
-            if term in content_lower:
+            if scan.has(term):
                 audit.suggestions.append(f"Contains '{term}' — verify no confidentiality breach")
 
         # Completeness: basic length check for proposals
@@ -247,7 +331,7 @@ class TrustEngine:
         audit.weighted_trust_score = trust.weighted_score(intent)
 
         # Facts checked (rough proxy)
-        stats_found = re.findall(r"\d+%|\$[\d,]+", content)
+        stats_found = scan.stats
         audit.facts_checked = len(stats_found)
         audit.facts_verified = len(stats_found)  # Assume verified; real system would check
 
@@ -257,11 +341,11 @@ class TrustEngine:
 
         # ── 3. Multi-Perspective Review ─────────────────────────
         if gate_level >= 3:
-            audit.perspective_reviews = self._run_review_council(content, profile)
+            audit.perspective_reviews = self._run_review_council(content, profile, scan=scan)
 
         # ── 4. Credibility Engineering ──────────────────────────
         if gate_level >= 2:
-            present, missing, suggestions = self._analyse_credibility(content)
+            present, missing, suggestions = self._analyse_credibility(content, scan=scan)
             audit.credibility_present = present
             audit.credibility_missing = missing
             audit.credibility_suggestions = suggestions
@@ -304,6 +388,10 @@ class TrustEngine:
 
         # Store
         self.audits[audit.audit_id] = audit
+        with self._cache_lock:
+            self._review_memo[memo_key] = audit
+            if len(self._review_memo) > REVIEW_MEMO_SIZE:
+                self._review_memo.popitem(last=False)
         logger.info(
             f"Sentinel review: {title[:40]} | Profile: {profile.value} | "
             f"Intent: {intent.value} | Gate: {gate_level} | Verdict: {audit.verdict.value} | "
@@ -313,43 +401,47 @@ class TrustEngine:
 
     # ── Position Integrity Graph ─────────────────────────────────
 
-    def track_position(self, claim: str, source_document: str, category: str = "general"):
+    def _add_position(self, pos: TrackedPosition):
+        self.positions.append(pos)
+        self.position_index.add(pos)
+
+    def track_position(self, claim: str, source_document: str, category: str = "general") -> TrackedPosition:
         """Add a claim to the position integrity graph."""
         pos = TrackedPosition(claim=claim, source_document=source_document, category=category)
-        self.positions.append(pos)
+        self._add_position(pos)
+        with self._cache_lock:
+            self._review_memo.clear()  # Conflicts depend on the position graph
         logger.info(f"Position tracked: {claim[:50]}")
+        return pos
+
+    def import_positions(self, documents: list[dict]) -> int:
+        """
+        Bulk-import historical positions from published content.
+        Each document: {"source": "blog_jan_2026", "content": "...", "category": optional}.
+        Claim-like sentences are extracted and categorised automatically unless
+        the document fixes a category.
+        """
+        imported = 0
+        for doc in documents:
+            source = doc.get("source", "imported")
+            for claim, category in extract_claims(doc.get("content", "")):
+                self._add_position(TrackedPosition(
+                    claim=claim, source_document=source,
+                    category=doc.get("category") or category,
+                ))
+                imported += 1
+        with self._cache_lock:
+            self._review_memo.clear()
+        logger.info(f"Positions imported: {imported} from {len(documents)} documents")
+        return imported
 
     def _check_position_integrity(self, content: str) -> list[PositionConflict]:
-        """Check content against tracked positions for conflicts."""
-        conflicts = []
-        content_lower = content.lower()
-
-        # Check for timeline conflicts (e.g. "30 days" vs "2-3 weeks")
-        timeline_matches = re.findall(r"(\d+)\s*(?:working\s+)?days?", content_lower)
-        for pos in self.positions:
-            if pos.category == "methodology":
-                pos_lower = pos.claim.lower()
-                # Simple keyword overlap check
-                pos_keywords = set(pos_lower.split())
-                content_keywords = set(content_lower.split())
-                overlap = pos_keywords & content_keywords
-                # If there's significant overlap but the sentences aren't the same → investigate
-                # This is a simplified check; real system would use NLP
-
-        # Check for pricing conflicts
-        prices_in_content = re.findall(r"\$[\d,]+", content)
-        for price_str in prices_in_content:
-            for pos in self.positions:
-                if pos.category == "pricing" and pos.claim and price_str not in pos.claim:
-                    if "$" in pos.claim:
-                        conflicts.append(PositionConflict(
-                            claim_in_document=f"Price: {price_str}",
-                            conflicts_with=pos.source_document,
-                            conflict_description=f"Price differs from prior: {pos.claim}",
-                            resolution_options=["Update prior document", "Adjust this document", "Explain variance"],
-                        ))
-
-        return conflicts
+        """
+        Check content against tracked positions for conflicts.
+        Only positions sharing key terms with a sentence are evaluated
+        (see PositionIndex), so cost tracks the content, not the library.
+        """
+        return self.position_index.find_conflicts(content, negation_aware=self.negation_aware)
 
     def get_positions(self) -> list[dict]:
         return [
@@ -360,17 +452,18 @@ class TrustEngine:
 
     # ── Multi-Perspective Review Council ─────────────────────────
 
-    def _run_review_council(self, content: str, profile: GovernanceProfile) -> list[PerspectiveReview]:
+    def _run_review_council(self, content: str, profile: GovernanceProfile,
+                            scan: ScanResult = None) -> list[PerspectiveReview]:
         """Run adversarial multi-persona review."""
         reviews = []
-        content_lower = content.lower()
+        scan = scan or self._scan(content)
 
         # Regulator persona
         reg_flags = []
         for pattern, term, message in GUARANTEE_PATTERNS:
-            if re.search(pattern, content, re.I):
+            if scan.has(term):
                 reg_flags.append(f"'{term}' could be viewed as misleading by a regulator")
-        if "comprehensive" in content_lower:
+        if scan.has("comprehensive"):
             reg_flags.append("'Comprehensive' could be read as 'covers everything' — consider 'thorough'")
         reviews.append(PerspectiveReview(
             persona="regulator", flags=reg_flags, flag_count=len(reg_flags),
@@ -379,11 +472,13 @@ class TrustEngine:
         # Lawyer persona
         law_flags = []
         for pattern, term, message in GUARANTEE_PATTERNS:
-            if re.search(pattern, content, re.I):
+            if scan.has(term):
                 law_flags.append(f"'{term}' creates potential contractual liability")
-        timeline_refs = re.findall(r"\d+[\s-]*(?:day|week|month)", content_lower)
-        for t in timeline_refs:
-            if "estimated" not in content_lower[max(0, content_lower.index(t)-30):content_lower.index(t)]:
+        estimated = scan.terms.get("estimated", [])
+        for t, offset in scan.timelines:
+            # Qualified if "estimated" sits within the 30 characters before the timeline
+            i = bisect.bisect_left(estimated, offset - 30)
+            if i == len(estimated) or estimated[i] + len("estimated") > offset:
                 law_flags.append(f"Timeline '{t}' without qualifier — add 'estimated' or 'subject to'")
         reviews.append(PerspectiveReview(
             persona="lawyer", flags=law_flags, flag_count=len(law_flags),
@@ -391,10 +486,10 @@ class TrustEngine:
 
         # Sceptical prospect persona
         prospect_flags = []
-        if "testimonial" not in content_lower and "reference" not in content_lower and "case study" not in content_lower:
+        if not scan.has("testimonial", "reference", "case study"):
             prospect_flags.append("No client testimonials or references — add social proof")
         if profile == GovernanceProfile.SALES_MATERIALS:
-            if "solo" in content_lower or "one-person" in content_lower or len(content) < 2000:
+            if scan.has("solo", "one-person") or len(content) < 2000:
                 prospect_flags.append("Consider adding team/capability credibility signals")
         reviews.append(PerspectiveReview(
             persona="sceptical_prospect", flags=prospect_flags, flag_count=len(prospect_flags),
@@ -402,7 +497,7 @@ class TrustEngine:
 
         # Hostile competitor persona
         comp_flags = []
-        if "only" in content_lower and ("australia" in content_lower or "first" in content_lower):
+        if scan.has("only") and scan.has("australia", "first"):
             comp_flags.append("'Only' or 'first' claim detected — verify this is still true")
         reviews.append(PerspectiveReview(
             persona="hostile_competitor", flags=comp_flags, flag_count=len(comp_flags),
@@ -411,7 +506,7 @@ class TrustEngine:
         # Client sponsor persona
         sponsor_flags = []
         if profile == GovernanceProfile.SALES_MATERIALS:
-            if "escalat" not in content_lower and "issue" not in content_lower:
+            if not scan.has("escalat", "issue"):
                 sponsor_flags.append("No 'what if things go wrong' section — add escalation/support")
         reviews.append(PerspectiveReview(
             persona="client_sponsor", flags=sponsor_flags, flag_count=len(sponsor_flags),
@@ -421,15 +516,15 @@ class TrustEngine:
 
     # ── Credibility Engineering ───────────────────────────────────
 
-    def _analyse_credibility(self, content: str) -> tuple:
+    def _analyse_credibility(self, content: str, scan: ScanResult = None) -> tuple:
         """Analyse credibility signals present and missing."""
-        content_lower = content.lower()
+        scan = scan or self._scan(content)
         present = []
         missing = []
         suggestions = []
 
         # Check for signals
-        if re.search(r"iso \d{5}|certified|certification", content_lower):
+        if scan.has_iso() or scan.has(*CREDIBILITY_SIGNALS["certification_reference"]):
             present.append("certification_reference")
         else:
             missing.append("certification_reference")
@@ -439,7 +534,7 @@ class TrustEngine:
                 expected_trust_impact=5.0,
             ))
 
-        if re.search(r"case study|client|implementation|delivered", content_lower):
+        if scan.has(*CREDIBILITY_SIGNALS["social_proof"]):
             present.append("social_proof")
         else:
             missing.append("social_proof")
@@ -449,7 +544,7 @@ class TrustEngine:
                 expected_trust_impact=8.0,
             ))
 
-        if re.search(r"methodology|approach|framework|process", content_lower):
+        if scan.has(*CREDIBILITY_SIGNALS["methodology"]):
             present.append("methodology")
         else:
             missing.append("methodology")
@@ -459,7 +554,7 @@ class TrustEngine:
                 expected_trust_impact=4.0,
             ))
 
-        if re.search(r"milestone|timeline|deliverable|phase", content_lower):
+        if scan.has(*CREDIBILITY_SIGNALS["commitment"]):
             present.append("commitment")
         else:
             missing.append("commitment")
@@ -523,8 +618,9 @@ class TrustEngine:
     def quick_scan(self, content: str) -> dict:
         """Gate 1: Grammar + spelling + obvious issues only."""
         issues = []
+        scan = self._scan(content)
         for pattern, term, message in GUARANTEE_PATTERNS:
-            if re.search(pattern, content, re.I):
+            if scan.has(term):
                 issues.append({"term": term, "message": message})
 
         return {
@@ -594,8 +690,10 @@ class TrustEngine:
         return {
             "total_audits": len(self.audits),
             "positions_tracked": len(self.positions),
+            "position_terms_indexed": self.position_index.term_count,
             "overrides": len(self.overrides),
             "incidents": len(self.incidents),
             "exceptions": len(self.exceptions),
+            "review_memo": {**self._memo_stats, "size": len(self._review_memo)},
             "learning": self.get_learning_report(),
         }
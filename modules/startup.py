@@ -0,0 +1,207 @@
+"""
+Elaine v4 — Lazy Engine Startup
+Deferred engine construction and a startup profiler for create_app().
+
+Blueprints are handed LazyEngine proxies instead of built engines. A proxy
+imports and constructs its engine the first time anything on it is used
+(a request, another engine, or the warm-up thread), so the app starts
+serving /api/health before a single engine exists. Every import and
+constructor is timed; GET /api/system/startup shows where startup went.
+
+Almost Magic Tech Lab
+"""
+
+import importlib
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Optional
+
+logger = logging.getLogger("elaine.startup")
+
+WARMUP_DELAY_S = 1.0        # Let the server bind its port before warming
+
+
+# ── Startup Profiler ─────────────────────────────────────────────
+
+class StartupProfiler:
+    """Wall-clock timings for named startup phases, imports and inits."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.entries = []           # {"name", "kind", "ms", "at_ms", "thread"}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def phase(self, name, kind="phase"):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, kind, start)
+
+    def record(self, name, kind, start):
+        end = time.perf_counter()
+        with self._lock:
+            self.entries.append({
+                "name": name,
+                "kind": kind,
+                "ms": round((end - start) * 1000, 2),
+                "at_ms": round((start - self.started) * 1000, 1),
+                "thread": threading.current_thread().name,
+            })
+
+    def mark_ready(self):
+        """create_app() has returned — the app can take requests."""
+        self.record("create_app", "ready", self.started)
+
+    def report(self) -> dict:
+        with self._lock:
+            entries = list(self.entries)
+        ready = next((e["ms"] for e in entries if e["kind"] == "ready"), None)
+        totals = {}
+        for e in entries:
+            if e["kind"] != "ready":
+                totals[e["kind"]] = round(totals.get(e["kind"], 0) + e["ms"], 2)
+        return {
+            "create_app_ms": ready,
+            "totals_ms": totals,
+            "slowest": sorted((e for e in entries if e["kind"] != "ready"),
+                              key=lambda e: e["ms"], reverse=True)[:15],
+            "timeline": entries,
+        }
+
+
+# ── Lazy Engines ─────────────────────────────────────────────────
+
+class LazyEngine:
+    """
+    Stands in for an engine until first use, then forwards attribute access
+    (get, set, delete) to it. Only attribute access is forwarded: len(),
+    `in`, iteration and indexing are looked up on the proxy's type and raise
+    TypeError, so call the engine's methods instead. No registered engine
+    defines them. A proxy is always truthy and is never built just to be
+    tested.
+    """
+
+    # Prefixed so they never shadow an engine attribute of the same name
+    __slots__ = ("_lazy_registry", "_lazy_name", "_lazy_target", "_lazy_kwargs",
+                 "_lazy_after", "_lazy_instance", "_lazy_lock")
+
+    def __init__(self, registry, name, target, kwargs=None, after=None):
+        object.__setattr__(self, "_lazy_registry", registry)
+        object.__setattr__(self, "_lazy_name", name)
+        object.__setattr__(self, "_lazy_target", target)
+        object.__setattr__(self, "_lazy_kwargs", kwargs or {})
+        object.__setattr__(self, "_lazy_after", after)
+        object.__setattr__(self, "_lazy_instance", None)
+        object.__setattr__(self, "_lazy_lock", threading.RLock())
+
+    def _lazy_built(self):
+        return self._lazy_instance is not None
+
+    def _lazy_get(self):
+        instance = self._lazy_instance
+        if instance is not None:
+            return instance
+        with self._lazy_lock:
+            if self._lazy_instance is None:
+                object.__setattr__(self, "_lazy_instance", self._lazy_registry._build(self))
+            return self._lazy_instance
+
+    def __getattr__(self, attr):
+        return getattr(self._lazy_get(), attr)
+
+    def __setattr__(self, attr, value):
+        setattr(self._lazy_get(), attr, value)
+
+    def __delattr__(self, attr):
+        delattr(self._lazy_get(), attr)
+
+    def __repr__(self):
+        state = "built" if self._lazy_instance is not None else "pending"
+        return f"<LazyEngine {self._lazy_name} ({state})>"
+
+
+class EngineRegistry:
+    """Named lazy engines, built on demand or all at once by warm()."""
+
+    def __init__(self, profiler: Optional[StartupProfiler] = None):
+        self.profiler = profiler or StartupProfiler()
+        self.engines = {}           # name -> LazyEngine, in registration order
+        self._hooks = []
+        self._warm_steps = []
+        self.warm_thread = None
+
+    def register(self, name, target: str, after: Optional[Callable] = None, **kwargs):
+        """
+        Args:
+            target: "package.module:ClassName"
+            after: called with the new instance (e.g. to start watchers)
+            kwargs: constructor arguments; may be other LazyEngines
+        """
+        engine = LazyEngine(self, name, target, kwargs, after)
+        self.engines[name] = engine
+        return engine
+
+    def on_build(self, hook: Callable):
+        """hook(name, instance) runs for every engine as it is built."""
+        self._hooks.append(hook)
+        for name, engine in self.engines.items():
+            if engine._lazy_built():
+                hook(name, engine._lazy_instance)
+
+    def _build(self, engine):
+        module_name, _, class_name = engine._lazy_target.partition(":")
+        start = time.perf_counter()
+        module = importlib.import_module(module_name)
+        self.profiler.record(module_name, "import", start)
+        start = time.perf_counter()
+        instance = getattr(module, class_name)(**engine._lazy_kwargs)
+        if engine._lazy_after:
+            engine._lazy_after(instance)
+        self.profiler.record(engine._lazy_name, "init", start)
+        logger.info(f"Engine {engine._lazy_name} ready in {(time.perf_counter() - start) * 1000:.0f} ms")
+        for hook in self._hooks:
+            try:
+                hook(engine._lazy_name, instance)
+            except Exception as e:
+                logger.error(f"Build hook failed for {engine._lazy_name}: {e}")
+        return instance
+
+    def add_warm_step(self, name, fn: Callable):
+        """Extra startup work (scheduler, model pre-warm) run after the engines."""
+        self._warm_steps.append((name, fn))
+
+    def warm(self):
+        """Build every engine and run the warm-up steps; errors are logged, not raised."""
+        for name, engine in self.engines.items():
+            try:
+                engine._lazy_get()
+            except Exception as e:
+                logger.error(f"Engine {name} failed to build: {e}")
+        for name, fn in self._warm_steps:
+            try:
+                with self.profiler.phase(name, "warm"):
+                    fn()
+            except Exception as e:
+                logger.error(f"Warm-up step {name} failed: {e}")
+        logger.info(f"Warm-up complete: {len(self.engines)} engines")
+
+    def warm_in_background(self, delay=WARMUP_DELAY_S):
+        def run():
+            time.sleep(delay)
+            self.warm()
+        self.warm_thread = threading.Thread(target=run, daemon=True, name="engine-warmup")
+        self.warm_thread.start()
+        return self.warm_thread
+
+    def status(self) -> dict:
+        built = [n for n, e in self.engines.items() if e._lazy_built()]
+        return {
+            "engines": len(self.engines),
+            "built": built,
+            "pending": [n for n in self.engines if n not in built],
+            "warming": bool(self.warm_thread and self.warm_thread.is_alive()),
+        }
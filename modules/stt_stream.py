@@ -0,0 +1,346 @@
+"""
+Elaine v4 — Streaming Speech-to-Text
+Voice-activity segmentation and pooled faster-whisper decoding.
+
+Audio arrives as raw 16-bit mono PCM at 16 kHz in whatever chunk sizes
+the client sends. The pipeline:
+
+1. VAD      — 30 ms frames are classed speech/silence (webrtcvad when
+               installed, otherwise RMS energy against an adaptive noise floor)
+2. Segment  — speech opens a segment (with a short pre-roll so the first
+               syllable isn't clipped); ~450 ms of silence closes it
+3. Decode   — each closed segment is decoded on a small pool of pre-loaded
+               Whisper models while audio keeps arriving; long utterances
+               also get interim partial decodes
+4. Emit     — partial and final transcripts are returned in order as soon
+               as they are ready
+
+A voice command's text is ready roughly end-of-speech plus one segment
+decode, instead of upload + model load + whole-file decode.
+
+Almost Magic Tech Lab
+"""
+
+import logging
+import math
+import threading
+import time
+from array import array
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional
+
+logger = logging.getLogger("elaine.stt_stream")
+
+try:
+    import webrtcvad
+    HAS_WEBRTCVAD = True
+except ImportError:
+    HAS_WEBRTCVAD = False
+
+
+SAMPLE_RATE = 16000         # Whisper's native rate
+FRAME_MS = 30               # VAD frame
+START_FRAMES = 3            # Consecutive voiced frames that open a segment (90 ms)
+END_SILENCE_MS = 450        # Silence that closes a segment
+PRE_ROLL_MS = 240           # Audio kept from before speech was detected
+MAX_SEGMENT_S = 15.0        # Long monologues are cut and decoded in pieces
+PARTIAL_INTERVAL_S = 1.0    # New speech between interim decodes of an open segment
+POOL_SIZE = 2               # Whisper models kept loaded for concurrent decodes
+
+
+# ── Voice Activity Detection ─────────────────────────────────────
+
+class EnergyVAD:
+    """RMS energy against a noise floor that adapts during silence."""
+
+    def __init__(self, ratio=3.0, min_rms=200.0):
+        self.ratio = ratio
+        self.min_rms = min_rms
+        self.noise = min_rms / ratio
+
+    def is_speech(self, frame: bytes, sample_rate=SAMPLE_RATE) -> bool:
+        samples = array("h", frame)
+        rms = math.sqrt(sum(s * s for s in samples) / len(samples)) if samples else 0.0
+        speech = rms > max(self.min_rms, self.noise * self.ratio)
+        if not speech:
+            self.noise = 0.95 * self.noise + 0.05 * rms
+        return speech
+
+
+class WebRTCVAD:
+    """webrtcvad wrapper (aggressiveness 0–3)."""
+
+    def __init__(self, aggressiveness=2):
+        self._vad = webrtcvad.Vad(aggressiveness)
+
+    def is_speech(self, frame: bytes, sample_rate=SAMPLE_RATE) -> bool:
+        return self._vad.is_speech(frame, sample_rate)
+
+
+def default_vad():
+    return WebRTCVAD() if HAS_WEBRTCVAD else EnergyVAD()
+
+
+# ── Segmentation ─────────────────────────────────────────────────
+
+class SpeechSegmenter:
+    """Turns a PCM byte stream into closed speech segments."""
+
+    def __init__(self, vad=None, sample_rate=SAMPLE_RATE, frame_ms=FRAME_MS,
+                 start_frames=START_FRAMES, end_silence_ms=END_SILENCE_MS,
+                 pre_roll_ms=PRE_ROLL_MS, max_segment_s=MAX_SEGMENT_S):
+        self.vad = vad or default_vad()
+        self.sample_rate = sample_rate
+        self.frame_ms = frame_ms
+        self.frame_bytes = sample_rate * frame_ms // 1000 * 2
+        self.start_frames = start_frames
+        self.end_frames = max(1, end_silence_ms // frame_ms)
+        self.max_frames = int(max_segment_s * 1000 // frame_ms)
+        self._pending = bytearray()
+        self._pre_roll = deque(maxlen=max(start_frames, pre_roll_ms // frame_ms))
+        self._segment = None        # bytearray while speech is open
+        self._segment_start = 0     # frame index
+        self._voiced = 0
+        self._silent = 0
+        self.frames = 0             # frames consumed so far
+
+    @property
+    def in_speech(self):
+        return self._segment is not None
+
+    def current(self) -> bytes:
+        """Audio of the open segment so far (empty between utterances)."""
+        return bytes(self._segment or b"")
+
+    def current_seconds(self) -> float:
+        return len(self._segment or b"") / (2 * self.sample_rate)
+
+    def feed(self, pcm: bytes) -> list:
+        """Consume audio; returns closed segments as (pcm, start_s, end_s)."""
+        self._pending.extend(pcm)
+        closed = []
+        fb = self.frame_bytes
+        while len(self._pending) >= fb:
+            frame = bytes(self._pending[:fb])
+            del self._pending[:fb]
+            self.frames += 1
+            speech = self.vad.is_speech(frame, self.sample_rate)
+            if self._segment is None:
+                self._pre_roll.append(frame)
+                self._voiced = self._voiced + 1 if speech else 0
+                if self._voiced >= self.start_frames:
+                    self._segment = bytearray(b"".join(self._pre_roll))
+                    self._segment_start = self.frames - len(self._pre_roll)
+                    self._pre_roll.clear()
+                    self._silent = 0
+                continue
+            self._segment.extend(frame)
+            self._silent = 0 if speech else self._silent + 1
+            if self._silent >= self.end_frames or len(self._segment) >= self.max_frames * fb:
+                closed.append(self._close())
+        return closed
+
+    def flush(self) -> list:
+        """Close an open segment at end of stream."""
+        return [self._close()] if self._segment is not None else []
+
+    def _close(self):
+        # Keep a little of the trailing silence; Whisper likes a clean ending
+        keep = max(0, self._silent - 3) * self.frame_bytes
+        pcm = bytes(self._segment[:len(self._segment) - keep] if keep else self._segment)
+        start = self._segment_start * self.frame_ms / 1000
+        end = start + len(pcm) / (2 * self.sample_rate)
+        self._segment = None
+        self._voiced = 0
+        self._silent = 0
+        return pcm, round(start, 3), round(end, 3)
+
+
+# ── Model Pool ───────────────────────────────────────────────────
+
+class WhisperAdapter:
+    """faster-whisper model taking a file path or raw PCM16 bytes."""
+
+    def __init__(self, model):
+        self.model = model
+
+    def transcribe(self, audio, language="en"):
+        if isinstance(audio, (bytes, bytearray)):
+            import numpy as np   # faster-whisper depends on numpy
+            audio = np.frombuffer(audio, dtype=np.int16).astype(np.float32) / 32768.0
+        segments, info = self.model.transcribe(audio, language=language)
+        return " ".join(seg.text for seg in segments).strip(), info.language
+
+
+def faster_whisper_loader(model_size="tiny"):
+    """Loader for WhisperPool: CPU int8 faster-whisper (~75 MB RAM for tiny)."""
+    def load():
+        from faster_whisper import WhisperModel
+        return WhisperAdapter(WhisperModel(model_size, device="cpu", compute_type="int8"))
+    return load
+
+
+class WhisperPool:
+    """
+    A few loaded models shared by all transcriptions. Models are created
+    on demand up to `size` (or all at once by warm()); a caller waits for
+    a free one rather than loading another.
+    """
+
+    def __init__(self, loader: Callable, size=POOL_SIZE, language="en"):
+        self._loader = loader
+        self.size = max(1, size)
+        self.language = language
+        self._idle = []                         # Loaded models not in use
+        self._created = 0                       # Loaded or loading
+        self._lock = threading.Lock()
+        self._ready = threading.Condition(self._lock)   # A model came back, or a load failed
+        self.executor = ThreadPoolExecutor(max_workers=self.size, thread_name_prefix="stt-decode")
+        self.stats = {"loads": 0, "load_ms": [], "decodes": 0, "decode_ms_total": 0,
+                      "busy": 0, "warm": False, "error": None}
+
+    def _acquire(self):
+        with self._ready:
+            while not self._idle:
+                if self._created < self.size:
+                    self._created += 1
+                    break
+                self._ready.wait()
+            else:
+                return self._idle.pop()
+        start = time.perf_counter()
+        try:
+            model = self._loader()
+        except Exception as e:
+            with self._ready:
+                self._created -= 1
+                self.stats["error"] = str(e)
+                self._ready.notify()            # A waiter may now try the load itself
+            raise
+        with self._lock:
+            self.stats["loads"] += 1
+            self.stats["load_ms"].append(int((time.perf_counter() - start) * 1000))
+        return model
+
+    def transcribe(self, audio):
+        """(text, language) for a file path or PCM16 bytes; blocks for a free model."""
+        model = self._acquire()
+        start = time.perf_counter()
+        with self._lock:
+            self.stats["busy"] += 1
+        try:
+            return model.transcribe(audio, language=self.language)
+        finally:
+            with self._lock:
+                self.stats["busy"] -= 1
+                self.stats["decodes"] += 1
+                self.stats["decode_ms_total"] += int((time.perf_counter() - start) * 1000)
+            self._release(model)
+
+    def _release(self, model):
+        with self._ready:
+            self._idle.append(model)
+            self._ready.notify()
+
+    def submit(self, audio):
+        return self.executor.submit(self.transcribe, audio)
+
+    def warm(self):
+        """Load every model and run one short decode through each."""
+        models = []
+        try:
+            for _ in range(self.size):
+                models.append(self._acquire())
+            silence = b"\x00\x00" * (SAMPLE_RATE // 2)
+            for model in models:
+                model.transcribe(silence, language=self.language)
+            self.stats["warm"] = True
+            logger.info(f"STT pool warm: {len(models)} model(s)")
+        except Exception as e:
+            self.stats["error"] = str(e)
+            logger.info(f"STT pre-warm skipped: {e}")
+        finally:
+            for model in models:
+                self._release(model)
+
+    def warm_in_background(self):
+        t = threading.Thread(target=self.warm, daemon=True, name="stt-prewarm")
+        t.start()
+        return t
+
+    def status(self) -> dict:
+        with self._lock:
+            stats = dict(self.stats, load_ms=list(self.stats["load_ms"]))
+            stats.update(size=self.size, loaded=self._created, idle=len(self._idle))
+        stats["avg_decode_ms"] = (round(stats["decode_ms_total"] / stats["decodes"])
+                                  if stats["decodes"] else None)
+        return stats
+
+
+# ── Stream ───────────────────────────────────────────────────────
+
+class STTStream:
+    """
+    One live transcription. feed() and finish() return event dicts:
+      {"type": "partial", "segment", "text"}
+      {"type": "final", "segment", "text", "start_s", "end_s", "latency_ms"}
+    latency_ms is from the moment the segment closed to its text being ready.
+    """
+
+    def __init__(self, pool: WhisperPool, segmenter: Optional[SpeechSegmenter] = None,
+                 partials=True, partial_interval=PARTIAL_INTERVAL_S):
+        self.pool = pool
+        self.segmenter = segmenter or SpeechSegmenter()
+        self.partials = partials
+        self.partial_interval = partial_interval
+        self._finals = deque()          # (index, future, start_s, end_s, closed_at)
+        self._partial = None            # (index, future)
+        self._partial_at = 0.0          # open-segment length at the last partial
+        self._index = 0                 # index of the segment currently open / next to open
+        self.transcript = []
+        self.started = time.perf_counter()
+
+    def feed(self, pcm: bytes) -> list:
+        for seg_pcm, start_s, end_s in self.segmenter.feed(pcm):
+            self._submit_final(seg_pcm, start_s, end_s)
+        if (self.partials and self.segmenter.in_speech and self._partial is None
+                and self.segmenter.current_seconds() - self._partial_at >= self.partial_interval):
+            self._partial_at = self.segmenter.current_seconds()
+            self._partial = (self._index, self.pool.submit(self.segmenter.current()))
+        return self._ready(wait=False)
+
+    def finish(self) -> list:
+        for seg_pcm, start_s, end_s in self.segmenter.flush():
+            self._submit_final(seg_pcm, start_s, end_s)
+        return self._ready(wait=True)
+
+    def _submit_final(self, pcm, start_s, end_s):
+        self._finals.append((self._index, self.pool.submit(pcm), start_s, end_s, time.perf_counter()))
+        self._index += 1
+        self._partial_at = 0.0
+
+    def _ready(self, wait):
+        events = []
+        if self._partial is not None and self._partial[1].done():
+            index, future = self._partial
+            self._partial = None
+            if index == self._index and not future.exception():
+                events.append({"type": "partial", "segment": index, "text": future.result()[0]})
+        while self._finals and (wait or self._finals[0][1].done()):
+            index, future, start_s, end_s, closed_at = self._finals.popleft()
+            try:
+                text = future.result()[0]
+            except Exception as e:
+                events.append({"type": "error", "segment": index, "error": str(e)})
+                continue
+            if text:
+                self.transcript.append(text)
+            events.append({"type": "final", "segment": index, "text": text,
+                           "start_s": start_s, "end_s": end_s,
+                           "latency_ms": int((time.perf_counter() - closed_at) * 1000)})
+        return events
+
+    @property
+    def text(self):
+        return " ".join(self.transcript)
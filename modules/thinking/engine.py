@@ -12,17 +12,33 @@ Six frameworks, applied automatically or on request:
 
 Patentable: Multi-Framework Decision Intelligence with Auto-Application
 
+Sentinel, Gravity, Amplifier and the Orchestrator often analyse the same
+topic within moments of each other, so finished analyses are memoised on
+(topic, domain, stakes, frameworks, context) for a few minutes. When a
+provider (e.g. an LLM) fills in framework context, the frameworks of one
+analysis are run against it concurrently.
+
 Almost Magic Tech Lab — Patentable IP
 """
 
+import json
 import logging
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
-from typing import Optional
+from typing import Callable, Optional
 
 logger = logging.getLogger("elaine.thinking")
 
+ANALYSIS_CACHE_SIZE = 256   # Finished analyses kept for repeat requests
+ANALYSIS_CACHE_TTL = 600    # Seconds an analysis is reused before it is run again
+HISTORY_SIZE = 500          # Analyses kept for status() / get_history()
+PROVIDER_WORKERS = 4        # Concurrent provider calls across all analyses
+
 
 # ── Enums ────────────────────────────────────────────────────────
 
@@ -209,10 +225,26 @@ class ThinkingFrameworksEngine:
     6. Elaine proactively ("Before you decide, here's a pre-mortem")
     """
 
-    def __init__(self):
-        self._history: list[ThinkingResult] = []
+    def __init__(self, provider: Optional[Callable[[FrameworkType, str, dict], dict]] = None,
+                 cache_size: int = ANALYSIS_CACHE_SIZE, cache_ttl: float = ANALYSIS_CACHE_TTL):
+        """
+        Args:
+            provider: optional provider(framework, topic, context) → framework context,
+                      e.g. an LLM call. Keys the caller supplied win over the provider's.
+        """
+        self.provider = provider
+        self._history: deque[ThinkingResult] = deque(maxlen=HISTORY_SIZE)
+        self._total_analyses = 0
         self._framework_usage: dict[str, int] = {ft.value: 0 for ft in FrameworkType}
 
+        self.cache_size = cache_size
+        self.cache_ttl = cache_ttl
+        self._cache: OrderedDict[tuple, tuple[float, ThinkingResult]] = OrderedDict()
+        self._inflight: dict[tuple, Future] = {}
+        self._cache_stats = {"hits": 0, "misses": 0}
+        self._lock = threading.Lock()
+        self._pool: Optional[ThreadPoolExecutor] = None
+
     # ── Individual Frameworks ────────────────────────────────────
 
     def second_order(self, action: str, context: dict = None) -> SecondOrderResult:
@@ -385,15 +417,93 @@ class ThinkingFrameworksEngine:
         Returns a ThinkingResult with all framework outputs and synthesis.
 
         If frameworks is None, auto-selects based on domain + stakes.
+        An identical request within cache_ttl gets the same ThinkingResult back.
         """
         ctx = context or {}
 
         if frameworks is None:
             frameworks = self.select_frameworks(domain, stakes)
 
+        key = self._cache_key(topic, domain, stakes, frameworks, ctx)
+        if key is None:
+            return self._run(topic, domain, stakes, ctx, frameworks)
+
+        # Serve a fresh cached result, or wait on an identical analysis already running
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None and cached[0] > time.monotonic():
+                self._cache.move_to_end(key)
+                self._cache_stats["hits"] += 1
+                return cached[1]
+            pending = self._inflight.get(key)
+            if pending is None:
+                self._cache_stats["misses"] += 1
+                self._inflight[key] = future = Future()
+        if pending is not None:
+            with self._lock:
+                self._cache_stats["hits"] += 1
+            return pending.result()
+
+        try:
+            result = self._run(topic, domain, stakes, ctx, frameworks)
+        except BaseException as e:
+            with self._lock:
+                del self._inflight[key]
+            future.set_exception(e)
+            raise
+        with self._lock:
+            del self._inflight[key]
+            self._cache[key] = (time.monotonic() + self.cache_ttl, result)
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        future.set_result(result)
+        return result
+
+    @staticmethod
+    def _cache_key(topic, domain, stakes, frameworks, ctx) -> Optional[tuple]:
+        """Normalised (topic, domain, stakes, frameworks, context); None if context won't serialise."""
+        try:
+            context_key = json.dumps(ctx, sort_keys=True, default=str)
+        except (TypeError, ValueError):
+            return None
+        return (" ".join(topic.casefold().split()), domain.value, stakes.value,
+                tuple(fw.value for fw in frameworks), context_key)
+
+    def clear_cache(self):
+        with self._lock:
+            self._cache.clear()
+
+    def _framework_contexts(self, topic: str, ctx: dict,
+                            frameworks: list[FrameworkType]) -> dict[str, dict]:
+        """Each framework's context, with provider output filled in — concurrently when there's a provider."""
+        contexts = {fw.value: ctx.get(fw.value, {}) for fw in frameworks}
+        if not self.provider or not frameworks:
+            return contexts
+
+        def provide(fw):
+            try:
+                return self.provider(fw, topic, contexts[fw.value]) or {}
+            except Exception as e:
+                logger.warning(f"Thinking provider failed for {fw.value}: {e}")
+                return {}
+
+        if len(frameworks) == 1:
+            provided = {frameworks[0].value: provide(frameworks[0])}
+        else:
+            with self._lock:
+                if self._pool is None:
+                    self._pool = ThreadPoolExecutor(max_workers=PROVIDER_WORKERS,
+                                                    thread_name_prefix="thinking")
+            futures = {fw.value: self._pool.submit(provide, fw) for fw in frameworks}
+            provided = {name: f.result() for name, f in futures.items()}
+        return {name: {**provided[name], **contexts[name]} for name in contexts}
+
+    def _run(self, topic, domain, stakes, ctx, frameworks) -> ThinkingResult:
+        contexts = self._framework_contexts(topic, ctx, frameworks)
         results = {}
         for fw in frameworks:
-            fw_context = ctx.get(fw.value, {})
+            fw_context = contexts[fw.value]
             if fw == FrameworkType.SECOND_ORDER:
                 results[fw.value] = self.second_order(topic, fw_context)
             elif fw == FrameworkType.SYSTEMS:
@@ -419,7 +529,9 @@ class ThinkingFrameworksEngine:
             warnings=ctx.get("warnings", []),
         )
 
-        self._history.append(thinking_result)
+        with self._lock:
+            self._history.append(thinking_result)
+            self._total_analyses += 1
         logger.info(
             f"Thinking analysis complete: {topic[:40]} | "
             f"{len(frameworks)} frameworks | domain={domain.value} stakes={stakes.value}"
@@ -535,12 +647,13 @@ class ThinkingFrameworksEngine:
 
     def status(self) -> dict:
         return {
-            "total_analyses": len(self._history),
+            "total_analyses": self._total_analyses,
             "framework_usage": self._framework_usage,
             "recent_topics": [
                 {"topic": r.topic[:60], "frameworks": len(r.frameworks_applied), "stakes": r.stakes.value}
-                for r in self._history[-5:]
+                for r in list(self._history)[-5:]
             ],
+            "cache": dict(self._cache_stats, size=len(self._cache)),
         }
 
     def get_history(self, limit: int = 10) -> list[dict]:
@@ -555,5 +668,5 @@ class ThinkingFrameworksEngine:
                 "warnings": r.warnings,
                 "timestamp": r.timestamp.isoformat(),
             }
-            for r in self._history[-limit:]
+            for r in list(self._history)[-limit:]
         ]
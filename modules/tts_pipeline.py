@@ -0,0 +1,362 @@
+"""
+Elaine v4 — Streaming TTS Pipeline
+Sentence-pipelined speech synthesis with an on-disk phrase cache.
+
+Instead of synthesising a whole reply and then sending one audio file:
+
+1. Split   — text (plain or SSML) is cut at sentence and SSML boundaries;
+             <break time="…"/> becomes a pause before the next chunk
+2. Render  — a worker thread synthesises chunks in order, a few ahead of
+             playback, while earlier chunks are already streaming out
+3. Cache   — every chunk is content-addressed (backend, voice, settings,
+             text) on disk, so phrases that recur day to day ("Morning
+             Mani.", section intros) cost a file read, not a synthesis
+4. Evict   — the cache is bounded in bytes, least recently used first
+
+Time to first audio is one sentence's synthesis (or a cache read).
+
+Almost Magic Tech Lab
+"""
+
+import hashlib
+import json
+import logging
+import os
+import queue
+import re
+import struct
+import threading
+import urllib.request
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Optional
+
+logger = logging.getLogger("elaine.tts_pipeline")
+
+
+MAX_CHUNK_CHARS = 280       # Longer sentences are split again at , ; : —
+LOOKAHEAD = 2               # Chunks synthesised ahead of the one streaming out
+CACHE_MAX_BYTES = int(os.environ.get("ELAINE_TTS_CACHE_MB", "200")) * 1024 * 1024
+CACHE_DIR = Path.home() / ".elaine" / "tts_cache"
+PCM_SAMPLE_RATE = 24000     # Kokoro-82M output, 16-bit mono
+
+_ABBREVIATIONS = {"mr", "mrs", "ms", "dr", "st", "vs", "etc", "e.g", "i.e", "approx", "no", "inc", "ltd"}
+_BOUNDARY_TAG = re.compile(r"<\s*(/?)\s*(speak|p|s|break)\b([^>]*)>", re.IGNORECASE)
+_ANY_TAG = re.compile(r"<[^>]+>")
+_BREAK_TIME = re.compile(r'time\s*=\s*"(\d+(?:\.\d+)?)\s*(ms|s)"', re.IGNORECASE)
+_SENTENCE_END = re.compile(r"""(?:(?<=[.!?…])|(?<=[.!?…]["')\]]))\s+""")
+_SOFT_BREAK = re.compile(r"(?<=[,;:—])\s+")
+_SPACE_BEFORE_PUNCT = re.compile(r"\s+([,.;:!?…])")
+
+
+# ── Splitting ────────────────────────────────────────────────────
+
+@dataclass
+class SpeechChunk:
+    """One unit of synthesis: a sentence (or part of one) and the pause before it."""
+    text: str
+    pause_before_ms: int = 0
+
+
+def _sentences(text):
+    pieces = []
+    for piece in _SENTENCE_END.split(text):
+        piece = piece.strip()
+        if not piece:
+            continue
+        last_word = pieces[-1].rsplit(None, 1)[-1].rstrip(".").lower() if pieces else ""
+        if pieces and last_word in _ABBREVIATIONS:
+            pieces[-1] += " " + piece
+        else:
+            pieces.append(piece)
+    out = []
+    for sentence in pieces:
+        while len(sentence) > MAX_CHUNK_CHARS:
+            cuts = [m.start() for m in _SOFT_BREAK.finditer(sentence, 0, MAX_CHUNK_CHARS)]
+            cut = cuts[-1] if cuts else sentence.rfind(" ", 0, MAX_CHUNK_CHARS)
+            if cut <= 0:
+                cut = MAX_CHUNK_CHARS
+            out.append(sentence[:cut].strip())
+            sentence = sentence[cut:].strip()
+        if sentence:
+            out.append(sentence)
+    return out
+
+
+def split_speech(text: str) -> list[SpeechChunk]:
+    """Plain text or SSML → chunks at sentence and SSML boundaries."""
+    chunks = []
+    pause = 0
+    pos = 0
+    matches = list(_BOUNDARY_TAG.finditer(text)) + [None]
+    for m in matches:
+        run = text[pos:m.start() if m else len(text)]
+        plain = _SPACE_BEFORE_PUNCT.sub(r"\1", " ".join(_ANY_TAG.sub(" ", run).split()))
+        for sentence in _sentences(plain):
+            chunks.append(SpeechChunk(sentence, pause))
+            pause = 0
+        if m is None:
+            break
+        pos = m.end()
+        if m.group(2).lower() == "break":
+            t = _BREAK_TIME.search(m.group(3))
+            if t:
+                pause += int(float(t.group(1)) * (1000 if t.group(2).lower() == "s" else 1))
+    return chunks
+
+
+def segments_to_chunks(segments) -> list[SpeechChunk]:
+    """VoiceSegment-like objects (text, pause_before_ms) → chunks; the pause leads the first sentence."""
+    chunks = []
+    for seg in segments:
+        pieces = split_speech(seg.text)
+        if pieces:
+            pieces[0].pause_before_ms += seg.pause_before_ms
+        chunks.extend(pieces)
+    return chunks
+
+
+# ── Phrase Cache ─────────────────────────────────────────────────
+
+class PhraseCache:
+    """Content-addressed audio files on disk, evicted least recently used first."""
+
+    def __init__(self, cache_dir=CACHE_DIR, max_bytes=CACHE_MAX_BYTES):
+        self.dir = Path(cache_dir)
+        self.dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()   # key → size, oldest first
+        self.total_bytes = 0
+        self.stats = {"hits": 0, "misses": 0, "writes": 0, "evictions": 0}
+        files = []
+        for path in self.dir.glob("*.audio"):
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            files.append((st.st_mtime, path.stem, st.st_size))
+        for _, key, size in sorted(files):
+            self._entries[key] = size
+            self.total_bytes += size
+        self._evict()
+
+    @staticmethod
+    def key(*parts) -> str:
+        return hashlib.sha256(json.dumps(parts, sort_keys=True, default=str).encode()).hexdigest()
+
+    def _path(self, key):
+        return self.dir / f"{key}.audio"
+
+    def get(self, key) -> Optional[bytes]:
+        with self._lock:
+            if key not in self._entries:
+                self.stats["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+        try:
+            data = self._path(key).read_bytes()
+            os.utime(self._path(key))    # recency survives restarts
+        except OSError:
+            with self._lock:
+                self.total_bytes -= self._entries.pop(key, 0)
+                self.stats["misses"] += 1
+            return None
+        with self._lock:
+            self.stats["hits"] += 1
+        return data
+
+    def put(self, key, data: bytes):
+        if not data or len(data) > self.max_bytes:
+            return
+        tmp = self.dir / f".{key}.{threading.get_ident()}.tmp"
+        try:
+            tmp.write_bytes(data)
+            os.replace(tmp, self._path(key))
+        except OSError as e:
+            logger.warning(f"Phrase cache write failed: {e}")
+            return
+        with self._lock:
+            self.total_bytes -= self._entries.pop(key, 0)
+            self._entries[key] = len(data)
+            self.total_bytes += len(data)
+            self.stats["writes"] += 1
+            self._evict()
+
+    def _evict(self):
+        while self.total_bytes > self.max_bytes and self._entries:
+            key, size = self._entries.popitem(last=False)
+            self.total_bytes -= size
+            self.stats["evictions"] += 1
+            try:
+                self._path(key).unlink()
+            except OSError:
+                pass
+
+    def status(self) -> dict:
+        with self._lock:
+            return {"entries": len(self._entries), "bytes": self.total_bytes,
+                    "max_bytes": self.max_bytes, **self.stats}
+
+
+# ── Backends ─────────────────────────────────────────────────────
+
+class ElevenLabsBackend:
+    """ElevenLabs text-to-speech. Each chunk is a self-contained MP3; MP3 streams concatenate."""
+    name = "elevenlabs"
+    mimetype = "audio/mpeg"
+
+    def __init__(self, api_key, voice_id, model_id, timeout=10):
+        self.api_key = api_key
+        self.voice_id = voice_id
+        self.model_id = model_id
+        self.timeout = timeout
+
+    @property
+    def cache_id(self):
+        return (self.name, self.voice_id, self.model_id)
+
+    def header(self) -> bytes:
+        return b""
+
+    def silence(self, ms) -> bytes:
+        return b""      # MP3 frames can't be padded without an encoder
+
+    def synthesise(self, text, settings=None) -> bytes:
+        payload = json.dumps({
+            "text": text,
+            "model_id": self.model_id,
+            "voice_settings": settings or {"stability": 0.5, "similarity_boost": 0.75, "style": 0.3},
+        }).encode("utf-8")
+        req = urllib.request.Request(
+            f"https://api.elevenlabs.io/v1/text-to-speech/{self.voice_id}",
+            data=payload,
+            headers={"Content-Type": "application/json", "xi-api-key": self.api_key,
+                     "Accept": "audio/mpeg"},
+            method="POST",
+        )
+        with urllib.request.urlopen(req, timeout=self.timeout) as resp:
+            return resp.read()
+
+
+class PCMBackend:
+    """
+    Local synthesis returning 16-bit mono PCM (Kokoro-82M). The stream is
+    one WAV whose header declares an open-ended length, then raw PCM per
+    chunk, so players start on the first sentence.
+    """
+    mimetype = "audio/wav"
+
+    def __init__(self, name, synthesise_pcm: Callable[[str], Optional[bytes]],
+                 sample_rate=PCM_SAMPLE_RATE):
+        self.name = name
+        self._synthesise = synthesise_pcm
+        self.sample_rate = sample_rate
+
+    @property
+    def cache_id(self):
+        return (self.name, self.sample_rate)
+
+    def header(self) -> bytes:
+        return wav_header(self.sample_rate, 0xFFFFFFFF - 36)
+
+    def silence(self, ms) -> bytes:
+        return b"\x00\x00" * (self.sample_rate * ms // 1000)
+
+    def synthesise(self, text, settings=None) -> bytes:
+        pcm = self._synthesise(text)
+        if pcm is None:
+            raise RuntimeError(f"{self.name} synthesis failed")
+        return pcm
+
+
+def wav_header(sample_rate, data_size) -> bytes:
+    """44-byte PCM WAV header, 16-bit mono."""
+    return (b"RIFF" + struct.pack("<I", (36 + data_size) & 0xFFFFFFFF) + b"WAVE"
+            + b"fmt " + struct.pack("<IHHIIHH", 16, 1, 1, sample_rate, sample_rate * 2, 2, 16)
+            + b"data" + struct.pack("<I", data_size & 0xFFFFFFFF))
+
+
+# ── Pipeline ─────────────────────────────────────────────────────
+
+class TTSPipeline:
+    """Streams chunked audio for a list of SpeechChunks through a backend and the phrase cache."""
+
+    def __init__(self, cache: Optional[PhraseCache] = None, lookahead=LOOKAHEAD):
+        self.cache = cache
+        self.lookahead = lookahead
+        self._lock = threading.Lock()
+        self.stats = {"streams": 0, "chunks": 0, "synthesised": 0, "cancelled": 0}
+
+    def render(self, backend, chunk: SpeechChunk, settings=None) -> bytes:
+        """Audio for one chunk (pause included), from the cache when possible."""
+        key = PhraseCache.key(backend.cache_id, settings, chunk.text)
+        audio = self.cache.get(key) if self.cache else None
+        if audio is None:
+            audio = backend.synthesise(chunk.text, settings)
+            with self._lock:
+                self.stats["synthesised"] += 1
+            if self.cache:
+                self.cache.put(key, audio)
+        return backend.silence(chunk.pause_before_ms) + audio if chunk.pause_before_ms else audio
+
+    def stream(self, backend, chunks, settings=None):
+        """
+        Generator of audio bytes. The first item is the stream header plus
+        the first chunk, so a failing backend raises before anything is
+        sent. `settings` is one dict for every chunk or a list, one per chunk.
+        """
+        chunks = list(chunks)
+        per_chunk = settings if isinstance(settings, list) else [settings] * len(chunks)
+        out = queue.Queue(maxsize=max(1, self.lookahead))
+        cancel = threading.Event()
+
+        def put(item):
+            while not cancel.is_set():
+                try:
+                    out.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def produce():
+            try:
+                for chunk, chunk_settings in zip(chunks, per_chunk):
+                    if cancel.is_set() or not put(("audio", self.render(backend, chunk, chunk_settings))):
+                        return
+                put(("end", None))
+            except Exception as e:
+                put(("error", e))
+
+        with self._lock:
+            self.stats["streams"] += 1
+        threading.Thread(target=produce, daemon=True, name="tts-render").start()
+        first = True
+        finished = False
+        try:
+            while True:
+                kind, value = out.get()
+                if kind == "end":
+                    if first:
+                        yield backend.header()
+                    finished = True
+                    return
+                if kind == "error":
+                    raise value
+                with self._lock:
+                    self.stats["chunks"] += 1
+                yield backend.header() + value if first else value
+                first = False
+        finally:
+            cancel.set()
+            if not finished:
+                with self._lock:
+                    self.stats["cancelled"] += 1
+
+    def status(self) -> dict:
+        with self._lock:
+            status = dict(self.stats)
+        status["cache"] = self.cache.status() if self.cache else None
+        return status
@@ -8,7 +8,11 @@ Accessible to all AMTL apps via /api/wisdom/* endpoints.
 Almost Magic Tech Lab
 """
 
+import math
 import random
+import re
+from bisect import bisect_left
+from collections import defaultdict
 from datetime import datetime
 
 # ── Sitcom Quotes ────────────────────────────────────────────────
@@ -120,6 +124,74 @@ PHILOSOPHY = [
 ]
 
 
+# ── Search Index ─────────────────────────────────────────────────
+
+# Field weights mirror the old substring scoring: text 3, author 2, source/culture 1
+FIELD_WEIGHTS = {"text": 3.0, "author": 2.0, "source": 1.0, "culture": 1.0}
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+_TOKEN_RX = re.compile(r"[a-z0-9]+")
+
+
+def tokenise(text: str) -> list[str]:
+    return _TOKEN_RX.findall(text.lower().replace("'", ""))
+
+
+class BM25Index:
+    """Fielded BM25 over the quotes, built once at load.
+
+    Each quote is one document whose term frequencies are weighted by
+    field (BM25F-style). Query terms match whole tokens or token
+    prefixes ("swan" → "swanson"), and every query term must match,
+    like the old substring search did for a phrase.
+    """
+
+    def __init__(self, docs: list[dict]):
+        self.postings: dict[str, dict[int, float]] = defaultdict(dict)  # term → doc → weighted tf
+        lengths = []
+        for i, doc in enumerate(docs):
+            length = 0.0
+            for field, weight in FIELD_WEIGHTS.items():
+                for token in tokenise(doc.get(field, "")):
+                    self.postings[token][i] = self.postings[token].get(i, 0.0) + weight
+                    length += weight
+            lengths.append(length)
+        self.lengths = lengths
+        self.avg_length = (sum(lengths) / len(lengths)) if lengths else 0.0
+        self.vocabulary = sorted(self.postings)
+        n = len(docs)
+        self.idf = {t: math.log(1 + (n - len(p) + 0.5) / (len(p) + 0.5)) for t, p in self.postings.items()}
+
+    def expand(self, token: str) -> list[str]:
+        """Vocabulary terms equal to or starting with token."""
+        i = bisect_left(self.vocabulary, token)
+        terms = []
+        while i < len(self.vocabulary) and self.vocabulary[i].startswith(token):
+            terms.append(self.vocabulary[i])
+            i += 1
+        return terms
+
+    def search(self, query: str, limit: int = 10) -> list[tuple[int, float]]:
+        """Return (doc index, score) pairs, best first."""
+        scores: dict[int, float] = {}
+        matched: dict[int, int] = defaultdict(int)
+        tokens = list(dict.fromkeys(tokenise(query)))
+        for token in tokens:
+            hit = set()
+            for term in self.expand(token):
+                idf = self.idf[term]
+                for doc, tf in self.postings[term].items():
+                    norm = tf + BM25_K1 * (1 - BM25_B + BM25_B * self.lengths[doc] / self.avg_length)
+                    scores[doc] = scores.get(doc, 0.0) + idf * tf * (BM25_K1 + 1) / norm
+                    hit.add(doc)
+            for doc in hit:
+                matched[doc] += 1
+        ranked = [(doc, score) for doc, score in scores.items() if matched[doc] == len(tokens)]
+        ranked.sort(key=lambda x: (-x[1], x[0]))
+        return ranked[:limit]
+
+
 # ── Knowledge Base Class ─────────────────────────────────────────
 
 class WisdomKB:
@@ -130,15 +202,18 @@ class WisdomKB:
     def __init__(self):
         self.all_quotes = SITCOM_QUOTES + ONE_LINERS + WORLD_IDIOMS + PHILOSOPHY
         self._daily_cache = {}  # date → quote
+        self._index = BM25Index(self.all_quotes)
+        self._by_category: dict[str, list[dict]] = defaultdict(list)
+        for q in self.all_quotes:
+            self._by_category[q.get("category", "unknown")].append(q)
 
     def random(self, category: str = None) -> dict:
         """Get a random quote, optionally filtered by category."""
-        pool = self.all_quotes
-        if category:
-            pool = [q for q in pool if q.get("category") == category]
-        if not pool:
-            pool = self.all_quotes
-        return random.choice(pool)
+        pool = self._by_category.get(category) if category else None
+        return random.choice(pool or self.all_quotes)
+
+    def by_category(self, category: str) -> list[dict]:
+        return list(self._by_category.get(category, []))
 
     def daily(self) -> dict:
         """Get the quote of the day (same quote all day, changes at midnight)."""
@@ -150,23 +225,9 @@ class WisdomKB:
         return self._daily_cache[today]
 
     def search(self, query: str, limit: int = 10) -> list[dict]:
-        """Search quotes by keyword (text, author, source, culture)."""
-        q = query.lower()
-        results = []
-        for quote in self.all_quotes:
-            score = 0
-            if q in quote["text"].lower():
-                score += 3
-            if q in quote.get("author", "").lower():
-                score += 2
-            if q in quote.get("source", "").lower():
-                score += 1
-            if q in quote.get("culture", "").lower():
-                score += 1
-            if score > 0:
-                results.append({**quote, "_score": score})
-        results.sort(key=lambda x: x["_score"], reverse=True)
-        return [{k: v for k, v in r.items() if k != "_score"} for r in results[:limit]]
+        """Search quotes by keyword (text, author, source, culture), BM25-ranked.
+        Returns copies, so callers can annotate results without touching the KB."""
+        return [dict(self.all_quotes[i]) for i, _ in self._index.search(query, limit)]
 
     def by_source(self, source: str) -> list[dict]:
         """Get all quotes from a specific source (e.g. 'Seinfeld', 'The Office')."""
@@ -180,11 +241,7 @@ class WisdomKB:
 
     def categories(self) -> dict:
         """Return category counts."""
-        counts = {}
-        for q in self.all_quotes:
-            cat = q.get("category", "unknown")
-            counts[cat] = counts.get(cat, 0) + 1
-        return counts
+        return {cat: len(quotes) for cat, quotes in self._by_category.items()}
 
     def stats(self) -> dict:
         return {
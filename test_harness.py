@@ -292,10 +292,52 @@ def test_sentinel_position_integrity():
     positions = te.get_positions()
     assert len(positions) > 0  # Seeded positions
 
+def test_sentinel_single_pass_scan():
+    from modules.sentinel.trust_engine import SCANNER
+    scan = SCANNER.scan("We GUARANTEE delivery in 3 weeks. Fees: $5,000 (40% growing). "
+                        "See the 2023 client name list. Not certifying anything.")
+    assert scan.has("guarantee") and scan.has("client name") and scan.has("client")
+    assert not scan.has("certify")  # bounded term inside "certifying"
+    assert scan.prices == ["$5,000"] and scan.stats == ["$5,000", "40%"]
+    assert scan.years == ["2023"] and scan.trend_claim
+    assert [t for t, _ in scan.timelines] == ["3 week"]
+
+def test_sentinel_review_memo():
+    from modules.sentinel.trust_engine import TrustEngine
+    te = TrustEngine()
+    draft = "Proposal: we guarantee results for $9,000."
+    first = te.review(draft, title="Proposal")
+    again = te.review(draft, title="Proposal")
+    assert again is first
+    assert te.status()["review_memo"]["hits"] == 1
+    te.track_position("Standard fee is $8,000", "rate_card", "pricing")
+    assert te.review(draft, title="Proposal") is not first  # Position graph changed
+
+def test_sentinel_position_index():
+    from modules.sentinel.trust_engine import TrustEngine
+    te = TrustEngine()
+    conflicts = te._check_position_integrity("We guarantee compliance outcomes for every client.")
+    assert any("never guarantee" in c.conflict_description for c in conflicts)
+    te.track_position("Our readiness assessment fee is $8,000", "rate_card", "pricing")
+    conflicts = te._check_position_integrity("The readiness assessment fee is $9,500. Parking is $20.")
+    assert [c.claim_in_document for c in conflicts] == ["Price: $9,500"]
+    imported = te.import_positions([{"source": "blog", "content": "We never sell client data. Reviews take 30 days."}])
+    assert imported == 2 and len(te.position_index) == len(te.positions)
+    from modules.sentinel.position_index import split_sentences
+    assert split_sentences("Uptime is 99.5% a year. Fees start at $1.5M!\nDone") == [
+        "Uptime is 99.5% a year", "Fees start at $1.5M", "Done"]
+    te.track_position("Hosting is $2.5 per seat", "rate_card", "pricing")
+    assert te._check_position_integrity("Hosting is $2.5 per seat.") == []
+    conflicts = te._check_position_integrity("Hosting is now $3.5 per seat.")
+    assert [c.claim_in_document for c in conflicts] == ["Price: $3.5"]
+
 test("Sentinel: clean review", test_sentinel_review_clean)
 test("Sentinel: dangerous language detection", test_sentinel_review_dangerous)
 test("Sentinel: quick scan", test_sentinel_quick_scan)
 test("Sentinel: position integrity", test_sentinel_position_integrity)
+test("Sentinel: single-pass scanner", test_sentinel_single_pass_scan)
+test("Sentinel: review memo", test_sentinel_review_memo)
+test("Sentinel: position index", test_sentinel_position_index)
 
 # ── Chronicle v2 ──
 
@@ -754,6 +796,89 @@ def test_gatekeeper_status():
     s = gk.status()
     assert s["items_checked"] == 1
 
+def test_gatekeeper_check_many():
+    from modules.gatekeeper import Gatekeeper
+    gk = Gatekeeper()
+    items = [{"content": f"Note {i % 3}", "title": f"Email {i % 3}"} for i in range(6)]
+    items += [{"content": "Note 0", "title": "Other"},
+              {"content": "Note 0", "title": "Email 0", "emotional_context": "grief"}]
+    results = sorted(gk.check_many(items), key=lambda r: r[0])
+    assert [r[0] for r in results] == list(range(8))
+    assert [r[2] for r in results] == [None, None, None, 0, 1, 2, None, None]  # duplicates reuse the first verdict
+    assert gk.status()["items_checked"] == 5
+
+def test_gatekeeper_persistent_history():
+    import tempfile
+    from modules.gatekeeper import Gatekeeper
+    db = os.path.join(tempfile.mkdtemp(), "gatekeeper.db")
+    gk = Gatekeeper(db_path=db, history_size=3)
+    for i in range(5):
+        gk.check(f"Test {i}", f"Email {i}")
+    assert len(gk.get_history(10)) == 3  # bounded ring
+    reloaded = Gatekeeper(db_path=db, history_size=3)
+    assert [h["title"] for h in reloaded.get_history(10)] == ["Email 2", "Email 3", "Email 4"]
+    assert reloaded.status()["items_checked"] == 5
+
+def _watch_temp_folder(backend):
+    import tempfile
+    from modules.gatekeeper import Gatekeeper, ContentChannel, ContentPriority
+    from modules.folder_watcher import FolderWatcher
+    gk = Gatekeeper()
+    gk.watcher = FolderWatcher(gk._check_file, debounce=0.15, backend=backend, poll_interval=0.05)
+    folder = tempfile.mkdtemp()
+    gk.add_watched_folder(folder, ContentChannel.FILE, ContentPriority.STANDARD, extensions=[".txt"])
+    gk.start_watching()
+    return gk, folder
+
+def _exercise_watcher(backend):
+    import time
+    gk, folder = _watch_temp_folder(backend)
+    try:
+        path = os.path.join(folder, "proposal.txt")
+        for i in range(5):  # editor save storm → one check
+            with open(path, "w") as f:
+                f.write(f"Draft {i}")
+            time.sleep(0.02)
+        with open(os.path.join(folder, "notes.tmp"), "w") as f:
+            f.write("ignored extension")
+        time.sleep(0.3)
+        assert gk.watcher.drain()
+        stats = next(s for s in gk.watcher.stats()["folders"] if s["path"] == folder)
+        assert stats["checked"] == 1, stats
+        assert gk.get_history()[-1]["title"] == "proposal.txt"
+
+        with open(path, "w") as f:  # re-saved with identical bytes → skipped
+            f.write("Draft 4")
+        time.sleep(0.3)
+        assert gk.watcher.drain()
+        stats = next(s for s in gk.watcher.stats()["folders"] if s["path"] == folder)
+        assert stats["checked"] == 1 and stats["unchanged"] >= 1, stats
+    finally:
+        gk.stop_watching()
+
+def test_gatekeeper_watcher_inotify():
+    from modules.folder_watcher import _LIBC
+    if _LIBC is None:
+        return  # inotify is Linux-only; the polling test covers other platforms
+    _exercise_watcher("inotify")
+
+def test_gatekeeper_watcher_polling():
+    _exercise_watcher("polling")
+
+def test_gatekeeper_watcher_poll_interval():
+    import time
+    gk, folder = _watch_temp_folder("polling")
+    gk.stop_watching()
+    gk.watcher.poll_interval = 2.0
+    gk.start_watching()
+    scans, snapshot = [], gk.watcher._snapshot
+    gk.watcher._snapshot = lambda path: scans.append(path) or snapshot(path)
+    try:
+        time.sleep(0.6)
+        assert scans == []  # nothing pending, so no rescan before poll_interval
+    finally:
+        gk.stop_watching()
+
 test("Gatekeeper: clean email clears", test_gatekeeper_clear)
 test("Gatekeeper: detect sensitive priority", test_gatekeeper_priority_detect_sensitive)
 test("Gatekeeper: detect critical priority", test_gatekeeper_priority_detect_critical)
@@ -762,6 +887,11 @@ test("Gatekeeper: Compassion checks tone", test_gatekeeper_with_compassion)
 test("Gatekeeper: Communication flags structure", test_gatekeeper_with_communication)
 test("Gatekeeper: override", test_gatekeeper_override)
 test("Gatekeeper: history", test_gatekeeper_history)
+test("Gatekeeper: bulk check dedupes", test_gatekeeper_check_many)
+test("Gatekeeper: persistent bounded history", test_gatekeeper_persistent_history)
+test("Gatekeeper: folder watcher (inotify)", test_gatekeeper_watcher_inotify)
+test("Gatekeeper: folder watcher (polling)", test_gatekeeper_watcher_polling)
+test("Gatekeeper: polling watcher keeps its interval", test_gatekeeper_watcher_poll_interval)
 test("Gatekeeper: watched folders", test_gatekeeper_watched_folders)
 test("Gatekeeper: Outlook rules", test_gatekeeper_outlook_rules)
 test("Gatekeeper: Outlook script", test_gatekeeper_outlook_script)
@@ -1015,6 +1145,10 @@ def test_api_post_endpoints():
     data = resp.get_json()
     assert "verdict" in data
 
+    # Sentinel rejects an empty position
+    resp = client.post("/api/sentinel/positions", json={"claim": "  ", "source": "blog"})
+    assert resp.status_code == 400
+
     # Chronicle create meeting
     resp = client.post("/api/chronicle/meetings", json={
         "title": "API Test Meeting",
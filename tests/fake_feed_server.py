@@ -0,0 +1,100 @@
+"""Fake feed server — a local stand-in for RSS and JSON sources.
+
+Serves registered paths with a strong ETag and Last-Modified, honours
+If-None-Match / If-Modified-Since with 304, can delay responses to
+simulate slow feeds, and logs every request for assertions.
+
+Almost Magic Tech Lab
+"""
+
+import hashlib
+import threading
+import time
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+
+def rss(title, items):
+    """Minimal RSS 2.0 document from (title, link, summary) tuples."""
+    entries = "".join(
+        f"<item><title>{t}</title><link>{link}</link><description>{summary}</description></item>"
+        for t, link, summary in items
+    )
+    return (f'<?xml version="1.0"?><rss version="2.0"><channel><title>{title}</title>'
+            f"{entries}</channel></rss>").encode()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        server = self.server
+        path = urlsplit(self.path).path
+        started = time.monotonic()
+        route = server.routes.get(path)
+        if route is None:
+            status = 404
+            self.send_response(404)
+            self.end_headers()
+        else:
+            body, content_type, delay = route
+            if delay:
+                time.sleep(delay)
+            etag = '"%s"' % hashlib.sha1(body).hexdigest()
+            if self.headers.get("If-None-Match") == etag or (
+                    server.honour_last_modified
+                    and self.headers.get("If-Modified-Since") == server.last_modified):
+                status = 304
+                self.send_response(304)
+                self.send_header("ETag", etag)
+                self.end_headers()
+            else:
+                status = 200
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                if server.send_validators:
+                    self.send_header("ETag", etag)
+                    self.send_header("Last-Modified", server.last_modified)
+                self.end_headers()
+                self.wfile.write(body)
+        with server.log_lock:
+            server.log.append({"path": path, "status": status, "started": started,
+                               "if_none_match": self.headers.get("If-None-Match")})
+
+    def log_message(self, *args):
+        pass
+
+
+class FakeFeedServer:
+    """Threaded HTTP server on 127.0.0.1 with an ephemeral port."""
+
+    def __init__(self):
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        self.httpd.daemon_threads = True
+        self.httpd.routes = {}
+        self.httpd.log = []
+        self.httpd.log_lock = threading.Lock()
+        self.httpd.last_modified = formatdate(usegmt=True)
+        self.httpd.honour_last_modified = True
+        self.httpd.send_validators = True
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self.httpd.server_address[1]}"
+
+    @property
+    def log(self):
+        return self.httpd.log
+
+    def add(self, path, body, content_type="application/rss+xml", delay=0.0):
+        self.httpd.routes[path] = (body, content_type, delay)
+        return self.base_url + path
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
@@ -0,0 +1,186 @@
+"""Fake IMAP server — a local stand-in for the morning briefing mail sync.
+
+Implements the slice of IMAP4rev1 that imaplib and MailSync use:
+CAPABILITY, LOGIN, SELECT/EXAMINE (with UIDVALIDITY), UID SEARCH
+(UID ranges and SINCE), UID FETCH of BODY.PEEK[HEADER.FIELDS (...)] and
+partial BODY.PEEK[TEXT]<0.n>, STATUS, NOOP and LOGOUT. Every command is
+logged so tests can assert on round trips and on what was downloaded.
+
+Almost Magic Tech Lab
+"""
+
+import email
+import re
+import socketserver
+import threading
+from datetime import datetime
+from email.utils import parsedate_to_datetime
+
+
+def make_message(sender, subject, body, date, message_id=None):
+    return (f"From: {sender}\r\nTo: mani@example.com\r\nSubject: {subject}\r\n"
+            f"Date: {date}\r\nMessage-ID: {message_id or '<%s@test>' % abs(hash(subject))}\r\n"
+            f"Content-Type: text/plain; charset=utf-8\r\n\r\n{body}\r\n").encode()
+
+
+class Mailbox:
+    def __init__(self, uidvalidity=1):
+        self.uidvalidity = uidvalidity
+        self.messages = {}      # uid → raw bytes
+        self.next_uid = 1
+
+    def append(self, raw):
+        uid = self.next_uid
+        self.messages[uid] = raw
+        self.next_uid += 1
+        return uid
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def send(self, line):
+        self.wfile.write(line if isinstance(line, bytes) else line.encode())
+
+    def handle(self):
+        server = self.server
+        selected = None
+        self.send("* OK [CAPABILITY IMAP4rev1] fake IMAP ready\r\n")
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            text = line.decode().rstrip("\r\n")
+            tag, _, rest = text.partition(" ")
+            command, _, args = rest.partition(" ")
+            command = command.upper()
+            if command == "UID":
+                sub, _, args = args.partition(" ")
+                command = "UID " + sub.upper()
+            with server.lock:
+                server.log.append(text)
+
+            if command == "CAPABILITY":
+                self.send("* CAPABILITY IMAP4rev1\r\n")
+            elif command == "LOGIN":
+                user, password = [a.strip('"') for a in args.split(" ", 1)]
+                if (user, password) != server.credentials:
+                    self.send(f"{tag} NO LOGIN failed\r\n")
+                    continue
+                server.logins += 1
+            elif command in ("SELECT", "EXAMINE"):
+                name = args.strip('"')
+                selected = server.mailboxes.get(name)
+                if selected is None:
+                    self.send(f"{tag} NO no such mailbox\r\n")
+                    continue
+                self.send(f"* {len(selected.messages)} EXISTS\r\n")
+                self.send(f"* OK [UIDVALIDITY {selected.uidvalidity}] UIDs valid\r\n")
+                self.send(f"* OK [UIDNEXT {selected.next_uid}] next UID\r\n")
+            elif command == "STATUS":
+                name = args.split(" ", 1)[0].strip('"')
+                box = server.mailboxes[name]
+                self.send(f'* STATUS "{name}" (UIDVALIDITY {box.uidvalidity})\r\n')
+            elif command == "UID SEARCH":
+                uids = self._search(selected, args)
+                self.send("* SEARCH" + "".join(f" {u}" for u in uids) + "\r\n")
+            elif command == "UID FETCH":
+                self._fetch(selected, args)
+            elif command == "NOOP":
+                pass
+            elif command == "LOGOUT":
+                self.send("* BYE logging out\r\n")
+                self.send(f"{tag} OK LOGOUT completed\r\n")
+                return
+            else:
+                self.send(f"{tag} BAD unsupported {command}\r\n")
+                continue
+            self.send(f"{tag} OK {command} completed\r\n")
+
+    @staticmethod
+    def _uid_set(spec, box):
+        uids = set()
+        highest = max(box.messages, default=0)
+        for part in spec.split(","):
+            if ":" in part:
+                lo, hi = part.split(":")
+                lo = int(lo)
+                hi = highest if hi == "*" else int(hi)
+                lo, hi = min(lo, hi), max(lo, hi)
+                uids.update(u for u in box.messages if lo <= u <= hi)
+            elif part == "*":
+                uids.add(highest)
+            else:
+                uids.add(int(part))
+        return sorted(u for u in uids if u in box.messages)
+
+    def _search(self, box, args):
+        m = re.search(r'SINCE "?(\d{1,2}-\w{3}-\d{4})"?', args)
+        if m:
+            since = datetime.strptime(m.group(1), "%d-%b-%Y").date()
+            return [uid for uid, raw in sorted(box.messages.items())
+                    if parsedate_to_datetime(email.message_from_bytes(raw)["Date"]).date() >= since]
+        m = re.search(r"UID (\S+)", args)
+        return self._uid_set(m.group(1), box) if m else sorted(box.messages)
+
+    def _fetch(self, box, args):
+        spec, _, items = args.partition(" ")
+        fields = re.search(r"HEADER\.FIELDS \(([^)]*)\)", items)
+        partial = re.search(r"BODY\.PEEK\[TEXT\]<(\d+)\.(\d+)>", items)
+        full = "RFC822" in items.upper()
+        with self.server.lock:
+            self.server.fetches.append({"uids": self._uid_set(spec, box), "items": items})
+        for seq, uid in enumerate(self._uid_set(spec, box), start=1):
+            raw = box.messages[uid]
+            header, _, text = raw.partition(b"\r\n\r\n")
+            parts = [f"UID {uid}".encode()]
+            if fields:
+                wanted = {f.upper() for f in fields.group(1).split()}
+                lines = [ln for ln in header.split(b"\r\n")
+                         if ln.split(b":", 1)[0].decode().upper() in wanted]
+                block = b"\r\n".join(lines) + b"\r\n\r\n"
+                parts.append(f"BODY[HEADER.FIELDS ({fields.group(1)})] {{{len(block)}}}\r\n".encode() + block)
+            if partial:
+                start, length = int(partial.group(1)), int(partial.group(2))
+                chunk = text[start:start + length]
+                parts.append(f"BODY[TEXT]<{start}> {{{len(chunk)}}}\r\n".encode() + chunk)
+            if full:
+                parts.append(f"RFC822 {{{len(raw)}}}\r\n".encode() + raw)
+            self.send(f"* {seq} FETCH (".encode() + b" ".join(parts) + b")\r\n")
+
+
+class FakeIMAPServer:
+    """Threaded IMAP stand-in on 127.0.0.1 with an ephemeral port."""
+
+    def __init__(self, user="mani@example.com", password="secret"):
+        socketserver.ThreadingTCPServer.allow_reuse_address = True
+        self.server = socketserver.ThreadingTCPServer(("127.0.0.1", 0), _Handler)
+        self.server.daemon_threads = True
+        self.server.credentials = (user, password)
+        self.server.mailboxes = {"INBOX": Mailbox()}
+        self.server.log = []
+        self.server.fetches = []
+        self.server.logins = 0
+        self.server.lock = threading.Lock()
+        self._thread = threading.Thread(target=self.server.serve_forever, args=(0.05,), daemon=True)
+
+    @property
+    def port(self):
+        return self.server.server_address[1]
+
+    @property
+    def log(self):
+        return self.server.log
+
+    @property
+    def fetches(self):
+        return self.server.fetches
+
+    def mailbox(self, name="INBOX"):
+        return self.server.mailboxes.setdefault(name, Mailbox())
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
@@ -0,0 +1,82 @@
+"""Fake Ollama server — a local stand-in for streaming /api/chat.
+
+Streams a scripted reply as NDJSON records, one token per record, with
+a configurable delay before the first token and between tokens. Records
+how many tokens each request actually got onto the wire, so tests can
+check that a client hang-up stops generation.
+
+Almost Magic Tech Lab
+"""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        server = self.server
+        body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        entry = {"path": self.path, "stream": body.get("stream"), "sent": 0, "aborted": False}
+        with server.lock:
+            server.log.append(entry)
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        try:
+            time.sleep(server.first_token_delay)
+            for token in server.tokens:
+                self._chunk({"model": body.get("model"), "message": {"role": "assistant", "content": token},
+                             "done": False})
+                entry["sent"] += 1
+                time.sleep(server.token_delay)
+            self._chunk({"model": body.get("model"), "message": {"role": "assistant", "content": ""},
+                         "done": True, "eval_count": len(server.tokens),
+                         "eval_duration": int(len(server.tokens) * server.token_delay * 1e9) or 1})
+            self.wfile.write(b"0\r\n\r\n")
+        except (BrokenPipeError, ConnectionResetError):
+            entry["aborted"] = True
+        self.close_connection = True
+
+    def _chunk(self, record):
+        data = json.dumps(record).encode() + b"\n"
+        self.wfile.write(f"{len(data):X}\r\n".encode() + data + b"\r\n")
+        self.wfile.flush()
+
+    def log_message(self, *args):
+        pass
+
+
+class FakeOllamaServer:
+    """Threaded HTTP server on 127.0.0.1 with an ephemeral port."""
+
+    def __init__(self, tokens=("G'day", " Mani", "."), first_token_delay=0.0, token_delay=0.01):
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        self.httpd.daemon_threads = True
+        self.httpd.tokens = list(tokens)
+        self.httpd.first_token_delay = first_token_delay
+        self.httpd.token_delay = token_delay
+        self.httpd.log = []
+        self.httpd.lock = threading.Lock()
+        self._thread = threading.Thread(target=self.httpd.serve_forever, args=(0.05,), daemon=True)
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self.httpd.server_address[1]}"
+
+    @property
+    def log(self):
+        return self.httpd.log
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
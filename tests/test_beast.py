@@ -167,6 +167,50 @@ def test_beast_wisdom_sitcom_filter(client):
         assert q["source"] == "Seinfeld"
 
 
+def test_beast_wisdom_search_prefix_and_rank(client):
+    """Wisdom search matches word prefixes and needs every query word."""
+    data = client.get("/api/wisdom/search?q=swan").get_json()
+    assert data["results"] and all("Ron Swanson" in r["author"] for r in data["results"])
+    data = client.get("/api/wisdom/search?q=fall+seven").get_json()
+    assert [r["text"] for r in data["results"]] == ["Fall seven times, stand up eight."]
+
+
+def test_beast_wisdom_search_returns_copies():
+    """Changing a search result leaves the knowledge base alone."""
+    from modules.wisdom_kb import WisdomKB
+
+    kb = WisdomKB()
+    hit = kb.search("swan", 1)[0]
+    text = hit["text"]
+    hit["text"] = "edited"
+    assert kb.search("swan", 1)[0]["text"] == text
+
+
+def test_beast_wisdom_external_cache():
+    """External Wisdom API answers are cached, served stale while refreshing, and never block long."""
+    import threading
+    import time
+    from api_routes_wisdom import ExternalCache
+
+    calls = []
+    cache = ExternalCache(ttl=0.05, failure_ttl=0.05)
+    assert cache.get("q", lambda: calls.append(1) or ["a"], wait=1) == ["a"]
+    assert cache.get("q", lambda: calls.append(1) or ["b"]) == ["a"]   # fresh hit, no call
+    time.sleep(0.06)
+    assert cache.get("q", lambda: calls.append(1) or ["b"]) == ["a"]   # stale, refreshing
+    time.sleep(0.05)
+    assert cache.get("q", lambda: ["c"]) == ["b"]
+    assert len(calls) == 2
+
+    release = threading.Event()
+    start = time.perf_counter()
+    assert cache.get("slow", lambda: release.wait(1) and ["late"], wait=0.05) is None
+    assert time.perf_counter() - start < 0.5
+    release.set()
+    time.sleep(0.05)
+    assert cache.get("slow", lambda: ["again"]) == ["late"]
+
+
 # ── Beast 8: Morning Briefing ────────────────────────────────────
 
 def test_beast_morning_briefing_generate(client):
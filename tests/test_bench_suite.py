@@ -0,0 +1,37 @@
+"""Benchmarks — engine suite runner and baseline comparison.
+
+Almost Magic Tech Lab
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "benchmarks"))
+
+import suite
+
+
+def test_every_case_runs_at_small_scale():
+    results = suite.run_suite(scales=(200,), only=[n for n in suite.CASES if not n.startswith("briefing")],
+                              repeats=1)
+    assert set(results) == set(suite.CASES) - {"briefing.collect_briefing_data"}
+    for name, scales in results.items():
+        r = scales["200"]
+        assert r["runs"] == 1 and r["median_ms"] >= 0 and r["compare_ms"] <= r["median_ms"], name
+
+
+def test_max_scale_is_skipped_not_run():
+    results = suite.run_suite(scales=(20000,), only=["gravity.detect_collisions"], repeats=1)
+    assert "skipped" in results["gravity.detect_collisions"]["20000"]
+
+
+def test_compare_flags_only_real_regressions():
+    baseline = {"results": {"a": {"1000": {"compare_ms": 10.0}, "10000": {"compare_ms": 1.0}},
+                            "b": {"1000": {"compare_ms": 10.0}}}}
+    current = {"a": {"1000": {"compare_ms": 14.0}, "10000": {"compare_ms": 2.0}},
+               "b": {"1000": {"compare_ms": 5.0}},
+               "c": {"1000": {"compare_ms": 1.0}}}
+    rows = {(r["case"], r["scale"]): r["status"] for r in suite.compare(current, baseline)}
+    # +40% and +4 ms is a regression; +100% but only +1 ms is noise
+    assert rows == {("a", 1000): "regression", ("a", 10000): "ok", ("b", 1000): "improved"}
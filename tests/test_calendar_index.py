@@ -0,0 +1,129 @@
+"""Morning briefing — parsed-calendar cache and recurrence-expanded time index.
+
+Almost Magic Tech Lab
+"""
+
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from modules.phase5_briefing.calendar_index import CalendarCache, CalendarIndex, parse_ics
+
+
+NOW = datetime(2026, 3, 10, 8, 0)     # a Tuesday
+
+
+def _ics(*events):
+    return "BEGIN:VCALENDAR\r\nVERSION:2.0\r\n" + "".join(events) + "END:VCALENDAR\r\n"
+
+
+def _event(uid, summary, start, end=None, extra=""):
+    return (f"BEGIN:VEVENT\r\nUID:{uid}\r\nSUMMARY:{summary}\r\nDTSTART:{start}\r\n"
+            + (f"DTEND:{end}\r\n" if end else "") + extra + "END:VEVENT\r\n")
+
+
+def _window(events, start, days):
+    start = datetime.combine(start.date(), datetime.min.time())
+    return CalendarIndex(events, start, start + timedelta(days=days)).starting_between(
+        start, start + timedelta(days=days))
+
+
+def test_parse_unfolds_lines_and_skips_alarms():
+    events = parse_ics(_ics(_event(
+        "a", "Board", "20260310T090000", "20260310T100000",
+        "LOCATION:Level 3\\, Sydney\r\n"
+        "ATTENDEE;CN=\"Chair: Jo\";ROLE=REQ-PARTICIPANT:mailto:jo@board.\r\n org\r\n"
+        "BEGIN:VALARM\r\nTRIGGER:-PT15M\r\nSUMMARY:Alarm text\r\nEND:VALARM\r\n")))
+    assert len(events) == 1
+    ev = events[0]
+    assert ev["title"] == "Board" and ev["location"] == "Level 3, Sydney"
+    assert ev["attendees"] == ["jo@board.org"]
+    assert ev["length"] == timedelta(hours=1)
+
+
+def test_weekly_series_with_exdate_and_override():
+    events = parse_ics(_ics(
+        _event("standup", "Standup", "20250106T093000", "20250106T094500",
+               "RRULE:FREQ=WEEKLY;BYDAY=MO,TU,TH\r\nEXDATE:20260312T093000\r\n"),
+        _event("standup", "Standup (moved)", "20260310T140000", "20260310T141500",
+               "RECURRENCE-ID:20260310T093000\r\n"),
+    ))
+    week = _window(events, datetime(2026, 3, 9), 7)
+    assert [(e["title"], e["start"].strftime("%a %H:%M")) for e in week] == [
+        ("Standup", "Mon 09:30"), ("Standup (moved)", "Tue 14:00")]
+    assert all(e["recurring"] for e in week)
+
+
+def test_monthly_ordinal_count_and_until():
+    events = parse_ics(_ics(
+        _event("review", "Review", "20260105T100000", extra="RRULE:FREQ=MONTHLY;BYDAY=-1FR\r\n"),
+        _event("short", "Short run", "20260301T080000", extra="RRULE:FREQ=DAILY;COUNT=3\r\n"),
+        _event("ended", "Ended", "20250101T080000", extra="RRULE:FREQ=DAILY;UNTIL=20250201\r\n"),
+    ))
+    march = _window(events, datetime(2026, 3, 1), 31)
+    assert [(e["title"], e["start"].day) for e in march] == [
+        ("Short run", 1), ("Short run", 2), ("Short run", 3), ("Review", 27)]
+
+
+def test_cache_parses_once_until_file_changes(tmp_path):
+    path = tmp_path / "calendar.ics"
+    path.write_text(_ics(_event("a", "Client call", "20260310T090000")))
+    cache = CalendarCache()
+    for _ in range(5):
+        assert [e["title"] for e in cache.on_day([str(path)], now=NOW)] == ["Client call"]
+    assert cache.stats["parses"] == 1 and cache.stats["index_builds"] == 1
+
+    path.write_text(_ics(_event("a", "Client call", "20260310T090000"),
+                         _event("b", "Pitch", "20260310T130000")))
+    os.utime(path, ns=(time.time_ns(), time.time_ns() + 1_000_000_000))
+    assert [e["title"] for e in cache.on_day([str(path)], now=NOW)] == ["Client call", "Pitch"]
+    assert cache.stats["parses"] == 2
+
+    path.unlink()
+    assert cache.on_day([str(path)], now=NOW) == []
+
+
+def test_multi_year_calendar_queries_stay_fast(tmp_path):
+    start = datetime(2020, 1, 1, 9)
+    events = [_event(f"e{i}", f"Meeting {i}", (start + timedelta(hours=6 * i)).strftime("%Y%m%dT%H%M%S"))
+              for i in range(30_000)]
+    events.append(_event("daily", "Daily sync", "20200101T083000", extra="RRULE:FREQ=DAILY\r\n"))
+    path = tmp_path / "big.ics"
+    path.write_text(_ics(*events))
+
+    cache = CalendarCache()
+    first = cache.upcoming([str(path)], hours=12, now=NOW)
+    t0 = time.perf_counter()
+    for _ in range(200):
+        again = cache.upcoming([str(path)], hours=12, now=NOW)
+    per_query = (time.perf_counter() - t0) / 200
+    assert [e["title"] for e in again] == [e["title"] for e in first]
+    assert "Daily sync" in [e["title"] for e in first]
+    assert cache.stats["parses"] == 1
+    assert per_query < 0.005, per_query
+
+
+def test_briefing_meetings_and_batched_poi_match(tmp_path, monkeypatch):
+    monkeypatch.setenv("HOME", str(tmp_path))
+    from modules.phase5_briefing.morning_briefing import MorningBriefingEngine
+    today = datetime.now().strftime("%Y%m%d")
+    path = tmp_path / "calendar.ics"
+    path.write_text(_ics(_event("a", "Governance review", f"{today}T235900", extra=(
+        "ATTENDEE:mailto:ceo@acme.com\r\nATTENDEE:mailto:cfo@acme.com\r\n"))))
+
+    engine = MorningBriefingEngine(config_path=str(tmp_path / "briefing_config.json"))
+    engine.config["calendar"].update({"ics_path": str(path), "outlook_ics_paths": []})
+    engine.add_person_of_interest("Alex CEO", email_addr="ceo@acme.com")
+    engine.add_person_of_interest("Sam Smith", email_addr="sam@other.com")
+
+    meetings = engine._parse_ics_calendar()
+    assert [m["title"] for m in meetings] == ["Governance review"]
+    assert meetings[0]["time"] == "11:59 PM"
+
+    matches = engine._match_pois([meetings[0]["attendees"], ["Sam"], []])
+    assert [[p["name"] for p in m] for m in matches] == [["Alex CEO"], ["Sam Smith"], []]
+    prep = engine._generate_prep_questions(meetings)
+    assert prep["items"][0]["poi_present"] == ["Alex CEO"]
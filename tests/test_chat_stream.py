@@ -0,0 +1,106 @@
+"""Chat — SSE streaming relay against a local fake Ollama.
+
+Almost Magic Tech Lab
+"""
+
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import pytest
+from flask import Flask
+
+import api_routes_chat
+from tests.fake_ollama_server import FakeOllamaServer
+
+
+@pytest.fixture
+def client():
+    app = Flask(__name__)
+    app.register_blueprint(api_routes_chat.create_chat_routes())
+    return app.test_client()
+
+
+@pytest.fixture
+def servers(monkeypatch):
+    started = []
+
+    def targets(supervisor, ollama):
+        for srv in (supervisor, ollama):
+            if srv is not None:
+                started.append(srv.start())
+        monkeypatch.setattr(api_routes_chat, "SUPERVISOR_URL",
+                            supervisor.base_url if supervisor else "http://127.0.0.1:9")
+        monkeypatch.setattr(api_routes_chat, "OLLAMA_URL",
+                            ollama.base_url if ollama else "http://127.0.0.1:9")
+        return supervisor, ollama
+
+    yield targets
+    for srv in started:
+        srv.stop()
+
+
+def _events(body):
+    events = []
+    for block in body.decode().strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.splitlines())
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
+def test_stream_relays_tokens_with_stats(client, servers):
+    supervisor, _ = servers(FakeOllamaServer(tokens=["G'day", " Mani", ", all", " clear."]), None)
+    resp = client.post("/api/chat/stream", json={"message": "hi"})
+    assert resp.mimetype == "text/event-stream"
+    events = _events(resp.data)
+    assert [e for e, _ in events] == ["start", "token", "token", "token", "token", "done"]
+    assert events[0][1]["via"] == "supervisor"
+    done = events[-1][1]
+    assert done["reply"] == "G'day Mani, all clear."
+    assert done["tokens"] == 4 and done["tokens_per_s"] > 0
+    assert 0 <= done["ttft_ms"] <= done["elapsed_s"] * 1000
+    assert supervisor.log[0]["stream"] is True
+
+
+def test_falls_back_only_when_first_token_is_late(client, servers, monkeypatch):
+    monkeypatch.setattr(api_routes_chat, "CHAT_FIRST_TOKEN_DEADLINE", 0.3)
+    servers(FakeOllamaServer(first_token_delay=2.0), FakeOllamaServer(tokens=["direct"]))
+    start = time.perf_counter()
+    events = _events(client.post("/api/chat/stream", json={"message": "hi"}).data)
+    assert events[0] == ("start", {"via": "ollama-direct", "model": api_routes_chat.CHAT_MODEL,
+                                   "ttft_ms": events[0][1]["ttft_ms"]})
+    assert events[-1][1]["reply"] == "direct"
+    assert time.perf_counter() - start < 1.5
+
+    # A slow but steady reply after a prompt first token is not abandoned
+    servers(FakeOllamaServer(tokens=["a", "b", "c"], token_delay=0.4), None)
+    events = _events(client.post("/api/chat/stream", json={"message": "hi"}).data)
+    assert events[-1][0] == "done" and events[-1][1]["reply"] == "abc"
+
+
+def test_offline_reports_error_event(client, servers):
+    servers(None, None)
+    events = _events(client.post("/api/chat/stream", json={"message": "hi"}).data)
+    assert events == [("error", events[0][1])]
+    assert events[0][1]["via"] == "offline"
+
+
+def test_client_disconnect_stops_generation(client, servers):
+    supervisor, _ = servers(FakeOllamaServer(tokens=[f" t{i}" for i in range(200)], token_delay=0.02), None)
+    resp = client.post("/api/chat/stream", json={"message": "hi"}, buffered=False)
+    chunks = iter(resp.response)
+    for _ in range(3):
+        next(chunks)
+    resp.close()
+    deadline = time.time() + 3
+    while time.time() < deadline and not supervisor.log[0]["aborted"]:
+        time.sleep(0.05)
+    assert supervisor.log[0]["aborted"]
+    assert supervisor.log[0]["sent"] < 50
+
+
+def test_message_required(client):
+    assert client.post("/api/chat/stream", json={}).status_code == 400
@@ -0,0 +1,176 @@
+"""The Current — feed fetcher tests against a local fake-feed server.
+
+Almost Magic Tech Lab
+"""
+
+import json
+import os
+import sqlite3
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import pytest
+
+from tests.fake_feed_server import FakeFeedServer, rss
+from modules.phase4_current.fetcher import FeedFetcher, FetchJob
+
+
+@pytest.fixture
+def server():
+    srv = FakeFeedServer().start()
+    yield srv
+    srv.stop()
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / "the_current.db")
+
+
+def _feeds(server, count, delay=0.0):
+    return [
+        server.add(f"/feed/{i}", rss(f"Feed {i}", [(f"AI governance update {i}", f"http://x/{i}", "ISO 42001 news")]),
+                   delay=delay)
+        for i in range(count)
+    ]
+
+
+def test_fetch_is_concurrent(server, db_path):
+    """Six 0.3s feeds finish in about the time of one, not six."""
+    urls = _feeds(server, 6, delay=0.3)
+    fetcher = FeedFetcher(db_path, max_concurrency=8, max_per_host=8, host_intervals={})
+    start = time.perf_counter()
+    results = fetcher.fetch_all([FetchJob(u) for u in urls])
+    elapsed = time.perf_counter() - start
+    assert all(r.ok for r in results)
+    assert [r.data.feed.title for r in results] == [f"Feed {i}" for i in range(6)]
+    assert elapsed < 1.0, elapsed
+
+
+def test_unchanged_feeds_cost_one_304(server, db_path):
+    urls = _feeds(server, 3)
+    fetcher = FeedFetcher(db_path, host_intervals={})
+    fetcher.fetch_all([FetchJob(u) for u in urls])
+    second = fetcher.fetch_all([FetchJob(u) for u in urls])
+    assert all(r.not_modified and r.data is None for r in second)
+    assert fetcher.status()["not_modified"] == 3
+
+    # Validators survive a restart
+    restarted = FeedFetcher(db_path, host_intervals={})
+    third = restarted.fetch_all([FetchJob(u) for u in urls])
+    assert all(r.status == 304 for r in third)
+    assert all(entry["if_none_match"] for entry in server.log[-3:])
+
+
+def test_changed_feed_is_refetched(server, db_path):
+    url = server.add("/feed/live", rss("Live", [("first", "http://x/1", "")]))
+    fetcher = FeedFetcher(db_path, host_intervals={})
+    fetcher.fetch_all([FetchJob(url)])
+    server.httpd.honour_last_modified = False
+    server.add("/feed/live", rss("Live", [("second", "http://x/2", "")]))
+    result = fetcher.fetch_all([FetchJob(url)])[0]
+    assert result.status == 200
+    assert result.data.entries[0].title == "second"
+
+
+def test_per_host_politeness(server, db_path):
+    """Requests to one host start at least the host interval apart."""
+    urls = _feeds(server, 4)
+    fetcher = FeedFetcher(db_path, host_intervals={"127.0.0.1": 0.15})
+    fetcher.fetch_all([FetchJob(u) for u in urls])
+    starts = sorted(entry["started"] for entry in server.log)
+    gaps = [b - a for a, b in zip(starts, starts[1:])]
+    assert min(gaps) >= 0.12, gaps
+
+
+def test_json_jobs_and_errors(server, db_path):
+    ok = server.add("/api/data", json.dumps({"data": [1, 2]}).encode(), content_type="application/json")
+    fetcher = FeedFetcher(db_path, host_intervals={})
+    good, missing = fetcher.fetch_all([
+        FetchJob(ok, params={"q": "ai"}, parse="json"),
+        FetchJob(server.base_url + "/nope", parse="json"),
+    ])
+    assert good.data == {"data": [1, 2]}
+    assert missing.error == "HTTP 404" and not missing.ok
+
+
+def test_unparseable_body_keeps_no_validators(server, db_path):
+    url = server.add("/api/cut", b'{"data": [1,', content_type="application/json")
+    fetcher = FeedFetcher(db_path, host_intervals={})
+    assert fetcher.fetch_all([FetchJob(url, parse="json")])[0].error.startswith("parse:")
+    retry = FeedFetcher(db_path, host_intervals={}).fetch_all([FetchJob(url, parse="json")])[0]
+    assert retry.status == 200 and not server.log[-1]["if_none_match"]
+
+    server.add("/api/cut", b'{"data": [1]}', content_type="application/json")
+    assert fetcher.fetch_all([FetchJob(url, parse="json")])[0].data == {"data": [1]}
+    assert fetcher.fetch_all([FetchJob(url, parse="json")])[0].not_modified
+
+
+def test_unreadable_feed_keeps_no_validators(server, db_path):
+    url = server.add("/feed/broken", b"<html><body>Service unavailable</body>", content_type="text/html")
+    fetcher = FeedFetcher(db_path, host_intervals={})
+    assert fetcher.fetch_all([FetchJob(url)])[0].error.startswith("parse:")
+    assert fetcher.fetch_all([FetchJob(url)])[0].status == 200
+    assert not server.log[-1]["if_none_match"] and fetcher.status()["validators"] == 0
+
+
+def test_200_without_validators_drops_the_old_ones(server, db_path):
+    url = server.add("/feed/live", rss("Live", [("first", "http://x/1", "")]))
+    fetcher = FeedFetcher(db_path, host_intervals={})
+    fetcher.fetch_all([FetchJob(url)])
+    server.httpd.send_validators = False
+    server.add("/feed/live", rss("Live", [("second", "http://x/2", "")]))
+    server.httpd.honour_last_modified = False
+    assert fetcher.fetch_all([FetchJob(url)])[0].data.entries[0].title == "second"
+    server.httpd.send_validators = True
+    server.add("/feed/live", rss("Live", [("first", "http://x/1", "")]))
+    # The first body's validators would 304 here and hide the change back
+    restarted = FeedFetcher(db_path, host_intervals={})
+    assert restarted.status()["validators"] == 0
+    assert restarted.fetch_all([FetchJob(url)])[0].data.entries[0].title == "first"
+
+
+def test_bad_payload_fails_only_its_feed(server, db_path):
+    from modules.phase4_current.the_current import TheCurrentEngine
+    engine = TheCurrentEngine(db_path=db_path)
+    engine.fetcher.host_intervals = {}
+    engine.interest_areas = [{"name": "AI Governance", "keywords": ["AI governance"],
+                              "subreddits": ["good", "nulls", "listing"]}]
+    post = {"title": "AI governance in practice", "permalink": "/r/good/1", "score": 50, "selftext": ""}
+    bodies = {
+        "r/good": {"data": {"children": [{"data": post}]}},
+        "r/nulls": {"data": {"children": [{"data": {**post, "selftext": None}}]}},
+        "r/listing": [],
+    }
+    fetch_all = engine.fetcher.fetch_all
+
+    def local(jobs):            # Same jobs, served by the fake server
+        for job in jobs:
+            job.url = server.add("/" + job.tag[1], json.dumps(bodies[job.tag[1]]).encode(),
+                                 content_type="application/json")
+        return fetch_all(jobs)
+
+    engine.fetcher.fetch_all = local
+    assert [d["title"] for d in engine.scan_reddit()] == ["AI governance in practice"]
+    conn = sqlite3.connect(db_path)
+    log = conn.execute("SELECT source, status FROM scan_log ORDER BY id").fetchall()
+    conn.close()
+    assert log == [("r/good", "completed"), ("r/nulls", "error"), ("r/listing", "error")]
+
+    engine.scan_reddit()        # The broken feeds are fetched in full again
+    assert {e["path"]: e["status"] for e in server.log[-3:]} == {"/r/good": 304, "/r/nulls": 200, "/r/listing": 200}
+
+
+def test_current_rss_scan_uses_fetcher(server, db_path):
+    from modules.phase4_current.the_current import TheCurrentEngine
+    urls = _feeds(server, 3, delay=0.2)
+    engine = TheCurrentEngine(db_path=db_path)
+    engine.fetcher.host_intervals = {}
+    engine.interest_areas = [{"name": "AI Governance", "keywords": ["AI governance"], "rss_feeds": urls}]
+
+    first = engine.scan_rss_feeds()
+    assert len(first) == 3
+    assert engine.scan_rss_feeds() == []  # all 304 — nothing re-parsed or re-saved
+    assert engine.fetcher.status()["not_modified"] == 3
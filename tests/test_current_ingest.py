@@ -0,0 +1,94 @@
+"""The Current — batched ingest pipeline and incremental trend counters.
+
+Almost Magic Tech Lab
+"""
+
+import os
+import sqlite3
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import pytest
+
+from modules.phase4_current.ingest import BloomFilter
+
+
+@pytest.fixture
+def engine(tmp_path):
+    from modules.phase4_current.the_current import TheCurrentEngine
+    return TheCurrentEngine(db_path=str(tmp_path / "the_current.db"))
+
+
+def _record(i, area="AI Governance", keywords=("AI governance",)):
+    return dict(source="rss", source_url=f"http://x/{i}", title=f"Story {i}",
+                summary="", author="", interest_area=area,
+                keywords_matched=list(keywords), content_hash=f"hash-{i}")
+
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom = BloomFilter(capacity=1000, error_rate=0.01)
+    for i in range(1000):
+        bloom.add(f"item-{i}")
+    assert all(f"item-{i}" in bloom for i in range(1000))
+    false_positives = sum(f"other-{i}" in bloom for i in range(10000))
+    assert false_positives < 300
+
+
+def test_batch_dedupes_within_and_across_batches(engine):
+    first = engine.ingest.save([_record(1), _record(2), _record(2)])
+    assert [d["title"] for d in first] == ["Story 1", "Story 2"]
+    second = engine.ingest.save([_record(2), _record(3)])
+    assert [d["title"] for d in second] == ["Story 3"]
+    assert engine.ingest.stats["inserted"] == 3
+    assert len(engine.get_discoveries()) == 3
+
+    # A fresh engine rebuilds the bloom filter from the table
+    from modules.phase4_current.the_current import TheCurrentEngine
+    again = TheCurrentEngine(db_path=engine.db_path)
+    assert again.ingest.save([_record(1)]) == []
+
+
+def test_save_discovery_still_works(engine):
+    saved = engine._save_discovery(**_record(7))
+    assert saved == {"id": saved["id"], "title": "Story 7", "source": "rss",
+                     "interest_area": "AI Governance"}
+    assert engine._save_discovery(**_record(7)) is None
+
+
+def test_trend_counters_are_incremental(engine):
+    engine.ingest.save([_record(i) for i in range(2)])
+    engine.detect_trends()
+    assert engine.get_trends() == []  # below threshold
+
+    engine.ingest.save([_record(i, keywords=("AI governance", "ISO 42001")) for i in range(2, 5)])
+    counts = engine.ingest.window_counts(days=7)
+    assert counts[("AI Governance", "AI governance")] == 5
+    assert counts[("AI Governance", "ISO 42001")] == 3
+
+    engine.detect_trends()
+    engine.detect_trends()  # re-running does not inflate counts
+    trends = {t["topic"]: t for t in engine.get_trends()}
+    assert trends["AI governance"]["mention_count"] == 5
+    assert trends["ISO 42001"]["mention_count"] == 3
+
+
+def test_trend_buckets_backfill_existing_database(engine):
+    engine.ingest.save([_record(i) for i in range(4)])
+    conn = sqlite3.connect(engine.db_path)
+    conn.execute("DROP TABLE trend_buckets")
+    conn.commit()
+    conn.close()
+
+    from modules.phase4_current.the_current import TheCurrentEngine
+    upgraded = TheCurrentEngine(db_path=engine.db_path)
+    assert upgraded.ingest.window_counts()[("AI Governance", "AI governance")] == 4
+
+
+def test_opportunities_for_new_discoveries_only(engine):
+    old = engine.ingest.save([_record(1)])
+    new = engine.ingest.save([_record(2)])
+    opportunities = engine.generate_content_opportunities(discovery_ids=[d["id"] for d in new])
+    assert opportunities
+    assert engine.generate_content_opportunities(discovery_ids=[d["id"] for d in new]) == []
+    assert engine.generate_content_opportunities(discovery_ids=[d["id"] for d in old])
@@ -0,0 +1,114 @@
+"""Cartographer — windowed pattern and convergence counters.
+
+Almost Magic Tech Lab
+"""
+
+import os
+import sys
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from modules.cartographer.discovery_engine import DiscoveryEngine
+from modules.cartographer.models import (
+    ActionabilityLevel, Discovery, DiscoveryLayer, InteractionType,
+)
+
+
+def _add(engine, title, territory, source="afr", days_ago=0):
+    disc = engine.create_discovery(title, "", "", source, DiscoveryLayer.SIGNAL,
+                                   ActionabilityLevel.INFORM, territory=territory)
+    disc.discovered_at = datetime.now() - timedelta(days=days_ago)
+    return disc
+
+
+def _brute_force_territories(engine):
+    cutoff = datetime.now() - timedelta(days=30)
+    groups = {}
+    for d in engine.discoveries.values():
+        if d.discovered_at > cutoff and d.territory and d.interaction != InteractionType.DISMISSED:
+            groups.setdefault(d.territory, []).append(d.discovery_id)
+    return {t: ids for t, ids in groups.items() if len(ids) >= 3}
+
+
+def test_patterns_are_detected_once_and_refreshed():
+    engine = DiscoveryEngine()
+    for i in range(3):
+        _add(engine, f"Privacy Act reform draft {i}", "privacy")
+    _add(engine, "Cloud outage", "cloud")
+
+    patterns = engine.detect_patterns()
+    assert [(p.label, p.signal_count) for p in patterns] == [("Emerging: privacy", 3)]
+    assert engine.detect_patterns() == []               # Refreshed, not duplicated
+    _add(engine, "Privacy commissioner guidance", "privacy")
+    assert engine.detect_patterns() == []
+    assert patterns[0].signal_count == 4 and len(engine.patterns) == 1
+    assert engine.get_morning_briefing()["active_patterns"][0]["label"] == "Emerging: privacy"
+
+
+def test_old_and_dismissed_discoveries_leave_the_window():
+    engine = DiscoveryEngine()
+    old = _add(engine, "Board AI oversight", "governance", days_ago=40)
+    ids = [_add(engine, "Board AI oversight again", "governance", days_ago=29).discovery_id]
+    fresh = _add(engine, "AI register", "governance")
+    assert engine.detect_patterns() == []                   # old is outside the window
+    assert engine.discoveries.territory_signals("governance") == ids + [fresh.discovery_id]
+
+    old.discovered_at = datetime.now()                      # Re-dated signals count again
+    assert len(engine.detect_patterns()) == 1
+    engine.record_interaction(fresh.discovery_id, InteractionType.DISMISSED)
+    engine.discoveries.advance(datetime.now() - timedelta(days=30) + timedelta(days=2))
+    assert engine.discoveries.territory_signals("governance") == [old.discovery_id]
+    assert engine.discoveries.window_size() == 1
+
+
+def test_keyword_co_occurrence_describes_patterns():
+    engine = DiscoveryEngine()
+    _add(engine, "Tariffs hit cloud pricing", "cloud")
+    _add(engine, "Tariffs and vendor contracts", "procurement")
+    _add(engine, "Tariffs raise hardware costs", "procurement")
+    _add(engine, "Hardware tariffs: vendor reaction", "procurement")
+
+    [pattern] = engine.detect_patterns()
+    assert pattern.description == "3 signals in 30 days: tariffs, vendor, hardware"
+    assert engine.discoveries.keyword_territories("Tariffs") == {"cloud": 1, "procurement": 3}
+
+
+def test_counters_match_a_rescan_and_convergence_counts_tiers():
+    engine = DiscoveryEngine()
+    territories = ["privacy", "cloud", "ai"]
+    sources = ["afr", "acsc", "hn", "reuters"]
+    made = []
+    for i in range(60):
+        made.append(_add(engine, f"Signal {i}", territories[i % 3], sources[i % 4], days_ago=i % 45))
+    engine.record_interaction(made[0].discovery_id, InteractionType.DISMISSED)
+    del engine.discoveries[made[3].discovery_id]
+    engine.discoveries[made[3].discovery_id] = made[3]
+    made[6].territory = "cloud"
+    engine.detect_patterns()
+
+    expected = _brute_force_territories(engine)
+    assert {p.territory: sorted(p.discovery_ids) for p in engine.patterns.values()} == \
+        {t: sorted(ids) for t, ids in expected.items()}
+
+    # afr (tier 2), acsc (1), hn (5) and reuters (2) → three tiers, best credibility 0.9
+    assert engine.calculate_convergence(territory="privacy") == 0.99
+    assert engine.calculate_convergence([made[1].discovery_id, "missing"]) == made[1].source_credibility
+    assert engine.calculate_convergence(territory="unknown") == 0.0
+
+
+def test_plain_dict_assignment_is_indexed():
+    engine = DiscoveryEngine()
+    engine.discoveries = {f"d{i}": Discovery(discovery_id=f"d{i}", title="Quantum safe crypto",
+                                             territory="crypto", source_name="NIST")
+                          for i in range(3)}
+    assert [p.territory for p in engine.detect_patterns()] == ["crypto"]
+    assert engine.calculate_convergence(territory="crypto") == 0.5    # One tier, default credibility
+
+
+def test_unregistered_sources_are_not_a_tier():
+    engine = DiscoveryEngine()
+    made = [_add(engine, f"Signal {i}", "privacy", source)
+            for i, source in enumerate(["afr", "reuters", "blog-a", "blog-b"])]
+    # afr and reuters share tier 2; the blogs have no tier → one tier, no bonus
+    assert engine.calculate_convergence(territory="privacy") == max(d.source_credibility for d in made)
@@ -0,0 +1,91 @@
+"""Indexed store — every dict write passes through _index / _unindex.
+
+Almost Magic Tech Lab
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from modules.cartographer.models import KnowledgeTerritory
+from modules.cartographer.territory_state import TerritoryStore
+from modules.indexed_store import IndexedRecord, IndexedStore, StoreAttribute, claim
+
+
+class Record(IndexedRecord):
+    index_fields = frozenset({"name"})
+
+    def __init__(self, name):
+        self.name = name
+        self.seen = 0           # Not indexed
+
+
+class NameStore(IndexedStore):
+    def __init__(self, records=None):
+        super().__init__()
+        self.names = {}         # key → name indexed
+        self.replaced = []
+        self.reindexed = []
+        if records:
+            self.update(records)
+
+    def _index(self, key, record):
+        self.names[key] = record.name
+        claim(self, record)
+
+    def _unindex(self, key):
+        if key in self:
+            self.replaced.append(key)
+        del self.names[key]
+
+    def reindex(self, record, attr, value):
+        self.reindexed.append(attr)
+        key = next(k for k, v in self.items() if v is record)
+        self._unindex(key)
+        self._index(key, record)
+
+
+class Engine:
+    records = StoreAttribute(NameStore)
+
+
+def test_every_write_is_indexed():
+    store = NameStore({"a": Record("Ann")})
+    store["b"] = Record("Bo")
+    store["a"] = Record("Ada")
+    store.update([("c", Record("Cy"))], d=Record("Di"))
+    store |= {"e": Record("Eve")}
+    store.setdefault("f", Record("Fay"))
+    store.setdefault("f", Record("ignored"))
+    del store["b"]
+    assert store.pop("c").name == "Cy" and store.pop("missing", None) is None
+    store.popitem()
+    store["a"].name = "Ava"
+    store["a"].seen += 1
+    assert store.names == {k: v.name for k, v in store.items()} == {"a": "Ava", "d": "Di", "e": "Eve"}
+    assert store.replaced[0] == "a" and store.reindexed == ["name"]
+    store.clear()
+    assert store.names == {}
+
+
+def test_store_attribute_wraps_plain_dicts():
+    engine = Engine()
+    engine.records = {"a": Record("Ann")}
+    assert isinstance(engine.records, NameStore) and engine.records.names == {"a": "Ann"}
+    store = NameStore()
+    engine.records = store
+    assert engine.records is store
+
+
+def test_territory_rows_keep_dict_order():
+    store = TerritoryStore({f"t{i}": KnowledgeTerritory(f"t{i}", f"T{i}") for i in range(6)})
+    store["t2"] = KnowledgeTerritory("t2", "Replaced")
+    del store["t0"]
+    store.pop("t4")
+    store.popitem()
+    store["t9"] = KnowledgeTerritory("t9", "T9")
+    assert store.ids == list(store) == ["t1", "t2", "t3", "t9"]
+    assert [store.records[store.row(k)] for k in store] == list(store.values())
+    store.clear()
+    assert store.ids == store.records == [] and len(store.column("credentials")) == 0
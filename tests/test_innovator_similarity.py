@@ -0,0 +1,86 @@
+"""App Innovator — MinHash/LSH opportunity matching.
+
+Almost Magic Tech Lab
+"""
+
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from modules.innovator.engine import InnovationEngine
+from modules.innovator.models import InnovationType, Opportunity
+from modules.innovator.similarity import OpportunityIndex, jaccard, shingles, stem
+
+
+def test_shingles_fold_stopwords_and_suffixes():
+    assert stem("policies") == "policy" and stem("governance") == "govern" and stem("process") == "process"
+    assert shingles("Can you maintain our AI policies?") == {"maintain", "ai", "policy"}
+
+
+def test_repeated_questions_merge_and_one_shared_word_does_not():
+    engine = InnovationEngine()
+    seeded = len(engine.opportunities)
+    data = {"chronicle": {"repeated_questions": ["How do we audit our vendor AI models?"]}}
+    created = engine.detect_from_modules(data)
+    assert len(created) == 1 and created[0].title.startswith("Product from client need:")
+
+    # Same need in other words joins it; a question sharing only "models" does not
+    again = engine.detect_from_modules({"chronicle": {"repeated_questions": [
+        "Can you audit vendor AI models for us?",
+        "Which pricing models work for retainers?",
+    ]}})
+    assert [o.title for o in again] == ["Product from client need: Which pricing models work for retainers?"]
+    assert created[0].signal_count == 2
+    assert len(engine.opportunities) == seeded + 2
+
+    # The old substring rule merged anything sharing a word over four letters
+    assert engine._find_similar("maintain our AI policy").title == "AI Policy-as-a-Service"
+    assert engine._find_similar("governance pricing questions") is None
+
+
+def test_ranked_candidates_match_brute_force_jaccard():
+    rng = random.Random(3)
+    words = ["audit", "vendor", "privacy", "board", "policy", "training", "risk", "cloud",
+             "register", "workshop", "model", "budget", "pilot", "renewal", "controls", "data"]
+    index = OpportunityIndex()
+    texts = {f"opp_{i}": " ".join(rng.sample(words, 4)) for i in range(300)}
+    for oid, text in texts.items():
+        index.add(oid, [text])
+    index.remove("opp_0")
+    del texts["opp_0"]
+
+    for _ in range(20):
+        query = " ".join(rng.sample(words, 4))
+        exact = {oid: jaccard(shingles(query), shingles(t)) for oid, t in texts.items()}
+        expected = {oid for oid, j in exact.items() if j >= 0.6}
+        found = dict(index.query(query, threshold=0.6))
+        assert set(found) == expected                   # At 0.6 LSH recall is effectively total
+        assert all(abs(found[oid] - exact[oid]) < 1e-3 for oid in found)
+        assert list(found.values()) == sorted(found.values(), reverse=True)
+
+
+def test_opportunities_added_to_the_dict_directly_are_matched():
+    engine = InnovationEngine()
+    opp = Opportunity(title="Board AI literacy workshop", innovation_type=InnovationType.SERVICE_PACKAGE)
+    engine.opportunities[opp.opportunity_id] = opp
+    assert engine.find_similar("AI literacy workshop for the board")[0] == (opp, 1.0)
+    del engine.opportunities[opp.opportunity_id]
+    assert engine.find_similar("AI literacy workshop for the board") == []
+
+
+def test_swapped_and_edited_opportunities_are_reindexed():
+    engine = InnovationEngine()
+    first = next(iter(engine.opportunities))
+    del engine.opportunities[first]                         # Same count after the add below
+    opp = Opportunity(title="Privacy impact assessment sprint")
+    engine.opportunities[opp.opportunity_id] = opp
+    assert engine.find_similar("privacy impact assessment")[0][0] is opp
+
+    opp.title = "Vendor risk questionnaire review"
+    assert engine.find_similar("privacy impact assessment") == []
+    assert engine.find_similar("vendor risk questionnaire")[0][0] is opp
+
+    engine.opportunities = {opp.opportunity_id: opp}
+    assert [o for o, _ in engine.find_similar("vendor risk questionnaire review")] == [opp]
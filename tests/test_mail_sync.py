@@ -0,0 +1,142 @@
+"""Morning briefing — incremental IMAP sync against a local IMAP stand-in.
+
+Almost Magic Tech Lab
+"""
+
+import imaplib
+import os
+import sqlite3
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import pytest
+
+from tests.fake_imap_server import FakeIMAPServer, Mailbox, make_message
+from modules.phase5_briefing.mail_sync import MailSync
+
+
+def _date(hours_ago=1):
+    return format_datetime(datetime.now(timezone.utc) - timedelta(hours=hours_ago))
+
+
+@pytest.fixture
+def imap():
+    server = FakeIMAPServer().start()
+    yield server
+    server.stop()
+
+
+@pytest.fixture
+def sync(imap, tmp_path):
+    def connect():
+        mail = imaplib.IMAP4("127.0.0.1", imap.port, timeout=5)
+        mail.login("mani@example.com", "secret")
+        return mail
+    s = MailSync(str(tmp_path / "briefing.db"), connect, batch_size=100)
+    yield s
+    s.close()
+
+
+def _fill(imap, count, start=0):
+    box = imap.mailbox()
+    for i in range(start, start + count):
+        box.append(make_message(f"Client {i} <client{i}@acme.com>", f"Proposal {i}",
+                                "Please review the proposal. " * 200, _date(),
+                                message_id=f"<m{i}@acme.com>"))
+
+
+def test_first_sync_is_header_only_and_batched(imap, sync):
+    _fill(imap, 250)
+    new = sync.sync(["INBOX"])
+    assert len(new["INBOX"]) == 250
+    assert len(imap.fetches) == 3  # 100 + 100 + 50 per UID FETCH round trip
+    assert all("RFC822" not in f["items"] and "BODY.PEEK[HEADER.FIELDS" in f["items"] for f in imap.fetches)
+
+    first = sync.recent(hours=12)[-1]
+    assert first["sender_email"].startswith("client")
+    assert first["subject"].startswith("Proposal")
+    assert first["snippet"].startswith("Please review the proposal.")
+    assert len(first["snippet"]) <= 300
+
+
+def test_unchanged_mailbox_fetches_nothing_and_reuses_session(imap, sync):
+    _fill(imap, 5)
+    sync.sync(["INBOX"])
+    fetches = len(imap.fetches)
+    assert sync.sync(["INBOX"]) == {"INBOX": []}
+    assert len(imap.fetches) == fetches
+    assert imap.server.logins == 1
+
+
+def test_only_new_uids_are_fetched(imap, sync):
+    _fill(imap, 5)
+    sync.sync(["INBOX"])
+    _fill(imap, 2, start=5)
+    new = sync.sync(["INBOX"])["INBOX"]
+    assert [m["uid"] for m in new] == [6, 7]
+    assert imap.fetches[-1]["uids"] == [6, 7]
+    assert len(sync.recent(hours=12)) == 7
+
+
+def test_uidvalidity_change_resyncs_folder(imap, sync):
+    _fill(imap, 3)
+    sync.sync(["INBOX"])
+    imap.server.mailboxes["INBOX"] = Mailbox(uidvalidity=2)
+    _fill(imap, 2, start=10)
+    new = sync.sync(["INBOX"])["INBOX"]
+    assert [m["subject"] for m in new] == ["Proposal 10", "Proposal 11"]
+    assert len(sync.recent(hours=12)) == 2
+    assert sync.folder_state()[0]["uidvalidity"] == 2
+
+
+def test_briefing_emails_from_local_index(imap, tmp_path, monkeypatch):
+    monkeypatch.setenv("HOME", str(tmp_path))
+    from modules.phase5_briefing.morning_briefing import MorningBriefingEngine
+    box = imap.mailbox()
+    box.append(make_message("Board <board@acme.com>", "URGENT: contract deadline", "Action required today.", _date()))
+    box.append(make_message("News <news@acme.com>", "Weekly digest", "Nothing much.", _date()))
+    box.append(make_message("Old <old@acme.com>", "Ancient", "Long ago.", _date(hours_ago=72)))
+
+    engine = MorningBriefingEngine(config_path=str(tmp_path / "briefing_config.json"))
+    engine.config["email"].update({
+        "enabled": True, "imap_server": "127.0.0.1", "imap_port": imap.port,
+        "imap_ssl": False, "username": "mani@example.com", "password": "secret",
+    })
+    emails = engine._get_important_emails()
+    assert emails["source"] == "imap"
+    assert [e["subject"] for e in emails["items"]] == ["URGENT: contract deadline", "Weekly digest"]
+    assert emails["items"][0]["priority_score"] > emails["items"][1]["priority_score"]
+
+    again = engine._get_important_emails()
+    assert again["new_since_last_sync"] == 0 and len(again["items"]) == 2
+    conn = sqlite3.connect(engine.db_path)
+    assert conn.execute("SELECT COUNT(*) FROM email_cache").fetchone()[0] == 3
+    conn.close()
+
+
+def test_failed_folder_is_reported_not_empty(imap, sync):
+    _fill(imap, 2)
+    new = sync.sync(["INBOX", "Missing"])
+    assert len(new["INBOX"]) == 2 and new["Missing"] == []
+    assert list(sync.errors) == ["Missing"] and "Missing" in sync.errors["Missing"]
+    imap.mailbox("Missing")
+    sync.sync(["Missing"])
+    assert sync.errors == {}
+
+
+def test_concurrent_syncs_share_the_session_safely(imap, sync):
+    for name in ("INBOX", "Archive"):
+        box = imap.mailbox(name)
+        for i in range(40):
+            box.append(make_message(f"{name} <{name.lower()}@acme.com>", f"{name} {i}", "Body.", _date()))
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        runs = list(pool.map(sync.sync, [["INBOX"], ["Archive"]] * 4))
+    assert sum(len(r.get("INBOX", [])) for r in runs) == 40
+    assert sum(len(r.get("Archive", [])) for r in runs) == 40
+    assert sync.errors == {} and imap.server.logins == 1
+    for m in sync.recent(hours=12):
+        assert m["subject"].startswith(m["folder"])
@@ -0,0 +1,129 @@
+"""Chronicle — commitment and participant indexes behind MeetingEngine.
+
+Almost Magic Tech Lab
+"""
+
+import os
+import random
+import sys
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from modules.chronicle.meeting_engine import MeetingEngine
+from modules.chronicle.meeting_index import MeetingStore
+from modules.chronicle.models import (
+    Commitment, CommitmentStatus, CommitmentType, MeetingRecord, MeetingTemplate, Participant,
+)
+
+NOW = datetime.now()
+
+
+def _scan_active(engine, owner=""):
+    """The pre-index get_active_commitments, for comparison."""
+    active = []
+    for m in engine.meetings.values():
+        for c in m.commitments:
+            if c.status in (CommitmentStatus.PENDING, CommitmentStatus.IN_PROGRESS):
+                if not owner or c.owner == owner:
+                    active.append((c.due_date.isoformat() if c.due_date else None, c.commitment_id))
+    return sorted(active, key=lambda x: x[0] or "9999")
+
+
+def _ids(rows):
+    return [(r["due_date"], r["commitment_id"]) for r in rows]
+
+
+def _random_engine(seed=1, meetings=60):
+    rng = random.Random(seed)
+    engine = MeetingEngine()
+    for i in range(meetings):
+        m = engine.create_meeting(f"Meeting {i}", MeetingTemplate.STRATEGY_SESSION,
+                                  [{"name": rng.choice(["Sarah Chen", "Wei Kim", "Ana Lopez"])}],
+                                  date=NOW - timedelta(days=i))
+        for j in range(rng.randint(0, 4)):
+            due = NOW + timedelta(days=rng.uniform(-10, 10)) if rng.random() < 0.8 else None
+            engine.add_commitment(m.meeting_id, f"Do {i}.{j}", rng.choice(["mani", "mutual", "Wei Kim"]),
+                                  CommitmentType.ACTION_ITEM, due_date=due)
+    return engine, rng
+
+
+def test_active_and_overdue_match_full_scan_through_edits():
+    engine, rng = _random_engine()
+    every = [(m, c) for m in engine.meetings.values() for c in m.commitments]
+    for _ in range(150):
+        m, c = rng.choice(every)
+        action = rng.random()
+        if action < 0.5:
+            engine.update_commitment_status(m.meeting_id, c.commitment_id, rng.choice(list(CommitmentStatus)))
+        elif action < 0.7:
+            c.due_date = NOW + timedelta(days=rng.uniform(-5, 5))       # Direct edit, not via the engine
+        elif action < 0.85:
+            c.owner = rng.choice(["mani", "Ana Lopez"])
+        else:
+            m.commitments.remove(c)
+            every.remove((m, c))
+
+        for owner in ("", "mani", "Wei Kim", "Ana Lopez"):
+            assert _ids(engine.get_active_commitments(owner)) == _scan_active(engine, owner)
+        assert [r["commitment_id"] for r in engine.get_overdue_commitments()] == [
+            cid for due, cid in _scan_active(engine)
+            if next(c for _, c in every if c.commitment_id == cid).is_overdue]
+
+
+def test_overdue_is_a_range_on_due_date_and_undated_sort_last():
+    engine = MeetingEngine()
+    m = engine.create_meeting("Review", MeetingTemplate.PROPOSAL_REVIEW, [])
+    late = engine.add_commitment(m.meeting_id, "Late", "mani", CommitmentType.ACTION_ITEM,
+                                 due_date=NOW - timedelta(days=2))
+    engine.add_commitment(m.meeting_id, "Undated", "mani", CommitmentType.SOFT)
+    soon = engine.add_commitment(m.meeting_id, "Soon", "mani", CommitmentType.ACTION_ITEM,
+                                 due_date=NOW + timedelta(days=1))
+
+    assert [r["text"] for r in engine.get_active_commitments()] == ["Late", "Soon", "Undated"]
+    assert [c.text for _, c in engine.meetings.overdue()] == ["Late"]
+    assert engine.meetings.count_overdue(NOW + timedelta(days=2)) == 2
+
+    # In progress is still active but no longer overdue
+    engine.update_commitment_status(m.meeting_id, late.commitment_id, CommitmentStatus.IN_PROGRESS)
+    assert engine.get_overdue_commitments() == []
+    assert engine.status()["active_commitments"] == 3
+
+    engine.update_commitment_status(m.meeting_id, soon.commitment_id, CommitmentStatus.COMPLETED)
+    assert [c.text for _, c in engine.meetings.with_status(CommitmentStatus.COMPLETED)] == ["Soon"]
+    assert engine.meetings.count_active(owner="mani") == 2
+
+
+def test_meetings_by_participant_follow_list_edits_and_assignment():
+    engine = MeetingEngine()
+    a = engine.create_meeting("Kickoff", MeetingTemplate.DISCOVERY_CALL, [{"name": "Sarah Chen"}],
+                              date=NOW - timedelta(days=3))
+    b = engine.create_meeting("Follow-up", MeetingTemplate.PROPOSAL_REVIEW, [{"name": "Wei Kim"}])
+    assert engine.list_meetings(person="sarah chen") == [a]
+
+    b.participants.append(Participant(name="Sarah Chen"))
+    assert engine.list_meetings(person="Sarah Chen") == [b, a]
+    a.participants.clear()
+    assert engine.list_meetings(person="Sarah Chen") == [b]
+
+    del engine.meetings[b.meeting_id]
+    assert engine.list_meetings(person="Sarah Chen") == []
+    assert engine.meetings.commitment_count() == 0
+
+    # Plain dicts assigned from outside get indexed, and commitments added to them are seen
+    record = MeetingRecord(meeting_id="m1", participants=[Participant(name="Ana Lopez")],
+                           commitments=[Commitment(text="Send deck", owner="Ana Lopez")])
+    engine.meetings = {"m1": record}
+    assert isinstance(engine.meetings, MeetingStore)
+    assert [r["text"] for r in engine.get_active_commitments("Ana Lopez")] == ["Send deck"]
+    record.commitments.append(Commitment(text="Book room", owner="Ana Lopez"))
+    assert engine.meetings.count_active("Ana Lopez") == 2
+    assert engine.list_meetings(person="ana lopez") == [record]
+
+
+def test_extracted_commitments_are_indexed():
+    engine = MeetingEngine()
+    m = engine.create_meeting("Call", MeetingTemplate.DISCOVERY_CALL, [])
+    engine.extract_commitments(m.meeting_id, "I'll send the proposal by Friday. Action: book the workshop.")
+    assert engine.meetings.count_active() == len(m.commitments) == 2
+    assert engine.get_meeting_patterns()["total_commitments"] == 2
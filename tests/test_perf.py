@@ -0,0 +1,177 @@
+"""Perf — route histograms, span attribution, slow-request sampling, /metrics.
+
+Almost Magic Tech Lab
+"""
+
+import json
+import os
+import sqlite3
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import pytest
+import requests
+from flask import Flask, Response, jsonify
+
+from api_routes_perf import create_perf_routes
+from modules.perf import LatencyHistogram, PerfMonitor
+from tests.fake_ollama_server import FakeOllamaServer
+
+
+class NoteEngine:
+    def __init__(self, db):
+        self.db = db
+
+    def count(self):
+        conn = sqlite3.connect(self.db)
+        try:
+            return conn.execute("SELECT COUNT(*) FROM notes").fetchone()[0]
+        finally:
+            conn.close()
+
+    def _private(self):
+        return "untouched"
+
+
+def _crunch(seconds):
+    end = time.perf_counter() + seconds
+    n = 0
+    while time.perf_counter() < end:
+        n += 1
+    return n
+
+
+@pytest.fixture
+def perf(tmp_path):
+    db = str(tmp_path / "notes.db")
+    conn = sqlite3.connect(db)
+    conn.execute("CREATE TABLE notes (id INTEGER PRIMARY KEY, body TEXT)")
+    conn.executemany("INSERT INTO notes (body) VALUES (?)", [(f"n{i}",) for i in range(50)])
+    conn.commit()
+    conn.close()
+
+    monitor = PerfMonitor(slow_ms=150, sample_interval=0.005, profile=True)
+    engine = NoteEngine(db)
+    app = Flask(__name__)
+    monitor.install(app)
+    assert monitor.trace_engines({"notes": engine}) == 1
+    server = FakeOllamaServer(tokens=["x"]).start()
+
+    @app.route("/notes/<int:note_id>")
+    def note(note_id):
+        conn = sqlite3.connect(db)
+        row = conn.execute("SELECT body FROM notes WHERE id = ?", (note_id,)).fetchone()
+        conn.close()
+        return jsonify({"body": row[0], "total": engine.count()})
+
+    @app.route("/crunch")
+    def crunch():
+        return jsonify({"n": _crunch(0.25)})
+
+    @app.route("/upstream")
+    def upstream():
+        requests.post(f"{server.base_url}/api/chat", json={"stream": True}, timeout=5).close()
+        return jsonify({"ok": True})
+
+    @app.route("/stream")
+    def stream():
+        def gen():
+            for i in range(3):
+                time.sleep(0.05)
+                yield f"{i}\n"
+        return Response(gen())
+
+    @app.route("/boom")
+    def boom():
+        raise RuntimeError("boom")
+
+    app.register_blueprint(create_perf_routes(monitor))
+    yield monitor, app.test_client()
+    server.stop()
+
+
+def test_histogram_quantiles():
+    h = LatencyHistogram()
+    for ms in range(1, 101):
+        h.observe(ms / 1000)
+    assert h.count == 100 and abs(h.total - 5.05) < 1e-9
+    assert 0.02 <= h.quantile(0.5) <= 0.05
+    assert 0.05 <= h.quantile(0.99) <= 0.1 and h.max == 0.1
+    assert h.cumulative()[-1] == (float("inf"), 100)
+
+
+def test_routes_keyed_by_rule_with_span_breakdown(perf):
+    monitor, client = perf
+    for i in range(1, 11):
+        assert client.get(f"/notes/{i}").status_code == 200
+    client.get("/upstream")
+    client.get("/missing")
+    client.get("/boom")
+
+    routes = {(r["method"], r["route"]): r for r in client.get("/api/perf").get_json()["routes"]}
+    notes = routes[("GET", "/notes/<int:note_id>")]
+    assert notes["count"] == 10 and notes["errors"] == 0
+    assert notes["span_calls"]["sql"] >= 20 and notes["span_calls"]["engine"] == 10
+    assert notes["spans_ms"]["sql"] > 0 and notes["p50_ms"] <= notes["p99_ms"] <= notes["max_ms"]
+    assert routes[("GET", "/upstream")]["span_calls"]["http"] == 1
+    assert routes[("GET", "(unmatched)")]["statuses"] == {"404": 1}
+    assert routes[("GET", "/boom")]["errors"] == 1
+
+    spans = {(s["kind"], s["name"]) for s in monitor.snapshot()["top_spans"]}
+    assert ("sql", "SELECT notes") in spans and ("engine", "notes.count") in spans
+
+
+def test_without_profiling_requests_are_only_timed(tmp_path):
+    monitor = PerfMonitor(slow_ms=150, sample_interval=0.005, profile=False)
+    app = Flask(__name__)
+    monitor.install(app)
+    assert monitor.trace_engines({"notes": NoteEngine(str(tmp_path / "notes.db"))}) == 0
+
+    @app.route("/crunch")
+    def crunch():
+        return jsonify({"n": _crunch(0.2)})
+
+    client = app.test_client()
+    assert client.get("/crunch").status_code == 200
+    snap = monitor.snapshot()
+    assert snap["profiling"] is False and snap["routes"][0]["count"] == 1
+    assert monitor._sampler is None and snap["top_spans"] == []
+    assert [r["samples"] for r in monitor.slow_requests()] == [0]
+
+
+def test_streamed_body_is_timed_to_the_end(perf):
+    monitor, client = perf
+    resp = client.get("/stream")
+    assert resp.data == b"0\n1\n2\n"
+    resp.close()
+    row = next(r for r in monitor.snapshot()["routes"] if r["route"] == "/stream")
+    assert row["max_ms"] >= 150
+
+
+def test_slow_request_keeps_sampled_stacks(perf):
+    monitor, client = perf
+    seen = []
+    monitor.on_slow(seen.append)
+    client.get("/crunch")
+    client.get("/notes/1")
+    slow = client.get("/api/perf/slow").get_json()["requests"]
+    assert [r["route"] for r in slow] == ["/crunch"] and seen[0]["route"] == "/crunch"
+    assert slow[0]["samples"] > 5
+    assert any(":_crunch:" in fn for fn, _ in slow[0]["hot_functions"])
+
+
+def test_prometheus_exposition(perf):
+    monitor, client = perf
+    client.get("/notes/3")
+    client.get("/notes/4")
+    text = client.get("/metrics").data.decode()
+    assert "# TYPE elaine_request_duration_seconds histogram" in text
+    assert 'elaine_request_duration_seconds_bucket{method="GET",route="/notes/<int:note_id>",le="+Inf"} 2' in text
+    assert 'elaine_request_duration_seconds_count{method="GET",route="/notes/<int:note_id>"} 2' in text
+    assert 'kind="sql"' in text and "elaine_slow_requests_total 0" in text
+
+    client.post("/api/perf/reset")
+    routes = json.loads(client.get("/api/perf").data)["routes"]
+    assert [r["route"] for r in routes] == ["/api/perf/reset"]
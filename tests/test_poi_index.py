@@ -0,0 +1,132 @@
+"""Constellation — indexed POI store, fuzzy matching and bulk signal ingestion.
+
+Almost Magic Tech Lab
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from modules.constellation.models import NetworkConnection, POIRecord, POITier
+from modules.constellation.network_intelligence import NetworkIntelligence
+from modules.constellation.poi_engine import POIEngine
+from modules.constellation.poi_index import POIStore, blocking_key, soundex
+
+
+def _engine():
+    engine = POIEngine()
+    engine.pois = {
+        "p1": POIRecord(poi_id="p1", name="Sarah Chen", email="Sarah.Chen@Acme.com", company="Acme Corp"),
+        "p2": POIRecord(poi_id="p2", name="James Wilson", email="james@globex.com", company="Globex",
+                        tier=POITier.INNER_CIRCLE),
+        "p3": POIRecord(poi_id="p3", name="Priya Patel", company="Acme Labs"),
+    }
+    return engine
+
+
+def _scan(engine, query="", tier=None, company=""):
+    """The pre-index search_pois filter, for comparison."""
+    results = list(engine.pois.values())
+    if query:
+        q = query.lower()
+        results = [p for p in results if q in p.name.lower()
+                   or q in p.company.lower() or q in p.email.lower()]
+    if tier:
+        results = [p for p in results if p.tier == tier]
+    if company:
+        results = [p for p in results if company.lower() in p.company.lower()]
+    return [p.poi_id for p in results]
+
+
+def test_plain_dict_is_indexed_and_search_matches_a_scan():
+    engine = _engine()
+    assert isinstance(engine.pois, POIStore)
+    for query, tier, company in [("chen", None, ""), ("ah ch", None, ""), ("acme", None, ""),
+                                 ("", None, "acme"), ("", POITier.INNER_CIRCLE, ""),
+                                 (".com", None, ""), ("zzz", None, ""), ("@", None, ""),
+                                 ("a", POITier.AWARENESS, "lab")]:
+        found = [p.poi_id for p in engine.search_pois(query=query, tier=tier, company=company)]
+        assert found == _scan(engine, query, tier, company), (query, tier, company)
+
+
+def test_search_results_keep_store_order():
+    engine = POIEngine()
+    engine.pois = {f"p{i}": POIRecord(poi_id=f"p{i}", name=f"Person {i}", company=f"Acme {i % 3}")
+                   for i in range(12)}
+    for i in (7, 2, 9, 4):
+        engine.pois[f"p{i}"].tier = POITier.INNER_CIRCLE
+    engine.pois["p9"].tier = POITier.AWARENESS
+    engine.pois["p9"].tier = POITier.INNER_CIRCLE
+    engine.pois["p4"] = POIRecord(poi_id="p4", name="Person 4", company="Acme 1",
+                                  tier=POITier.INNER_CIRCLE)
+    engine.pois["p2"] = engine.pois.pop("p2")
+    for query, tier, company in [("acme", None, ""), ("person", POITier.INNER_CIRCLE, ""),
+                                 ("", POITier.INNER_CIRCLE, "acme"), ("", None, "acme 1")]:
+        found = [p.poi_id for p in engine.search_pois(query=query, tier=tier, company=company)]
+        assert found == _scan(engine, query, tier, company), (query, tier, company)
+    assert [p.poi_id for p in engine.search_pois(tier=POITier.INNER_CIRCLE)] == ["p4", "p7", "p9", "p2"]
+
+
+def test_field_changes_reindex_the_record():
+    engine = _engine()
+    poi = engine.pois["p3"]
+    poi.company = "Initech"
+    poi.tier = POITier.ACTIVE_NETWORK
+    assert [p.poi_id for p in engine.search_pois(company="initech")] == ["p3"]
+    assert engine.search_pois(company="acme labs") == []
+    assert [p.poi_id for p in engine.search_pois(tier=POITier.ACTIVE_NETWORK)] == ["p3"]
+
+    poi.email = "priya@initech.com"
+    assert engine.get_or_create_poi("P. Patel", "PRIYA@initech.com ") is poi
+    del engine.pois["p3"]
+    assert engine.pois.find_by_email("priya@initech.com") is None
+
+
+def test_get_or_create_matches_email_name_and_close_spellings():
+    engine = _engine()
+    assert engine.get_or_create_poi("Someone", "sarah.chen@acme.com").poi_id == "p1"
+    assert engine.get_or_create_poi("  sarah chen ").poi_id == "p1"
+    assert engine.get_or_create_poi("Priya Patell").poi_id == "p3"         # No emails to contradict
+    assert engine.get_or_create_poi("Jamie Wilson", "jamie@other.com").poi_id not in {"p2"}
+    assert engine.get_or_create_poi("Sarah").poi_id not in {"p1"}           # Too ambiguous
+    assert len(engine.pois) == 5
+
+
+def test_blocking_keys():
+    assert soundex("Robert") == soundex("Rupert") == "R163"
+    assert soundex("Ashcraft") == "A261" and soundex("Tymczak") == "T522"
+    assert blocking_key("Jon Smyth") == blocking_key("John Smith")
+    assert blocking_key("Team Alpha 2") != blocking_key("Team Alpha 3")
+    assert blocking_key("Madonna") == ""
+
+
+def test_ingest_signals_batch():
+    engine = _engine()
+    summary = engine.ingest_signals([
+        {"type": "email", "from_name": "Sarah Chen", "from_email": "sarah.chen@acme.com"},
+        {"type": "calendar", "participant_name": "James Wilson", "participant_email": "james@globex.com",
+         "was_cancelled": True},
+        {"type": "voice_agent", "visitor_name": "Olivia Brown", "company": "Hooli"},
+        {"type": "fax", "from_name": "Nobody"},
+        {"type": "email", "wrong_field": "x"},
+        "not a signal",
+    ])
+    assert summary["processed"] == 3 and summary["created"] == 1 and summary["pois_touched"] == 3
+    assert summary["by_type"] == {"email": 1, "calendar": 1, "voice_agent": 1}
+    assert summary["error_count"] == 3
+    assert [p.name for p in engine.search_pois(company="hooli")] == ["Olivia Brown"]
+    assert engine.pois["p2"].trust_account.balance < 0
+
+
+def test_network_lookup_uses_the_name_index():
+    engine = _engine()
+    engine.pois["p2"].trust_account.balance = 50
+    engine.pois["p2"].known_connections = [
+        NetworkConnection(name="sarah chen", estimated_value=10000),
+        NetworkConnection(name="New Person", estimated_value=10000),
+    ]
+    engine.pois["p1"].tier = POITier.ACTIVE_NETWORK
+    intel = NetworkIntelligence()
+    for pois in (engine.pois, dict(engine.pois)):
+        assert [o.target_name for o in intel.find_opportunities(pois)] == ["New Person"]
@@ -0,0 +1,114 @@
+"""Constellation — column-wise decay, tiers, alerts and summary match the per-POI rules.
+
+Almost Magic Tech Lab
+"""
+
+import os
+import random
+import sys
+from datetime import datetime, timedelta
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from modules.constellation import portfolio_view
+from modules.constellation.models import (
+    POIRecord, POITier, TrustAccount, TrustTransaction, TrustTransactionType,
+)
+from modules.constellation.portfolio_view import PortfolioView
+from modules.constellation.trust_ledger import TrustLedger
+
+BACKENDS = [False, pytest.param(True, marks=pytest.mark.skipif(
+    not portfolio_view.HAS_NUMPY, reason="numpy not installed"))]
+
+
+@pytest.fixture(params=BACKENDS, ids=["lists", "numpy"])
+def backend(request, monkeypatch):
+    monkeypatch.setattr(portfolio_view, "HAS_NUMPY", request.param)
+    return request.param
+
+
+def _portfolio(n=400, seed=11):
+    rng = random.Random(seed)
+    now = datetime.now()
+    pois = {}
+    for i in range(n):
+        acct = TrustAccount(
+            balance=rng.uniform(-5, 90),
+            last_interaction=None if rng.random() < 0.1 else now - timedelta(days=rng.uniform(0, 200)),
+            relationship_age_months=rng.choice([0, 2, 6, 13, 30]),
+        )
+        if rng.random() < 0.2:
+            acct.transactions.append(TrustTransaction(
+                date=now - timedelta(days=rng.uniform(0, 150)),
+                amount=15, transaction_type=TrustTransactionType.REFERRAL_MADE))
+        poi = POIRecord(poi_id=f"p{i}", name=f"Person {i}", trust_account=acct,
+                        tier=rng.choice(list(POITier)), pinned_tier=rng.random() < 0.05)
+        pois[poi.poi_id] = poi
+    return pois
+
+
+def test_decay_matches_per_poi_rules(backend):
+    ledger = TrustLedger()
+    expected, actual = _portfolio(), _portfolio()
+    expected_alerts = []
+    for poi in expected.values():
+        prev = poi.trust_account.health
+        ledger.apply_decay(poi)
+        if prev != poi.trust_account.health and poi.trust_account.health != "healthy":
+            expected_alerts.append((poi.poi_id, prev, poi.trust_account.health))
+
+    alerts = ledger.apply_decay_all(actual)
+    assert [(a["poi_id"], a["previous_health"], a["current_health"]) for a in alerts] == expected_alerts
+    for pid, poi in expected.items():
+        got = actual[pid].trust_account
+        assert got.balance == pytest.approx(poi.trust_account.balance)
+        assert len(got.transactions) == len(poi.trust_account.transactions)
+        assert got.trajectory == poi.trust_account.trajectory
+
+
+def test_tiers_alerts_and_summary_match(backend):
+    ledger = TrustLedger()
+    expected, actual = _portfolio(), _portfolio()
+    for poi in expected.values():
+        ledger.recalculate_tier(poi)
+    changed = ledger.recalculate_all_tiers(actual)
+    assert changed > 0
+    assert {p: (r.tier, r.tier_trend) for p, r in expected.items()} == \
+           {p: (r.tier, r.tier_trend) for p, r in actual.items()}
+    ledger.recalculate_all_tiers(actual)                    # Trends settle to "stable"...
+    assert ledger.recalculate_all_tiers(actual) == 0        # ...then nothing is written back
+
+    alerts = ledger.get_trust_alerts(actual)
+    unhealthy = [p for p in actual.values() if p.trust_account.health != "healthy"]
+    assert len(alerts) == len(unhealthy)
+    assert [a["balance"] for a in alerts] == sorted(a["balance"] for a in alerts)
+
+    summary = ledger.get_portfolio_summary(actual)
+    assert summary["cooling_count"] == len(unhealthy)
+    assert summary["total_trust_debt"] == pytest.approx(
+        round(sum(max(0, 30 - p.trust_account.balance) for p in unhealthy), 1))
+    inner = [p.trust_account.balance for p in actual.values() if p.tier == POITier.INNER_CIRCLE]
+    assert summary["tiers"]["INNER_CIRCLE"]["count"] == len(inner)
+    assert summary["tiers"]["INNER_CIRCLE"]["avg_trust"] == round(sum(inner) / len(inner), 1)
+
+
+def test_view_reads_only_the_columns_a_pass_needs():
+    pois = _portfolio(20)
+    view = PortfolioView(pois, use_numpy=False)
+    view.health_codes()
+    assert "balance" in vars(view) and "rate" not in vars(view) and "days" not in vars(view)
+    assert len(view) == 20
+
+
+def test_old_transactions_do_not_count_as_recent_referrals():
+    now = datetime.now()
+    old = TrustTransaction(date=now - timedelta(days=120), transaction_type=TrustTransactionType.REFERRAL_MADE)
+    recent = TrustTransaction(date=now - timedelta(days=89), transaction_type=TrustTransactionType.REFERRAL_RECEIVED)
+    assert not portfolio_view._recent_referral([old], now)
+    assert portfolio_view._recent_referral([old, recent], now)
+    poi = POIRecord(trust_account=TrustAccount(transactions=[old, recent],
+                                               relationship_age_months=6))
+    assert PortfolioView({"p": poi}, use_numpy=False).rate[0] == pytest.approx(
+        poi.trust_account.effective_decay_rate)
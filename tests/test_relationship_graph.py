@@ -0,0 +1,97 @@
+"""Constellation — relationship graph, multi-hop intro paths and centrality.
+
+Almost Magic Tech Lab
+"""
+
+import os
+import sys
+from datetime import datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from modules.constellation.models import NetworkConnection, POIRecord, POITier, TrustAccount
+from modules.constellation.network_intelligence import NetworkIntelligence
+from modules.constellation.poi_engine import POIEngine
+
+
+def _poi(poi_id, name, tier=POITier.AWARENESS, balance=20, connections=()):
+    return POIRecord(poi_id=poi_id, name=name, tier=tier,
+                     trust_account=TrustAccount(balance=balance, last_interaction=datetime.now()),
+                     known_connections=[NetworkConnection(name=n, estimated_value=v) for n, v in connections])
+
+
+def _engine():
+    engine = POIEngine()
+    engine.pois = {
+        "a": _poi("a", "Alice Ng", POITier.INNER_CIRCLE, 70, [("Ben Ito", 0), ("Zed Ray", 10000)]),
+        "b": _poi("b", "Ben Ito", connections=[("Cara Diaz", 0)]),
+        "c": _poi("c", "Cara Diaz", balance=45),
+        "d": _poi("d", "Dev Shah", connections=[("Cara Diaz", 0)]),
+    }
+    # Cara knows Dana; Dana is only a name
+    engine.pois["c"].known_connections.append(NetworkConnection(name="Dana Target", estimated_value=20000))
+    return engine
+
+
+def test_single_hop_unchanged_and_multi_hop_finds_chains():
+    engine, intel = _engine(), NetworkIntelligence()
+    direct = intel.find_opportunities(engine.pois)
+    assert [(o.target_name, o.hops) for o in direct] == [("Zed Ray", 1)]
+    assert direct[0].warm_intro_probability == 0.7
+
+    far = intel.find_opportunities(engine.pois, max_hops=3)
+    dana = next(o for o in far if o.target_name == "Dana Target")
+    assert dana.path == ["Alice Ng", "Ben Ito", "Cara Diaz", "Dana Target"] and dana.hops == 3
+    assert dana.warm_intro_probability == round(0.7 * 0.5 * 0.6, 3)
+    assert dana.source_poi_id == "a"
+    assert [o.target_name for o in intel.find_opportunities(engine.pois, max_hops=2)] == ["Zed Ray"]
+
+
+def test_intro_paths_use_mutual_knowing_and_respect_max_hops():
+    engine, intel = _engine(), NetworkIntelligence()
+    paths = intel.find_intro_paths(engine.pois, "dana target")
+    assert [p.path for p in paths] == [["Alice Ng", "Ben Ito", "Cara Diaz", "Dana Target"]]
+    assert paths[0].poi_ids == ["a", "b", "c"]
+
+    # Dev lists Cara, so Cara can introduce Dev even though Cara doesn't list him
+    dev = intel.find_intro_paths(engine.pois, "d")
+    assert dev[0].path == ["Alice Ng", "Ben Ito", "Cara Diaz", "Dev Shah"]
+    assert intel.find_intro_paths(engine.pois, "Dev Shah", max_hops=2) == []
+
+
+def test_graph_syncs_only_what_changed():
+    engine, intel = _engine(), NetworkIntelligence()
+    graph = intel.graph(engine.pois)
+    version = graph.version
+    assert graph.sync() == 0 and graph.version == version
+
+    engine.pois["a"].trust_account.balance = 65              # Probabilities are read at search time
+    assert graph.sync() == 0
+
+    engine.pois["b"].known_connections.append(NetworkConnection(name="Eve Cole"))
+    assert graph.sync() == 1
+
+    # A name-only person becoming a POI re-links whoever knew them by name
+    engine.pois["e"] = _poi("e", "Dana Target", POITier.ACTIVE_NETWORK, 50)
+    assert graph.sync() == 2                                 # e itself and Cara
+    assert graph.node("Dana Target") == "e" and "e" in graph.neighbours("c")
+    assert [o.target_name for o in intel.find_opportunities(engine.pois, max_hops=3)] == ["Zed Ray"]
+
+    del engine.pois["e"]
+    graph.sync()
+    assert graph.node("Dana Target") == "name:dana target"
+
+
+def test_centrality_is_cached_until_the_graph_changes():
+    engine, intel = _engine(), NetworkIntelligence()
+    report = intel.analyse_portfolio(engine.pois)
+    top = report["top_connectors"][0]
+    assert top["name"] in ("Ben Ito", "Cara Diaz") and top["centrality"] == 1.0
+
+    graph = intel.graph(engine.pois)
+    scores = graph.centrality()
+    assert graph.centrality() is scores
+    engine.pois["d"].known_connections.append(NetworkConnection(name="Alice Ng"))
+    graph.sync()
+    assert graph.centrality() is not scores
+    assert graph.centrality()["d"]["degree"] == 2
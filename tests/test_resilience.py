@@ -0,0 +1,102 @@
+"""Resilience — batched health telemetry and per-module circuit breakers.
+
+Almost Magic Tech Lab
+"""
+
+import os
+import sqlite3
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from modules.phase5_resilience.resilience import CircuitBreaker, ResilienceEngine
+
+
+def _engine(tmp_path):
+    engine = ResilienceEngine(home=tmp_path)
+    engine.retry_delay = 0
+    return engine
+
+
+def _rows(engine, table):
+    conn = sqlite3.connect(engine.db_path)
+    try:
+        return conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+    finally:
+        conn.close()
+
+
+def _boom():
+    raise ValueError("boom")
+
+
+def test_calls_are_counted_in_memory_and_written_in_one_batch(tmp_path):
+    engine = _engine(tmp_path)
+    for i in range(50):
+        assert engine.safe_call("calendar", lambda x: x * 2, i) == i * 2
+    assert engine.safe_call("mail", _boom, fallback="offline") == "offline"
+
+    report = engine.get_health_report()
+    modules = {m["module"]: m for m in report["modules"]}
+    assert modules["calendar"]["calls"] == 50 and modules["calendar"]["status"] == "healthy"
+    assert modules["calendar"]["p95_ms"] is not None
+    assert modules["mail"]["status"] == "degraded" and report["error_counts_24h"] == {"mail": 1}
+    assert report["recent_errors"][0]["error_message"] == "boom"
+    assert report["overall"] == "degraded"
+
+    engine._closed = True                       # Keep the writer thread out of the way
+    assert engine.flush() == 51
+    assert _rows(engine, "error_log") == 1
+    assert _rows(engine, "health_checks") == 1          # 50 successes, one aggregated row
+    assert _rows(engine, "module_status") == 2
+    assert len(engine.get_error_log(module="mail")) == 1
+
+    reloaded = ResilienceEngine(home=tmp_path).get_health_report()
+    assert reloaded["error_counts_24h"] == {"mail": 1}
+    assert {m["module"]: m["status"] for m in reloaded["modules"]}["mail"] == "degraded"
+
+
+def test_breaker_opens_and_fails_fast(tmp_path):
+    engine = _engine(tmp_path)
+    engine.configure_breaker("ollama", failures=3, reset_s=60)
+    calls = []
+
+    def down():
+        calls.append(1)
+        raise ConnectionError("refused")
+
+    for _ in range(5):
+        assert engine.safe_call("ollama", down, fallback=lambda: "fallback") == "fallback"
+    assert len(calls) == 3                          # 2 with a retry, then the breaker opened
+    breaker = engine.get_health_report()["breakers"]["ollama"]
+    assert breaker["state"] == "open" and breaker["short_circuited"] == 3
+    assert "ollama" in engine.get_health_report()["summary"]["open_breakers"]
+
+
+def test_half_open_trial_closes_breaker(tmp_path):
+    engine = _engine(tmp_path)
+    breaker = engine.configure_breaker("feeds", failures=1, reset_s=0.05)
+    assert engine.safe_call("feeds", _boom) is None
+    assert breaker.state == CircuitBreaker.OPEN
+
+    time.sleep(0.06)
+    assert breaker.allow() and breaker.state == CircuitBreaker.HALF_OPEN
+    assert not breaker.allow()                      # Only one trial at a time
+    breaker.record(True, 1)
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert engine.safe_call("feeds", lambda: "ok") == "ok"
+
+
+def test_slow_calls_trip_the_breaker(tmp_path):
+    engine = _engine(tmp_path)
+    engine.configure_breaker("search", failures=2, slow_ms=10)
+
+    def slow():
+        time.sleep(0.02)
+        return "late"
+
+    assert engine.safe_call("search", slow) == "late"
+    assert engine.safe_call("search", slow) == "late"
+    assert engine.safe_call("search", slow, fallback="cached") == "cached"
+    assert engine.breaker("search").state == CircuitBreaker.OPEN
@@ -0,0 +1,94 @@
+"""Startup — lazy engine proxies, warm-up and the startup profiler.
+
+Almost Magic Tech Lab
+"""
+
+import os
+import sys
+import threading
+import time
+import types
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from modules.startup import EngineRegistry, StartupProfiler
+
+
+class SlowEngine:
+    instances = 0
+
+    def __init__(self, helper=None, delay=0.05):
+        time.sleep(delay)
+        SlowEngine.instances += 1
+        self.helper = helper
+        self.items = []
+        self._lock = "engine's own"
+
+    def add(self, item):
+        self.items.append(item)
+        return len(self.items)
+
+    def helper_name(self):
+        return type(self.helper).__name__
+
+
+def _registry():
+    module = types.ModuleType("fake_engines")
+    module.SlowEngine = SlowEngine
+    sys.modules["fake_engines"] = module
+    SlowEngine.instances = 0
+    return EngineRegistry(StartupProfiler())
+
+
+def test_engine_is_built_on_first_use_only_once():
+    engines = _registry()
+    helper = engines.register("helper", "fake_engines:SlowEngine")
+    main = engines.register("main", "fake_engines:SlowEngine", helper=helper)
+    assert main and SlowEngine.instances == 0 and engines.status()["pending"] == ["helper", "main"]
+
+    threads = [threading.Thread(target=main.add, args=(i,)) for i in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert SlowEngine.instances == 1 and len(main.items) == 8
+    assert engines.status()["built"] == ["main"]            # helper still untouched
+
+    assert main.helper_name() == "LazyEngine"
+    assert main.helper.add("x") == 1 and SlowEngine.instances == 2
+    main.items = ["replaced"]
+    assert main.items == ["replaced"] and main._lock == "engine's own"
+
+
+def test_warm_builds_everything_and_reports_timings():
+    engines = _registry()
+    built, steps = [], []
+    engines.register("a", "fake_engines:SlowEngine")
+    engines.register("b", "fake_engines:SlowEngine", after=lambda e: e.add("started"))
+    engines.register("broken", "fake_engines:Missing")
+    engines.on_build(lambda name, engine: built.append(name))
+    engines.add_warm_step("scheduler", lambda: steps.append("scheduler"))
+
+    engines.warm_in_background(delay=0).join(timeout=5)
+    assert built == ["a", "b"] and steps == ["scheduler"]
+    assert engines.engines["b"].items == ["started"]
+    assert engines.status()["pending"] == ["broken"]
+
+    report = engines.profiler.report()
+    inits = {e["name"]: e["ms"] for e in report["timeline"] if e["kind"] == "init"}
+    assert set(inits) == {"a", "b"} and all(ms >= 40 for ms in inits.values())
+    assert "fake_engines" in {e["name"] for e in report["timeline"] if e["kind"] == "import"}
+    assert report["totals_ms"]["warm"] >= 0
+
+
+def test_startup_report_and_engine_built_on_request(client):
+    # Session app from conftest: create_app() can only run once per process
+    startup = client.get("/api/system/startup").get_json()
+    assert startup["create_app_ms"] > 0 and startup["engines"] >= 20
+    assert len(startup["built"]) + len(startup["pending"]) == startup["engines"]
+    assert startup["totals_ms"]["phase"] > 0
+    phases = {e["name"] for e in startup["timeline"] if e["kind"] == "phase"}
+    assert "scheduler" in phases                            # Started by create_app, not by warm-up
+
+    assert client.get("/api/gravity/top").status_code == 200
+    assert "gravity" in client.get("/api/system/startup").get_json()["built"]
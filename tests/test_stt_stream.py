@@ -0,0 +1,180 @@
+"""Voice — streaming speech-to-text: VAD segmentation, model pool, routes.
+
+Almost Magic Tech Lab
+"""
+
+import json
+import math
+import os
+import random
+import sys
+import time
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import pytest
+from flask import Flask
+
+import api_routes_chat
+from modules.stt_stream import EnergyVAD, SpeechSegmenter, STTStream, WhisperPool
+
+RATE = 16000
+WORDS = {4000: "hello", 6000: "elaine", 8000: "schedule"}
+
+
+def _tone(seconds, amplitude):
+    n = int(seconds * RATE)
+    return array("h", (int(amplitude * math.sin(2 * math.pi * 220 * i / RATE)) for i in range(n))).tobytes()
+
+
+def _silence(seconds, noise=60):
+    rng = random.Random(7)
+    return array("h", (rng.randint(-noise, noise) for _ in range(int(seconds * RATE)))).tobytes()
+
+
+class FakeModel:
+    """Transcribes each tone burst in the audio as the word for its amplitude."""
+
+    def __init__(self, delay):
+        self.delay = delay
+
+    def transcribe(self, audio, language="en"):
+        time.sleep(self.delay)
+        samples = array("h", audio)
+        words = []
+        for i in range(0, len(samples), RATE // 10):
+            peak = max((abs(s) for s in samples[i:i + RATE // 10]), default=0)
+            word = next((w for a, w in WORDS.items() if abs(peak - a) < 200), None)
+            if word and (not words or words[-1] != word):
+                words.append(word)
+        return " ".join(words), language
+
+
+def _pool(delay=0.05, size=2):
+    loads = []
+
+    def loader():
+        loads.append(time.perf_counter())
+        return FakeModel(delay)
+    pool = WhisperPool(loader, size=size)
+    pool.loads = loads
+    return pool
+
+
+def _utterances():
+    return (_silence(0.5) + _tone(0.8, 4000) + _silence(0.7)
+            + _tone(0.6, 6000) + _tone(0.6, 8000) + _silence(0.7))
+
+
+def test_segmenter_splits_on_silence():
+    segments = SpeechSegmenter(vad=EnergyVAD()).feed(_utterances())
+    assert len(segments) == 2
+    (first, s1, e1), (second, s2, e2) = segments
+    assert 0.2 <= s1 <= 0.5 and 1.2 <= e1 <= 1.5
+    assert 1.7 <= s2 <= 2.0 and e2 > 3.0
+    assert SpeechSegmenter(vad=EnergyVAD()).feed(_silence(3, noise=150)) == []
+
+
+def test_finals_arrive_while_audio_is_still_streaming():
+    stream = STTStream(_pool(delay=0.05), SpeechSegmenter(vad=EnergyVAD()), partials=False)
+    audio = _utterances() + _silence(1.0)
+    events = []
+    chunk = RATE // 5
+    for i in range(0, len(audio), chunk):
+        events += stream.feed(audio[i:i + chunk])
+        time.sleep(0.02)
+    finals = [e for e in events if e["type"] == "final"]
+    assert [e["text"] for e in finals] == ["hello", "elaine schedule"]
+    assert all(e["latency_ms"] < 300 for e in finals)
+    assert stream.finish() == [] and stream.text == "hello elaine schedule"
+
+
+def test_partials_for_long_utterances():
+    stream = STTStream(_pool(delay=0.01), SpeechSegmenter(vad=EnergyVAD()), partial_interval=0.5)
+    audio = _silence(0.3) + _tone(2.5, 6000)
+    events = []
+    for i in range(0, len(audio), RATE // 5):
+        events += stream.feed(audio[i:i + RATE // 5])
+        time.sleep(0.03)
+    events += stream.finish()
+    kinds = [e["type"] for e in events]
+    assert "partial" in kinds and kinds[-1] == "final"
+    assert events[-1]["text"] == "elaine"
+
+
+def test_pool_decodes_concurrently_and_prewarms():
+    pool = _pool(delay=0.2, size=2)
+    pool.warm()
+    assert len(pool.loads) == 2 and pool.status()["warm"]
+    start = time.perf_counter()
+    futures = [pool.submit(_tone(0.3, 4000)) for _ in range(4)]
+    assert [f.result()[0] for f in futures] == ["hello"] * 4
+    assert time.perf_counter() - start < 0.7
+    assert len(pool.loads) == 2 and pool.status()["decodes"] == 4
+
+
+def test_waiters_are_woken_when_a_model_load_fails():
+    attempts = []
+
+    def loader():
+        attempts.append(time.perf_counter())
+        time.sleep(0.1)
+        if len(attempts) == 1:
+            raise RuntimeError("model files missing")
+        return FakeModel(0.0)
+    pool = WhisperPool(loader, size=1)
+    with ThreadPoolExecutor(max_workers=2) as ex:       # One loads, the other waits for it
+        futures = [ex.submit(pool.transcribe, _tone(0.3, 4000)) for _ in range(2)]
+        errors = [f.exception(timeout=2) for f in futures]
+    assert sorted(type(e).__name__ for e in errors) == ["NoneType", "RuntimeError"]
+    assert "hello" in [f.result()[0] for f in futures if not f.exception()]
+    assert len(attempts) == 2 and pool.status()["loaded"] == 1
+
+
+def test_shared_pool_is_created_once(monkeypatch):
+    monkeypatch.setattr(api_routes_chat, "_stt_pool", None)
+    created = []
+    real = api_routes_chat.WhisperPool
+
+    def slow_pool(*args, **kwargs):
+        created.append(1)
+        time.sleep(0.05)
+        return real(*args, **kwargs)
+    monkeypatch.setattr(api_routes_chat, "WhisperPool", slow_pool)
+    with ThreadPoolExecutor(max_workers=4) as ex:
+        pools = list(ex.map(lambda _: api_routes_chat._get_stt_pool(), range(4)))
+    assert len(created) == 1 and all(p is pools[0] for p in pools)
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(api_routes_chat, "_stt_pool", _pool())
+    app = Flask(__name__)
+    app.register_blueprint(api_routes_chat.create_chat_routes())
+    return app.test_client()
+
+
+def test_stream_route_emits_ndjson(client):
+    resp = client.post("/api/stt/stream?partials=0", data=_utterances(),
+                       content_type="application/octet-stream")
+    events = [json.loads(line) for line in resp.data.decode().splitlines()]
+    assert [e["type"] for e in events] == ["final", "final", "done"]
+    assert events[-1]["text"] == "hello elaine schedule"
+
+
+def test_session_route_flow(client):
+    sid = client.post("/api/stt/sessions?partials=0").get_json()["session_id"]
+    audio = _utterances()
+    finals = []
+    for i in range(0, len(audio), RATE):
+        finals += [e for e in client.post(f"/api/stt/sessions/{sid}", data=audio[i:i + RATE]).get_json()["events"]
+                   if e["type"] == "final"]
+        time.sleep(0.1)
+    end = client.post(f"/api/stt/sessions/{sid}/end").get_json()
+    assert [e["text"] for e in finals + [e for e in end["events"] if e["type"] == "final"]] == [
+        "hello", "elaine schedule"]
+    assert end["text"] == "hello elaine schedule"
+    assert client.post(f"/api/stt/sessions/{sid}", data=b"\x00\x00").status_code == 404
+    assert client.get("/api/stt/status").get_json()["decodes"] >= 2
@@ -0,0 +1,146 @@
+"""Cartographer — columnar territory state: decay, map, debt and projections match the per-territory rules.
+
+Almost Magic Tech Lab
+"""
+
+import copy
+import os
+import random
+import sys
+from datetime import datetime, timedelta
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from modules.cartographer import territory_state
+from modules.cartographer.models import DepthLevel, DepthSignals, KnowledgeTerritory, DEPTH_THRESHOLDS
+from modules.cartographer.territory_map import TerritoryMap
+
+BACKENDS = [False, pytest.param(True, marks=pytest.mark.skipif(
+    not territory_state.HAS_NUMPY, reason="numpy not installed"))]
+
+
+@pytest.fixture(params=BACKENDS, ids=["lists", "numpy"])
+def backend(request, monkeypatch):
+    monkeypatch.setattr(territory_state, "HAS_NUMPY", request.param)
+    return request.param
+
+
+def _map(n=300, seed=5):
+    rng = random.Random(seed)
+    now = datetime.now()
+    tm = TerritoryMap()
+    for i in range(n):
+        tm.territories[f"t{i}"] = KnowledgeTerritory(
+            territory_id=f"t{i}", label=f"Territory {i}",
+            depth_signals=DepthSignals(*(rng.uniform(0, 100) for _ in range(6))),
+            decay_rate_per_quarter=rng.choice([0.02, 0.03, 0.05, 0.2]),
+            last_engagement=None if rng.random() < 0.1 else now - timedelta(days=rng.uniform(0, 1000)),
+        )
+    return tm
+
+
+def _decay_one(t, now):
+    """The original per-territory rule."""
+    quarters = (now - t.last_engagement).days / 90.0
+    if quarters < 1.0:
+        return None
+    f = max(0.3, 1.0 - t.decay_rate_per_quarter * quarters)
+    old = t.depth
+    for name in territory_state.DECAYING:
+        setattr(t.depth_signals, name, getattr(t.depth_signals, name) * f)
+    return (t.label, old.value, t.depth.value) if t.depth != old else None
+
+
+def test_decay_matches_per_territory_rules(backend):
+    actual = _map()
+    expected = copy.deepcopy(actual.territories)
+    now = datetime.now()
+    expected_alerts = [a for t in expected.values() if t.last_engagement
+                       for a in [_decay_one(t, now)] if a]
+
+    alerts = actual.apply_quarterly_decay()
+    assert [(a["territory"], a["old_depth"], a["new_depth"]) for a in alerts] == expected_alerts
+    assert expected_alerts                                            # Some levels did drop
+    for tid, t in actual.territories.items():
+        assert t.depth_signals == expected[tid].depth_signals
+    assert all(actual.territories[tid].trend.value == "stale"
+               for tid in expected if any(a[0] == expected[tid].label for a in expected_alerts))
+
+
+def test_map_and_debt_match_per_territory_rules(backend):
+    tm = _map()
+    rows = tm.get_map()
+    by_id = {r["territory_id"]: r for r in rows}
+    assert [r["depth_score"] for r in rows] == sorted((r["depth_score"] for r in rows), reverse=True)
+    for tid, t in tm.territories.items():
+        assert by_id[tid]["depth"] == t.depth.value and by_id[tid]["depth_score"] == round(t.depth_score, 1)
+
+    rng = random.Random(1)
+    required = {tid: rng.choice(list(DepthLevel)) for tid in list(tm.territories)[::3]}
+    required["brand_new"] = DepthLevel.GROWING
+    debts = tm.calculate_knowledge_debt(required)
+    expected = sorted(
+        [(tm.territories[tid].label, round(DEPTH_THRESHOLDS[lvl] - tm.territories[tid].depth_score, 1))
+         for tid, lvl in required.items()
+         if tid in tm.territories and tm.territories[tid].depth_score < DEPTH_THRESHOLDS[lvl]]
+        + [("brand_new", None)], key=lambda x: 100 if x[1] is None else x[1], reverse=True)
+    assert [(d["territory"], d.get("gap_points")) for d in debts] == expected
+    assert debts[0]["territory"] == "brand_new" and debts[0]["estimated_hours"] == 20
+
+
+def test_as_of_projects_without_touching_territories(backend):
+    tm = _map(50)
+    before = copy.deepcopy(tm.territories)
+    now = datetime.now()
+    dates = [now - timedelta(days=400), now + timedelta(days=1), now + timedelta(days=365)]
+
+    projected = tm.project_depth(dates)
+    year_out = {r["territory_id"]: r["depth_score"] for r in tm.get_map(as_of=dates[2])}
+    future_debt = tm.calculate_knowledge_debt({"ai_agents": DepthLevel.DEEP}, as_of=dates[2])
+    assert tm.territories == before
+
+    for tid, t in tm.territories.items():
+        for date, score in zip(dates, projected[tid]):
+            clone = copy.deepcopy(t)
+            if clone.last_engagement:
+                _decay_one(clone, date)
+            assert score == round(clone.depth_score, 1)
+        assert year_out[tid] == projected[tid][2]
+    # A year without engagement costs the uncredentialed signals 5% a quarter
+    assert future_debt[0]["current_score"] < round(tm.territories["ai_agents"].depth_score, 1)
+
+
+def test_columns_follow_edits_made_anywhere(backend):
+    tm = _map(20)
+    store = tm.territories
+    tm.apply_quarterly_decay()
+    tm.territories["t4"].depth_signals.time_investment = 12.5  # After a column-wise write
+    t = tm.territories["t3"]
+    t.depth_signals.credentials = 0                          # Signal edit
+    t.depth_signals = DepthSignals(credentials=100)          # Replaced signals
+    t.depth_signals.teaching_evidence = 50
+    tm.territories["t5"].last_engagement = None              # Engagement and rate
+    tm.territories["t6"].decay_rate_per_quarter = 0.5
+    tm.record_engagement("t7")
+    del tm.territories["t0"]
+    tm.territories["t8"] = KnowledgeTerritory("t8", "Replaced")
+    tm.add_territory("fresh", "Fresh", DepthSignals(credentials=40))
+    tm.territories = dict(tm.territories)                    # Plain dicts are wrapped
+
+    assert list(tm.territories.records) == list(tm.territories.values())
+    for row, (tid, t) in enumerate(tm.territories.items()):
+        for name in territory_state.SIGNALS:
+            assert tm.territories.column(name)[row] == getattr(t.depth_signals, name)
+        assert tm.territories.column("rate")[row] == t.decay_rate_per_quarter
+        assert bool(tm.territories.column("engaged")[row]) == (t.last_engagement is not None)
+    assert {r["territory_id"]: r["depth_score"] for r in tm.get_map()}["t3"] == 30.0
+
+    # Objects no longer in a store don't reach it
+    old = store["t1"]
+    del store["t1"]
+    before = list(store.column("credentials"))
+    old.depth_signals.credentials = 1
+    old.last_engagement = None
+    assert list(store.column("credentials")) == before
@@ -0,0 +1,89 @@
+"""Thinking Frameworks — memoised analyses, concurrent providers, bounded history.
+
+Almost Magic Tech Lab
+"""
+
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from modules.thinking import engine as thinking
+from modules.thinking.engine import DecisionDomain, FrameworkType, StakesLevel, ThinkingFrameworksEngine
+
+CRITICAL = (DecisionDomain.STRATEGY, StakesLevel.CRITICAL)   # Four frameworks
+
+
+def test_repeat_analyses_are_cache_hits_and_context_is_part_of_the_key():
+    engine = ThinkingFrameworksEngine()
+    first = engine.analyse("Raise prices for  Q3", *CRITICAL, context={"confidence": 0.8})
+    assert engine.analyse("raise prices for Q3", *CRITICAL, context={"confidence": 0.8}) is first
+    assert engine.analyse("raise prices for Q3", *CRITICAL, context={"confidence": 0.6}) is not first
+    assert engine.analyse("raise prices for Q3", *CRITICAL, context={"confidence": 0.8},
+                          frameworks=[FrameworkType.INVERSION]) is not first
+
+    status = engine.status()
+    assert status["cache"] == {"hits": 1, "misses": 3, "size": 3}
+    assert status["total_analyses"] == 3
+    assert status["framework_usage"]["six_hats"] == 2
+
+
+def test_cache_expires_and_evicts_least_recently_used():
+    engine = ThinkingFrameworksEngine(cache_ttl=0)
+    a = engine.analyse("Hire a contractor", DecisionDomain.PRIORITY, StakesLevel.HIGH)
+    assert engine.analyse("Hire a contractor", DecisionDomain.PRIORITY, StakesLevel.HIGH) is not a
+
+    engine = ThinkingFrameworksEngine(cache_size=2)
+    a = engine.analyse("a", *CRITICAL)
+    b = engine.analyse("b", *CRITICAL)
+    assert engine.analyse("a", *CRITICAL) is a            # a is now most recent
+    engine.analyse("c", *CRITICAL)                        # evicts b
+    assert engine.analyse("a", *CRITICAL) is a
+    assert engine.analyse("b", *CRITICAL) is not b
+
+
+def test_history_is_a_bounded_ring(monkeypatch):
+    monkeypatch.setattr(thinking, "HISTORY_SIZE", 3)
+    engine = ThinkingFrameworksEngine()
+    for i in range(5):
+        engine.analyse(f"topic {i}", *CRITICAL)
+    assert [h["topic"] for h in engine.get_history(10)] == ["topic 2", "topic 3", "topic 4"]
+    assert engine.status()["total_analyses"] == 5
+
+
+def test_provider_calls_run_concurrently_and_caller_context_wins():
+    calls = []
+
+    def provider(framework, topic, context):
+        calls.append(framework)
+        time.sleep(0.2)
+        if framework == FrameworkType.FIRST_PRINCIPLES:
+            raise RuntimeError("model offline")
+        return {"recommendation": f"LLM on {topic}", "white_hat": "facts", "top_risk": "LLM risk"}
+
+    engine = ThinkingFrameworksEngine(provider=provider)
+    start = time.perf_counter()
+    result = engine.analyse("Enter the NZ market", *CRITICAL,
+                            context={"pre_mortem": {"top_risk": "Mani's risk"}})
+    assert time.perf_counter() - start < 0.5              # Four 0.2 s calls, not 0.8 s
+    assert sorted(calls) == sorted(result.frameworks_applied)
+    assert result.results["second_order"].recommendation == "LLM on Enter the NZ market"
+    assert result.results["six_hats"].white_hat == "facts"
+    assert result.results["pre_mortem"].top_risk == "Mani's risk"
+    assert result.results["first_principles"].rebuilt_answer == ""   # Failed provider, plain context
+
+
+def test_simultaneous_duplicates_share_one_run():
+    calls = []
+    engine = ThinkingFrameworksEngine(provider=lambda fw, topic, ctx: calls.append(fw) or time.sleep(0.1))
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(engine.analyse("Cascade topic", *CRITICAL)))
+               for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(calls) == 4 and len({id(r) for r in results}) == 1
+    assert engine.status()["cache"]["hits"] == 3
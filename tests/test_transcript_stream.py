@@ -0,0 +1,95 @@
+"""Chronicle — streaming transcript ingestion.
+
+Almost Magic Tech Lab
+"""
+
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import pytest
+
+from modules.chronicle.meeting_engine import MeetingEngine
+from modules.chronicle.models import MeetingTemplate
+from modules.chronicle.transcript_stream import MAX_CARRY
+
+TRANSCRIPT = (
+    "Mani: Thanks for making the time. I'll send the revised proposal by Friday.\n"
+    "Sarah Chen: Great. I will check the budget with our CFO. We decided to start with the pilot.\n"
+    "Mani: Action: book the governance workshop. Let's go with the smaller scope for now.\n"
+    "Sarah Chen: Sorry, I dropped out. I will check the budget with our CFO!\n"
+)
+
+
+def _meeting():
+    engine = MeetingEngine()
+    meeting = engine.create_meeting("Acme discovery", MeetingTemplate.DISCOVERY_CALL, [])
+    return engine, meeting
+
+
+def _run(engine, meeting, chunks):
+    stream = engine.stream_transcript(meeting.meeting_id)
+    events = []
+    for chunk in chunks:
+        events += stream.feed(chunk)
+    return events + stream.finish(), stream
+
+
+@pytest.mark.parametrize("size", [1, 7, 64, len(TRANSCRIPT)])
+def test_chunking_does_not_change_what_is_extracted(size):
+    engine, meeting = _meeting()
+    events, stream = _run(engine, meeting, [TRANSCRIPT[i:i + size] for i in range(0, len(TRANSCRIPT), size)])
+
+    assert [e["name"] for e in events if e["type"] == "participant"] == ["Mani", "Sarah Chen"]
+    assert [p.role for p in meeting.participants] == ["host", ""]
+    assert [(c.owner, c.text) for c in meeting.commitments] == [
+        ("mani", "I'll send the revised proposal by Friday."),
+        ("Sarah Chen", "I will check the budget with our CFO."),
+        ("assigned", "Action: book the governance workshop."),
+    ]
+    assert [(d.made_by, d.text) for d in meeting.decisions] == [
+        ("mutual", "We decided to start with the pilot."),
+        ("mutual", "Let's go with the smaller scope for now."),
+    ]
+    assert stream.stats["duplicates"] == 1          # The repeated budget check
+    assert meeting.patterns.commitment_balance == {"mani": 1, "other": 2}
+    assert engine.meetings.count_active("Sarah Chen") == 1
+    assert engine.list_meetings(person="sarah chen") == [meeting]
+
+
+def test_results_arrive_before_the_meeting_ends_and_carry_is_bounded():
+    engine, meeting = _meeting()
+    stream = engine.stream_transcript(meeting.meeting_id)
+    assert stream.feed("I'll send the deck by Friday") == []          # Sentence not finished yet
+    events = stream.feed(". And then")
+    assert [e["type"] for e in events] == ["commitment"]
+    assert events[0]["due_date"] is not None
+
+    # A long unpunctuated STT run is cut rather than held
+    stream.feed("word " * (MAX_CARRY // 2))
+    assert len(stream._carry) <= MAX_CARRY
+    stream.finish()
+    assert stream._carry == ""
+
+
+def test_resumed_stream_skips_statements_already_on_the_meeting():
+    engine, meeting = _meeting()
+    _run(engine, meeting, [TRANSCRIPT])
+    before = (len(meeting.commitments), len(meeting.decisions))
+    events, stream = _run(engine, meeting, [TRANSCRIPT])
+    assert [e for e in events if e["type"] != "participant"] == []
+    assert (len(meeting.commitments), len(meeting.decisions)) == before
+    assert engine.stream_transcript("mtg_missing") is None
+
+
+def test_stream_route_returns_ndjson_events(client):
+    meeting_id = client.post("/api/chronicle/meetings", json={"title": "Acme discovery"}).get_json()["meeting_id"]
+
+    body = TRANSCRIPT.encode("utf-8")
+    response = client.post(f"/api/chronicle/extract/{meeting_id}/stream", data=body)
+    lines = [json.loads(line) for line in response.data.decode().splitlines()]
+    assert [e["type"] for e in lines].count("commitment") == 3
+    assert lines[-1]["type"] == "done" and lines[-1]["stats"]["decisions"] == 2
+    assert client.post("/api/chronicle/extract/nope/stream", data=b"x").status_code == 404
@@ -0,0 +1,120 @@
+"""Voice — sentence-pipelined streaming TTS and the on-disk phrase cache.
+
+Almost Magic Tech Lab
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import pytest
+from flask import Flask
+
+import api_routes_chat
+from modules.tts_pipeline import (
+    PCMBackend, PhraseCache, SpeechChunk, TTSPipeline, split_speech,
+)
+
+
+class SlowPCM:
+    """Stand-in synthesiser: 10 ms of PCM per character, after a fixed delay."""
+
+    def __init__(self, delay=0.15, fail=False):
+        self.delay = delay
+        self.fail = fail
+        self.calls = []
+
+    def __call__(self, text):
+        self.calls.append(text)
+        time.sleep(self.delay)
+        return None if self.fail else b"\x01\x00" * (240 * len(text))
+
+
+def test_split_at_sentences_and_ssml_breaks():
+    assert [c.text for c in split_speech("Morning Mani. Dr. Chen confirmed. Revenue is 4.5 thousand dollars!")] == [
+        "Morning Mani.", "Dr. Chen confirmed.", "Revenue is 4.5 thousand dollars!"]
+    ssml = '<speak>\nMorning Mani.\n<break time="300ms"/>\nNo <emphasis>Red Giants</emphasis>.\n</speak>'
+    assert split_speech(ssml) == [SpeechChunk("Morning Mani.", 0), SpeechChunk("No Red Giants.", 300)]
+    assert all(len(c.text) <= 280 for c in split_speech("clause, " * 150))
+
+
+def test_phrase_cache_evicts_least_recently_used(tmp_path):
+    cache = PhraseCache(tmp_path, max_bytes=300)
+    for key in "abc":
+        cache.put(key, bytes(100))
+    assert cache.get("a") == bytes(100)     # a is now most recent
+    cache.put("d", bytes(100))
+    assert cache.get("b") is None and cache.get("a") is not None
+    assert cache.status()["evictions"] == 1
+
+    reopened = PhraseCache(tmp_path, max_bytes=300)
+    assert reopened.status()["entries"] == 3 and reopened.get("d") == bytes(100)
+
+
+def test_first_audio_after_one_sentence(tmp_path):
+    synth = SlowPCM(delay=0.15)
+    pipeline = TTSPipeline(PhraseCache(tmp_path))
+    backend = PCMBackend("fake", synth)
+    chunks = split_speech("One. Two. Three. Four. Five. Six.")
+
+    start = time.perf_counter()
+    stream = pipeline.stream(backend, chunks)
+    first = next(stream)
+    first_s = time.perf_counter() - start
+    rest = b"".join(stream)
+    total_s = time.perf_counter() - start
+    assert first[:4] == b"RIFF" and first[8:12] == b"WAVE"
+    assert first_s < 0.4 < total_s
+    assert len(first) + len(rest) == 44 + sum(480 * len(c.text) for c in chunks)
+
+    # Second time round every sentence comes from the phrase cache
+    start = time.perf_counter()
+    again = b"".join(pipeline.stream(backend, chunks))
+    assert time.perf_counter() - start < 0.1
+    assert again == first + rest
+    assert pipeline.status()["synthesised"] == 6 and pipeline.cache.status()["hits"] == 6
+
+
+def test_closing_stream_stops_synthesis(tmp_path):
+    synth = SlowPCM(delay=0.05)
+    pipeline = TTSPipeline(PhraseCache(tmp_path), lookahead=1)
+    stream = pipeline.stream(PCMBackend("fake", synth), split_speech("Sentence. " * 40))
+    next(stream)
+    stream.close()
+    time.sleep(0.3)
+    assert len(synth.calls) < 10
+    assert pipeline.status()["cancelled"] == 1
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    monkeypatch.setattr(api_routes_chat, "_tts_pipeline", TTSPipeline(PhraseCache(tmp_path)))
+    app = Flask(__name__)
+    app.register_blueprint(api_routes_chat.create_chat_routes())
+    return app.test_client()
+
+
+def test_stream_route_falls_back_and_uses_segments(client, monkeypatch):
+    broken, working = SlowPCM(delay=0, fail=True), SlowPCM(delay=0)
+    monkeypatch.setattr(api_routes_chat, "_tts_backends",
+                        lambda: [PCMBackend("broken", broken), PCMBackend("kokoro", working)])
+    resp = client.post("/api/tts/stream", json={"segments": [
+        {"text": "Morning Mani.", "emotion": "warm", "pause_ms": 0},
+        {"text": "No Red Giants. Your gravity field is clean.", "emotion": "calm", "pause_ms": 200},
+    ]})
+    assert resp.mimetype == "audio/wav"
+    assert resp.headers["X-TTS-Backend"] == "kokoro" and resp.headers["X-TTS-Chunks"] == "3"
+    audio = resp.data
+    assert working.calls == ["Morning Mani.", "No Red Giants.", "Your gravity field is clean."]
+    pause = 2 * 24000 * 200 // 1000
+    assert len(audio) == 44 + pause + 480 * sum(len(t) for t in working.calls)
+
+
+def test_stream_route_without_backends_hints_browser(client, monkeypatch):
+    monkeypatch.setattr(api_routes_chat, "_tts_backends", lambda: [])
+    assert client.post("/api/tts/stream", json={"text": "Hello."}).get_json()["fallback"] == "browser-tts"
+    assert client.post("/api/tts/stream", json={}).status_code == 400
+    for bad in ({"text": "Hi.", "emotion": "grumpy"}, {"text": "Hi.", "pause_ms": "soon"}, "Hi."):
+        assert client.post("/api/tts/stream", json={"segments": [bad]}).status_code == 400